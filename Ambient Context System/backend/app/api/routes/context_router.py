@@ -0,0 +1,110 @@
+"""
+Context routes
+
+Session context lives in the ContextEngine (app.services.context_engine):
+events and state are applied incrementally, reads return the maintained
+context, and ``since_version`` lets clients skip unchanged contexts.
+"""
+
+from typing import Annotated, List, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from pydantic import BaseModel, Field
+
+from app.services.context_engine import SessionCapacityError, SessionNotFound
+
+router = APIRouter()
+
+
+class ContextEvent(BaseModel):
+    kind: str = Field(..., min_length=1, max_length=32)
+    ref: Optional[str] = Field(None, max_length=512)
+    actor: Optional[str] = Field(None, max_length=128)
+    topics: List[Annotated[str, Field(min_length=1, max_length=128)]] = Field([], max_length=16)
+    weight: float = Field(1.0, ge=0.0, le=100.0)
+
+
+class EventsIn(BaseModel):
+    project_id: Optional[str] = Field(None, max_length=128)
+    events: List[ContextEvent] = Field(..., min_length=1, max_length=1000)
+
+
+class StateIn(BaseModel):
+    value: str = Field(..., max_length=16384)
+
+
+def get_context_engine(request: Request):
+    engine = getattr(request.app.state, "context_engine", None)
+    if engine is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Context engine not ready")
+    return engine
+
+
+def capacity_error(e: SessionCapacityError) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+
+@router.post("/sessions/{session_id}/events")
+async def record_events(session_id: str, body: EventsIn, request: Request):
+    """Apply events to the session context in order; returns the resulting version"""
+    engine = get_context_engine(request)
+    version = None
+    try:
+        for event in body.events:
+            version = engine.record(session_id, event.kind, event.ref, event.actor, event.topics, event.weight,
+                                    project_id=body.project_id)
+    except SessionCapacityError as e:
+        raise capacity_error(e)
+    return {"session_id": session_id, "version": version, "accepted": len(body.events)}
+
+
+@router.put("/sessions/{session_id}/state/{key}")
+async def set_state(session_id: str, key: str, body: StateIn, request: Request):
+    engine = get_context_engine(request)
+    try:
+        version = engine.set_state(session_id, key, body.value)
+    except SessionCapacityError as e:
+        raise capacity_error(e)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    return {"session_id": session_id, "version": version}
+
+
+@router.get("/sessions/{session_id}")
+async def get_context(
+    session_id: str,
+    request: Request,
+    since_version: Optional[int] = None,
+    recent: int = Query(20, ge=0, le=500),
+    topics: int = Query(10, ge=0, le=100),
+):
+    """The session's current context, or just its version when unchanged since ``since_version``"""
+    engine = get_context_engine(request)
+    try:
+        version = engine.version(session_id)
+        if since_version is not None and since_version == version:
+            return {"session_id": session_id, "version": version, "changed": False}
+        return dict(engine.get_context(session_id, recent, topics), changed=True)
+    except SessionNotFound:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No live context for this session")
+
+
+@router.delete("/sessions/{session_id}")
+async def close_session(session_id: str, request: Request):
+    if not get_context_engine(request).close_session(session_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No live context for this session")
+    return {"session_id": session_id, "closed": True}
+
+
+@router.get("/sessions/{session_id}/memory")
+async def session_memory(session_id: str, request: Request):
+    """Accounted bytes for one session, by component, against its budget"""
+    try:
+        return get_context_engine(request).session_memory(session_id)
+    except SessionNotFound:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No live context for this session")
+
+
+@router.get("/metrics")
+async def context_metrics(request: Request):
+    return get_context_engine(request).metrics()
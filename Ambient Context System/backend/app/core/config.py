@@ -1,4 +1,3 @@
-```python
 """
 Configuration management for Ambient Context System
 """
@@ -53,7 +52,16 @@ class Settings(BaseSettings):
     MAX_CONCURRENT_SESSIONS: int = 100
     SESSION_TIMEOUT_MINUTES: int = 30
     PRESENCE_UPDATE_INTERVAL: int = 5
-    
+
+    # Context engine (per-session memory budget; total stays under MAX_CONCURRENT_SESSIONS x budget)
+    CONTEXT_SESSION_MEMORY_KB: int = 256
+    CONTEXT_MAX_EVENTS_PER_SESSION: int = 4096
+    CONTEXT_MAX_TOPICS_PER_SESSION: int = 64
+    CONTEXT_MAX_PARTICIPANTS_PER_SESSION: int = 32
+    CONTEXT_TOPIC_HALF_LIFE_MINUTES: float = 30.0
+    CONTEXT_MIN_IDLE_SECONDS: int = 60
+    CONTEXT_SWEEP_INTERVAL_SECONDS: int = 30
+
     # Storage
     UPLOAD_DIR: str = "/tmp/uploads"
     MAX_UPLOAD_SIZE: int = 100 * 1024 * 1024  # 100MB
@@ -70,4 +78,3 @@ def get_settings() -> Settings:
 
 
 settings = get_settings()
-```
\ No newline at end of file
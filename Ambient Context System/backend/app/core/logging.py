@@ -1,39 +1,36 @@
 ```python
 """
 Logging configuration
+
+The console and rotating JSON file handlers run on QueueListener threads;
+loggers only enqueue, so requests never wait on file writes or rotation.
 """
 
 import logging
-import logging.config
+import logging.handlers
+import os
+import sys
 from pythonjsonlogger import jsonlogger
 from app.core.config import settings
+from app.middleware.request_logging import install_queue_logging, setup_access_logging
+
+LOG_FILE = "logs/ambient_context.log"
 
 
 def setup_logging():
-    """Configure application logging"""
-    
-    logging_config = {
-        "version": 1,
-        "disable_existing_loggers": False,
-        "formatters": {
-            "standard": {
-                "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-            },
-            "json": {
-                "()": "pythonjsonlogger.jsonlogger.JsonFormatter",
-                "format": "%(asctime)s %(name)s %(levelname)s %(message)s"
-            }
-        },
-        "handlers": {
-            "console": {
-                "class": "logging.StreamHandler",
-                "level": settings.LOG_LEVEL,
-                "formatter": "standard",
-                "stream": "ext://sys.stdout"
-            },
-            "file": {
-                "class": "logging.handlers.RotatingFileHandler",
-                "level": settings.LOG_LEVEL,
-                "formatter": "json",
-                "filename": "logs/ambient_context.log",
-                "maxBytes": 10485760,  #
\ No newline at end of file
+    """Configure application logging; returns the queue listeners to stop on shutdown"""
+    os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
+
+    console = logging.StreamHandler(sys.stdout)
+    console.setLevel(settings.LOG_LEVEL)
+    console.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+
+    file_handler = logging.handlers.RotatingFileHandler(LOG_FILE, maxBytes=10485760, backupCount=5)  # 10MB
+    file_handler.setLevel(settings.LOG_LEVEL)
+    file_handler.setFormatter(jsonlogger.JsonFormatter("%(asctime)s %(name)s %(levelname)s %(message)s"))
+
+    app_listener = install_queue_logging([console, file_handler], level=settings.LOG_LEVEL)
+    # One JSON access record per request, into the same rotating file
+    access_listener = setup_access_logging([file_handler])
+    return [app_listener, access_listener]
+```
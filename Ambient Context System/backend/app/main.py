@@ -11,6 +11,7 @@ import logging
 
 from app.core.config import settings
 from app.core.logging import setup_logging
+from app.middleware.request_logging import RequestLoggingMiddleware, stop_listener
 from app.api.routes import (
     context_router,
     collaboration_router,
@@ -22,7 +23,7 @@ from app.services.context_engine import ContextEngine
 from app.services.cache_manager import CacheManager
 
 # Setup logging
-setup_logging()
+log_listeners = setup_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -50,6 +51,8 @@ async def lifespan(app: FastAPI):
     await app.state.cache_manager.disconnect()
     await app.state.context_engine.cleanup()
     logger.info("Shutdown complete")
+    for listener in log_listeners:
+        stop_listener(listener)
 
 
 # Create FastAPI application
@@ -75,6 +78,9 @@ app.add_middleware(
     allowed_hosts=settings.ALLOWED_HOSTS
 )
 
+# One structured access record per request
+app.add_middleware(RequestLoggingMiddleware)
+
 
 # Include routers
 app.include_router(health_router.router, prefix="/api/health", tags=["health"])
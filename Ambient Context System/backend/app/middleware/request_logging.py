@@ -0,0 +1,201 @@
+"""
+Request logging middleware (pure ASGI)
+
+Shared by the FastAPI backends. Each service builds from its own backend
+directory, so every service carries an identical copy of this module.
+Edit this copy and run ``python check_shared_modules.py --sync`` from the
+repository root; without ``--sync`` it fails when the copies differ.
+
+One structured record per request (method, path, route template, status,
+response bytes, duration, request id). The request path only puts the
+record on a bounded queue; a QueueListener thread formats it as a JSON
+line and writes it, so slow handlers (files, rotation, stdout under
+backpressure) never add latency. When the queue is full the record is
+dropped and counted instead of blocking. High-volume routes can be
+sampled; server errors and slow requests are always logged.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+ACCESS_LOGGER = "access"
+
+# "/api/v1/health=0.01,/api/v1/search=0.1": log 1% of health checks, 10% of searches
+REQUEST_LOG_SAMPLE_RATES = os.environ.get("REQUEST_LOG_SAMPLE_RATES", "")
+REQUEST_LOG_SLOW_MS = float(os.environ.get("REQUEST_LOG_SLOW_MS", 1000))
+REQUEST_LOG_QUEUE_SIZE = int(os.environ.get("REQUEST_LOG_QUEUE_SIZE", 10000))
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """``"/prefix=rate,/other=rate"`` -> ``{"/prefix": rate, ...}``"""
+    rates = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        prefix, _, rate = item.partition("=")
+        rates[prefix.strip()] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+
+class JsonLineFormatter(logging.Formatter):
+    """One JSON object per line; dict messages are merged into the object"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+        }
+        if isinstance(record.msg, dict):
+            payload.update(record.msg)
+        else:
+            payload["message"] = record.getMessage()
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, separators=(",", ":"))
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Enqueue without formatting or waiting; a full queue drops the record"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Same process, so no pickling; the listener thread does the formatting
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def install_queue_logging(handlers: Iterable[logging.Handler], logger: Optional[str] = None,
+                          level: int = logging.INFO,
+                          queue_size: int = REQUEST_LOG_QUEUE_SIZE) -> logging.handlers.QueueListener:
+    """Put ``handlers`` behind a queue: ``logger`` (root by default) only enqueues
+
+    Returns the started listener; ``stop_listener`` drains the queue and is
+    also registered at exit.
+    """
+    log_queue: queue.Queue = queue.Queue(queue_size)
+    target = logging.getLogger(logger)
+    for handler in list(target.handlers):
+        target.removeHandler(handler)
+    target.addHandler(NonBlockingQueueHandler(log_queue))
+    target.setLevel(level)
+
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(stop_listener, listener)
+    return listener
+
+
+def stop_listener(listener: logging.handlers.QueueListener):
+    """Drain and stop; safe to call more than once"""
+    if getattr(listener, "_thread", None) is not None:
+        listener.stop()
+
+
+def setup_access_logging(handlers: Optional[List[logging.Handler]] = None) -> logging.handlers.QueueListener:
+    """Access records as JSON lines on stdout (or ``handlers``), written off the request path"""
+    if handlers is None:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(JsonLineFormatter())
+        handlers = [handler]
+    listener = install_queue_logging(handlers, logger=ACCESS_LOGGER)
+    logging.getLogger(ACCESS_LOGGER).propagate = False
+    return listener
+
+
+class RequestLoggingMiddleware:
+    """Emit one access record per HTTP request"""
+
+    def __init__(self, app, logger_name: str = ACCESS_LOGGER, sample_rates: Optional[Dict[str, float]] = None,
+                 slow_ms: float = REQUEST_LOG_SLOW_MS, exclude_paths: Iterable[str] = (),
+                 request_id_header: str = "x-request-id"):
+        self.app = app
+        self.logger = logging.getLogger(logger_name)
+        rates = parse_sample_rates(REQUEST_LOG_SAMPLE_RATES) if sample_rates is None else sample_rates
+        # Longest prefix wins
+        self.sample_rates = sorted(rates.items(), key=lambda item: -len(item[0]))
+        self.slow_ms = slow_ms
+        self.exclude_paths = frozenset(exclude_paths)
+        self.request_id_header = request_id_header.lower().encode("latin-1")
+        self.sampled_out = 0
+
+    def _sample_rate(self, path: str) -> float:
+        for prefix, rate in self.sample_rates:
+            if path.startswith(prefix):
+                return rate
+        return 1.0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        response_bytes = 0
+        error = None
+
+        async def send_wrapper(message):
+            nonlocal status_code, response_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self._emit(scope, status_code, response_bytes, (time.perf_counter() - started) * 1000, error)
+
+    def _emit(self, scope, status_code: int, response_bytes: int, duration_ms: float, error: Optional[str]):
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+
+        path = scope["path"]
+        rate = 1.0
+        if status_code < 500 and duration_ms < self.slow_ms and self.sample_rates:
+            rate = self._sample_rate(path)
+            if rate < 1.0 and random.random() >= rate:
+                self.sampled_out += 1
+                return
+
+        record = {
+            "method": scope["method"],
+            "path": path,
+            "route": getattr(scope.get("route"), "path", None),
+            "status": status_code,
+            "duration_ms": round(duration_ms, 3),
+            "bytes": response_bytes,
+            "client": scope["client"][0] if scope.get("client") else None,
+        }
+        for name, value in scope["headers"]:
+            if name == self.request_id_header:
+                record["request_id"] = value.decode("latin-1")
+                break
+        if error:
+            record["error"] = error
+        if rate < 1.0:
+            # Lets aggregations weight sampled records back up
+            record["sample_rate"] = rate
+
+        # handle() skips Logger.info's caller lookup
+        self.logger.handle(logging.LogRecord(self.logger.name, logging.INFO, __file__, 0, record, None, None))
@@ -0,0 +1,505 @@
+"""
+Context engine
+
+Keeps the live context of every collaboration session in memory under an
+explicit budget: at most MAX_CONCURRENT_SESSIONS sessions, each held to
+CONTEXT_SESSION_MEMORY_KB. Events update a session's context in place
+(decayed topic scores, per-kind counts, activity rate, a fixed-size ring of
+recent events), so reading a context never replays history. Sessions idle
+for SESSION_TIMEOUT_MINUTES are swept, and when the table is full the least
+recently active session makes room if it has been idle for at least
+CONTEXT_MIN_IDLE_SECONDS.
+
+Memory is accounted incrementally per session: fixed array storage plus
+sys.getsizeof of every string held, with an estimate for dict slots. The
+figure is an upper bound (strings shared between sessions are counted in
+each), which is what a budget needs. A session over its budget sheds its
+oldest events, then its weakest topics and stalest participants.
+"""
+
+import asyncio
+import heapq
+import logging
+import math
+import sys
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+EVENT_KINDS = (
+    "other", "view", "edit", "comment", "decision", "voice",
+    "suggestion_accepted", "suggestion_rejected", "presence",
+)
+KIND_CODES = {kind: code for code, kind in enumerate(EVENT_KINDS)}
+
+# Ring slot: float64 timestamp, uint8 kind code, ref and actor pointers
+EVENT_SLOT_BYTES = 8 + 1 + 8 + 8
+# Topic slot: float64 forward-decayed score, name pointer
+TOPIC_SLOT_BYTES = 8 + 8
+# Hash table slot with load-factor slack plus the boxed value, approximate
+DICT_ENTRY_BYTES = 64
+# The session object, its containers and the per-kind counters
+SESSION_BASE_BYTES = 1024
+
+ACTIVITY_HALF_LIFE_SECONDS = 300.0
+# Half-lives after which forward-decayed topic scores are renormalized (far below float overflow)
+RESCALE_HALVINGS = 256
+
+
+class SessionNotFound(KeyError):
+    """No live context for this session (never opened, closed or evicted)"""
+
+
+class SessionCapacityError(RuntimeError):
+    """MAX_CONCURRENT_SESSIONS are live and none has been idle long enough to evict"""
+
+
+def _str_bytes(value: Optional[str]) -> int:
+    return sys.getsizeof(value) if value is not None else 0
+
+
+class SessionContext:
+    """
+    One session's context: parallel arrays for the event ring and topic
+    scores, small dicts for participants and key/value state.
+    """
+
+    __slots__ = (
+        "session_id", "project_id", "created_at", "last_active", "version", "budget_bytes",
+        "ts", "kinds", "refs", "actors", "head", "size", "ring_bytes",
+        "kind_counts", "activity", "activity_at",
+        "topic_index", "topic_names", "topic_score", "topic_origin", "topic_bytes",
+        "participants", "participant_bytes", "max_participants",
+        "state", "state_bytes", "state_budget",
+    )
+
+    def __init__(self, session_id: str, project_id: Optional[str], now: float, budget_bytes: int,
+                 max_events: int, max_topics: int, max_participants: int):
+        self.session_id = session_id
+        self.project_id = project_id
+        self.created_at = now
+        self.last_active = now
+        self.version = 0
+        self.budget_bytes = budget_bytes
+
+        # Half the budget at most goes to the ring's fixed slots; the rest holds its strings,
+        # topics, participants and state
+        capacity = max(1, min(max_events, budget_bytes // 2 // EVENT_SLOT_BYTES))
+        self.ts = array("d", bytes(8 * capacity))
+        self.kinds = array("B", bytes(capacity))
+        self.refs: List[Optional[str]] = [None] * capacity
+        self.actors: List[Optional[str]] = [None] * capacity
+        self.head = 0
+        self.size = 0
+        self.ring_bytes = 0
+
+        self.kind_counts = array("I", bytes(4 * len(EVENT_KINDS)))
+        self.activity = 0.0
+        self.activity_at = now
+
+        self.topic_index: Dict[str, int] = {}
+        self.topic_names: List[Optional[str]] = [None] * max_topics
+        # Scores are stored as weight x 2^((t - topic_origin) / half_life): they compare without
+        # decaying each one, and the current score is the stored one scaled by the same factor
+        self.topic_score = array("d", bytes(8 * max_topics))
+        self.topic_origin = now
+        self.topic_bytes = 0
+
+        self.participants: Dict[str, float] = {}
+        self.participant_bytes = 0
+        self.max_participants = max_participants
+
+        self.state: Dict[str, str] = {}
+        self.state_bytes = 0
+        self.state_budget = budget_bytes // 4
+
+    @property
+    def capacity(self) -> int:
+        return len(self.ts)
+
+    @property
+    def fixed_bytes(self) -> int:
+        return (SESSION_BASE_BYTES + self.capacity * EVENT_SLOT_BYTES
+                + len(self.topic_names) * TOPIC_SLOT_BYTES)
+
+    @property
+    def memory_bytes(self) -> int:
+        return (self.fixed_bytes + self.ring_bytes + self.topic_bytes
+                + self.participant_bytes + self.state_bytes)
+
+    def memory(self) -> dict:
+        return {
+            "total": self.memory_bytes,
+            "budget": self.budget_bytes,
+            "fixed": self.fixed_bytes,
+            "events": self.ring_bytes,
+            "topics": self.topic_bytes,
+            "participants": self.participant_bytes,
+            "state": self.state_bytes,
+            "events_held": self.size,
+            "event_capacity": self.capacity,
+        }
+
+    # -- incremental updates -------------------------------------------------
+
+    def push_event(self, now: float, kind_code: int, ref: Optional[str], actor: Optional[str]):
+        slot = self.head
+        if self.size == self.capacity:
+            self.ring_bytes -= _str_bytes(self.refs[slot]) + _str_bytes(self.actors[slot])
+        else:
+            self.size += 1
+        self.ts[slot] = now
+        self.kinds[slot] = kind_code
+        self.refs[slot] = ref
+        self.actors[slot] = actor
+        self.ring_bytes += _str_bytes(ref) + _str_bytes(actor)
+        self.head = (slot + 1) % self.capacity
+
+        self.kind_counts[kind_code] += 1
+        self.activity = self.activity * _decay(now - self.activity_at, ACTIVITY_HALF_LIFE_SECONDS) + 1.0
+        self.activity_at = now
+
+    def drop_oldest(self):
+        slot = (self.head - self.size) % self.capacity
+        self.ring_bytes -= _str_bytes(self.refs[slot]) + _str_bytes(self.actors[slot])
+        self.refs[slot] = None
+        self.actors[slot] = None
+        self.size -= 1
+
+    def bump_topic(self, topic: str, weight: float, now: float, half_life: float):
+        halvings = (now - self.topic_origin) / half_life if half_life > 0 else 0.0
+        if halvings > RESCALE_HALVINGS:
+            decay = 0.5 ** halvings
+            for i in range(len(self.topic_score)):
+                self.topic_score[i] *= decay
+            self.topic_origin = now
+            halvings = 0.0
+        scale = 2.0 ** max(0.0, halvings)
+        slot = self.topic_index.get(topic)
+        if slot is None:
+            if len(self.topic_index) < len(self.topic_names):
+                slot = len(self.topic_index)
+            else:
+                # Full: the weakest topic gives up its slot
+                slot = self.topic_score.index(min(self.topic_score))
+                evicted = self.topic_names[slot]
+                del self.topic_index[evicted]
+                self.topic_bytes -= _str_bytes(evicted) + DICT_ENTRY_BYTES
+            self.topic_index[topic] = slot
+            self.topic_names[slot] = topic
+            self.topic_score[slot] = 0.0
+            self.topic_bytes += _str_bytes(topic) + DICT_ENTRY_BYTES
+        self.topic_score[slot] += weight * scale
+
+    def drop_weakest_topic(self):
+        count = len(self.topic_index)
+        slot = min(range(count), key=self.topic_score.__getitem__)
+        name = self.topic_names[slot]
+        del self.topic_index[name]
+        self.topic_bytes -= _str_bytes(name) + DICT_ENTRY_BYTES
+        # Keep occupied slots contiguous: the last topic moves into the hole
+        last = count - 1
+        if slot != last:
+            moved = self.topic_names[last]
+            self.topic_names[slot] = moved
+            self.topic_score[slot] = self.topic_score[last]
+            self.topic_index[moved] = slot
+        self.topic_names[last] = None
+        self.topic_score[last] = 0.0
+
+    def see_participant(self, actor: str, now: float):
+        if actor not in self.participants:
+            if len(self.participants) >= self.max_participants:
+                self.drop_stalest_participant()
+            self.participant_bytes += _str_bytes(actor) + DICT_ENTRY_BYTES
+        self.participants[actor] = now
+
+    def drop_stalest_participant(self):
+        stale = min(self.participants, key=self.participants.__getitem__)
+        del self.participants[stale]
+        self.participant_bytes -= _str_bytes(stale) + DICT_ENTRY_BYTES
+
+    def put_state(self, key: str, value: str):
+        size = _str_bytes(key) + _str_bytes(value) + DICT_ENTRY_BYTES
+        if size > self.state_budget:
+            raise ValueError(f"State entry of {size} bytes exceeds the session state budget of {self.state_budget}")
+        previous = self.state.pop(key, None)
+        if previous is not None:
+            self.state_bytes -= _str_bytes(key) + _str_bytes(previous) + DICT_ENTRY_BYTES
+        # Oldest keys go first (dicts keep insertion order; updates re-insert at the end)
+        while self.state and self.state_bytes + size > self.state_budget:
+            old_key = next(iter(self.state))
+            self.state_bytes -= _str_bytes(old_key) + _str_bytes(self.state.pop(old_key)) + DICT_ENTRY_BYTES
+        self.state[key] = value
+        self.state_bytes += size
+
+    # -- reads ----------------------------------------------------------------
+
+    def recent_events(self, limit: int) -> List[dict]:
+        events = []
+        for back in range(1, min(limit, self.size) + 1):
+            slot = (self.head - back) % self.capacity
+            events.append({
+                "timestamp": self.ts[slot],
+                "kind": EVENT_KINDS[self.kinds[slot]],
+                "ref": self.refs[slot],
+                "actor": self.actors[slot],
+            })
+        return events
+
+    def top_topics(self, limit: int, now: float, half_life: float) -> List[dict]:
+        decay = _decay(now - self.topic_origin, half_life)
+        scored = ((self.topic_score[slot], topic) for topic, slot in self.topic_index.items())
+        return [{"topic": topic, "score": round(score * decay, 4)} for score, topic in heapq.nlargest(limit, scored)]
+
+    def events_per_minute(self, now: float) -> float:
+        decayed = self.activity * _decay(now - self.activity_at, ACTIVITY_HALF_LIFE_SECONDS)
+        return decayed * math.log(2) / ACTIVITY_HALF_LIFE_SECONDS * 60
+
+
+def _decay(elapsed: float, half_life: float) -> float:
+    if half_life <= 0:
+        return 1.0
+    return 0.5 ** (max(0.0, elapsed) / half_life)
+
+
+class ContextEngine:
+    """
+    Session contexts in an LRU table (an OrderedDict ordered by last update),
+    with a background sweep for timed-out sessions.
+    """
+
+    def __init__(
+        self,
+        max_sessions: Optional[int] = None,
+        session_timeout_seconds: Optional[float] = None,
+        session_budget_bytes: Optional[int] = None,
+        max_events: Optional[int] = None,
+        max_topics: Optional[int] = None,
+        max_participants: Optional[int] = None,
+        topic_half_life_seconds: Optional[float] = None,
+        min_idle_seconds: Optional[float] = None,
+        sweep_interval_seconds: Optional[float] = None,
+    ):
+        def pick(value, default):
+            return default if value is None else value
+
+        self.max_sessions = pick(max_sessions, settings.MAX_CONCURRENT_SESSIONS)
+        self.session_timeout = pick(session_timeout_seconds, settings.SESSION_TIMEOUT_MINUTES * 60)
+        self.session_budget = pick(session_budget_bytes, settings.CONTEXT_SESSION_MEMORY_KB * 1024)
+        self.max_events = pick(max_events, settings.CONTEXT_MAX_EVENTS_PER_SESSION)
+        self.max_topics = pick(max_topics, settings.CONTEXT_MAX_TOPICS_PER_SESSION)
+        self.max_participants = pick(max_participants, settings.CONTEXT_MAX_PARTICIPANTS_PER_SESSION)
+        self.topic_half_life = pick(topic_half_life_seconds, settings.CONTEXT_TOPIC_HALF_LIFE_MINUTES * 60)
+        self.min_idle = pick(min_idle_seconds, settings.CONTEXT_MIN_IDLE_SECONDS)
+        self.sweep_interval = pick(sweep_interval_seconds, settings.CONTEXT_SWEEP_INTERVAL_SECONDS)
+
+        self._sessions: "OrderedDict[str, SessionContext]" = OrderedDict()
+        self._sweeper: Optional[asyncio.Task] = None
+        self.updates = 0
+        self.trimmed_events = 0
+        self.trimmed_topics = 0
+        self.trimmed_participants = 0
+        self.rejected_sessions = 0
+        self.evictions = {"idle_lru": 0, "expired": 0, "closed": 0}
+
+    async def initialize(self):
+        self._sweeper = asyncio.create_task(self._sweep_loop())
+        logger.info(
+            "Context engine ready: %d sessions x %d KB, timeout %ds",
+            self.max_sessions, self.session_budget // 1024, self.session_timeout,
+        )
+
+    async def cleanup(self):
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+        self._sessions.clear()
+
+    async def _sweep_loop(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                expired = self.sweep()
+                if expired:
+                    logger.info("Expired %d idle context sessions", expired)
+            except Exception:
+                logger.exception("Context sweep failed")
+
+    # -- session table ---------------------------------------------------------
+
+    def open_session(self, session_id: str, project_id: Optional[str] = None,
+                     now: Optional[float] = None) -> SessionContext:
+        """The live context for ``session_id``, created (evicting an idle session if full) when missing"""
+        now = time.time() if now is None else now
+        session = self._sessions.get(session_id)
+        if session is not None:
+            if project_id is not None:
+                session.project_id = project_id
+            return session
+        if len(self._sessions) >= self.max_sessions:
+            self._evict_idle(now)
+        session = SessionContext(session_id, project_id, now, self.session_budget,
+                                 self.max_events, self.max_topics, self.max_participants)
+        self._sessions[session_id] = session
+        return session
+
+    def _evict_idle(self, now: float):
+        oldest = next(iter(self._sessions.values()))
+        if now - oldest.last_active < self.min_idle:
+            self.rejected_sessions += 1
+            raise SessionCapacityError(
+                f"{self.max_sessions} sessions active; the least recent was active "
+                f"{now - oldest.last_active:.0f}s ago"
+            )
+        del self._sessions[oldest.session_id]
+        self.evictions["idle_lru"] += 1
+        logger.debug("Evicted idle context session %s", oldest.session_id)
+
+    def _get(self, session_id: str) -> SessionContext:
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise SessionNotFound(session_id)
+        return session
+
+    def _touch(self, session: SessionContext, now: float):
+        session.last_active = now
+        session.version += 1
+        self._sessions.move_to_end(session.session_id)
+        self.updates += 1
+
+    def close_session(self, session_id: str) -> bool:
+        if self._sessions.pop(session_id, None) is None:
+            return False
+        self.evictions["closed"] += 1
+        return True
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Drop sessions idle past the timeout; the table is in LRU order so this stops at the first live one"""
+        now = time.time() if now is None else now
+        cutoff = now - self.session_timeout
+        expired = 0
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if session.last_active > cutoff:
+                break
+            del self._sessions[session.session_id]
+            expired += 1
+        self.evictions["expired"] += expired
+        return expired
+
+    # -- updates -----------------------------------------------------------------
+
+    def record(
+        self,
+        session_id: str,
+        kind: str,
+        ref: Optional[str] = None,
+        actor: Optional[str] = None,
+        topics: Iterable[str] = (),
+        weight: float = 1.0,
+        project_id: Optional[str] = None,
+        now: Optional[float] = None,
+    ) -> int:
+        """Apply one event to the session's context; returns the new context version"""
+        now = time.time() if now is None else now
+        session = self.open_session(session_id, project_id, now)
+        session.push_event(now, KIND_CODES.get(kind, 0), ref, actor)
+        for topic in topics:
+            session.bump_topic(topic, weight, now, self.topic_half_life)
+        if actor is not None:
+            session.see_participant(actor, now)
+        self._trim(session)
+        self._touch(session, now)
+        return session.version
+
+    def _trim(self, session: SessionContext):
+        """Bring a session back under its budget
+
+        The oldest events give way first, keeping the newest; then the
+        weakest topics and the least recently seen participants, whose
+        names can be long; the newest event goes last.
+        """
+        while session.memory_bytes > session.budget_bytes:
+            if session.size > 1:
+                session.drop_oldest()
+                self.trimmed_events += 1
+            elif session.topic_index:
+                session.drop_weakest_topic()
+                self.trimmed_topics += 1
+            elif session.participants:
+                session.drop_stalest_participant()
+                self.trimmed_participants += 1
+            elif session.size:
+                session.drop_oldest()
+                self.trimmed_events += 1
+            else:
+                break
+
+    def set_state(self, session_id: str, key: str, value: str, now: Optional[float] = None) -> int:
+        """Set a context fact (goal, creative direction...); oldest facts are dropped past the state budget"""
+        now = time.time() if now is None else now
+        session = self.open_session(session_id, now=now)
+        session.put_state(key, value)
+        self._trim(session)
+        self._touch(session, now)
+        return session.version
+
+    # -- reads -------------------------------------------------------------------
+
+    def get_context(self, session_id: str, recent: int = 20, top_topics: int = 10,
+                    now: Optional[float] = None) -> dict:
+        """The maintained context; reads do not count as activity for idle eviction"""
+        now = time.time() if now is None else now
+        session = self._get(session_id)
+        return {
+            "session_id": session_id,
+            "project_id": session.project_id,
+            "version": session.version,
+            "created_at": session.created_at,
+            "last_active": session.last_active,
+            "events_per_minute": round(session.events_per_minute(now), 3),
+            "event_counts": {kind: session.kind_counts[code] for code, kind in enumerate(EVENT_KINDS)
+                             if session.kind_counts[code]},
+            "topics": session.top_topics(top_topics, now, self.topic_half_life),
+            "participants": sorted(session.participants, key=session.participants.__getitem__, reverse=True),
+            "state": dict(session.state),
+            "recent_events": session.recent_events(recent),
+        }
+
+    def version(self, session_id: str) -> int:
+        return self._get(session_id).version
+
+    def session_memory(self, session_id: str) -> dict:
+        return dict(self._get(session_id).memory(), session_id=session_id)
+
+    def metrics(self) -> dict:
+        sizes = sorted(session.memory_bytes for session in self._sessions.values())
+        total = sum(sizes)
+        return {
+            "sessions": len(sizes),
+            "max_sessions": self.max_sessions,
+            "session_budget_bytes": self.session_budget,
+            "memory_budget_bytes": self.max_sessions * self.session_budget,
+            "memory_bytes": total,
+            "memory_per_session": {
+                "mean": round(total / len(sizes)) if sizes else 0,
+                "p95": sizes[int(0.95 * (len(sizes) - 1))] if sizes else 0,
+                "max": sizes[-1] if sizes else 0,
+            },
+            "updates": self.updates,
+            "trimmed_events": self.trimmed_events,
+            "trimmed_topics": self.trimmed_topics,
+            "trimmed_participants": self.trimmed_participants,
+            "rejected_sessions": self.rejected_sessions,
+            "evictions": dict(self.evictions),
+        }
@@ -0,0 +1,140 @@
+"""
+Ambient Context System - Context engine memory benchmark
+
+Fills MAX_CONCURRENT_SESSIONS sessions with synthetic collaboration events
+and compares:
+
+    naive    a list of event dicts per session, context rebuilt from the
+             full history on every read
+    engine   app.services.context_engine: array-backed rings and topic
+             slots updated in place, per-session budget
+
+Reports traced heap per session (tracemalloc) against the engine's own
+accounting, update and read latency, and LRU eviction under churn. Both
+stores reference the generated strings, so traced bytes cover containers;
+the engine's accounting also counts the strings it holds.
+
+    python benchmarks/context_memory_benchmark.py --sessions 100 --events 5000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from app.services.context_engine import EVENT_KINDS, ContextEngine  # noqa: E402
+
+TOPICS = [f"topic-{i}" for i in range(400)]
+
+
+def synthetic_events(rng: random.Random, count: int, start: float):
+    for i in range(count):
+        yield {
+            "ts": start + i * 0.5,
+            "kind": rng.choice(EVENT_KINDS[1:]),
+            "ref": f"scenes/act-{rng.randrange(5)}/shot-{rng.randrange(200)}.json",
+            "actor": f"user-{rng.randrange(8)}",
+            "topics": rng.sample(TOPICS[:40] if rng.random() < 0.8 else TOPICS, 2),
+        }
+
+
+def naive_context(history: list) -> dict:
+    """Rebuild from history: the pattern the engine replaces"""
+    topics = Counter(t for event in history for t in event["topics"])
+    return {
+        "event_counts": Counter(event["kind"] for event in history),
+        "topics": topics.most_common(10),
+        "participants": sorted({event["actor"] for event in history}),
+        "recent_events": history[-20:],
+    }
+
+
+def traced(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def run(sessions: int, events: int, budget_kb: int) -> dict:
+    rng = random.Random(5)
+    start = time.time()
+    streams = {f"session-{s}": list(synthetic_events(rng, events, start)) for s in range(sessions)}
+    results = {"sessions": sessions, "events_per_session": events}
+
+    def build_naive():
+        return {sid: [dict(e) for e in stream] for sid, stream in streams.items()}
+
+    naive, naive_bytes = traced(build_naive)
+
+    def build_engine():
+        engine = ContextEngine(max_sessions=sessions, session_budget_bytes=budget_kb * 1024)
+        for sid, stream in streams.items():
+            for e in stream:
+                engine.record(sid, e["kind"], e["ref"], e["actor"], e["topics"], now=e["ts"])
+        return engine
+
+    started = time.perf_counter()
+    engine = build_engine()
+    update_seconds = (time.perf_counter() - started) / (sessions * events)
+    # Traced separately so interpreter warm-up is not billed to the engine
+    engine, engine_bytes = traced(build_engine)
+    metrics = engine.metrics()
+    assert metrics["memory_per_session"]["max"] <= engine.session_budget
+    assert engine_bytes <= metrics["memory_bytes"] * 1.1, (engine_bytes, metrics["memory_bytes"])
+    results["bytes_per_session"] = {
+        "naive_traced": round(naive_bytes / sessions),
+        "engine_traced": round(engine_bytes / sessions),
+        "engine_accounted": metrics["memory_per_session"]["mean"],
+        "engine_budget": engine.session_budget,
+    }
+
+    now = start + events * 0.5
+    reads = 200
+    started = time.perf_counter()
+    for _ in range(reads):
+        naive_context(naive["session-0"])
+    naive_read = (time.perf_counter() - started) / reads
+    started = time.perf_counter()
+    for _ in range(reads):
+        engine.get_context("session-0", now=now)
+    engine_read = (time.perf_counter() - started) / reads
+    results["latency_us"] = {
+        "engine_update": round(update_seconds * 1e6, 2),
+        "naive_read": round(naive_read * 1e6, 1),
+        "engine_read": round(engine_read * 1e6, 1),
+    }
+
+    # Churn: new sessions arrive after the existing ones have gone idle
+    later = now + engine.min_idle + 1
+    for s in range(sessions // 2):
+        engine.record(f"late-{s}", "view", now=later)
+    results["after_churn"] = engine.metrics()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bounded-memory context engine vs per-session event lists")
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--events", type=int, default=5_000)
+    parser.add_argument("--budget-kb", type=int, default=256)
+    args = parser.parse_args()
+
+    r = run(args.sessions, args.events, args.budget_kb)
+    b, lat = r["bytes_per_session"], r["latency_us"]
+    print(f"🧠 {r['sessions']} sessions x {r['events_per_session']:,} events")
+    print(f"   memory/session  naive {b['naive_traced']:>12,} B   engine {b['engine_traced']:>10,} B "
+          f"(accounted {b['engine_accounted']:,}, budget {b['engine_budget']:,})")
+    print(f"   read            naive {lat['naive_read']:>12,} us  engine {lat['engine_read']:>10,} us")
+    print(json.dumps(r, indent=2))
+
+
+if __name__ == "__main__":
+    main()
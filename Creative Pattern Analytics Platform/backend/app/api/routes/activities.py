@@ -0,0 +1,85 @@
+"""
+Creative Pattern Analytics Platform - Activity Routes
+"""
+
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Request, status
+
+from app.services.activity_ingestion import (
+    ActivityEvent,
+    BatchTooLarge,
+    IngestBackpressure,
+    IngestFailed,
+    IngestTimeout,
+    parse_events,
+)
+
+router = APIRouter()
+
+# Bodies above this are parsed and validated off the event loop
+PARSE_IN_THREAD_BYTES = 64 * 1024
+
+
+def get_ingestor(request: Request):
+    """Activity ingestor started in the application lifespan"""
+    ingestor = getattr(request.app.state, "activity_ingestor", None)
+    if ingestor is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Ingestion not available")
+    return ingestor
+
+
+@router.post("", status_code=status.HTTP_201_CREATED)
+async def create_activity(event: ActivityEvent, request: Request):
+    """Record a single activity, written before the response"""
+    row = event.to_row()
+    inserted = await get_ingestor(request).write_now([row])
+    return {"idempotency_key": row[0], "duplicate": inserted == 0}
+
+
+@router.post("/batch", status_code=status.HTTP_202_ACCEPTED)
+async def ingest_activities(request: Request, wait: bool = False):
+    """Bulk ingestion: NDJSON (application/x-ndjson) or a JSON array of activities
+
+    Valid events are buffered and written in batches; invalid ones are
+    reported by index. With ``wait=true`` the response is sent once the
+    events are persisted (504 if that takes too long, 500 if they were
+    dead-lettered).
+    """
+    ingestor = get_ingestor(request)
+    body = await request.body()
+    content_type = request.headers.get("content-type", "")
+    try:
+        if len(body) > PARSE_IN_THREAD_BYTES:
+            rows, errors = await asyncio.to_thread(parse_events, body, content_type)
+        else:
+            rows, errors = parse_events(body, content_type)
+    except BatchTooLarge as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+
+    if rows:
+        try:
+            await ingestor.submit(rows, wait=wait)
+        except IngestBackpressure as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Ingestion queue full ({e}); retry later",
+                headers={"Retry-After": "1"},
+            )
+        except IngestTimeout as e:
+            raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=f"Not persisted yet: {e}")
+        except IngestFailed as e:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+    return {
+        "accepted": len(rows),
+        "rejected": len(errors),
+        "errors": errors[:50],
+        "persisted": wait,
+    }
+
+
+@router.get("/ingest/stats")
+async def ingest_stats(request: Request):
+    """Write-behind buffer and flush statistics"""
+    return get_ingestor(request).stats()
@@ -0,0 +1,89 @@
+"""
+Creative Pattern Analytics Platform - Analytics Routes
+
+Every endpoint reads the incrementally maintained rollups
+(app.services.rollups), so cost grows with the number of time buckets in
+the requested range, not with the number of activity events.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from fastapi import APIRouter, HTTPException, Query, Request, status
+
+from app.api.routes.activities import get_ingestor
+
+router = APIRouter()
+
+DEFAULT_RANGE_DAYS = 30
+MAX_RANGE_DAYS = 366
+
+
+def resolve_range(start: Optional[date], end: Optional[date]) -> Tuple[str, str]:
+    """Inclusive day range, defaulting to the last DEFAULT_RANGE_DAYS days (UTC)"""
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    if start > end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must not be after end")
+    if (end - start).days >= MAX_RANGE_DAYS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"Range is limited to {MAX_RANGE_DAYS} days")
+    return start.isoformat(), end.isoformat()
+
+
+def get_rollups(request: Request):
+    ingestor = get_ingestor(request)
+    rollups = getattr(ingestor.writer, "rollups", None)
+    if rollups is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Rollups are disabled")
+    return ingestor, rollups
+
+
+@router.get("/users/{user_id}/activity")
+async def user_activity(
+    request: Request,
+    user_id: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    granularity: str = Query("day", pattern="^(hour|day)$"),
+):
+    """Event counts and time spent per hour or day"""
+    ingestor, rollups = get_rollups(request)
+    start_day, end_day = resolve_range(start, end)
+    series = await ingestor.read(rollups.user_timeseries, user_id, start_day, end_day, granularity)
+    return {"user_id": user_id, "start": start_day, "end": end_day, "granularity": granularity, "series": series}
+
+
+@router.get("/users/{user_id}/summary")
+async def user_summary(request: Request, user_id: str, start: Optional[date] = None, end: Optional[date] = None):
+    """Totals, activity type distribution, hour-of-week heatmap and streaks"""
+    ingestor, rollups = get_rollups(request)
+    start_day, end_day = resolve_range(start, end)
+    return await ingestor.read(rollups.user_summary, user_id, start_day, end_day)
+
+
+@router.get("/patterns")
+async def top_patterns(
+    request: Request,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    limit: int = Query(20, ge=1, le=100),
+):
+    """Activity types ranked by event count"""
+    ingestor, rollups = get_rollups(request)
+    start_day, end_day = resolve_range(start, end)
+    patterns = await ingestor.read(rollups.top_patterns, start_day, end_day, limit)
+    return {"start": start_day, "end": end_day, "patterns": patterns}
+
+
+@router.get("/patterns/{activity_type}")
+async def pattern_summary(
+    request: Request,
+    activity_type: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+):
+    """Daily events, time spent and distinct users, plus the duration distribution"""
+    ingestor, rollups = get_rollups(request)
+    start_day, end_day = resolve_range(start, end)
+    return await ingestor.read(rollups.pattern_summary, activity_type, start_day, end_day)
@@ -0,0 +1,42 @@
+"""
+Creative Pattern Analytics Platform - Pattern Routes
+
+Pattern detection over raw activity_events with the vectorized engine
+(app.services.pattern_engine). The user's window is streamed in chunks, so
+long histories do not have to fit in memory at once.
+"""
+
+from datetime import date, timedelta
+from functools import partial
+from typing import Optional
+
+from fastapi import APIRouter, Query, Request
+
+from app.api.routes.activities import get_ingestor
+from app.api.routes.analytics import resolve_range
+from app.services.pattern_engine import (
+    PATTERN_BIN_MINUTES,
+    PATTERN_SESSION_GAP_MINUTES,
+    detect_user_patterns,
+)
+
+router = APIRouter()
+
+
+@router.get("/users/{user_id}")
+async def user_patterns(
+    request: Request,
+    user_id: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    bin_minutes: int = Query(PATTERN_BIN_MINUTES, ge=5, le=1440),
+    session_gap_minutes: int = Query(PATTERN_SESSION_GAP_MINUTES, ge=1, le=1440),
+):
+    """Periodicity, bursts and activity type co-occurrence for one user"""
+    ingestor = get_ingestor(request)
+    start_day, end_day = resolve_range(start, end)
+    end_exclusive = (date.fromisoformat(end_day) + timedelta(days=1)).isoformat()
+    detect = partial(detect_user_patterns, paramstyle=ingestor.writer.paramstyle, bin_minutes=bin_minutes,
+                     session_gap_minutes=session_gap_minutes)
+    patterns = await ingestor.read(detect, user_id, start_day, end_exclusive)
+    return dict(patterns, start=start_day, end=end_day)
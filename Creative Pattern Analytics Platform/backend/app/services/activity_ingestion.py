@@ -0,0 +1,526 @@
+"""
+Creative Pattern Analytics Platform - Activity Ingestion
+Batched, idempotent write-behind ingestion of activity events
+
+Batches arrive as NDJSON or a JSON array and are validated, given an
+idempotency key (the client's, or a hash of the event) and appended to an
+in-memory write-behind buffer. A background task drains the buffer in
+batches of INGEST_BATCH_SIZE: PostgreSQL batches use COPY into a staging
+table (or one multi-row INSERT for small batches) followed by
+``INSERT ... ON CONFLICT (idempotency_key) DO NOTHING``, so retried
+batches never create duplicates. SQLite (local development, benchmarks)
+inserts the batch's new rows in one transaction. The rows actually
+inserted are applied to the analytics rollups in the same transaction.
+
+Accepted events are only in memory until their batch is flushed; callers
+that need durability submit with ``wait=True``. When the buffer holds
+INGEST_MAX_PENDING events new batches are refused (IngestBackpressure)
+instead of growing without bound. A batch that still fails after
+INGEST_MAX_ATTEMPTS writes is appended to INGEST_DEAD_LETTER_PATH as NDJSON
+(replayable through the batch endpoint) and its waiters fail with
+IngestFailed.
+"""
+
+import asyncio
+import csv
+import hashlib
+import io
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+logger = logging.getLogger(__name__)
+
+DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///./creative_patterns.db")
+INGEST_BATCH_SIZE = int(os.environ.get("INGEST_BATCH_SIZE", 2000))
+INGEST_FLUSH_INTERVAL_MS = int(os.environ.get("INGEST_FLUSH_INTERVAL_MS", 200))
+INGEST_MAX_PENDING = int(os.environ.get("INGEST_MAX_PENDING", 200_000))
+INGEST_MAX_BATCH_EVENTS = int(os.environ.get("INGEST_MAX_BATCH_EVENTS", 10_000))
+# PostgreSQL batches at least this large go through COPY instead of a multi-row INSERT
+INGEST_COPY_THRESHOLD = int(os.environ.get("INGEST_COPY_THRESHOLD", 500))
+# Failed writes of one batch before it is dead-lettered
+INGEST_MAX_ATTEMPTS = int(os.environ.get("INGEST_MAX_ATTEMPTS", 5))
+INGEST_DEAD_LETTER_PATH = os.environ.get("INGEST_DEAD_LETTER_PATH", "./activity_dead_letters.ndjson")
+# Longest a ``wait=True`` submit waits for its events to be persisted
+INGEST_WAIT_TIMEOUT = float(os.environ.get("INGEST_WAIT_TIMEOUT", 30))
+# Maintain analytics rollups (app.services.rollups) in the ingestion transaction
+ROLLUPS_ENABLED = os.environ.get("ROLLUPS_ENABLED", "true").lower() == "true"
+
+COLUMNS = ("idempotency_key", "user_id", "activity_type", "occurred_at", "duration_seconds", "project_id", "metadata")
+
+Row = Tuple[str, str, str, str, Optional[float], Optional[str], str]
+
+
+class ActivityEvent(BaseModel):
+    """One creative activity as submitted by a client"""
+
+    user_id: str = Field(..., min_length=1, max_length=64)
+    activity_type: str = Field(..., min_length=1, max_length=64)
+    occurred_at: datetime
+    duration_seconds: Optional[float] = Field(None, ge=0)
+    project_id: Optional[str] = Field(None, max_length=64)
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+    idempotency_key: Optional[str] = Field(None, min_length=1, max_length=128)
+
+    @field_validator("occurred_at")
+    @classmethod
+    def to_utc(cls, value: datetime) -> datetime:
+        # Naive timestamps are taken as UTC
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+    def to_row(self) -> Row:
+        occurred_at = self.occurred_at.isoformat()
+        metadata = json.dumps(self.metadata, sort_keys=True, separators=(",", ":"))
+        key = self.idempotency_key
+        if key is None:
+            # Same event content -> same key, so blind client retries are deduplicated too
+            content = json.dumps([self.user_id, self.activity_type, occurred_at, self.duration_seconds,
+                                  self.project_id, metadata], separators=(",", ":"))
+            key = hashlib.sha256(content.encode()).hexdigest()[:32]
+        return (key, self.user_id, self.activity_type, occurred_at, self.duration_seconds, self.project_id, metadata)
+
+
+class IngestBackpressure(Exception):
+    """The write-behind buffer is full; the client should retry later"""
+
+
+class BatchTooLarge(Exception):
+    pass
+
+
+class IngestFailed(Exception):
+    """Events could not be written and were dead-lettered"""
+
+
+class IngestTimeout(Exception):
+    """Events are still buffered after the wait timeout; they may be persisted later"""
+
+
+def parse_events(body: bytes, content_type: str = "") -> Tuple[List[Row], List[Dict[str, Any]]]:
+    """NDJSON or JSON array body -> (rows, errors); invalid events are reported, not fatal"""
+    if "ndjson" in content_type or "jsonl" in content_type:
+        items = []
+        for line in body.splitlines():
+            line = line.strip()
+            if line:
+                try:
+                    items.append(json.loads(line))
+                except json.JSONDecodeError as e:
+                    items.append(e)
+    else:
+        try:
+            payload = json.loads(body or b"[]")
+        except json.JSONDecodeError as e:
+            return [], [{"index": None, "error": f"Invalid JSON: {e}"}]
+        if isinstance(payload, dict):
+            payload = payload.get("events", [payload])
+        items = payload if isinstance(payload, list) else [payload]
+
+    if len(items) > INGEST_MAX_BATCH_EVENTS:
+        raise BatchTooLarge(f"{len(items)} events in one batch; the limit is {INGEST_MAX_BATCH_EVENTS}")
+
+    rows, errors = [], []
+    for index, item in enumerate(items):
+        if isinstance(item, Exception):
+            errors.append({"index": index, "error": f"Invalid JSON: {item}"})
+            continue
+        try:
+            rows.append(ActivityEvent.model_validate(item).to_row())
+        except ValidationError as e:
+            details = e.errors(include_url=False, include_context=False, include_input=False)
+            errors.append({"index": index, "error": details})
+    return rows, errors
+
+
+def _first_occurrences(rows: List[Row], inserted_keys: Set[str]) -> List[Row]:
+    """Rows whose key was inserted, once each, in batch order"""
+    novel = []
+    for row in rows:
+        if row[0] in inserted_keys:
+            inserted_keys.discard(row[0])
+            novel.append(row)
+    return novel
+
+
+class SQLiteActivityWriter:
+    """One transaction per batch: new rows are inserted and rolled up together"""
+
+    paramstyle = "qmark"
+    DDL = """
+        CREATE TABLE IF NOT EXISTS activity_events (
+            id INTEGER PRIMARY KEY,
+            idempotency_key TEXT NOT NULL UNIQUE,
+            user_id TEXT NOT NULL,
+            activity_type TEXT NOT NULL,
+            occurred_at TEXT NOT NULL,
+            duration_seconds REAL,
+            project_id TEXT,
+            metadata TEXT NOT NULL DEFAULT '{}',
+            received_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE INDEX IF NOT EXISTS activity_events_user_time ON activity_events (user_id, occurred_at);
+    """
+
+    def __init__(self, path: str, rollups=None):
+        self.path = path
+        self.rollups = rollups
+        self._conn: Optional[sqlite3.Connection] = None
+        self._reader: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._read_lock = threading.Lock()
+
+    def open(self):
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.DDL)
+        if self.rollups:
+            self.rollups.ensure_schema(self._conn)
+        # WAL lets dashboard reads run beside a flush on their own connection
+        self._reader = self._conn if self.path == ":memory:" else sqlite3.connect(self.path, check_same_thread=False)
+        return self
+
+    def close(self):
+        if self._reader is not None and self._reader is not self._conn:
+            self._reader.close()
+        if self._conn is not None:
+            self._conn.close()
+        self._conn = self._reader = None
+
+    def transaction(self, fn, *args):
+        """Run ``fn(connection, *args)`` in one write transaction"""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                result = fn(self._conn, *args)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return result
+
+    def read(self, fn, *args):
+        """Run ``fn(connection, *args)`` on the read connection"""
+        with self._read_lock if self._reader is not self._conn else self._lock:
+            return fn(self._reader, *args)
+
+    def _write(self, conn, rows: List[Row]) -> int:
+        keys = list({row[0] for row in rows})
+        existing = set()
+        for i in range(0, len(keys), 500):
+            part = keys[i:i + 500]
+            existing.update(key for (key,) in conn.execute(
+                f"SELECT idempotency_key FROM activity_events WHERE idempotency_key IN ({', '.join('?' * len(part))})",
+                part,
+            ))
+        novel = _first_occurrences(rows, set(keys) - existing)
+        conn.executemany(
+            f"INSERT INTO activity_events ({', '.join(COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?, ?)", novel
+        )
+        if self.rollups:
+            self.rollups.apply(conn, novel)
+        return len(novel)
+
+    def write(self, rows: List[Row]) -> int:
+        """Insert rows, skipping known idempotency keys; returns rows actually inserted"""
+        return self.transaction(self._write, rows)
+
+
+class PostgresActivityWriter:
+    """Multi-row INSERT for small batches, COPY through a staging table for large ones"""
+
+    paramstyle = "format"
+    DDL = """
+        CREATE TABLE IF NOT EXISTS activity_events (
+            id BIGSERIAL PRIMARY KEY,
+            idempotency_key TEXT NOT NULL UNIQUE,
+            user_id TEXT NOT NULL,
+            activity_type TEXT NOT NULL,
+            occurred_at TIMESTAMPTZ NOT NULL,
+            duration_seconds DOUBLE PRECISION,
+            project_id TEXT,
+            metadata JSONB NOT NULL DEFAULT '{}',
+            received_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        );
+        CREATE INDEX IF NOT EXISTS activity_events_user_time ON activity_events (user_id, occurred_at);
+    """
+
+    STAGING_DDL = """
+        CREATE TEMP TABLE IF NOT EXISTS activity_events_staging (
+            idempotency_key TEXT, user_id TEXT, activity_type TEXT, occurred_at TIMESTAMPTZ,
+            duration_seconds DOUBLE PRECISION, project_id TEXT, metadata JSONB
+        ) ON COMMIT DELETE ROWS
+    """
+
+    def __init__(self, dsn: str, copy_threshold: int = INGEST_COPY_THRESHOLD, rollups=None):
+        self.dsn = dsn
+        self.copy_threshold = copy_threshold
+        self.rollups = rollups
+        self._conn = None
+        self._reader = None
+        self._lock = threading.Lock()
+        self._read_lock = threading.Lock()
+
+    def open(self):
+        import psycopg2
+
+        self._conn = psycopg2.connect(self.dsn)
+        with self._conn, self._conn.cursor() as cur:
+            # Rollup buckets and day-range filters are UTC
+            cur.execute("SET TIME ZONE 'UTC'")
+            cur.execute(self.DDL)
+            if self.rollups:
+                self.rollups.ensure_schema(cur)
+        # Dashboard reads get their own connection so they never wait behind a flush
+        self._reader = psycopg2.connect(self.dsn)
+        self._reader.set_session(readonly=True, autocommit=True)
+        with self._reader.cursor() as cur:
+            cur.execute("SET TIME ZONE 'UTC'")
+        return self
+
+    def close(self):
+        for conn in (self._reader, self._conn):
+            if conn is not None:
+                conn.close()
+        self._conn = self._reader = None
+
+    def transaction(self, fn, *args):
+        """Run ``fn(cursor, *args)`` in one transaction"""
+        with self._lock, self._conn, self._conn.cursor() as cur:
+            return fn(cur, *args)
+
+    def read(self, fn, *args):
+        """Run ``fn(cursor, *args)`` on the read-only connection"""
+        with self._read_lock, self._reader.cursor() as cur:
+            return fn(cur, *args)
+
+    def _write(self, cur, rows: List[Row]) -> int:
+        from psycopg2.extras import execute_values
+
+        columns = ", ".join(COLUMNS)
+        if len(rows) < self.copy_threshold:
+            inserted = execute_values(
+                cur,
+                f"INSERT INTO activity_events ({columns}) VALUES %s "
+                "ON CONFLICT (idempotency_key) DO NOTHING RETURNING idempotency_key",
+                rows,
+                page_size=len(rows),
+                fetch=True,
+            )
+        else:
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(rows)
+            buffer.seek(0)
+            cur.execute(self.STAGING_DDL)
+            cur.copy_expert(f"COPY activity_events_staging ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+            cur.execute(
+                f"INSERT INTO activity_events ({columns}) SELECT {columns} FROM activity_events_staging "
+                "ON CONFLICT (idempotency_key) DO NOTHING RETURNING idempotency_key"
+            )
+            inserted = cur.fetchall()
+
+        novel = _first_occurrences(rows, {key for (key,) in inserted})
+        if self.rollups:
+            self.rollups.apply(cur, novel)
+        return len(novel)
+
+    def write(self, rows: List[Row]) -> int:
+        """Insert rows, skipping known idempotency keys; returns rows actually inserted"""
+        return self.transaction(self._write, rows)
+
+
+def create_writer(url: str = DATABASE_URL, rollups: bool = ROLLUPS_ENABLED):
+    """Writer for a DATABASE_URL (postgresql://... or sqlite:///path), maintaining rollups by default"""
+    from app.services.rollups import RollupEngine
+
+    if url.startswith("sqlite:///"):
+        return SQLiteActivityWriter(url[len("sqlite:///"):], rollups=RollupEngine("qmark") if rollups else None)
+    if url.startswith("postgresql+"):
+        # SQLAlchemy-style driver suffix, e.g. postgresql+psycopg2://
+        url = "postgresql://" + url.split("://", 1)[1]
+    if url.startswith(("postgresql://", "postgres://")):
+        return PostgresActivityWriter(url, rollups=RollupEngine("format") if rollups else None)
+    raise ValueError(f"Unsupported DATABASE_URL for activity ingestion: {url}")
+
+
+class ActivityIngestor:
+    """Write-behind buffer in front of an activity writer"""
+
+    def __init__(self, writer=None, batch_size: int = INGEST_BATCH_SIZE,
+                 flush_interval_ms: int = INGEST_FLUSH_INTERVAL_MS, max_pending: int = INGEST_MAX_PENDING,
+                 max_attempts: int = INGEST_MAX_ATTEMPTS, dead_letter_path: Optional[str] = INGEST_DEAD_LETTER_PATH,
+                 wait_timeout: float = INGEST_WAIT_TIMEOUT):
+        self.writer = writer or create_writer()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self.dead_letter_path = dead_letter_path
+        self.wait_timeout = wait_timeout
+
+        self._pending: Deque[Row] = deque()
+        self._submitted = 0  # sequence number of the last buffered row
+        self._persisted = 0  # sequence number of the last flushed row
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []  # (first seq, last seq, future)
+        self._attempts = 0  # failed writes of the batch at the head of the buffer
+        self._wake: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._stats = {"accepted": 0, "inserted": 0, "rejected_backpressure": 0, "flushes": 0,
+                       "flush_failures": 0, "dead_lettered": 0, "wait_timeouts": 0, "flush_seconds": 0.0}
+
+    async def start(self):
+        await asyncio.to_thread(self.writer.open)
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        if self._flusher:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+        await asyncio.to_thread(self.writer.close)
+
+    async def read(self, fn, *args):
+        """Run ``fn(cursor, *args)`` against the database off the event loop"""
+        return await asyncio.to_thread(self.writer.read, fn, *args)
+
+    async def write_now(self, rows: List[Row]) -> int:
+        """Write immediately, bypassing the buffer; returns rows inserted"""
+        inserted = await asyncio.to_thread(self.writer.write, rows)
+        self._stats["accepted"] += len(rows)
+        self._stats["inserted"] += inserted
+        return inserted
+
+    async def submit(self, rows: List[Row], wait: bool = False):
+        """Buffer rows for the next flush; with ``wait`` return once they are persisted
+
+        A waiting submit raises IngestFailed when its rows were dead-lettered
+        and IngestTimeout when they are not persisted within ``wait_timeout``.
+        """
+        if len(self._pending) + len(rows) > self.max_pending:
+            self._stats["rejected_backpressure"] += len(rows)
+            raise IngestBackpressure(f"{len(self._pending)} events pending")
+
+        self._pending.extend(rows)
+        self._submitted += len(rows)
+        self._stats["accepted"] += len(rows)
+        if len(self._pending) >= self.batch_size:
+            self._wake.set()
+
+        if wait:
+            future = asyncio.get_running_loop().create_future()
+            waiter = (self._submitted - len(rows) + 1, self._submitted, future)
+            self._waiters.append(waiter)
+            self._wake.set()
+            try:
+                await asyncio.wait_for(future, self.wait_timeout)
+            except asyncio.TimeoutError:
+                self._stats["wait_timeouts"] += 1
+                raise IngestTimeout(f"events not persisted within {self.wait_timeout:g}s; they remain buffered")
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+    async def flush(self):
+        """Write everything buffered so far, one batch at a time"""
+        async with self._flush_lock:
+            while self._pending:
+                count = min(self.batch_size, len(self._pending))
+                batch = [self._pending.popleft() for _ in range(count)]
+                started = time.perf_counter()
+                try:
+                    inserted = await asyncio.to_thread(self.writer.write, batch)
+                except Exception as e:
+                    self._stats["flush_failures"] += 1
+                    self._attempts += 1
+                    if self._attempts >= self.max_attempts:
+                        await self._dead_letter(batch, e)
+                        continue
+                    # Put the batch back in order; the next tick retries it
+                    self._pending.extendleft(reversed(batch))
+                    raise
+                self._attempts = 0
+                self._stats["flush_seconds"] += time.perf_counter() - started
+                self._stats["flushes"] += 1
+                self._stats["inserted"] += inserted
+                self._persisted += count
+                self._release_waiters()
+
+    async def _dead_letter(self, batch: List[Row], error: Exception):
+        """Give up on a batch: record it for replay and fail the submits it contains"""
+        first, last = self._persisted + 1, self._persisted + len(batch)
+        self._attempts = 0
+        self._persisted = last
+        self._stats["dead_lettered"] += len(batch)
+        logger.error(f"Activity batch of {len(batch)} events failed {self.max_attempts} times, dead-lettered: {error}")
+        if self.dead_letter_path:
+            try:
+                await asyncio.to_thread(self._append_dead_letters, batch)
+            except OSError as e:
+                logger.error(f"Could not write dead letters to {self.dead_letter_path}: {e}")
+
+        failure = IngestFailed(f"{len(batch)} events could not be written: {error}")
+        still_waiting = []
+        for waiter in self._waiters:
+            waiter_first, waiter_last, future = waiter
+            if waiter_first <= last and waiter_last >= first:
+                if not future.done():
+                    future.set_exception(failure)
+            else:
+                still_waiting.append(waiter)
+        self._waiters = still_waiting
+        self._release_waiters()
+
+    def _append_dead_letters(self, batch: List[Row]):
+        with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+            for row in batch:
+                event = dict(zip(COLUMNS, row), metadata=json.loads(row[-1]))
+                f.write(json.dumps(event, separators=(",", ":")) + "\n")
+
+    def _release_waiters(self):
+        still_waiting = []
+        for waiter in self._waiters:
+            if waiter[1] <= self._persisted:
+                if not waiter[2].done():
+                    waiter[2].set_result(None)
+            else:
+                still_waiting.append(waiter)
+        self._waiters = still_waiting
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Activity flush failed, retrying: {e}")
+                await asyncio.sleep(self.flush_interval)
+
+    def stats(self) -> Dict[str, Any]:
+        flushes = self._stats["flushes"]
+        return {
+            **{k: v for k, v in self._stats.items() if k != "flush_seconds"},
+            # Accepted events neither written, dead-lettered nor still buffered were duplicates
+            "duplicates_skipped": (self._stats["accepted"] - self._stats["inserted"]
+                                   - self._stats["dead_lettered"] - len(self._pending)),
+            "pending": len(self._pending),
+            "avg_flush_ms": round(self._stats["flush_seconds"] / flushes * 1000, 3) if flushes else None,
+            "writer": type(self.writer).__name__,
+        }
@@ -0,0 +1,368 @@
+"""
+Creative Pattern Analytics Platform - Pattern Engine
+Vectorized periodicity, burst and co-occurrence detection
+
+Activity windows are loaded into contiguous NumPy columns (epoch seconds,
+activity type codes, durations) and every analysis is a whole-array pass:
+
+    periodicity    autocorrelation of the binned event counts via FFT, plus
+                   hour-of-week and per-type distributions
+    bursts         z-score of each bin against a trailing window (cumulative
+                   sums), contiguous runs found with np.diff
+    co-occurrence  sessions split at gaps; a sessions x types presence
+                   matrix gives co-occurrence by one matrix product, and
+                   consecutive events give type transitions
+
+Long histories are processed in chunks: ``PatternAccumulator.add`` folds
+each chunk into additive state (bin counts, co-occurrence and transition
+matrices), holding back the trailing session so sessions that span two
+chunks are counted once. Memory is bounded by the chunk size and the
+number of bins, not by history length.
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PATTERN_CHUNK_ROWS = int(os.environ.get("PATTERN_CHUNK_ROWS", 200_000))
+PATTERN_BIN_MINUTES = int(os.environ.get("PATTERN_BIN_MINUTES", 60))
+PATTERN_SESSION_GAP_MINUTES = int(os.environ.get("PATTERN_SESSION_GAP_MINUTES", 30))
+PATTERN_BURST_WINDOW_BINS = int(os.environ.get("PATTERN_BURST_WINDOW_BINS", 168))
+PATTERN_BURST_Z = float(os.environ.get("PATTERN_BURST_Z", 4.0))
+
+SECONDS_PER_HOUR = 3600
+# 1970-01-01 was a Thursday (Monday = 0)
+EPOCH_WEEKDAY = 3
+
+
+@dataclass
+class ActivityColumns:
+    """One window of activity as contiguous arrays, ordered by time"""
+
+    timestamps: np.ndarray  # int64 epoch seconds
+    activity_types: np.ndarray  # str
+    durations: np.ndarray  # float64 seconds, NaN when unknown
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[tuple]) -> "ActivityColumns":
+        """(occurred_at, activity_type, duration_seconds, ...) rows -> columns, without a per-row Python loop
+
+        ``occurred_at`` is epoch seconds or an ISO-8601 UTC string; extra columns are ignored.
+        """
+        if not rows:
+            return cls(np.empty(0, np.int64), np.empty(0, str), np.empty(0, np.float64))
+        occurred_at, activity_types, durations = list(zip(*rows))[:3]
+        if isinstance(occurred_at[0], str):
+            # The first 19 characters are the naive UTC timestamp
+            timestamps = np.array(occurred_at, dtype="U19").astype("datetime64[s]").astype(np.int64)
+        else:
+            timestamps = np.array(occurred_at, dtype=np.int64)
+        return cls(
+            timestamps,
+            np.array(activity_types, dtype=str),
+            np.array(durations, dtype=np.float64),  # None -> nan
+        )
+
+    def slice(self, start: int, stop: Optional[int] = None) -> "ActivityColumns":
+        return ActivityColumns(self.timestamps[start:stop], self.activity_types[start:stop],
+                               self.durations[start:stop])
+
+    @staticmethod
+    def concat(first: "ActivityColumns", second: "ActivityColumns") -> "ActivityColumns":
+        return ActivityColumns(np.concatenate([first.timestamps, second.timestamps]),
+                               np.concatenate([first.activity_types, second.activity_types]),
+                               np.concatenate([first.durations, second.durations]))
+
+
+EPOCH_SQL = {
+    "qmark": "CAST(strftime('%s', occurred_at) AS INTEGER)",
+    "format": "CAST(EXTRACT(EPOCH FROM occurred_at) AS BIGINT)",
+}
+
+
+def load_activity_chunks(cur, user_id: str, start_day: Optional[str] = None, end_day: Optional[str] = None,
+                         chunk_rows: int = PATTERN_CHUNK_ROWS, paramstyle: str = "qmark") -> Iterator[ActivityColumns]:
+    """Stream a user's activity in time order, ``chunk_rows`` at a time (keyset pagination)
+
+    The database converts timestamps to epoch seconds so columns are built
+    from plain integers.
+    """
+    clauses, params = ["user_id = ?"], [user_id]
+    if start_day:
+        clauses.append("occurred_at >= ?")
+        params.append(start_day)
+    if end_day:
+        clauses.append("occurred_at < ?")
+        params.append(end_day)
+    base = (f"SELECT {EPOCH_SQL[paramstyle]}, activity_type, duration_seconds, occurred_at, id "
+            f"FROM activity_events WHERE {' AND '.join(clauses)}")
+    first_sql = f"{base} ORDER BY occurred_at, id LIMIT {int(chunk_rows)}"
+    next_sql = f"{base} AND (occurred_at, id) > (?, ?) ORDER BY occurred_at, id LIMIT {int(chunk_rows)}"
+    if paramstyle == "format":
+        first_sql, next_sql = first_sql.replace("?", "%s"), next_sql.replace("?", "%s")
+
+    sql, cursor_params = first_sql, []
+    while True:
+        result = cur.execute(sql, params + cursor_params)
+        rows = (result or cur).fetchall()
+        if not rows:
+            return
+        yield ActivityColumns.from_rows(rows)
+        if len(rows) < chunk_rows:
+            return
+        sql, cursor_params = next_sql, [rows[-1][3], rows[-1][4]]
+
+
+def _grow_square(matrix: np.ndarray, size: int) -> np.ndarray:
+    extra = size - matrix.shape[0]
+    return np.pad(matrix, ((0, extra), (0, extra))) if extra > 0 else matrix
+
+
+class PatternAccumulator:
+    """Additive pattern state, fed one time-ordered chunk at a time"""
+
+    def __init__(self, bin_minutes: int = PATTERN_BIN_MINUTES,
+                 session_gap_minutes: int = PATTERN_SESSION_GAP_MINUTES):
+        self.bin_seconds = bin_minutes * 60
+        self.session_gap = session_gap_minutes * 60
+        self.origin: Optional[int] = None
+        self.counts = np.zeros(0, np.int64)
+        self.hour_of_week = np.zeros(168, np.int64)
+
+        self.types: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self.type_events = np.zeros(0, np.int64)
+        self.type_duration = np.zeros(0, np.float64)
+        self.co_occurrence = np.zeros((0, 0), np.int64)  # diagonal = sessions containing the type
+        self.transitions = np.zeros((0, 0), np.int64)
+        self.sessions = 0
+        self.events = 0
+        self._carry: Optional[ActivityColumns] = None
+
+    def _encode(self, activity_types: np.ndarray) -> np.ndarray:
+        """Stable global codes: np.unique per chunk, dictionary only for the distinct values"""
+        distinct, inverse = np.unique(activity_types, return_inverse=True)
+        for name in distinct:
+            if name not in self._codes:
+                self._codes[name] = len(self.types)
+                self.types.append(str(name))
+        size = len(self.types)
+        if self.type_events.shape[0] < size:
+            grow = size - self.type_events.shape[0]
+            self.type_events = np.pad(self.type_events, (0, grow))
+            self.type_duration = np.pad(self.type_duration, (0, grow))
+            self.co_occurrence = _grow_square(self.co_occurrence, size)
+            self.transitions = _grow_square(self.transitions, size)
+        return np.array([self._codes[name] for name in distinct], dtype=np.int64)[inverse]
+
+    def add(self, chunk: ActivityColumns):
+        """Fold a chunk (later in time than the previous one) into the state"""
+        if not len(chunk):
+            return
+        if self._carry is not None:
+            chunk = ActivityColumns.concat(self._carry, chunk)
+            self._carry = None
+
+        # Hold back the trailing session: the next chunk may continue it
+        gaps = np.flatnonzero(np.diff(chunk.timestamps) > self.session_gap)
+        if len(gaps):
+            cut = gaps[-1] + 1
+            self._carry = chunk.slice(cut)
+            self._fold(chunk.slice(0, cut))
+        else:
+            self._carry = chunk
+
+    def finish(self):
+        if self._carry is not None:
+            self._fold(self._carry)
+            self._carry = None
+
+    def _fold(self, chunk: ActivityColumns):
+        timestamps = chunk.timestamps
+        codes = self._encode(chunk.activity_types)
+        n_types = len(self.types)
+        self.events += len(timestamps)
+
+        # Binned counts, growing the series to the right as time advances
+        if self.origin is None:
+            self.origin = int(timestamps[0]) - int(timestamps[0]) % self.bin_seconds
+        bins = (timestamps - self.origin) // self.bin_seconds
+        needed = int(bins[-1]) + 1
+        if needed > self.counts.shape[0]:
+            self.counts = np.pad(self.counts, (0, needed - self.counts.shape[0]))
+        self.counts += np.bincount(bins, minlength=self.counts.shape[0])
+
+        hours = timestamps // SECONDS_PER_HOUR
+        weekday = (hours // 24 + EPOCH_WEEKDAY) % 7
+        self.hour_of_week += np.bincount(weekday * 24 + hours % 24, minlength=168)
+
+        self.type_events += np.bincount(codes, minlength=n_types)
+        self.type_duration += np.bincount(codes, weights=np.nan_to_num(chunk.durations), minlength=n_types)
+
+        # Sessions: a new one starts after every gap longer than session_gap
+        session_ids = np.concatenate([[0], np.cumsum(np.diff(timestamps) > self.session_gap)])
+        n_sessions = int(session_ids[-1]) + 1
+        presence = np.zeros((n_sessions, n_types), dtype=np.float32)
+        presence[session_ids, codes] = 1.0
+        self.co_occurrence += np.rint(presence.T @ presence).astype(np.int64)
+        self.sessions += n_sessions
+
+        same_session = session_ids[1:] == session_ids[:-1]
+        pairs = codes[:-1][same_session] * n_types + codes[1:][same_session]
+        self.transitions += np.bincount(pairs, minlength=n_types * n_types).reshape(n_types, n_types)
+
+    # Results
+
+    def periodicity(self, top: int = 5) -> Dict[str, Any]:
+        """Dominant periods from the autocorrelation of binned counts"""
+        counts = self.counts.astype(np.float64)
+        n = counts.shape[0]
+        result = {"bins": n, "bin_minutes": self.bin_seconds // 60, "dominant_period_hours": None,
+                  "strength": None, "periods": [], "daily_strength": None, "weekly_strength": None}
+        if n < 4 or not counts.any():
+            return result
+
+        centered = counts - counts.mean()
+        spectrum = np.fft.rfft(centered, 2 * n)  # zero-padded: linear, not circular, correlation
+        acf = np.fft.irfft(spectrum * np.conj(spectrum))[:n]
+        if acf[0] <= 0:
+            return result
+        acf /= acf[0]
+
+        # Local maxima between lag 2 and n/2 (at least two full cycles observed)
+        max_lag = n // 2
+        if max_lag > 2:
+            inner = acf[1:max_lag]
+            peaks = np.flatnonzero((inner[1:-1] > inner[:-2]) & (inner[1:-1] >= inner[2:])) + 2
+            peaks = peaks[acf[peaks] > 0]
+            ranked = peaks[np.argsort(acf[peaks])[::-1][:top]]
+            hours_per_bin = self.bin_seconds / SECONDS_PER_HOUR
+            result["periods"] = [{"period_hours": round(float(lag * hours_per_bin), 2),
+                                  "strength": round(float(acf[lag]), 4)} for lag in ranked]
+            if len(ranked):
+                # Multiples of the true period score almost as high; report the fundamental
+                fundamental = ranked[acf[ranked] >= 0.9 * acf[ranked[0]]].min()
+                result["dominant_period_hours"] = round(float(fundamental * hours_per_bin), 2)
+                result["strength"] = round(float(acf[fundamental]), 4)
+
+        for name, hours in (("daily_strength", 24), ("weekly_strength", 168)):
+            lag = int(round(hours * SECONDS_PER_HOUR / self.bin_seconds))
+            if 0 < lag < n:
+                result[name] = round(float(acf[lag]), 4)
+        return result
+
+    def bursts(self, window_bins: int = PATTERN_BURST_WINDOW_BINS, z_threshold: float = PATTERN_BURST_Z,
+               min_events: int = 3, limit: int = 20) -> List[Dict[str, Any]]:
+        """Runs of bins far above their trailing-window baseline"""
+        counts = self.counts.astype(np.float64)
+        n = counts.shape[0]
+        if n <= 1:
+            return []
+
+        # Trailing mean/variance of the previous ``window`` bins from cumulative sums
+        cs = np.concatenate([[0.0], np.cumsum(counts)])
+        cs2 = np.concatenate([[0.0], np.cumsum(counts * counts)])
+        idx = np.arange(n)
+        lo = np.maximum(idx - window_bins, 0)
+        width = np.maximum(idx - lo, 1)
+        mean = (cs[idx] - cs[lo]) / width
+        var = np.maximum((cs2[idx] - cs2[lo]) / width - mean * mean, 0.0)
+        # Poisson floor keeps sparse baselines from turning every event into a burst
+        std = np.sqrt(np.maximum(var, mean)) + 1.0
+        z = (counts - mean) / std
+
+        active = (z >= z_threshold) & (counts >= min_events) & (idx >= min(window_bins, n - 1) // 4)
+        edges = np.diff(np.concatenate([[0], active.astype(np.int8), [0]]))
+        starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+        if not len(starts):
+            return []
+
+        bounds = np.ravel(np.column_stack([starts, ends]))
+        bounds = bounds[bounds < n]
+        totals = np.add.reduceat(counts, bounds)[::2]
+        peaks = np.maximum.reduceat(z, bounds)[::2]
+        order = np.argsort(peaks)[::-1][:limit]
+        return [
+            {
+                "start": int(self.origin + starts[i] * self.bin_seconds),
+                "end": int(self.origin + ends[i] * self.bin_seconds),
+                "bins": int(ends[i] - starts[i]),
+                "events": int(totals[i]),
+                "peak_z": round(float(peaks[i]), 2),
+                "baseline_per_bin": round(float(mean[starts[i]]), 3),
+            }
+            for i in order
+        ]
+
+    def co_occurrence_summary(self, min_support: float = 0.01, limit: int = 20) -> Dict[str, Any]:
+        """Type pairs that share sessions more than independence predicts (lift), and top transitions"""
+        n_types = len(self.types)
+        result = {"sessions": self.sessions, "types": self.types, "matrix": self.co_occurrence.tolist(),
+                  "pairs": [], "transitions": []}
+        if not self.sessions or n_types < 2:
+            return result
+
+        together = self.co_occurrence.astype(np.float64)
+        alone = np.diag(together)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            lift = together * self.sessions / np.outer(alone, alone)
+        support = together / self.sessions
+        i, j = np.triu_indices(n_types, k=1)
+        keep = support[i, j] >= min_support
+        i, j = i[keep], j[keep]
+        order = np.argsort(lift[i, j])[::-1][:limit]
+        result["pairs"] = [
+            {"a": self.types[a], "b": self.types[b], "sessions": int(together[a, b]),
+             "support": round(float(support[a, b]), 4), "lift": round(float(lift[a, b]), 3)}
+            for a, b in zip(i[order], j[order])
+        ]
+
+        flat = self.transitions.ravel()
+        top = np.argsort(flat)[::-1][:limit]
+        row_totals = self.transitions.sum(axis=1)
+        result["transitions"] = [
+            {"from": self.types[k // n_types], "to": self.types[k % n_types], "count": int(flat[k]),
+             "probability": round(float(flat[k] / row_totals[k // n_types]), 4)}
+            for k in top if flat[k] > 0
+        ]
+        return result
+
+    def result(self) -> Dict[str, Any]:
+        self.finish()
+        total = self.hour_of_week.sum()
+        return {
+            "events": self.events,
+            "start": int(self.origin) if self.origin is not None else None,
+            "activity_types": [
+                {"activity_type": t, "events": int(self.type_events[k]),
+                 "duration_seconds": round(float(self.type_duration[k]), 1)} for k, t in enumerate(self.types)
+            ],
+            "hour_of_week": (self.hour_of_week.reshape(7, 24) / total).round(5).tolist() if total else None,
+            "periodicity": self.periodicity(),
+            "bursts": self.bursts(),
+            "co_occurrence": self.co_occurrence_summary(),
+        }
+
+
+def detect_patterns(chunks, bin_minutes: int = PATTERN_BIN_MINUTES,
+                    session_gap_minutes: int = PATTERN_SESSION_GAP_MINUTES) -> Dict[str, Any]:
+    """Run every analysis over an iterable of time-ordered ActivityColumns chunks"""
+    accumulator = PatternAccumulator(bin_minutes, session_gap_minutes)
+    for chunk in chunks:
+        accumulator.add(chunk)
+    return accumulator.result()
+
+
+def detect_user_patterns(cur, user_id: str, start_day: Optional[str] = None, end_day: Optional[str] = None,
+                         paramstyle: str = "qmark", **options) -> Dict[str, Any]:
+    """Patterns for one user straight from activity_events, chunk by chunk"""
+    chunks = load_activity_chunks(cur, user_id, start_day, end_day, paramstyle=paramstyle)
+    return dict(detect_patterns(chunks, **options), user_id=user_id)
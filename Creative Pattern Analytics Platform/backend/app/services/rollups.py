@@ -0,0 +1,421 @@
+"""
+Creative Pattern Analytics Platform - Analytics Rollups
+Incrementally maintained per-user and per-pattern aggregates
+
+Rollups are updated in the same transaction that inserts activity events,
+from the rows that were actually inserted (duplicates never count twice).
+A pattern here is an activity type. Tables, all keyed by time bucket so
+a dashboard query reads O(buckets) rows whatever the event volume:
+
+    rollup_user_hourly          user, hour        -> events, duration
+    rollup_user_daily           user, day         -> events, duration
+    rollup_user_type_daily      user, type, day   -> events, duration
+    rollup_type_daily           type, day         -> events, duration, distinct users
+    rollup_type_duration_daily  type, day, bin    -> events (log2 duration bins)
+    rollup_user_streaks         user              -> active days, last and longest streak
+
+Streaks are recomputed for a user only when an event lands on a day that
+user had no activity yet. ``recompute`` rebuilds a day range from
+activity_events (or everything, ``backfill``); both are also available as
+commands:
+
+    python -m app.services.rollups backfill
+    python -m app.services.rollups recompute --start 2026-01-01 --end 2026-01-31 [--user user-7]
+"""
+
+import argparse
+import logging
+import math
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Largest log2(duration + 1) bin; 2^20 s is about 12 days
+MAX_DURATION_BIN = 20
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS rollup_user_hourly (
+        user_id TEXT NOT NULL, hour TEXT NOT NULL,
+        events INTEGER NOT NULL, duration_seconds DOUBLE PRECISION NOT NULL,
+        PRIMARY KEY (user_id, hour))""",
+    """CREATE TABLE IF NOT EXISTS rollup_user_daily (
+        user_id TEXT NOT NULL, day TEXT NOT NULL,
+        events INTEGER NOT NULL, duration_seconds DOUBLE PRECISION NOT NULL,
+        PRIMARY KEY (user_id, day))""",
+    """CREATE TABLE IF NOT EXISTS rollup_user_type_daily (
+        user_id TEXT NOT NULL, activity_type TEXT NOT NULL, day TEXT NOT NULL,
+        events INTEGER NOT NULL, duration_seconds DOUBLE PRECISION NOT NULL,
+        PRIMARY KEY (user_id, activity_type, day))""",
+    """CREATE TABLE IF NOT EXISTS rollup_type_daily (
+        activity_type TEXT NOT NULL, day TEXT NOT NULL,
+        events INTEGER NOT NULL, duration_seconds DOUBLE PRECISION NOT NULL, users INTEGER NOT NULL,
+        PRIMARY KEY (activity_type, day))""",
+    """CREATE TABLE IF NOT EXISTS rollup_type_duration_daily (
+        activity_type TEXT NOT NULL, day TEXT NOT NULL, bin INTEGER NOT NULL, events INTEGER NOT NULL,
+        PRIMARY KEY (activity_type, day, bin))""",
+    """CREATE TABLE IF NOT EXISTS rollup_user_streaks (
+        user_id TEXT PRIMARY KEY, active_days INTEGER NOT NULL,
+        last_active_day TEXT NOT NULL, last_streak INTEGER NOT NULL,
+        longest_streak INTEGER NOT NULL, longest_streak_end TEXT NOT NULL)""",
+]
+
+USER_TABLES = ("rollup_user_hourly", "rollup_user_daily", "rollup_user_type_daily")
+TYPE_TABLES = ("rollup_type_daily", "rollup_type_duration_daily")
+
+
+def _fetchall(cur, sql: str, params: Sequence = ()) -> List[tuple]:
+    # sqlite3 connections return a cursor from execute(), DB-API cursors return None
+    result = cur.execute(sql, params)
+    return (result or cur).fetchall()
+
+
+def duration_bin(duration: Optional[float]) -> int:
+    """log2 bucket of a duration in seconds; -1 when unknown"""
+    if duration is None:
+        return -1
+    return min(MAX_DURATION_BIN, int(math.log2(duration + 1)))
+
+
+def _as_iso(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc).isoformat()
+    return value
+
+
+def _next_day(day: str) -> str:
+    return (date.fromisoformat(day) + timedelta(days=1)).isoformat()
+
+
+def streaks(days: Iterable[str]) -> Dict[str, Any]:
+    """Active days, the run ending on the last active day and the longest run"""
+    ordered = sorted(days)
+    longest, longest_end, run, previous = 0, None, 0, None
+    for day in ordered:
+        current = date.fromisoformat(day)
+        run = run + 1 if previous is not None and current - previous == timedelta(days=1) else 1
+        if run >= longest:
+            longest, longest_end = run, day
+        previous = current
+    return {
+        "active_days": len(ordered),
+        "last_active_day": ordered[-1] if ordered else None,
+        "last_streak": run,
+        "longest_streak": longest,
+        "longest_streak_end": longest_end,
+    }
+
+
+class RollupEngine:
+    """Applies inserted activity rows to the rollup tables and answers dashboard queries
+
+    Works on a sqlite3 connection or a DB-API (psycopg2) cursor; ``paramstyle``
+    is ``"qmark"`` for SQLite and ``"format"`` for psycopg2.
+    """
+
+    def __init__(self, paramstyle: str = "qmark"):
+        self.paramstyle = paramstyle
+
+    def _sql(self, sql: str) -> str:
+        return sql.replace("?", "%s") if self.paramstyle == "format" else sql
+
+    def _upsert(self, cur, table: str, keys: Sequence[str], values: Sequence[str], rows: List[tuple]):
+        if not rows:
+            return
+        columns = list(keys) + list(values)
+        updates = ", ".join(f"{v} = {table}.{v} + excluded.{v}" for v in values)
+        cur.executemany(self._sql(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {updates}"
+        ), rows)
+
+    def _existing(self, cur, table: str, keys: Sequence[str], candidates: List[tuple], chunk: int = 300) -> Set[tuple]:
+        """Which of ``candidates`` (key tuples) already have a row in ``table``"""
+        found = set()
+        if self.paramstyle == "qmark":
+            # SQLite: primary-key point lookups are cheap and in-process; it does
+            # not use the index for a row-value IN (VALUES ...) list
+            sql = f"SELECT 1 FROM {table} WHERE {' AND '.join(f'{k} = ?' for k in keys)}"
+            for key in candidates:
+                if cur.execute(sql, key).fetchone():
+                    found.add(key)
+            return found
+
+        row_placeholder = "(" + ", ".join("?" * len(keys)) + ")"
+        for i in range(0, len(candidates), chunk):
+            part = candidates[i:i + chunk]
+            sql = (f"SELECT {', '.join(keys)} FROM {table} WHERE ({', '.join(keys)}) IN "
+                   f"(VALUES {', '.join([row_placeholder] * len(part))})")
+            found.update(_fetchall(cur, self._sql(sql), [v for key in part for v in key]))
+        return found
+
+    def ensure_schema(self, cur):
+        for statement in SCHEMA:
+            cur.execute(statement)
+
+    def apply(self, cur, rows: Iterable[tuple], include_types: bool = True):
+        """Add newly inserted activity rows (ingestion Row tuples) to the rollups"""
+        hourly = defaultdict(lambda: [0, 0.0])
+        daily = defaultdict(lambda: [0, 0.0])
+        user_type = defaultdict(lambda: [0, 0.0])
+        type_daily = defaultdict(lambda: [0, 0.0])
+        duration_bins = defaultdict(int)
+
+        for _key, user_id, activity_type, occurred_at, duration, _project, _metadata in rows:
+            occurred_at = _as_iso(occurred_at)
+            day, hour = occurred_at[:10], occurred_at[:13]
+            seconds = duration or 0.0
+            for bucket in (hourly[(user_id, hour)], daily[(user_id, day)],
+                           user_type[(user_id, activity_type, day)], type_daily[(activity_type, day)]):
+                bucket[0] += 1
+                bucket[1] += seconds
+            duration_bins[(activity_type, day, duration_bin(duration))] += 1
+
+        if not daily:
+            return
+
+        # New (user, day) and (user, type, day) keys drive streaks and distinct-user counts
+        new_days = set(daily) - self._existing(cur, "rollup_user_daily", ("user_id", "day"), list(daily))
+        new_user_types = set(user_type) - self._existing(
+            cur, "rollup_user_type_daily", ("user_id", "activity_type", "day"), list(user_type))
+
+        self._upsert(cur, "rollup_user_hourly", ("user_id", "hour"), ("events", "duration_seconds"),
+                     [(*k, *v) for k, v in hourly.items()])
+        self._upsert(cur, "rollup_user_daily", ("user_id", "day"), ("events", "duration_seconds"),
+                     [(*k, *v) for k, v in daily.items()])
+        self._upsert(cur, "rollup_user_type_daily", ("user_id", "activity_type", "day"),
+                     ("events", "duration_seconds"), [(*k, *v) for k, v in user_type.items()])
+
+        if include_types:
+            new_users = defaultdict(int)
+            for _user_id, activity_type, day in new_user_types:
+                new_users[(activity_type, day)] += 1
+            self._upsert(cur, "rollup_type_daily", ("activity_type", "day"), ("events", "duration_seconds", "users"),
+                         [(*k, *v, new_users[k]) for k, v in type_daily.items()])
+            self._upsert(cur, "rollup_type_duration_daily", ("activity_type", "day", "bin"), ("events",),
+                         [(*k, v) for k, v in duration_bins.items()])
+
+        self._advance_streaks(cur, new_days)
+
+    def _save_streak(self, cur, user_id: str, s: Dict[str, Any]):
+        cur.execute(self._sql(
+            "INSERT INTO rollup_user_streaks (user_id, active_days, last_active_day, last_streak, "
+            "longest_streak, longest_streak_end) VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (user_id) DO UPDATE SET "
+            "active_days = excluded.active_days, last_active_day = excluded.last_active_day, "
+            "last_streak = excluded.last_streak, longest_streak = excluded.longest_streak, "
+            "longest_streak_end = excluded.longest_streak_end"
+        ), (user_id, s["active_days"], s["last_active_day"], s["last_streak"],
+            s["longest_streak"], s["longest_streak_end"]))
+
+    def _advance_streaks(self, cur, new_days: Iterable[Tuple[str, str]]):
+        """Extend streaks with days that are new for their user
+
+        Days after the user's last active day (the live case) extend the
+        stored streak in O(1); a late day in the past may join two runs, so
+        that user is recomputed from rollup_user_daily.
+        """
+        by_user = defaultdict(list)
+        for user_id, day in new_days:
+            by_user[user_id].append(day)
+
+        recompute = []
+        for user_id, days in by_user.items():
+            row = _fetchall(cur, self._sql(
+                "SELECT active_days, last_active_day, last_streak, longest_streak, longest_streak_end "
+                "FROM rollup_user_streaks WHERE user_id = ?"), (user_id,))
+            days.sort()
+            if row and days[0] <= row[0][1]:
+                recompute.append(user_id)
+                continue
+
+            s = dict(zip(("active_days", "last_active_day", "last_streak", "longest_streak", "longest_streak_end"),
+                         row[0])) if row else {"active_days": 0, "last_active_day": None, "last_streak": 0,
+                                               "longest_streak": 0, "longest_streak_end": None}
+            for day in days:
+                consecutive = (s["last_active_day"] is not None
+                               and date.fromisoformat(day) - date.fromisoformat(s["last_active_day"]) == timedelta(days=1))
+                s["last_streak"] = s["last_streak"] + 1 if consecutive else 1
+                s["active_days"] += 1
+                s["last_active_day"] = day
+                if s["last_streak"] >= s["longest_streak"]:
+                    s["longest_streak"], s["longest_streak_end"] = s["last_streak"], day
+            self._save_streak(cur, user_id, s)
+
+        self.refresh_streaks(cur, recompute)
+
+    def refresh_streaks(self, cur, user_ids: Iterable[str]):
+        """Recompute streaks from rollup_user_daily; O(active days) per user"""
+        for user_id in user_ids:
+            days = [row[0] for row in _fetchall(
+                cur, self._sql("SELECT day FROM rollup_user_daily WHERE user_id = ?"), (user_id,))]
+            if days:
+                self._save_streak(cur, user_id, streaks(days))
+            else:
+                cur.execute(self._sql("DELETE FROM rollup_user_streaks WHERE user_id = ?"), (user_id,))
+
+    def recompute(self, cur, start_day: Optional[str] = None, end_day: Optional[str] = None,
+                  user_id: Optional[str] = None, chunk: int = 5000) -> int:
+        """Rebuild rollups for [start_day, end_day] (inclusive) from activity_events
+
+        With ``user_id`` only that user's tables are rebuilt; pattern tables
+        aggregate every user and need a range recompute. Returns events replayed.
+        """
+        day_filter, hour_filter, event_filter, params = [], [], [], []
+        if start_day:
+            day_filter.append("day >= ?")
+            hour_filter.append("hour >= ?")
+            event_filter.append("occurred_at >= ?")
+            params.append(start_day)
+        if end_day:
+            day_filter.append("day < ?")
+            hour_filter.append("hour < ?")
+            event_filter.append("occurred_at < ?")
+            params.append(_next_day(end_day))
+        if user_id:
+            for clauses in (day_filter, hour_filter, event_filter):
+                clauses.append("user_id = ?")
+            params.append(user_id)
+
+        def where(clauses):
+            return f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        affected_users = {row[0] for row in _fetchall(
+            cur, self._sql(f"SELECT DISTINCT user_id FROM rollup_user_daily{where(day_filter)}"), params)}
+        tables = USER_TABLES if user_id else USER_TABLES + TYPE_TABLES
+        for table in tables:
+            clauses = hour_filter if table == "rollup_user_hourly" else day_filter
+            cur.execute(self._sql(f"DELETE FROM {table}{where(clauses)}"), params)
+
+        # Keyset pagination by id keeps memory flat and works on a single DB-API cursor
+        replayed, last_id = 0, 0
+        columns = "id, idempotency_key, user_id, activity_type, occurred_at, duration_seconds, project_id, metadata"
+        page_sql = self._sql(f"SELECT {columns} FROM activity_events{where(event_filter + ['id > ?'])} "
+                             f"ORDER BY id LIMIT {int(chunk)}")
+        while True:
+            page = _fetchall(cur, page_sql, params + [last_id])
+            if not page:
+                break
+            last_id = page[-1][0]
+            rows = [row[1:] for row in page]
+            self.apply(cur, rows, include_types=not user_id)
+            affected_users.update(row[1] for row in rows)
+            replayed += len(rows)
+
+        # Users whose days were deleted but got no events back still need their streaks updated
+        self.refresh_streaks(cur, affected_users)
+        return replayed
+
+    def backfill(self, cur) -> int:
+        """Rebuild every rollup from the full event history"""
+        cur.execute("DELETE FROM rollup_user_streaks")
+        return self.recompute(cur)
+
+    # Dashboard queries: every read is bounded by the number of buckets in the range
+
+    def user_timeseries(self, cur, user_id: str, start_day: str, end_day: str,
+                        granularity: str = "day") -> List[Dict[str, Any]]:
+        if granularity == "hour":
+            sql = ("SELECT hour, events, duration_seconds FROM rollup_user_hourly "
+                   "WHERE user_id = ? AND hour >= ? AND hour < ? ORDER BY hour")
+        else:
+            sql = ("SELECT day, events, duration_seconds FROM rollup_user_daily "
+                   "WHERE user_id = ? AND day >= ? AND day < ? ORDER BY day")
+        rows = _fetchall(cur, self._sql(sql), (user_id, start_day, _next_day(end_day)))
+        return [{"bucket": b, "events": e, "duration_seconds": round(d, 1)} for b, e, d in rows]
+
+    def user_summary(self, cur, user_id: str, start_day: str, end_day: str,
+                     today: Optional[date] = None) -> Dict[str, Any]:
+        params = (user_id, start_day, _next_day(end_day))
+        types = _fetchall(cur, self._sql(
+            "SELECT activity_type, SUM(events), SUM(duration_seconds) FROM rollup_user_type_daily "
+            "WHERE user_id = ? AND day >= ? AND day < ? GROUP BY activity_type ORDER BY 2 DESC"), params)
+        hours = _fetchall(cur, self._sql(
+            "SELECT hour, events FROM rollup_user_hourly WHERE user_id = ? AND hour >= ? AND hour < ?"), params)
+
+        heatmap = [[0] * 24 for _ in range(7)]  # weekday (Monday=0) x hour of day, UTC
+        for hour, events in hours:
+            heatmap[date.fromisoformat(hour[:10]).weekday()][int(hour[11:13])] += events
+
+        total_events = sum(row[1] for row in types)
+        streak_row = _fetchall(cur, self._sql(
+            "SELECT active_days, last_active_day, last_streak, longest_streak, longest_streak_end "
+            "FROM rollup_user_streaks WHERE user_id = ?"), (user_id,))
+        streak = None
+        if streak_row:
+            active_days, last_day, last_streak, longest, longest_end = streak_row[0]
+            today = today or datetime.now(timezone.utc).date()
+            # The streak is still running if the user was active today or yesterday
+            current = last_streak if date.fromisoformat(last_day) >= today - timedelta(days=1) else 0
+            streak = {"active_days": active_days, "last_active_day": last_day, "current": current,
+                      "longest": longest, "longest_end": longest_end}
+
+        return {
+            "user_id": user_id,
+            "start": start_day,
+            "end": end_day,
+            "events": total_events,
+            "duration_seconds": round(sum(row[2] for row in types), 1),
+            "activity_types": [
+                {"activity_type": t, "events": e, "share": round(e / total_events, 4),
+                 "duration_seconds": round(d, 1)} for t, e, d in types
+            ],
+            "hour_of_week": heatmap,
+            "streak": streak,
+        }
+
+    def pattern_summary(self, cur, activity_type: str, start_day: str, end_day: str) -> Dict[str, Any]:
+        params = (activity_type, start_day, _next_day(end_day))
+        days = _fetchall(cur, self._sql(
+            "SELECT day, events, duration_seconds, users FROM rollup_type_daily "
+            "WHERE activity_type = ? AND day >= ? AND day < ? ORDER BY day"), params)
+        bins = _fetchall(cur, self._sql(
+            "SELECT bin, SUM(events) FROM rollup_type_duration_daily "
+            "WHERE activity_type = ? AND day >= ? AND day < ? GROUP BY bin ORDER BY bin"), params)
+        return {
+            "activity_type": activity_type,
+            "start": start_day,
+            "end": end_day,
+            "events": sum(row[1] for row in days),
+            "daily": [{"day": d, "events": e, "duration_seconds": round(s, 1), "users": u} for d, e, s, u in days],
+            "duration_distribution": [
+                {"min_seconds": None if b < 0 else 2 ** b - 1,
+                 "max_seconds": None if b < 0 or b == MAX_DURATION_BIN else 2 ** (b + 1) - 1,
+                 "events": e} for b, e in bins
+            ],
+        }
+
+    def top_patterns(self, cur, start_day: str, end_day: str, limit: int = 20) -> List[Dict[str, Any]]:
+        rows = _fetchall(cur, self._sql(
+            "SELECT activity_type, SUM(events), SUM(duration_seconds) FROM rollup_type_daily "
+            "WHERE day >= ? AND day < ? GROUP BY activity_type ORDER BY 2 DESC LIMIT ?"),
+            (start_day, _next_day(end_day), limit))
+        return [{"activity_type": t, "events": e, "duration_seconds": round(d, 1)} for t, e, d in rows]
+
+
+def main():
+    from app.services.activity_ingestion import DATABASE_URL, create_writer
+
+    parser = argparse.ArgumentParser(description="Rebuild analytics rollups from activity_events")
+    parser.add_argument("command", choices=("backfill", "recompute"))
+    parser.add_argument("--start", help="First day to rebuild (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Last day to rebuild (YYYY-MM-DD)")
+    parser.add_argument("--user", help="Only rebuild this user's rollups")
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    args = parser.parse_args()
+
+    writer = create_writer(args.database_url).open()
+    started = time.perf_counter()
+    try:
+        if args.command == "backfill":
+            replayed = writer.transaction(writer.rollups.backfill)
+        else:
+            replayed = writer.transaction(writer.rollups.recompute, args.start, args.end, args.user)
+    finally:
+        writer.close()
+    print(f"✅ {args.command}: {replayed:,} events rolled up in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
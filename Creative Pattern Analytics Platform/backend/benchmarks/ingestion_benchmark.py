@@ -0,0 +1,136 @@
+"""
+Creative Pattern Analytics Platform - Ingestion Benchmark
+
+Sends the same synthetic activity stream through the activities API
+in-process (httpx over ASGI, no sockets) two ways and reports events/sec
+until every event is persisted:
+
+    single    POST /activities, one event per request, written per request
+    batched   POST /activities/batch with NDJSON bodies, write-behind flushes
+
+A final pass resends a slice of the batches to check that idempotency keys
+keep the row count unchanged.
+
+    python benchmarks/ingestion_benchmark.py --events 50000
+    python benchmarks/ingestion_benchmark.py --database-url postgresql://user:pw@localhost/bench
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from fastapi import FastAPI
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from app.api.routes import activities  # noqa: E402
+from app.services.activity_ingestion import ActivityIngestor, create_writer  # noqa: E402
+
+ACTIVITY_TYPES = ["writing", "sketching", "composing", "editing", "research", "brainstorming", "review"]
+
+
+def synthetic_events(count: int, users: int = 500, seed: int = 11):
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for i in range(count):
+        yield {
+            "user_id": f"user-{rng.randrange(users)}",
+            "activity_type": rng.choice(ACTIVITY_TYPES),
+            "occurred_at": (start + timedelta(seconds=rng.randrange(90 * 86400))).isoformat(),
+            "duration_seconds": round(rng.expovariate(1 / 900), 1),
+            "project_id": f"project-{rng.randrange(2000)}",
+            "metadata": {"tool": rng.choice(["tablet", "desktop", "mobile"]), "mood": rng.randint(1, 5)},
+            "idempotency_key": f"bench-{i}",
+        }
+
+
+def build_app(ingestor: ActivityIngestor) -> FastAPI:
+    app = FastAPI()
+    app.state.activity_ingestor = ingestor
+    app.include_router(activities.router, prefix="/api/v1/activities")
+    return app
+
+
+async def run_mode(mode: str, events: list, database_url: str, batch_events: int, concurrency: int) -> dict:
+    ingestor = ActivityIngestor(create_writer(database_url))
+    await ingestor.start()
+    transport = httpx.ASGITransport(app=build_app(ingestor))
+    requests_sent = 0
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        if mode == "single":
+            cursor = iter(events)
+
+            async def worker():
+                nonlocal requests_sent
+                for event in cursor:
+                    response = await client.post("/api/v1/activities", json=event)
+                    response.raise_for_status()
+                    requests_sent += 1
+
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        else:
+            bodies = ["\n".join(json.dumps(e) for e in events[i:i + batch_events])
+                      for i in range(0, len(events), batch_events)]
+            headers = {"content-type": "application/x-ndjson"}
+            for body in bodies:
+                response = await client.post("/api/v1/activities/batch", content=body, headers=headers)
+                response.raise_for_status()
+                requests_sent += 1
+            await ingestor.flush()
+        elapsed = time.perf_counter() - started
+
+        # Replay part of the stream: idempotency keys must keep it from landing twice
+        replay = events[: max(1, len(events) // 10)]
+        body = "\n".join(json.dumps(e) for e in replay[:batch_events])
+        await client.post("/api/v1/activities/batch?wait=true", content=body,
+                          headers={"content-type": "application/x-ndjson"})
+
+    stats = ingestor.stats()
+    await ingestor.stop()
+    return {
+        "events": len(events),
+        "requests": requests_sent,
+        "seconds": round(elapsed, 3),
+        "events_per_second": round(len(events) / elapsed),
+        "inserted": stats["inserted"],
+        "duplicates_skipped": stats["duplicates_skipped"],
+        "flushes": stats["flushes"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Single vs batched activity ingestion")
+    parser.add_argument("--events", type=int, default=50_000)
+    parser.add_argument("--single-events", type=int, default=5_000,
+                        help="Events sent one per request (the single path is slow)")
+    parser.add_argument("--batch-events", type=int, default=1000, help="Events per batch request")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--database-url", help="Defaults to a temporary SQLite database per mode")
+    args = parser.parse_args()
+
+    events = list(synthetic_events(args.events))
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode, subset in (("single", events[: args.single_events]), ("batched", events)):
+            url = args.database_url or f"sqlite:///{os.path.join(tmp, mode + '.db')}"
+            results[mode] = asyncio.run(run_mode(mode, subset, url, args.batch_events, args.concurrency))
+
+    print(f"📥 Activity ingestion ({args.batch_events} events per batch)")
+    for mode, r in results.items():
+        print(f"   {mode:<8} {r['events_per_second']:>9,} events/s  {r['events']:>7,} events "
+              f"in {r['requests']:>6,} requests  duplicates skipped {r['duplicates_skipped']}")
+    speedup = results["batched"]["events_per_second"] / results["single"]["events_per_second"]
+    print(f"   🚀 batched ingestion is {speedup:.0f}x faster")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Creative Pattern Analytics Platform - Pattern Engine Benchmark
+
+Runs periodicity, burst and co-occurrence detection over a synthetic
+long-history user (default 1M events over three years) three ways: a
+row-by-row Python implementation of the same analyses, the vectorized
+engine over the whole window, and the engine fed in chunks. Optionally
+also end to end from SQLite through the chunked loader.
+
+    python benchmarks/pattern_benchmark.py --events 1000000 --sqlite
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from app.services.activity_ingestion import SQLiteActivityWriter  # noqa: E402
+from app.services.pattern_engine import (  # noqa: E402
+    ActivityColumns,
+    PatternAccumulator,
+    detect_patterns,
+    detect_user_patterns,
+)
+
+ACTIVITY_TYPES = np.array(["writing", "drawing", "music", "coding", "photography", "reading", "brainstorming"])
+START = 1767225600  # 2026-01-01T00:00:00Z
+
+
+def synthetic_history(events: int, days: int = 1095, seed: int = 7) -> ActivityColumns:
+    """Evening-heavy daily rhythm, quieter weekends, a few injected bursts, time-of-day dependent types"""
+    rng = np.random.default_rng(seed)
+    hour_weights = np.array([1, 1, 1, 1, 1, 1, 2, 3, 5, 6, 6, 5, 4, 4, 5, 5, 6, 7, 9, 10, 9, 7, 4, 2], float)
+    day = rng.integers(0, days, events)
+    weekend = ((day + 3) % 7) >= 5  # 2026-01-01 is a Thursday
+    day = np.where(weekend & (rng.random(events) < 0.5), rng.integers(0, days, events), day)
+    hour = rng.choice(24, events, p=hour_weights / hour_weights.sum())
+    timestamps = START + day * 86400 + hour * 3600 + rng.integers(0, 3600, events)
+
+    burst_events = events // 50
+    burst_starts = START + rng.choice(days, 5, replace=False) * 86400 + 14 * 3600
+    timestamps[:burst_events] = (rng.choice(burst_starts, burst_events)
+                                 + rng.integers(0, 3 * 3600, burst_events))
+
+    morning = (timestamps // 3600) % 24 < 12
+    types = np.where(morning, rng.choice([0, 3, 5], events), rng.choice([1, 2, 4, 6], events))
+    order = np.argsort(timestamps, kind="stable")
+    return ActivityColumns(timestamps[order], ACTIVITY_TYPES[types[order]],
+                           rng.exponential(900, events).round(1)[order])
+
+
+def row_by_row(rows, bin_seconds: int = 3600, gap: int = 1800, window: int = 168, z_threshold: float = 4.0,
+               max_lag: int = 336) -> dict:
+    """The same analyses, one Python object at a time"""
+    counts = defaultdict(int)
+    hour_of_week = [0] * 168
+    co = defaultdict(int)
+    transitions = defaultdict(int)
+    sessions, session_types, previous = 0, set(), None
+    origin = rows[0][0] - rows[0][0] % bin_seconds
+    for ts, activity_type, _ in rows:
+        counts[(ts - origin) // bin_seconds] += 1
+        hour_of_week[((ts // 86400 + 3) % 7) * 24 + (ts // 3600) % 24] += 1
+        if previous is None or ts - previous[0] > gap:
+            for a in session_types:
+                for b in session_types:
+                    co[(a, b)] += 1
+            sessions, session_types = sessions + 1, set()
+        elif previous is not None:
+            transitions[(previous[1], activity_type)] += 1
+        session_types.add(activity_type)
+        previous = (ts, activity_type)
+    for a in session_types:
+        for b in session_types:
+            co[(a, b)] += 1
+
+    n = max(counts) + 1
+    series = [counts.get(i, 0) for i in range(n)]
+    mean = sum(series) / n
+    centered = [c - mean for c in series]
+    denom = sum(c * c for c in centered)
+    acf = [sum(centered[i] * centered[i + lag] for i in range(n - lag)) / denom for lag in range(max_lag + 1)]
+
+    bursts = []
+    for i, c in enumerate(series):
+        past = series[max(0, i - window):i] or [0]
+        m = sum(past) / len(past)
+        var = max(sum(p * p for p in past) / len(past) - m * m, 0.0)
+        z = (c - m) / (math.sqrt(max(var, m)) + 1.0)
+        if z >= z_threshold and c >= 3 and i >= window // 4:
+            bursts.append(i)
+    return {"sessions": sessions, "co": dict(co), "transitions": dict(transitions),
+            "daily_strength": acf[24], "weekly_strength": acf[168], "burst_bins": len(bursts)}
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, round(time.perf_counter() - started, 3)
+
+
+def chunked(history: ActivityColumns, chunk_rows: int):
+    for i in range(0, len(history), chunk_rows):
+        yield history.slice(i, i + chunk_rows)
+
+
+def run(events: int, chunk_rows: int, baseline: bool, use_sqlite: bool) -> dict:
+    history = synthetic_history(events)
+    results = {"events": events, "chunk_rows": chunk_rows, "seconds": {}}
+
+    full, results["seconds"]["vectorized"] = timed(lambda: detect_patterns([history]))
+    chunks, results["seconds"]["vectorized_chunked"] = timed(lambda: detect_patterns(chunked(history, chunk_rows)))
+    assert chunks["co_occurrence"]["matrix"] == full["co_occurrence"]["matrix"]
+    assert chunks["periodicity"] == full["periodicity"] and chunks["bursts"] == full["bursts"]
+
+    results["patterns"] = {
+        "sessions": full["co_occurrence"]["sessions"],
+        "dominant_period_hours": full["periodicity"]["dominant_period_hours"],
+        "daily_strength": full["periodicity"]["daily_strength"],
+        "weekly_strength": full["periodicity"]["weekly_strength"],
+        "bursts": len(full["bursts"]),
+        "top_pair": full["co_occurrence"]["pairs"][0] if full["co_occurrence"]["pairs"] else None,
+    }
+
+    if baseline:
+        rows = list(zip(history.timestamps.tolist(), history.activity_types.tolist(), history.durations.tolist()))
+        slow, results["seconds"]["row_by_row"] = timed(lambda: row_by_row(rows))
+        accumulator = PatternAccumulator()
+        accumulator.add(history)
+        accumulator.finish()
+        index = {t: k for k, t in enumerate(accumulator.types)}
+        for (a, b), count in slow["co"].items():
+            assert accumulator.co_occurrence[index[a], index[b]] == count
+        for (a, b), count in slow["transitions"].items():
+            assert accumulator.transitions[index[a], index[b]] == count
+        assert slow["sessions"] == accumulator.sessions
+        assert abs(slow["daily_strength"] - full["periodicity"]["daily_strength"]) < 1e-3
+        assert slow["burst_bins"] == sum(b["bins"] for b in accumulator.bursts(limit=10_000))
+
+    if use_sqlite:
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = SQLiteActivityWriter(os.path.join(tmp, "patterns.db")).open()
+            iso = history.timestamps.astype("datetime64[s]").astype(str)
+            rows = [(f"bench-{i}", "user-1", t, f"{ts}+00:00", d, None, "{}")
+                    for i, (t, ts, d) in enumerate(zip(history.activity_types.tolist(), iso.tolist(),
+                                                       history.durations.tolist()))]
+            for i in range(0, len(rows), 50_000):
+                writer.write(rows[i:i + 50_000])
+            loaded, results["seconds"]["sqlite_end_to_end"] = timed(
+                lambda: writer.read(detect_user_patterns, "user-1"))
+            assert loaded["co_occurrence"]["matrix"] == full["co_occurrence"]["matrix"]
+            writer.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized pattern detection over a long activity history")
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--chunk-rows", type=int, default=200_000)
+    parser.add_argument("--no-baseline", action="store_true", help="Skip the (slow) row-by-row implementation")
+    parser.add_argument("--sqlite", action="store_true", help="Also load from SQLite through the chunked loader")
+    args = parser.parse_args()
+
+    r = run(args.events, args.chunk_rows, not args.no_baseline, args.sqlite)
+    print(f"🔍 {r['events']:,} events for one user, chunks of {r['chunk_rows']:,}")
+    for name, seconds in r["seconds"].items():
+        print(f"   {name:<20} {seconds:>8.3f} s   {r['events'] / seconds:>12,.0f} events/s")
+    print(json.dumps(r, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Creative Pattern Analytics Platform - Rollup Benchmark
+
+Ingests a synthetic activity history in time order with rollups maintained
+in the write path, then compares 90-day dashboard summaries read from the
+rollups with the same numbers aggregated from raw activity_events.
+
+    python benchmarks/rollup_benchmark.py --events 500000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from app.services.activity_ingestion import ActivityEvent, create_writer  # noqa: E402
+from ingestion_benchmark import synthetic_events  # noqa: E402
+
+RAW_SUMMARY_SQL = [
+    "SELECT activity_type, COUNT(*), SUM(COALESCE(duration_seconds, 0)) FROM activity_events "
+    "WHERE user_id = ? AND occurred_at >= ? AND occurred_at < ? GROUP BY activity_type",
+    "SELECT substr(occurred_at, 1, 13), COUNT(*) FROM activity_events "
+    "WHERE user_id = ? AND occurred_at >= ? AND occurred_at < ? GROUP BY 1",
+    "SELECT DISTINCT substr(occurred_at, 1, 10) FROM activity_events WHERE user_id = ?",
+]
+
+RAW_PATTERN_SQL = (
+    "SELECT substr(occurred_at, 1, 10), COUNT(*), SUM(COALESCE(duration_seconds, 0)), COUNT(DISTINCT user_id) "
+    "FROM activity_events WHERE activity_type = ? AND occurred_at >= ? AND occurred_at < ? GROUP BY 1"
+)
+
+
+def timed(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return round((time.perf_counter() - started) * 1000 / repeat, 3)
+
+
+def run(events: int, users: int, batch_size: int, repeat: int) -> dict:
+    rows = [ActivityEvent.model_validate(e).to_row() for e in synthetic_events(events, users=users)]
+    # Live ingestion arrives roughly in time order
+    rows.sort(key=lambda row: row[3])
+    results = {"events": events, "users": users}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, rollups in (("without_rollups", False), ("with_rollups", True)):
+            writer = create_writer(f"sqlite:///{os.path.join(tmp, label + '.db')}", rollups=rollups).open()
+            started = time.perf_counter()
+            for i in range(0, len(rows), batch_size):
+                writer.write(rows[i:i + batch_size])
+            results[f"ingest_events_per_second_{label}"] = round(events / (time.perf_counter() - started))
+            if not rollups:
+                writer.close()
+
+        conn, rollups = writer._conn, writer.rollups
+        start, end, end_exclusive = "2026-01-01", "2026-03-31", "2026-04-01"
+        user = "user-1"
+
+        def raw_summary():
+            for sql in RAW_SUMMARY_SQL:
+                params = (user,) if sql.count("?") == 1 else (user, start, end_exclusive)
+                conn.execute(sql, params).fetchall()
+
+        results["user_summary_ms"] = {
+            "raw_events": timed(raw_summary, repeat),
+            "rollups": timed(lambda: rollups.user_summary(conn, user, start, end), repeat),
+        }
+        results["pattern_summary_ms"] = {
+            "raw_events": timed(lambda: conn.execute(RAW_PATTERN_SQL, ("writing", start, end_exclusive)).fetchall(),
+                                repeat),
+            "rollups": timed(lambda: rollups.pattern_summary(conn, "writing", start, end), repeat),
+        }
+        started = time.perf_counter()
+        replayed = writer.transaction(rollups.backfill)
+        results["backfill_events_per_second"] = round(replayed / (time.perf_counter() - started))
+        writer.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rollup maintenance cost and dashboard query latency")
+    parser.add_argument("--events", type=int, default=500_000)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    r = run(args.events, args.users, args.batch_size, args.repeat)
+    print(f"📊 {r['events']:,} events, {r['users']} users, 90-day range")
+    print(f"   ingest  {r['ingest_events_per_second_without_rollups']:>9,} events/s without rollups, "
+          f"{r['ingest_events_per_second_with_rollups']:,} with")
+    for name in ("user_summary_ms", "pattern_summary_ms"):
+        print(f"   {name[:-3]:<16} raw {r[name]['raw_events']:>9.2f} ms   rollups {r[name]['rollups']:>7.2f} ms")
+    print(f"   backfill {r['backfill_events_per_second']:,} events/s")
+    print(json.dumps(r, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -27,10 +27,15 @@ from app.api.routes import (
     health,
 )
 from app.middleware.error_handler import error_handler_middleware
-from app.middleware.request_logger import request_logger_middleware
+from app.middleware.request_logging import RequestLoggingMiddleware, setup_access_logging, stop_listener
+from app.services.activity_ingestion import ActivityIngestor
 
-# Setup logging
+# Setup logging; access records are written off the request path
 logger = setup_logging(__name__)
+access_log_listener = setup_access_logging()
+
+# Batched, write-behind activity ingestion
+activity_ingestor = ActivityIngestor()
 
 
 @asynccontextmanager
@@ -48,6 +53,10 @@ async def lifespan(app: FastAPI):
         await init_redis()
         logger.info("✅ Redis cache initialized")
         
+        await activity_ingestor.start()
+        app.state.activity_ingestor = activity_ingestor
+        logger.info("✅ Activity ingestion started")
+        
     except Exception as e:
         logger.error(f"❌ Startup failed: {str(e)}")
         raise
@@ -57,11 +66,13 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("🛑 Shutting down Creative Pattern Analytics Platform")
     try:
+        await activity_ingestor.stop()
         await close_db()
         await close_redis()
         logger.info("✅ Cleanup completed")
     except Exception as e:
         logger.error(f"⚠️ Shutdown error: {str(e)}")
+    stop_listener(access_log_listener)
 
 
 # Initialize FastAPI app
@@ -88,8 +99,8 @@ app.add_middleware(
 )
 
 # Custom Middleware
-app.middleware("http")(request_logger_middleware)
 app.middleware("http")(error_handler_middleware)
+app.add_middleware(RequestLoggingMiddleware)
 
 
 # Exception Handlers
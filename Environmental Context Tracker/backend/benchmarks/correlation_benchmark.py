@@ -0,0 +1,126 @@
+"""
+Environmental Context Tracker - Streaming correlation benchmark
+
+Streams synthetic per-minute readings (four environment factors, two
+creative output metrics per user, uploaded every few minutes) through the
+CorrelationEngine, then compares reading one pair's statistics with
+recomputing Pearson, Spearman and the lag profile over the full bucket
+history with NumPy, at growing history lengths.
+
+    python benchmarks/correlation_benchmark.py --users 200 --days 2
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from backend.correlation import CorrelationEngine  # noqa: E402
+
+BUCKET_MS = 300_000
+START = 1_767_225_600_000  # 2026-01-01T00:00:00Z
+
+
+def ar1(rng, n: int, scale: float, phi: float = 0.98) -> np.ndarray:
+    """Mean-reverting noise (truncated AR(1) kernel), like a room's readings around its baseline"""
+    kernel = phi ** np.arange(int(np.log(1e-3) / np.log(phi)))
+    return np.convolve(rng.normal(0, scale, n), kernel)[:n]
+
+
+def user_signals(rng, minutes: int):
+    """Per-minute readings; words follow noise with a 15 minute delay, focus follows light"""
+    env = {
+        "noise_db": 45 + ar1(rng, minutes + 15, 0.5),
+        "light_lux": 300 + ar1(rng, minutes, 2),
+        "temperature": 21 + ar1(rng, minutes, 0.02),
+        "humidity": 40 + ar1(rng, minutes, 0.05),
+    }
+    out = {
+        "output.words": 50 - 0.8 * env["noise_db"][:minutes] + rng.normal(0, 2, minutes),
+        "output.focus": 0.01 * env["light_lux"] + rng.normal(0, 0.5, minutes),
+    }
+    env["noise_db"] = env["noise_db"][15:]
+    return {**env, **out}
+
+
+def recompute(x: np.ndarray, y: np.ndarray, max_lag: int) -> dict:
+    """Full-history batch statistics for one pair of aligned bucket means"""
+    pearson = np.corrcoef(x, y)[0, 1]
+    spearman = np.corrcoef(np.argsort(np.argsort(x)), np.argsort(np.argsort(y)))[0, 1]
+    lags = [np.corrcoef(x[:-k], y[k:])[0, 1] for k in range(1, max_lag + 1)]
+    return {"pearson": pearson, "spearman": spearman, "lags": lags}
+
+
+def timed(fn, repeat: int):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - started) / repeat
+
+
+def run(users: int, days: float, upload_minutes: int, history_buckets) -> dict:
+    rng = np.random.default_rng(9)
+    minutes = int(days * 1440)
+    engine = CorrelationEngine(half_life_buckets=0)
+    timestamps = START + np.arange(minutes, dtype=np.int64) * 60_000
+    data = {f"user-{u}": user_signals(rng, minutes) for u in range(users)}
+
+    readings = 0
+    started = time.perf_counter()
+    for start in range(0, minutes, upload_minutes):
+        ts = timestamps[start:start + upload_minutes]
+        for user_id, signals in data.items():
+            for factor, values in signals.items():
+                engine.observe(user_id, factor, ts, values[start:start + upload_minutes])
+                readings += len(ts)
+    seconds = time.perf_counter() - started
+    results = {"users": users, "readings": readings, "observe_readings_per_second": round(readings / seconds),
+               "engine": engine.stats()}
+
+    # Exactness: all-time engine statistics equal the batch computation over closed buckets
+    signals = data["user-0"]
+    buckets = minutes * 60_000 // BUCKET_MS
+    means = {f: signals[f][:buckets * 5].reshape(buckets, 5).mean(axis=1)[:-1] for f in signals}
+    pair = engine.pair("user-0", "noise_db", "output.words")
+    batch = recompute(means["noise_db"], means["output.words"], engine.max_lag)
+    assert abs(pair["pearson"] - batch["pearson"]) < 1e-9
+    assert abs(pair["lags"][2]["r"] - batch["lags"][2]) < 1e-2
+    results["user_0_noise_words"] = {
+        "pearson": round(pair["pearson"], 4), "spearman_streaming": round(pair["spearman"], 4),
+        "spearman_exact_all_time": round(batch["spearman"], 4), "best_lag_seconds": pair["best_lag_seconds"],
+        "best_lag_r": round(pair["best_lag_r"], 4),
+    }
+
+    # Read cost: O(1) engine read vs recomputing over history of growing length
+    _, engine_seconds = timed(lambda: engine.pair("user-0", "noise_db", "output.words"), 2000)
+    _, all_pairs_seconds = timed(lambda: engine.user_correlations("user-0"), 500)
+    results["read_us"] = {"engine_pair": round(engine_seconds * 1e6, 1),
+                          "engine_all_pairs": round(all_pairs_seconds * 1e6, 1), "recompute_pair": {}}
+    for n in history_buckets:
+        x, y = rng.normal(size=n), rng.normal(size=n)
+        _, seconds = timed(lambda: recompute(x, y, engine.max_lag), 20)
+        results["read_us"]["recompute_pair"][n] = round(seconds * 1e6, 1)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming correlation: update throughput and O(1) reads")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--days", type=float, default=2)
+    parser.add_argument("--upload-minutes", type=int, default=5, help="Readings per sensor upload")
+    args = parser.parse_args()
+
+    r = run(args.users, args.days, args.upload_minutes, (1_000, 10_000, 100_000, 1_000_000))
+    print(f"📈 {r['readings']:,} readings, {r['engine']['pairs']:,} pairs, "
+          f"{r['observe_readings_per_second']:,} readings/s")
+    print(f"   read one pair {r['read_us']['engine_pair']} us; recompute "
+          + ", ".join(f"{n:,} buckets {us:,} us" for n, us in r["read_us"]["recompute_pair"].items()))
+    print(json.dumps(r, indent=2))
+
+
+if __name__ == "__main__":
+    main()
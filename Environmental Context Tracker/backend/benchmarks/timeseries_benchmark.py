@@ -0,0 +1,186 @@
+"""
+Environmental Context Tracker - Time-series storage benchmark
+
+Synthetic 1 Hz sensors (temperature, noise, light, humidity) ending now,
+written two ways:
+
+    row_per_reading   one row and one committed transaction per reading
+                      (measured on a sample, the pattern an ORM insert per
+                      reading produces), then the full set via executemany
+                      for storage size and query timing
+    blocks            backend.timeseries: buffered heads sealed into
+                      compressed blocks with 1m/1h tiers
+
+and compares ingest rate, bytes per point, and range queries (24h at one
+minute steps, a 7 day summary).
+
+    python benchmarks/timeseries_benchmark.py --users 50 --hours 6
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from backend.timeseries import TimeSeriesStore  # noqa: E402
+
+FACTORS = ("temperature", "noise_db", "light_lux", "humidity")
+
+
+def synthetic(users: int, hours: float, now_ms: int, seed: int = 3):
+    """(user_id, factor, timestamps ms, values) per series; sensor-like resolution"""
+    rng = np.random.default_rng(seed)
+    points = int(hours * 3600)
+    timestamps = now_ms - (points - np.arange(points, dtype=np.int64)) * 1000
+    for u in range(users):
+        for factor in FACTORS:
+            drift = np.cumsum(rng.normal(0, 0.02, points))
+            if factor == "temperature":
+                values = np.round(21 + drift, 1)
+            elif factor == "noise_db":
+                values = np.round(45 + 8 * np.abs(rng.normal(0, 1, points)), 1)
+            elif factor == "light_lux":
+                values = np.round(np.maximum(0, 300 + 50 * drift), 0)
+            else:
+                values = np.round(40 + drift, 0)
+            yield f"user-{u}", factor, timestamps, values
+
+
+def row_store(path: str):
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE readings (id INTEGER PRIMARY KEY, user_id TEXT, factor TEXT, ts INTEGER, value REAL)")
+    conn.execute("CREATE INDEX readings_series ON readings (user_id, factor, ts)")
+    return conn
+
+
+def db_bytes(path: str) -> int:
+    return sum(os.path.getsize(p) for p in (path, path + "-wal") if os.path.exists(p))
+
+
+def timed(fn, repeat: int = 1):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - started) / repeat
+
+
+def run(users: int, hours: float, batch_points: int, sample: int) -> dict:
+    now_ms = int(time.time() * 1000)
+    series = list(synthetic(users, hours, now_ms))
+    total = sum(len(ts) for _, _, ts, _ in series)
+    results = {"series": len(series), "points": total}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Row per reading, one transaction each (sample)
+        rows_path = os.path.join(tmp, "rows.db")
+        conn = row_store(rows_path)
+        user_id, factor, timestamps, values = series[0]
+        sample_rows = list(zip(timestamps[:sample].tolist(), values[:sample].tolist()))
+
+        def one_by_one():
+            for ts, value in sample_rows:
+                conn.execute("BEGIN")
+                conn.execute("INSERT INTO readings (user_id, factor, ts, value) VALUES (?, ?, ?, ?)",
+                             (user_id, factor, ts, value))
+                conn.execute("COMMIT")
+
+        _, seconds = timed(one_by_one)
+        results["row_per_reading_points_per_second"] = round(sample / seconds)
+        conn.execute("DELETE FROM readings")
+
+        # Row per reading, bulk-loaded, for size and query comparison
+        conn.execute("BEGIN")
+        for user_id, factor, timestamps, values in series:
+            conn.executemany("INSERT INTO readings (user_id, factor, ts, value) VALUES (?, ?, ?, ?)",
+                             zip([user_id] * len(timestamps), [factor] * len(timestamps),
+                                 timestamps.tolist(), values.tolist()))
+        conn.execute("COMMIT")
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        results["row_bytes_per_point"] = round(db_bytes(rows_path) / total, 2)
+
+        # Blocks: sensors post ``batch_points`` readings at a time, interleaved across series
+        blocks_path = os.path.join(tmp, "blocks.db")
+        store = TimeSeriesStore(f"sqlite:///{blocks_path}").open()
+
+        def ingest():
+            for start in range(0, len(series[0][2]), batch_points):
+                for user_id, factor, timestamps, values in series:
+                    store.append(user_id, factor, timestamps[start:start + batch_points].tolist(),
+                                 values[start:start + batch_points].tolist())
+            store.flush(force=True)
+
+        _, seconds = timed(ingest)
+        results["blocks_points_per_second"] = round(total / seconds)
+        store._conn.execute("VACUUM")
+        store._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        results["blocks_bytes_per_point"] = round(db_bytes(blocks_path) / total, 2)
+        results["payload_bytes_per_point"] = store.stats()["bytes_per_point"]
+
+        # Queries on one series: the last ``hours`` at one-minute steps, and a summary
+        user_id, factor = series[0][0], series[0][1]
+        start_ms, end_ms = now_ms - int(hours * 3_600_000), now_ms + 1
+
+        def raw_sql():
+            return conn.execute(
+                "SELECT ts / 60000, COUNT(*), AVG(value), MIN(value), MAX(value) FROM readings "
+                "WHERE user_id = ? AND factor = ? AND ts >= ? AND ts < ? GROUP BY 1",
+                (user_id, factor, start_ms, end_ms)).fetchall()
+
+        expected, sql_seconds = timed(raw_sql, 20)
+        raw_tier, raw_seconds = timed(lambda: store.query(user_id, factor, start_ms, end_ms, 60_000, tier="raw"), 20)
+        minute_tier, tier_seconds = timed(lambda: store.query(user_id, factor, start_ms, end_ms, 60_000), 20)
+        assert minute_tier["tier"] == "1m"
+        assert [p["count"] for p in raw_tier["points"]] == [row[1] for row in expected]
+        assert [p["count"] for p in minute_tier["points"]] == [row[1] for row in expected]
+        assert np.allclose([p["mean"] for p in minute_tier["points"]], [row[2] for row in expected])
+        results["range_query_ms"] = {
+            "rows_group_by": round(sql_seconds * 1000, 2),
+            "blocks_raw_tier": round(raw_seconds * 1000, 2),
+            "blocks_1m_tier": round(tier_seconds * 1000, 2),
+        }
+
+        summary_sql, sql_seconds = timed(lambda: conn.execute(
+            "SELECT COUNT(*), AVG(value), MIN(value), MAX(value) FROM readings "
+            "WHERE user_id = ? AND factor = ? AND ts >= ? AND ts < ?",
+            (user_id, factor, start_ms - 86_400_000, end_ms)).fetchone(), 20)
+        summary, summary_seconds = timed(
+            lambda: store.summary(user_id, factor, start_ms - 86_400_000, end_ms), 20)
+        assert summary["count"] == summary_sql[0] and abs(summary["mean"] - summary_sql[1]) < 1e-6
+        results["summary_ms"] = {
+            "rows": round(sql_seconds * 1000, 2),
+            "blocks": round(summary_seconds * 1000, 2),
+            "blocks_from_metadata": summary["blocks_from_metadata"],
+        }
+        store.close()
+        conn.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Block-compressed time-series storage vs a row per reading")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--hours", type=float, default=6)
+    parser.add_argument("--batch-points", type=int, default=60, help="Readings per sensor upload")
+    parser.add_argument("--sample", type=int, default=5000, help="Readings for the one-transaction-each run")
+    args = parser.parse_args()
+
+    r = run(args.users, args.hours, args.batch_points, args.sample)
+    print(f"🌡️  {r['points']:,} readings across {r['series']} series")
+    print(f"   ingest   row per reading {r['row_per_reading_points_per_second']:>10,}/s   "
+          f"blocks {r['blocks_points_per_second']:>10,}/s")
+    print(f"   storage  row per reading {r['row_bytes_per_point']:>10} B/pt  "
+          f"blocks {r['blocks_bytes_per_point']:>10} B/pt")
+    print(json.dumps(r, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Environmental Context Tracker - WebSocket fan-out load test
+
+Simulated mode (default) opens 10k in-process sockets on the
+ConnectionManager, with a share of slow clients (every send sleeps) and a
+few stalled ones (sends never complete), then measures:
+
+    targeted    user-scoped publishes: publish latency and delivery rate
+    broadcast   publishes to every socket: time until all healthy sockets
+                have the message
+    coalesce    keyed updates to a slow socket keep its queue at one entry
+    legacy      the previous pattern, awaiting send_json on every
+                connection in turn for every message
+
+Network mode serves the real endpoint with uvicorn and connects real
+clients with ``websockets`` (mind the open-file limit: two descriptors per
+socket).
+
+    python benchmarks/websocket_load_test.py --sockets 10000
+    python benchmarks/websocket_load_test.py --network --sockets 2000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("WS_SEND_TIMEOUT_SECONDS", "1")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from backend.websocket import ConnectionManager  # noqa: E402
+
+
+class SimulatedSocket:
+    """Just enough of starlette's WebSocket for the manager's send side"""
+
+    def __init__(self, delay: float = 0.0, stalled: bool = False):
+        self.delay = delay
+        self.stalled = stalled
+        self.received = 0
+        self.last_seq = -1
+        self.closed_with = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, payload: str):
+        if self.stalled:
+            await asyncio.Event().wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.received += 1
+        self.last_seq = json.loads(payload).get("seq", self.last_seq)
+
+    async def send_json(self, message):
+        await self.send_text(json.dumps(message))
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))] if ordered else 0.0
+
+
+async def wait_until(predicate, timeout: float = 60.0, interval: float = 0.005) -> float:
+    started = time.perf_counter()
+    while not predicate():
+        if time.perf_counter() - started > timeout:
+            raise TimeoutError("delivery did not complete")
+        await asyncio.sleep(interval)
+    return time.perf_counter() - started
+
+
+async def simulated(sockets: int, slow_share: float, stalled: int, messages: int, broadcasts: int,
+                    legacy_messages: int) -> dict:
+    rng = random.Random(5)
+    manager = ConnectionManager(queue_size=256, overflow_policy="drop_oldest")
+    fleet, connections = [], []
+    for i in range(sockets):
+        socket = SimulatedSocket(delay=0.02 if rng.random() < slow_share else 0.0, stalled=i < stalled)
+        connections.append(await manager.connect(socket, f"user-{i}"))
+        fleet.append(socket)
+    healthy = [s for s in fleet if not s.stalled and not s.delay]
+    healthy_connections = [c for c in connections if not (c.websocket.stalled or c.websocket.delay)]
+    results = {"sockets": sockets, "slow": sum(1 for s in fleet if s.delay), "stalled": stalled}
+
+    # Targeted: each message goes to one user's topic
+    latencies = []
+    started = time.perf_counter()
+    for seq in range(messages):
+        t0 = time.perf_counter()
+        await manager.send_to_user(f"user-{rng.randrange(sockets)}", {"type": "update", "seq": seq})
+        latencies.append(time.perf_counter() - t0)
+    publish_seconds = time.perf_counter() - started
+    drained = await wait_until(lambda: all(c.depth == 0 for c in healthy_connections))
+    results["targeted"] = {
+        "messages": messages,
+        "publishes_per_second": round(messages / publish_seconds),
+        "publish_p50_us": round(statistics.median(latencies) * 1e6, 1),
+        "publish_p99_us": round(percentile(latencies, 0.99) * 1e6, 1),
+        "drain_seconds": round(publish_seconds + drained, 3),
+    }
+
+    # Broadcast: every socket, time until all healthy sockets have it
+    fanout = []
+    publish_cost = []
+    for seq in range(messages, messages + broadcasts):
+        t0 = time.perf_counter()
+        await manager.broadcast({"type": "announcement", "seq": seq})
+        publish_cost.append(time.perf_counter() - t0)
+        await wait_until(lambda: all(s.last_seq >= seq for s in healthy))
+        fanout.append(time.perf_counter() - t0)
+    results["broadcast"] = {
+        "broadcasts": broadcasts,
+        "publish_ms": round(statistics.median(publish_cost) * 1000, 2),
+        "all_healthy_delivered_p50_ms": round(statistics.median(fanout) * 1000, 2),
+        "all_healthy_delivered_max_ms": round(max(fanout) * 1000, 2),
+    }
+
+    # Coalesce: a burst of keyed readings to one slow socket
+    slow_connection = next(c for c in connections if c.websocket.delay and not c.websocket.stalled)
+    for value in range(1000):
+        await manager.send_to_user(slow_connection.user_id, {"reading": value}, key="noise")
+    results["coalesce"] = {"updates": 1000, "queue_depth_after": slow_connection.depth}
+
+    await wait_until(lambda: manager.stats().get("slow_disconnects", 0) >= stalled, timeout=10)
+    results["manager"] = {k: v for k, v in manager.stats().items()
+                          if k in ("sent", "dropped", "coalesced", "slow_disconnects", "connections")}
+    await manager.stop()
+
+    # Legacy: global broadcast, awaiting each connection in turn, in the sender's coroutine
+    legacy = [s for s in fleet if not s.stalled]
+    timings = []
+    for seq in range(legacy_messages):
+        t0 = time.perf_counter()
+        for socket in legacy:
+            await socket.send_json({"type": "update", "seq": seq})
+        timings.append(time.perf_counter() - t0)
+    results["legacy"] = {
+        "messages": legacy_messages,
+        "seconds_per_message": round(statistics.median(timings), 3),
+        "note": "every message to every socket; stalled sockets excluded or it never completes",
+    }
+    return results
+
+
+async def network(sockets: int, broadcasts: int, port: int) -> dict:
+    import uvicorn
+    import websockets
+    from fastapi import FastAPI, WebSocket
+
+    manager = ConnectionManager()
+    app = FastAPI()
+
+    @app.websocket("/ws/{user_id}")
+    async def endpoint(websocket: WebSocket, user_id: str):
+        await manager.serve(websocket, user_id)
+
+    server = uvicorn.Server(uvicorn.Config(app, port=port, log_level="warning",
+                                           backlog=sockets))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    started = time.perf_counter()
+    clients = []
+    for start in range(0, sockets, 500):
+        clients += await asyncio.gather(*(websockets.connect(f"ws://127.0.0.1:{port}/ws/user-{i}")
+                                          for i in range(start, min(start + 500, sockets))))
+    results = {"sockets": sockets, "connect_seconds": round(time.perf_counter() - started, 2)}
+    await wait_until(lambda: manager.stats()["connections"] == sockets)
+
+    async def receive_one(client):
+        return json.loads(await client.recv())
+
+    fanout = []
+    for seq in range(broadcasts):
+        t0 = time.perf_counter()
+        await manager.broadcast({"type": "announcement", "seq": seq})
+        await asyncio.gather(*(receive_one(c) for c in clients))
+        fanout.append(time.perf_counter() - t0)
+    results["broadcast_all_delivered_p50_ms"] = round(statistics.median(fanout) * 1000, 1)
+
+    # Targeted updates sent by clients themselves, echoed to the same user's topic
+    t0 = time.perf_counter()
+    await asyncio.gather(*(c.send(json.dumps({"temperature": 21.5})) for c in clients))
+    await asyncio.gather(*(receive_one(c) for c in clients))
+    results["client_updates_round_trip_seconds"] = round(time.perf_counter() - t0, 3)
+
+    await asyncio.gather(*(c.close() for c in clients))
+    server.should_exit = True
+    await serving
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WebSocket fan-out load test")
+    parser.add_argument("--sockets", type=int, default=10_000)
+    parser.add_argument("--slow-share", type=float, default=0.01)
+    parser.add_argument("--stalled", type=int, default=10)
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--broadcasts", type=int, default=20)
+    parser.add_argument("--legacy-messages", type=int, default=3)
+    parser.add_argument("--network", action="store_true", help="Real sockets through uvicorn")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    if args.network:
+        results = asyncio.run(network(args.sockets, args.broadcasts, args.port))
+    else:
+        results = asyncio.run(simulated(args.sockets, args.slow_share, args.stalled, args.messages,
+                                        args.broadcasts, args.legacy_messages))
+    print(f"🔌 {args.sockets:,} sockets")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
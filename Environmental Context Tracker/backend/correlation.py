@@ -0,0 +1,340 @@
+"""
+Environmental Context Tracker - Streaming correlation engine
+
+Correlates environment factors with creative output per user, updated as
+readings arrive so reads never touch history:
+
+- Every signal (user_id, factor) is reduced to one mean per bucket of
+  CORRELATION_BUCKET_SECONDS. Factors starting with
+  CORRELATION_OUTPUT_PREFIX (``output.words``, ``output.focus``, ...) are
+  creative output; every other factor is an environment factor.
+- When both signals of an (environment, output) pair have closed the same
+  bucket, the pair's accumulators take one O(1) update:
+
+    pearson   exponentially weighted Welford co-moments of the bucket means
+    spearman  the same, over sequential ranks: each bucket mean is ranked
+              against the signal's last CORRELATION_RANK_WINDOW buckets
+              when it closes (an online approximation of Spearman's rho;
+              exact ranks would change with every new point)
+    lags      one accumulator per lag k in 1..CORRELATION_MAX_LAG pairing
+              the environment k buckets earlier with the output now
+
+- With CORRELATION_HALF_LIFE_BUCKETS > 0 older buckets decay, so the
+  statistics follow recent behaviour (rolling); 0 keeps all-time values.
+
+A bucket closes when a reading for a later bucket arrives; readings older
+than a signal's open bucket are counted as late and ignored. Closed buckets
+are kept in a fixed ring per signal, so a signal can run at most
+CORRELATION_ALIGN_BUCKETS ahead of its partner and still pair up. State
+lives in memory (about 12 KB per signal at the defaults); on startup
+``bootstrap()`` replays the last CORRELATION_BOOTSTRAP_SECONDS of raw
+readings from the time-series store, so a restart keeps recent statistics
+(history older than raw retention is not replayed). A user's signals and pairs are dropped
+together once the user has sent nothing for CORRELATION_IDLE_SECONDS, or,
+least recently active first, while more than CORRELATION_MAX_SIGNALS
+signals are held; ``stats()`` counts the evictions.
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CORRELATION_BUCKET_SECONDS = int(os.environ.get("CORRELATION_BUCKET_SECONDS", 300))
+CORRELATION_OUTPUT_PREFIX = os.environ.get("CORRELATION_OUTPUT_PREFIX", "output.")
+CORRELATION_HALF_LIFE_BUCKETS = float(os.environ.get("CORRELATION_HALF_LIFE_BUCKETS", 2016))  # one week of 5 min
+CORRELATION_MAX_LAG = int(os.environ.get("CORRELATION_MAX_LAG", 12))
+CORRELATION_RANK_WINDOW = int(os.environ.get("CORRELATION_RANK_WINDOW", 288))
+CORRELATION_MIN_BUCKETS = int(os.environ.get("CORRELATION_MIN_BUCKETS", 12))
+# How many buckets one signal may run ahead of its partner and still pair up
+CORRELATION_ALIGN_BUCKETS = int(os.environ.get("CORRELATION_ALIGN_BUCKETS", 288))
+# Memory bounds: idle users are dropped, and the least recently active ones past the signal cap
+CORRELATION_IDLE_SECONDS = float(os.environ.get("CORRELATION_IDLE_SECONDS", 7 * 24 * 3600))
+CORRELATION_MAX_SIGNALS = int(os.environ.get("CORRELATION_MAX_SIGNALS", 20_000))  # ~240 MB at the defaults
+# History replayed from stored raw readings on startup; 0 starts empty
+CORRELATION_BOOTSTRAP_SECONDS = float(os.environ.get("CORRELATION_BOOTSTRAP_SECONDS", 7 * 24 * 3600))
+
+
+class CoMoments:
+    """Exponentially weighted Welford accumulator for one (x, y) stream"""
+
+    __slots__ = ("count", "weight", "mean_x", "mean_y", "m2_x", "m2_y", "c_xy")
+
+    def __init__(self):
+        self.count = 0
+        self.weight = self.mean_x = self.mean_y = self.m2_x = self.m2_y = self.c_xy = 0.0
+
+    def update(self, x: float, y: float, decay: float):
+        self.count += 1
+        self.weight = decay * self.weight + 1.0
+        dx = x - self.mean_x
+        dy = y - self.mean_y
+        self.mean_x += dx / self.weight
+        self.mean_y += dy / self.weight
+        self.m2_x = decay * self.m2_x + dx * (x - self.mean_x)
+        self.m2_y = decay * self.m2_y + dy * (y - self.mean_y)
+        self.c_xy = decay * self.c_xy + dx * (y - self.mean_y)
+
+    def correlation(self, min_count: int = CORRELATION_MIN_BUCKETS) -> Optional[float]:
+        if self.count < min_count or self.m2_x <= 0 or self.m2_y <= 0:
+            return None
+        return max(-1.0, min(1.0, self.c_xy / math.sqrt(self.m2_x * self.m2_y)))
+
+
+class _Signal:
+    """Bucketing and recent history for one (user_id, factor), in fixed-size arrays"""
+
+    __slots__ = ("open_bucket", "open_sum", "open_count", "ring_bucket", "ring_value", "ring_rank",
+                 "window", "window_pos", "sorted_window", "late")
+
+    def __init__(self, keep: int, rank_window: int):
+        self.open_bucket: Optional[int] = None
+        self.open_sum = 0.0
+        self.open_count = 0
+        # Closed buckets still needed for alignment and lags, indexed by bucket % keep
+        self.ring_bucket = array("q", [-1]) * keep
+        self.ring_value = array("d", [0.0]) * keep
+        self.ring_rank = array("d", [0.0]) * keep
+        # Last rank_window bucket means, in arrival order and sorted
+        self.window = array("d", [0.0]) * rank_window
+        self.window_pos = 0
+        self.sorted_window = array("d")
+        self.late = 0
+
+    def get(self, bucket: int) -> Optional[Tuple[float, float]]:
+        """(mean, rank) of a closed bucket if it is still in the ring"""
+        index = bucket % len(self.ring_bucket)
+        if self.ring_bucket[index] != bucket:
+            return None
+        return self.ring_value[index], self.ring_rank[index]
+
+    def rank(self, value: float) -> float:
+        """Mid-rank of ``value`` among the signal's recent bucket means, in [0, 1]"""
+        if not self.sorted_window:
+            return 0.5
+        low, high = bisect_left(self.sorted_window, value), bisect_right(self.sorted_window, value)
+        return (low + high) / (2 * len(self.sorted_window))
+
+    def remember(self, bucket: int, value: float):
+        index = bucket % len(self.ring_bucket)
+        self.ring_bucket[index] = bucket
+        self.ring_value[index] = value
+        self.ring_rank[index] = self.rank(value)
+
+        slot = self.window_pos % len(self.window)
+        if self.window_pos >= len(self.window):
+            del self.sorted_window[bisect_left(self.sorted_window, self.window[slot])]
+        self.window[slot] = value
+        self.window_pos += 1
+        insort(self.sorted_window, value)
+
+
+class _Pair:
+    __slots__ = ("pearson", "spearman", "lags", "last_bucket")
+
+    def __init__(self, max_lag: int):
+        self.pearson = CoMoments()
+        self.spearman = CoMoments()
+        self.lags = [CoMoments() for _ in range(max_lag)]
+        self.last_bucket: Optional[int] = None
+
+
+class CorrelationEngine:
+    """Per-user environment x output correlation, O(1) per bucket update and per read"""
+
+    def __init__(
+        self,
+        bucket_seconds: int = CORRELATION_BUCKET_SECONDS,
+        output_prefix: str = CORRELATION_OUTPUT_PREFIX,
+        half_life_buckets: float = CORRELATION_HALF_LIFE_BUCKETS,
+        max_lag: int = CORRELATION_MAX_LAG,
+        rank_window: int = CORRELATION_RANK_WINDOW,
+        idle_seconds: float = CORRELATION_IDLE_SECONDS,
+        max_signals: int = CORRELATION_MAX_SIGNALS,
+    ):
+        self.bucket_ms = bucket_seconds * 1000
+        self.output_prefix = output_prefix
+        self.decay = 0.5 ** (1.0 / half_life_buckets) if half_life_buckets > 0 else 1.0
+        self.max_lag = max_lag
+        self.rank_window = rank_window
+        self.idle_seconds = idle_seconds
+        self.max_signals = max_signals
+        # user_id -> monotonic time of the user's last reading, least recent first
+        self._users: "OrderedDict[str, float]" = OrderedDict()
+        self._signals: Dict[Tuple[str, str], _Signal] = {}
+        self._factors: Dict[str, Dict[bool, set]] = {}
+        self._pairs: Dict[str, Dict[Tuple[str, str], _Pair]] = {}
+        self._lock = threading.Lock()
+        self._stats = {"readings": 0, "buckets_closed": 0, "pair_updates": 0, "late_readings": 0,
+                       "evicted_users": 0, "evicted_signals": 0, "bootstrap_readings": 0}
+
+    def is_output(self, factor: str) -> bool:
+        return factor.startswith(self.output_prefix)
+
+    # Updates
+
+    def observe(self, user_id: str, factor: str, timestamps: Sequence[int], values: Sequence[float]):
+        """Fold readings (epoch ms) for one signal; closed buckets update the user's pairs"""
+        if not len(timestamps):
+            return
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        buckets = timestamps // self.bucket_ms
+        # One sum/count per distinct bucket, in time order, without a per-reading loop
+        distinct, inverse = np.unique(buckets, return_inverse=True)
+        sums = np.bincount(inverse, weights=values, minlength=len(distinct))
+        counts = np.bincount(inverse, minlength=len(distinct))
+
+        with self._lock:
+            self._stats["readings"] += len(timestamps)
+            key = (user_id, factor)
+            signal = self._signals.get(key)
+            if signal is None:
+                signal = self._signals[key] = _Signal(self.max_lag + CORRELATION_ALIGN_BUCKETS, self.rank_window)
+                self._factors.setdefault(user_id, {True: set(), False: set()})[self.is_output(factor)].add(factor)
+            for bucket, total, count in zip(distinct.tolist(), sums.tolist(), counts.tolist()):
+                if signal.open_bucket is None or bucket == signal.open_bucket:
+                    signal.open_bucket = bucket
+                    signal.open_sum += total
+                    signal.open_count += count
+                elif bucket > signal.open_bucket:
+                    self._close(user_id, factor, signal)
+                    signal.open_bucket, signal.open_sum, signal.open_count = bucket, total, count
+                else:
+                    signal.late += count
+                    self._stats["late_readings"] += count
+
+            self._users[user_id] = time.monotonic()
+            self._users.move_to_end(user_id)
+            self._evict(user_id)
+
+    def bootstrap(self, read_raw: Callable[[int, int], Iterable[Tuple[str, str, Sequence[int], Sequence[float]]]],
+                  seconds: float = CORRELATION_BOOTSTRAP_SECONDS, now_ms: Optional[int] = None) -> int:
+        """Replay stored readings through ``observe``; call before live readings arrive
+
+        ``read_raw(start_ms, end_ms)`` returns ``(user_id, factor, timestamps,
+        values)`` per series. Windows of half the alignment ring are replayed
+        oldest first, so every signal of a user stays close enough to its
+        partners to pair up. Returns the readings replayed.
+        """
+        if seconds <= 0:
+            return 0
+        end_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        window_ms = self.bucket_ms * max(CORRELATION_ALIGN_BUCKETS // 2, 1)
+        start_ms = end_ms - int(seconds * 1000)
+        start_ms -= start_ms % self.bucket_ms
+        replayed = 0
+        for window_start in range(start_ms, end_ms, window_ms):
+            for user_id, factor, timestamps, values in read_raw(window_start, min(window_start + window_ms, end_ms)):
+                self.observe(user_id, factor, timestamps, values)
+                replayed += len(timestamps)
+        with self._lock:
+            self._stats["bootstrap_readings"] += replayed
+        return replayed
+
+    def _evict(self, keep: str):
+        """Drop idle users, then the least recently active ones while over the signal cap"""
+        now = time.monotonic()
+        while self._users:
+            user_id, last_seen = next(iter(self._users.items()))
+            if user_id == keep:
+                break
+            if now - last_seen < self.idle_seconds and len(self._signals) <= self.max_signals:
+                break
+            self._drop_user(user_id)
+
+    def _drop_user(self, user_id: str):
+        del self._users[user_id]
+        for factors in self._factors.pop(user_id, {}).values():
+            for factor in factors:
+                del self._signals[(user_id, factor)]
+                self._stats["evicted_signals"] += 1
+        self._pairs.pop(user_id, None)
+        self._stats["evicted_users"] += 1
+
+    def _close(self, user_id: str, factor: str, signal: _Signal):
+        bucket = signal.open_bucket
+        signal.remember(bucket, signal.open_sum / signal.open_count)
+        self._stats["buckets_closed"] += 1
+
+        output = self.is_output(factor)
+        for partner in self._factors[user_id][not output]:
+            other = self._signals[(user_id, partner)]
+            if other.get(bucket) is None:
+                continue  # the pair updates when the partner closes this bucket
+            env, out = (other, signal) if output else (signal, other)
+            env_factor, out_factor = (partner, factor) if output else (factor, partner)
+            self._update_pair(user_id, env_factor, out_factor, env, out, bucket)
+
+    def _update_pair(self, user_id: str, env_factor: str, out_factor: str, env: _Signal, out: _Signal, bucket: int):
+        pairs = self._pairs.setdefault(user_id, {})
+        pair = pairs.get((env_factor, out_factor))
+        if pair is None:
+            pair = pairs[(env_factor, out_factor)] = _Pair(self.max_lag)
+        x, rank_x = env.get(bucket)
+        y, rank_y = out.get(bucket)
+        pair.pearson.update(x, y, self.decay)
+        pair.spearman.update(rank_x, rank_y, self.decay)
+        for lag, moments in enumerate(pair.lags, start=1):
+            earlier = env.get(bucket - lag)
+            if earlier is not None:
+                moments.update(earlier[0], y, self.decay)
+        pair.last_bucket = bucket
+        self._stats["pair_updates"] += 1
+
+    # Reads
+
+    def _describe(self, env_factor: str, out_factor: str, pair: _Pair, with_lags: bool) -> Dict[str, Any]:
+        result = {
+            "factor": env_factor,
+            "output": out_factor,
+            "buckets": pair.pearson.count,
+            "effective_buckets": round(pair.pearson.weight, 1),
+            "last_bucket_start": pair.last_bucket * self.bucket_ms if pair.last_bucket is not None else None,
+            "pearson": pair.pearson.correlation(),
+            "spearman": pair.spearman.correlation(),
+        }
+        lags = [(lag, moments.correlation()) for lag, moments in enumerate(pair.lags, start=1)]
+        scored = [(lag, r) for lag, r in lags if r is not None]
+        if result["pearson"] is not None:
+            scored.append((0, result["pearson"]))
+        best = max(scored, key=lambda item: abs(item[1]), default=None)
+        result["best_lag_seconds"] = best[0] * self.bucket_ms // 1000 if best else None
+        result["best_lag_r"] = best[1] if best else None
+        if with_lags:
+            result["lags"] = [
+                {"lag_seconds": lag * self.bucket_ms // 1000, "r": r, "buckets": pair.lags[lag - 1].count}
+                for lag, r in lags
+            ]
+        return result
+
+    def pair(self, user_id: str, env_factor: str, out_factor: str) -> Optional[Dict[str, Any]]:
+        """Current statistics for one pair, lag profile included"""
+        with self._lock:
+            pair = self._pairs.get(user_id, {}).get((env_factor, out_factor))
+            return self._describe(env_factor, out_factor, pair, True) if pair is not None else None
+
+    def user_correlations(self, user_id: str, min_abs: float = 0.0) -> List[Dict[str, Any]]:
+        """Every pair for a user, strongest Pearson first"""
+        with self._lock:
+            pairs = [self._describe(env, out, pair, False)
+                     for (env, out), pair in self._pairs.get(user_id, {}).items()]
+        if min_abs > 0:
+            pairs = [p for p in pairs if p["pearson"] is not None and abs(p["pearson"]) >= min_abs]
+        return sorted(pairs, key=lambda p: -abs(p["pearson"] or 0.0))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats, users=len(self._users), signals=len(self._signals),
+                        pairs=sum(len(pairs) for pairs in self._pairs.values()),
+                        bucket_seconds=self.bucket_ms // 1000, max_lag=self.max_lag,
+                        half_life_buckets=None if self.decay == 1.0 else round(math.log(0.5) / math.log(self.decay), 1))
@@ -4,11 +4,11 @@ Environmental Context Tracker - Main Application
 FastAPI application for monitoring and correlating environmental factors with creative output
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
-from datetime import datetime
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Depends
+from fastapi import FastAPI, WebSocket, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
@@ -26,6 +26,8 @@ from backend.routes import (
     health_routes,
 )
 from backend.websocket import ConnectionManager
+from backend.timeseries import TimeSeriesService
+from backend.correlation import CorrelationEngine
 from backend.monitoring import setup_monitoring
 
 # Configure logging
@@ -38,6 +40,13 @@ logger = logging.getLogger(__name__)
 # WebSocket connection manager
 manager = ConnectionManager()
 
+# Block-compressed storage for environmental readings
+timeseries = TimeSeriesService()
+
+# Streaming environment x creative output correlation, fed by every append
+correlations = CorrelationEngine()
+timeseries.listeners.append(correlations.observe)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -48,12 +57,20 @@ async def lifespan(app: FastAPI):
     await init_db()
     await init_redis()
     setup_monitoring()
+    await manager.start()
+    await timeseries.start()
+    replayed = await asyncio.to_thread(correlations.bootstrap, timeseries.store.read_raw)
+    logger.info(f"Correlation state rebuilt from {replayed} stored readings")
+    app.state.timeseries = timeseries
+    app.state.correlations = correlations
     
     logger.info("Application startup complete")
     yield
     
     # Shutdown
     logger.info("Shutting down Environmental Context Tracker")
+    await manager.stop()
+    await timeseries.stop()
     await close_redis()
     logger.info("Application shutdown complete")
 
@@ -93,19 +110,11 @@ app.include_router(analytics_routes.router, prefix="/api/v1/analytics", tags=["a
 # WebSocket endpoint
 @app.websocket("/ws/{user_id}")
 async def websocket_endpoint(websocket: WebSocket, user_id: str):
-    """WebSocket endpoint for real-time updates"""
-    await manager.connect(websocket, user_id)
-    try:
-        while True:
-            data = await websocket.receive_json()
-            await manager.broadcast(
-                {
-                    "type": "update",
-                    "user_id": user_id,
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "data": data,
-                }
-            )
-    except WebSocketDisconnect:
-        manager.disconnect(user_id)
-        logger.info(f"User {user_id} disconnecte
\ No newline at end of file
+    """WebSocket endpoint for real-time updates, scoped to the user's topics"""
+    await manager.serve(websocket, user_id)
+
+
+@app.get("/api/v1/ws/stats", tags=["health"])
+async def websocket_stats():
+    """Connection, queue and fan-out counters for this worker"""
+    return manager.stats()
@@ -0,0 +1,39 @@
+"""
+Environmental Context Tracker - Analytics routes
+
+Environment x creative output correlations, read from the streaming
+correlation engine (backend.correlation): every read returns maintained
+statistics, nothing is recomputed over history.
+"""
+
+from fastapi import APIRouter, HTTPException, Query, Request, status
+
+router = APIRouter()
+
+
+def get_correlations(request: Request):
+    engine = getattr(request.app.state, "correlations", None)
+    if engine is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Correlation engine not ready")
+    return engine
+
+
+@router.get("/correlations/{user_id}")
+async def user_correlations(user_id: str, request: Request, min_abs: float = Query(0.0, ge=0.0, le=1.0)):
+    """Every environment factor x output pair for the user, strongest first"""
+    engine = get_correlations(request)
+    return {"user_id": user_id, "correlations": engine.user_correlations(user_id, min_abs)}
+
+
+@router.get("/correlations/{user_id}/{factor}/{output}")
+async def pair_correlation(user_id: str, factor: str, output: str, request: Request):
+    """Pearson, Spearman and the lagged cross-correlation profile for one pair"""
+    pair = get_correlations(request).pair(user_id, factor, output)
+    if pair is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No aligned readings for this pair yet")
+    return dict(pair, user_id=user_id)
+
+
+@router.get("/correlations-stats")
+async def correlation_stats(request: Request):
+    return get_correlations(request).stats()
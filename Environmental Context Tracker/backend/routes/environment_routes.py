@@ -0,0 +1,132 @@
+"""
+Environmental Context Tracker - Environment routes
+
+Readings are buffered into the block-compressed time-series store
+(backend.timeseries): a batch costs one in-memory append per series, not
+one row and one transaction per reading.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Annotated, List, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+router = APIRouter()
+
+DEFAULT_RANGE = timedelta(hours=24)
+
+
+class Reading(BaseModel):
+    """One reading; ``timestamp`` defaults to the time it is received"""
+
+    user_id: str = Field(..., min_length=1, max_length=128)
+    factor: str = Field(..., min_length=1, max_length=64)
+    value: float = Field(..., allow_inf_nan=False)
+    timestamp: Optional[datetime] = None
+
+
+class SeriesPoints(BaseModel):
+    """Columnar readings for one series, epoch milliseconds; the cheapest format for sensors"""
+
+    user_id: str = Field(..., min_length=1, max_length=128)
+    factor: str = Field(..., min_length=1, max_length=64)
+    timestamps: List[int]
+    values: List[Annotated[float, Field(allow_inf_nan=False)]]
+
+    @model_validator(mode="after")
+    def same_length(self):
+        if len(self.timestamps) != len(self.values):
+            raise ValueError("timestamps and values must have the same length")
+        return self
+
+
+class ReadingsIn(BaseModel):
+    readings: List[Reading] = []
+    series: List[SeriesPoints] = []
+
+    @field_validator("readings", "series")
+    @classmethod
+    def bounded(cls, items):
+        if len(items) > 100_000:
+            raise ValueError("At most 100000 items per request")
+        return items
+
+
+def get_timeseries(request: Request):
+    service = getattr(request.app.state, "timeseries", None)
+    if service is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Time-series store not ready")
+    return service
+
+
+def to_ms(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1000)
+
+
+def resolve_range(start: Optional[datetime], end: Optional[datetime]):
+    end_ms = to_ms(end) if end else int(datetime.now(timezone.utc).timestamp() * 1000)
+    start_ms = to_ms(start) if start else end_ms - int(DEFAULT_RANGE.total_seconds() * 1000)
+    if start_ms >= end_ms:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must be before end")
+    return start_ms, end_ms
+
+
+@router.post("/readings", status_code=status.HTTP_202_ACCEPTED)
+async def ingest_readings(body: ReadingsIn, request: Request):
+    """Buffer readings; they are durable after the next flush (TIMESERIES_FLUSH_SECONDS)"""
+    service = get_timeseries(request)
+    accepted = 0
+    if body.readings:
+        now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+        accepted += await service.append_many([
+            (r.user_id, r.factor, to_ms(r.timestamp) if r.timestamp else now_ms, r.value) for r in body.readings
+        ])
+    for points in body.series:
+        accepted += await service.append(points.user_id, points.factor, points.timestamps, points.values)
+    return {"accepted": accepted}
+
+
+@router.get("/users/{user_id}/factors")
+async def list_factors(user_id: str, request: Request):
+    return {"user_id": user_id, "factors": await get_timeseries(request).list_series(user_id)}
+
+
+@router.get("/users/{user_id}/factors/{factor}")
+async def factor_series(
+    user_id: str,
+    factor: str,
+    request: Request,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    step_seconds: int = Query(60, ge=1, le=31 * 86400),
+    tier: Optional[str] = Query(None, pattern="^(raw|1m|1h)$"),
+):
+    """count/mean/min/max/sum per step, served from the coarsest tier that fits unless ``tier`` is given"""
+    start_ms, end_ms = resolve_range(start, end)
+    try:
+        result = await get_timeseries(request).query(user_id, factor, start_ms, end_ms, step_seconds * 1000,
+                                                     tier=tier)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return dict(result, user_id=user_id, factor=factor)
+
+
+@router.get("/users/{user_id}/factors/{factor}/summary")
+async def factor_summary(
+    user_id: str,
+    factor: str,
+    request: Request,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+):
+    start_ms, end_ms = resolve_range(start, end)
+    result = await get_timeseries(request).summary(user_id, factor, start_ms, end_ms)
+    return dict(result, user_id=user_id, factor=factor)
+
+
+@router.get("/timeseries/stats")
+async def timeseries_stats(request: Request):
+    return get_timeseries(request).store.stats()
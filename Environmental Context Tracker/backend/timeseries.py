@@ -0,0 +1,719 @@
+"""
+Environmental Context Tracker - Time-series storage
+
+Environmental readings (noise, light, temperature, ...) are stored per
+series (user_id, factor) in compressed column blocks instead of one row per
+reading:
+
+- Readings accumulate in an in-memory head per series and are sealed into a
+  block of up to TIMESERIES_BLOCK_POINTS points: one ``ts_blocks`` row per
+  block, written in one transaction per flush.
+- Block payload: timestamps as zigzag delta-of-delta, values as the XOR of
+  consecutive IEEE-754 bit patterns (the Gorilla transforms), byte-shuffled
+  and zlib-compressed. Regular sampling and slowly moving values turn into
+  long runs of zero bytes, so a point costs a few bytes instead of a row.
+- Every block carries count/sum/min/max, so range summaries read fully
+  covered blocks from metadata and only decode the blocks at the edges.
+
+Retention tiers: ``raw`` (every reading), ``1m`` and ``1h`` (count, sum,
+min, max per bucket). Downsampled buckets are computed from each raw block
+as it is sealed, so no background job re-reads history; a bucket split
+across two blocks is merged at query time (the aggregates are mergeable).
+Expired blocks are deleted per tier by ``enforce_retention``.
+
+Raw heads are flushed every TIMESERIES_FLUSH_SECONDS; downsampled heads are
+sealed when full or TIMESERIES_TIER_FLUSH_SECONDS old, and on shutdown.
+Queries include unsealed heads. ``ts_tier_marks`` records, per series and
+tier, the last raw block whose buckets are in sealed tier blocks; on open,
+raw blocks past the mark (their buckets were in a head when the process
+died) are downsampled and sealed again, so a crash costs no tier history.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from array import array
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TIMESERIES_DATABASE_URL = os.environ.get("TIMESERIES_DATABASE_URL", "sqlite:///./environment_timeseries.db")
+TIMESERIES_BLOCK_POINTS = int(os.environ.get("TIMESERIES_BLOCK_POINTS", 4096))
+TIMESERIES_FLUSH_SECONDS = float(os.environ.get("TIMESERIES_FLUSH_SECONDS", 10))
+TIMESERIES_TIER_FLUSH_SECONDS = float(os.environ.get("TIMESERIES_TIER_FLUSH_SECONDS", 3600))
+TIMESERIES_COMPRESSION_LEVEL = int(os.environ.get("TIMESERIES_COMPRESSION_LEVEL", 6))
+TIMESERIES_MAX_POINTS = int(os.environ.get("TIMESERIES_MAX_POINTS", 10_000))
+TIMESERIES_RAW_RETENTION_DAYS = int(os.environ.get("TIMESERIES_RAW_RETENTION_DAYS", 7))
+TIMESERIES_MINUTE_RETENTION_DAYS = int(os.environ.get("TIMESERIES_MINUTE_RETENTION_DAYS", 90))
+TIMESERIES_HOUR_RETENTION_DAYS = int(os.environ.get("TIMESERIES_HOUR_RETENTION_DAYS", 730))
+
+MS_PER_DAY = 86_400_000
+
+
+@dataclass(frozen=True)
+class Tier:
+    index: int
+    name: str
+    resolution_ms: int  # 0 = raw readings
+    retention_days: int
+
+
+TIERS = (
+    Tier(0, "raw", 0, TIMESERIES_RAW_RETENTION_DAYS),
+    Tier(1, "1m", 60_000, TIMESERIES_MINUTE_RETENTION_DAYS),
+    Tier(2, "1h", 3_600_000, TIMESERIES_HOUR_RETENTION_DAYS),
+)
+DOWNSAMPLED = TIERS[1:]
+
+
+# Block encoding
+
+def _zigzag(values: np.ndarray) -> np.ndarray:
+    return ((values << 1) ^ (values >> 63)).view(np.uint64)
+
+
+def _unzigzag(values: np.ndarray) -> np.ndarray:
+    return (values >> np.uint64(1)).view(np.int64) ^ -(values & np.uint64(1)).view(np.int64)
+
+
+def encode_block(timestamps: np.ndarray, columns: np.ndarray) -> bytes:
+    """int64 ms timestamps (n,) and float64 columns (k, n) -> compressed payload"""
+    deltas = np.diff(timestamps)
+    dod = np.concatenate([timestamps[:1], deltas[:1], np.diff(deltas)])
+    bits = np.ascontiguousarray(columns, dtype=np.float64).view(np.uint64)
+    xored = bits ^ np.concatenate([np.zeros((bits.shape[0], 1), np.uint64), bits[:, :-1]], axis=1)
+    matrix = np.vstack([_zigzag(dod.astype(np.int64))[None, :], xored])
+    # Byte shuffle: all first bytes, then all second bytes, ... per column
+    shuffled = matrix.view(np.uint8).reshape(matrix.shape[0], -1, 8).transpose(0, 2, 1)
+    return zlib.compress(shuffled.tobytes(), TIMESERIES_COMPRESSION_LEVEL)
+
+
+def decode_block(payload: bytes, points: int, width: int) -> Tuple[np.ndarray, np.ndarray]:
+    raw = np.frombuffer(zlib.decompress(payload), dtype=np.uint8)
+    matrix = raw.reshape(width + 1, 8, points).transpose(0, 2, 1).copy().view(np.uint64).reshape(width + 1, points)
+    dod = _unzigzag(matrix[0])
+    if points > 1:
+        timestamps = np.empty(points, np.int64)
+        timestamps[0] = dod[0]
+        timestamps[1:] = dod[0] + np.cumsum(np.cumsum(dod[1:]))
+    else:
+        timestamps = dod.copy()
+    columns = np.bitwise_xor.accumulate(matrix[1:], axis=1).view(np.float64)
+    return timestamps, columns
+
+
+# Aggregation
+
+def downsample(timestamps: np.ndarray, values: np.ndarray, resolution_ms: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Raw points -> (bucket starts, [count, sum, min, max]) for one resolution"""
+    order = np.argsort(timestamps, kind="stable")
+    timestamps, values = timestamps[order], values[order]
+    buckets = timestamps - timestamps % resolution_ms
+    starts = np.flatnonzero(np.concatenate([[True], buckets[1:] != buckets[:-1]]))
+    counts = np.diff(np.append(starts, len(values))).astype(np.float64)
+    return buckets[starts], np.vstack([
+        counts,
+        np.add.reduceat(values, starts),
+        np.minimum.reduceat(values, starts),
+        np.maximum.reduceat(values, starts),
+    ])
+
+
+def merge_buckets(buckets: np.ndarray, stats: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Combine [count, sum, min, max] rows that share a bucket"""
+    order = np.argsort(buckets, kind="stable")
+    buckets, stats = buckets[order], stats[:, order]
+    starts = np.flatnonzero(np.concatenate([[True], buckets[1:] != buckets[:-1]]))
+    return buckets[starts], np.vstack([
+        np.add.reduceat(stats[0], starts),
+        np.add.reduceat(stats[1], starts),
+        np.minimum.reduceat(stats[2], starts),
+        np.maximum.reduceat(stats[3], starts),
+    ])
+
+
+def _to_stats(tier: Tier, columns: np.ndarray) -> np.ndarray:
+    if tier.resolution_ms:
+        return columns
+    values = columns[0]
+    return np.vstack([np.ones_like(values), values, values, values])
+
+
+def group_readings(readings: Sequence[Tuple[str, str, int, float]]) -> Dict[Tuple[str, str], Tuple[list, list]]:
+    """(user_id, factor, ts_ms, value) readings -> per-series timestamp and value lists"""
+    grouped: Dict[Tuple[str, str], Tuple[List[int], List[float]]] = {}
+    for user_id, factor, ts, value in readings:
+        columns = grouped.setdefault((user_id, factor), ([], []))
+        columns[0].append(ts)
+        columns[1].append(value)
+    return grouped
+
+
+# Heads
+
+class _RawHead:
+    __slots__ = ("timestamps", "values", "opened")
+
+    def __init__(self):
+        self.timestamps = array("q")
+        self.values = array("d")
+        self.opened = time.monotonic()
+
+
+class _TierHead:
+    __slots__ = ("buckets", "stats", "opened", "raw_block_id")
+
+    def __init__(self):
+        self.buckets: List[np.ndarray] = []
+        self.stats: List[np.ndarray] = []
+        self.opened = time.monotonic()
+        self.raw_block_id = 0  # last raw block whose buckets are in this head
+
+    def __len__(self) -> int:
+        return sum(len(b) for b in self.buckets)
+
+
+class TimeSeriesStore:
+    """Block storage over sqlite3 or psycopg2; thread-safe, synchronous"""
+
+    SQLITE_DDL = """
+        CREATE TABLE IF NOT EXISTS ts_series (
+            id INTEGER PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            factor TEXT NOT NULL,
+            UNIQUE (user_id, factor)
+        );
+        CREATE TABLE IF NOT EXISTS ts_blocks (
+            id INTEGER PRIMARY KEY,
+            series_id INTEGER NOT NULL,
+            tier INTEGER NOT NULL,
+            start_ts INTEGER NOT NULL,
+            end_ts INTEGER NOT NULL,
+            points INTEGER NOT NULL,
+            count REAL NOT NULL,
+            sum REAL NOT NULL,
+            min REAL NOT NULL,
+            max REAL NOT NULL,
+            payload BLOB NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS ts_blocks_range ON ts_blocks (series_id, tier, end_ts);
+        CREATE INDEX IF NOT EXISTS ts_blocks_retention ON ts_blocks (tier, end_ts);
+        CREATE TABLE IF NOT EXISTS ts_tier_marks (
+            series_id INTEGER NOT NULL,
+            tier INTEGER NOT NULL,
+            raw_block_id INTEGER NOT NULL,
+            PRIMARY KEY (series_id, tier)
+        );
+    """
+
+    POSTGRES_DDL = """
+        CREATE TABLE IF NOT EXISTS ts_series (
+            id BIGSERIAL PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            factor TEXT NOT NULL,
+            UNIQUE (user_id, factor)
+        );
+        CREATE TABLE IF NOT EXISTS ts_blocks (
+            id BIGSERIAL PRIMARY KEY,
+            series_id BIGINT NOT NULL REFERENCES ts_series (id),
+            tier SMALLINT NOT NULL,
+            start_ts BIGINT NOT NULL,
+            end_ts BIGINT NOT NULL,
+            points INTEGER NOT NULL,
+            count DOUBLE PRECISION NOT NULL,
+            sum DOUBLE PRECISION NOT NULL,
+            min DOUBLE PRECISION NOT NULL,
+            max DOUBLE PRECISION NOT NULL,
+            payload BYTEA NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS ts_blocks_range ON ts_blocks (series_id, tier, end_ts);
+        CREATE INDEX IF NOT EXISTS ts_blocks_retention ON ts_blocks (tier, end_ts);
+        CREATE TABLE IF NOT EXISTS ts_tier_marks (
+            series_id BIGINT NOT NULL,
+            tier SMALLINT NOT NULL,
+            raw_block_id BIGINT NOT NULL,
+            PRIMARY KEY (series_id, tier)
+        );
+    """
+
+    def __init__(self, url: str = TIMESERIES_DATABASE_URL, block_points: int = TIMESERIES_BLOCK_POINTS):
+        self.url = url
+        self.block_points = block_points
+        self.paramstyle = "format" if url.startswith(("postgres://", "postgresql://")) else "qmark"
+        self._conn = None
+        self._lock = threading.RLock()
+        self._series: Dict[Tuple[str, str], int] = {}
+        self._raw: Dict[int, _RawHead] = {}
+        self._tiers: Dict[Tuple[int, int], _TierHead] = {}
+        self._stats = {"points": 0, "blocks": 0, "payload_bytes": 0, "recovered_raw_blocks": 0}
+
+    def _sql(self, sql: str) -> str:
+        return sql.replace("?", "%s") if self.paramstyle == "format" else sql
+
+    def open(self) -> "TimeSeriesStore":
+        if self.paramstyle == "format":
+            import psycopg2
+
+            self._conn = psycopg2.connect(self.url)
+            with self._conn, self._conn.cursor() as cur:
+                cur.execute("SELECT to_regclass('ts_tier_marks')")
+                had_marks = cur.fetchone()[0] is not None
+                cur.execute(self.POSTGRES_DDL)
+        else:
+            path = self.url[len("sqlite:///"):] if self.url.startswith("sqlite:///") else self.url
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            had_marks = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ts_tier_marks'").fetchone() is not None
+            self._conn.executescript(self.SQLITE_DDL)
+        if not had_marks:
+            # A store written before the marks existed: its raw blocks count as downsampled already
+            self._transaction(self._mark_all_downsampled)
+        recovered = self._transaction(self._recover_tiers)
+        if recovered:
+            logger.info(f"Time-series recovered downsampled buckets from {recovered} raw blocks")
+        return self
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self.flush(force=True)
+                self._conn.close()
+                self._conn = None
+
+    def _transaction(self, fn, *args):
+        with self._lock:
+            if self.paramstyle == "format":
+                with self._conn, self._conn.cursor() as cur:
+                    return fn(cur, *args)
+            cur = self._conn.cursor()
+            cur.execute("BEGIN")
+            try:
+                result = fn(cur, *args)
+                cur.execute("COMMIT")
+                return result
+            except BaseException:
+                cur.execute("ROLLBACK")
+                raise
+
+    def _series_id(self, cur, user_id: str, factor: str, create: bool = True) -> Optional[int]:
+        key = (user_id, factor)
+        series_id = self._series.get(key)
+        if series_id is None:
+            if create:
+                cur.execute(self._sql("INSERT INTO ts_series (user_id, factor) VALUES (?, ?) ON CONFLICT DO NOTHING"),
+                            key)
+            cur.execute(self._sql("SELECT id FROM ts_series WHERE user_id = ? AND factor = ?"), key)
+            row = cur.fetchone()
+            if row is None:
+                return None
+            series_id = self._series[key] = row[0]
+        return series_id
+
+    # Writes
+
+    def append(self, user_id: str, factor: str, timestamps: Sequence[int], values: Sequence[float]) -> int:
+        """Buffer readings (epoch ms) for one series; full heads are sealed in the same call"""
+        if len(timestamps) != len(values):
+            raise ValueError("timestamps and values must have the same length")
+        with self._lock:
+            series_id = self._series.get((user_id, factor))
+            if series_id is None:
+                series_id = self._transaction(self._series_id, user_id, factor)
+            head = self._raw.setdefault(series_id, _RawHead())
+            head.timestamps.extend(timestamps)
+            head.values.extend(values)
+            self._stats["points"] += len(timestamps)
+            if len(head.timestamps) >= self.block_points:
+                commit = self._transaction(self._seal_series, series_id, False)
+                commit()
+        return len(timestamps)
+
+    def append_many(self, readings: Sequence[Tuple[str, str, int, float]]) -> int:
+        """(user_id, factor, ts_ms, value) readings in any series order"""
+        for (user_id, factor), (timestamps, values) in group_readings(readings).items():
+            self.append(user_id, factor, timestamps, values)
+        return len(readings)
+
+    def _insert_block(self, cur, series_id: int, tier: Tier, timestamps: np.ndarray, columns: np.ndarray) -> int:
+        """Write one block; returns its id"""
+        stats = _to_stats(tier, columns)
+        payload = encode_block(timestamps, columns)
+        sql = ("INSERT INTO ts_blocks (series_id, tier, start_ts, end_ts, points, count, sum, min, max, payload) "
+               "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+        params = (series_id, tier.index, int(timestamps.min()), int(timestamps.max()), len(timestamps),
+                  float(stats[0].sum()), float(stats[1].sum()), float(stats[2].min()), float(stats[3].max()), payload)
+        if self.paramstyle == "format":
+            cur.execute(self._sql(sql + " RETURNING id"), params)
+            block_id = cur.fetchone()[0]
+        else:
+            cur.execute(sql, params)
+            block_id = cur.lastrowid
+        self._stats["blocks"] += 1
+        self._stats["payload_bytes"] += len(payload)
+        return block_id
+
+    def _insert_tier_blocks(self, cur, series_id: int, tier: Tier, buckets: np.ndarray, stats: np.ndarray,
+                            raw_block_id: int):
+        """Seal downsampled buckets and move the tier's mark to ``raw_block_id``"""
+        for start in range(0, len(buckets), self.block_points):
+            self._insert_block(cur, series_id, tier, buckets[start:start + self.block_points],
+                               stats[:, start:start + self.block_points])
+        cur.execute(
+            self._sql("INSERT INTO ts_tier_marks (series_id, tier, raw_block_id) VALUES (?, ?, ?) "
+                      "ON CONFLICT (series_id, tier) DO UPDATE SET raw_block_id = excluded.raw_block_id"),
+            (series_id, tier.index, raw_block_id),
+        )
+
+    def _mark_all_downsampled(self, cur):
+        for tier in DOWNSAMPLED:
+            cur.execute(self._sql("INSERT INTO ts_tier_marks (series_id, tier, raw_block_id) "
+                                  "SELECT series_id, ?, MAX(id) FROM ts_blocks WHERE tier = 0 GROUP BY series_id"),
+                        (tier.index,))
+
+    def _recover_tiers(self, cur) -> int:
+        """Downsample and seal raw blocks past each tier's mark; returns the raw blocks read"""
+        recovered = set()
+        for tier in DOWNSAMPLED:
+            cur.execute(self._sql(
+                "SELECT b.series_id, b.id, b.points, b.payload FROM ts_blocks b "
+                "LEFT JOIN ts_tier_marks m ON m.series_id = b.series_id AND m.tier = ? "
+                "WHERE b.tier = 0 AND b.id > COALESCE(m.raw_block_id, 0) ORDER BY b.series_id, b.id"),
+                (tier.index,))
+            by_series: Dict[int, List[tuple]] = {}
+            for series_id, block_id, points, payload in cur.fetchall():
+                by_series.setdefault(series_id, []).append((block_id, points, payload))
+            for series_id, blocks in by_series.items():
+                decoded = [decode_block(bytes(payload), points, 1) for _, points, payload in blocks]
+                timestamps = np.concatenate([ts for ts, _ in decoded])
+                values = np.concatenate([columns[0] for _, columns in decoded])
+                buckets, stats = downsample(timestamps, values, tier.resolution_ms)
+                self._insert_tier_blocks(cur, series_id, tier, buckets, stats, blocks[-1][0])
+                recovered.update(block_id for block_id, _, _ in blocks)
+        self._stats["recovered_raw_blocks"] += len(recovered)
+        return len(recovered)
+
+    def _seal_series(self, cur, series_id: int, force: bool) -> Callable[[], None]:
+        """Raw head -> raw block, feeding the downsampled heads; seal those when due
+
+        Only the blocks are written here. The heads are updated by the
+        returned callback, which callers run once the transaction has
+        committed, so a failed write leaves every buffered point in place.
+        """
+        updates: List[Callable[[], Any]] = []
+        fed: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        raw_block_id = 0
+        head = self._raw.get(series_id)
+        if head is not None:
+            updates.append(lambda: self._raw.pop(series_id, None))
+            if len(head.timestamps):
+                # Copies: a live view would stop the head's arrays growing if this write fails
+                timestamps = np.frombuffer(head.timestamps, dtype=np.int64).copy()
+                values = np.frombuffer(head.values, dtype=np.float64).copy()
+                for start in range(0, len(timestamps), self.block_points):
+                    chunk_ts, chunk_values = timestamps[start:start + self.block_points], values[start:start + self.block_points]
+                    raw_block_id = self._insert_block(cur, series_id, TIERS[0], chunk_ts, chunk_values[None, :])
+                for tier in DOWNSAMPLED:
+                    fed[tier.index] = downsample(timestamps, values, tier.resolution_ms)
+
+        now = time.monotonic()
+        for tier in DOWNSAMPLED:
+            key = (series_id, tier.index)
+            tier_head = self._tiers.get(key)
+            parts_buckets = list(tier_head.buckets) if tier_head is not None else []
+            parts_stats = list(tier_head.stats) if tier_head is not None else []
+            if tier.index in fed:
+                parts_buckets.append(fed[tier.index][0])
+                parts_stats.append(fed[tier.index][1])
+            if not parts_buckets:
+                continue
+            opened = tier_head.opened if tier_head is not None else now
+            if (force or sum(len(b) for b in parts_buckets) >= self.block_points
+                    or now - opened >= TIMESERIES_TIER_FLUSH_SECONDS):
+                buckets, stats = merge_buckets(np.concatenate(parts_buckets), np.hstack(parts_stats))
+                mark = max(raw_block_id, tier_head.raw_block_id if tier_head is not None else 0)
+                self._insert_tier_blocks(cur, series_id, tier, buckets, stats, mark)
+                updates.append(lambda key=key: self._tiers.pop(key, None))
+            elif tier.index in fed:
+                updates.append(lambda key=key, part=fed[tier.index]: self._feed_tier(key, *part, raw_block_id))
+
+        def commit():
+            for update in updates:
+                update()
+
+        return commit
+
+    def _feed_tier(self, key: Tuple[int, int], buckets: np.ndarray, stats: np.ndarray, raw_block_id: int):
+        tier_head = self._tiers.setdefault(key, _TierHead())
+        tier_head.buckets.append(buckets)
+        tier_head.stats.append(stats)
+        tier_head.raw_block_id = raw_block_id
+
+    def flush(self, force: bool = False):
+        """Seal every raw head (and downsampled heads that are due, or all with ``force``)"""
+        with self._lock:
+            series = set(self._raw) | {series_id for series_id, _ in self._tiers}
+            if not series:
+                return
+
+            def seal_all(cur):
+                return [self._seal_series(cur, series_id, force) for series_id in series]
+
+            for commit in self._transaction(seal_all):
+                commit()
+
+    def enforce_retention(self, now_ms: Optional[int] = None) -> int:
+        """Delete blocks that ended before each tier's retention window"""
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+
+        def delete(cur):
+            removed = 0
+            for tier in TIERS:
+                cur.execute(self._sql("DELETE FROM ts_blocks WHERE tier = ? AND end_ts < ?"),
+                            (tier.index, now_ms - tier.retention_days * MS_PER_DAY))
+                removed += max(cur.rowcount, 0)
+            return removed
+
+        return self._transaction(delete)
+
+    # Reads
+
+    def choose_tier(self, start_ms: int, step_ms: Optional[int], now_ms: Optional[int] = None) -> Tier:
+        """Tier to answer a query starting at ``start_ms``
+
+        Only tiers whose retention still covers the start qualify. With a
+        step, the coarsest tier whose buckets divide it is cheapest and
+        exact; without one (a single summary), the finest is most precise.
+        """
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        covering = [t for t in TIERS if start_ms >= now_ms - t.retention_days * MS_PER_DAY]
+        if not covering:
+            return max(TIERS, key=lambda t: t.retention_days)
+        if step_ms:
+            aligned = [t for t in covering if t.resolution_ms == 0
+                       or (step_ms % t.resolution_ms == 0 and start_ms % t.resolution_ms == 0)]
+            if aligned:
+                return max(aligned, key=lambda t: t.resolution_ms)
+        return min(covering, key=lambda t: t.resolution_ms)
+
+    def _load(self, cur, series_id: int, tier: Tier, start_ms: int, end_ms: int,
+              skip_covered: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """Timestamps and [count, sum, min, max] rows in [start, end), heads included"""
+        sql = "SELECT points, payload FROM ts_blocks WHERE series_id = ? AND tier = ? AND end_ts >= ? AND start_ts < ?"
+        if skip_covered:
+            sql += " AND NOT (start_ts >= ? AND end_ts < ?)"
+        params = (series_id, tier.index, start_ms, end_ms) + ((start_ms, end_ms) if skip_covered else ())
+        cur.execute(self._sql(sql), params)
+        width = 4 if tier.resolution_ms else 1
+        parts_ts, parts_stats = [], []
+        for points, payload in cur.fetchall():
+            timestamps, columns = decode_block(bytes(payload), points, width)
+            parts_ts.append(timestamps)
+            parts_stats.append(_to_stats(tier, columns))
+
+        if tier.resolution_ms:
+            head = self._tiers.get((series_id, tier.index))
+            if head is not None and len(head):
+                parts_ts.extend(head.buckets)
+                parts_stats.extend(head.stats)
+        raw = self._raw.get(series_id)
+        if raw is not None and len(raw.timestamps):
+            head_ts = np.frombuffer(raw.timestamps, dtype=np.int64)
+            head_values = np.frombuffer(raw.values, dtype=np.float64)
+            if tier.resolution_ms:
+                # Not yet sealed into the downsampled heads
+                buckets, stats = downsample(head_ts, head_values, tier.resolution_ms)
+                parts_ts.append(buckets)
+                parts_stats.append(stats)
+            else:
+                parts_ts.append(head_ts.copy())
+                parts_stats.append(_to_stats(tier, head_values[None, :]))
+
+        if not parts_ts:
+            return np.empty(0, np.int64), np.empty((4, 0))
+        timestamps, stats = np.concatenate(parts_ts), np.hstack(parts_stats)
+        keep = (timestamps >= start_ms) & (timestamps < end_ms)
+        return timestamps[keep], stats[:, keep]
+
+    def query(self, user_id: str, factor: str, start_ms: int, end_ms: int, step_ms: int,
+              now_ms: Optional[int] = None, tier: Optional[str] = None) -> Dict[str, Any]:
+        """count/mean/min/max/sum per ``step_ms`` bucket (epoch-aligned) in [start, end)
+
+        ``tier`` forces a tier by name instead of choosing one.
+        """
+        start_ms -= start_ms % step_ms
+        if (end_ms - start_ms) // step_ms > TIMESERIES_MAX_POINTS:
+            raise ValueError(f"Range would return more than {TIMESERIES_MAX_POINTS} buckets; increase the step")
+        if tier is None:
+            tier = self.choose_tier(start_ms, step_ms, now_ms)
+        else:
+            tier = next((t for t in TIERS if t.name == tier), None)
+            if tier is None:
+                raise ValueError(f"Unknown tier; expected one of {[t.name for t in TIERS]}")
+
+        def load(cur):
+            series_id = self._series_id(cur, user_id, factor, create=False)
+            if series_id is None:
+                return np.empty(0, np.int64), np.empty((4, 0))
+            return self._load(cur, series_id, tier, start_ms, end_ms)
+
+        timestamps, stats = self._transaction(load)
+        points = []
+        if len(timestamps):
+            buckets, merged = merge_buckets(timestamps - timestamps % step_ms, stats)
+            points = [
+                {"timestamp": b, "count": int(c), "mean": s / c, "min": lo, "max": hi, "sum": s}
+                for b, c, s, lo, hi in zip(buckets.tolist(), *merged.tolist())
+            ]
+        return {"tier": tier.name, "start": start_ms, "end": end_ms, "step_ms": step_ms, "points": points}
+
+    def summary(self, user_id: str, factor: str, start_ms: int, end_ms: int,
+                now_ms: Optional[int] = None) -> Dict[str, Any]:
+        """One aggregate over [start, end): covered blocks from metadata, edge blocks decoded
+
+        On a downsampled tier the range widens to whole buckets; the result
+        reports the range actually covered.
+        """
+        tier = self.choose_tier(start_ms, None, now_ms)
+        if tier.resolution_ms:
+            start_ms -= start_ms % tier.resolution_ms
+            end_ms += -end_ms % tier.resolution_ms
+        empty = {"tier": tier.name, "start": start_ms, "end": end_ms, "count": 0}
+
+        def load(cur):
+            series_id = self._series_id(cur, user_id, factor, create=False)
+            if series_id is None:
+                return None
+            cur.execute(self._sql(
+                "SELECT SUM(count), SUM(sum), MIN(min), MAX(max), COUNT(*) FROM ts_blocks "
+                "WHERE series_id = ? AND tier = ? AND start_ts >= ? AND end_ts < ?"),
+                (series_id, tier.index, start_ms, end_ms))
+            covered = cur.fetchone()
+            _, edges = self._load(cur, series_id, tier, start_ms, end_ms, skip_covered=True)
+            return covered, edges
+
+        loaded = self._transaction(load)
+        if loaded is None:
+            return empty
+        (count, total, low, high, covered), edges = loaded
+        count = (count or 0) + edges[0].sum()
+        if not count:
+            return empty
+        total = (total or 0.0) + edges[1].sum()
+        lows = [low] if low is not None else []
+        highs = [high] if high is not None else []
+        if edges.shape[1]:
+            lows.append(edges[2].min())
+            highs.append(edges[3].max())
+        return dict(empty, count=int(count), mean=float(total / count), min=float(min(lows)),
+                    max=float(max(highs)), sum=float(total), blocks_from_metadata=covered)
+
+    def list_series(self, user_id: str) -> List[str]:
+        def load(cur):
+            cur.execute(self._sql("SELECT factor FROM ts_series WHERE user_id = ? ORDER BY factor"), (user_id,))
+            return [row[0] for row in cur.fetchall()]
+
+        return self._transaction(load)
+
+    def read_raw(self, start_ms: int, end_ms: int) -> List[Tuple[str, str, np.ndarray, np.ndarray]]:
+        """(user_id, factor, timestamps, values) of every series with raw points in [start, end)"""
+
+        def load(cur):
+            cur.execute(self._sql(
+                "SELECT DISTINCT s.id, s.user_id, s.factor FROM ts_series s JOIN ts_blocks b ON b.series_id = s.id "
+                "WHERE b.tier = 0 AND b.end_ts >= ? AND b.start_ts < ? ORDER BY s.id"), (start_ms, end_ms))
+            readings = []
+            for series_id, user_id, factor in cur.fetchall():
+                timestamps, stats = self._load(cur, series_id, TIERS[0], start_ms, end_ms)
+                if len(timestamps):
+                    order = np.argsort(timestamps, kind="stable")
+                    readings.append((user_id, factor, timestamps[order], stats[1][order]))
+            return readings
+
+        return self._transaction(load)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            buffered = sum(len(head.timestamps) for head in self._raw.values())
+        stats = dict(self._stats, buffered_points=buffered, series=len(self._series))
+        stats["bytes_per_point"] = round(stats["payload_bytes"] / max(stats["points"] - buffered, 1), 3)
+        return stats
+
+
+class TimeSeriesService:
+    """Async facade: store calls run in a thread, plus periodic flush and retention
+
+    ``listeners`` are called as ``listener(user_id, factor, timestamps, values)``
+    in the same worker thread after each append (e.g. streaming correlation).
+    """
+
+    def __init__(self, store: Optional[TimeSeriesStore] = None, flush_seconds: float = TIMESERIES_FLUSH_SECONDS):
+        self.store = store or TimeSeriesStore()
+        self.flush_seconds = flush_seconds
+        self.listeners: List[Callable[[str, str, Sequence[int], Sequence[float]], None]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        await asyncio.to_thread(self.store.open)
+        self._task = asyncio.create_task(self._maintain())
+        logger.info(f"Time-series store ready ({self.store.paramstyle}, {self.store.block_points} points per block)")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self.store.close)
+
+    async def _maintain(self):
+        last_retention = 0.0
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            try:
+                await asyncio.to_thread(self.store.flush)
+                if time.monotonic() - last_retention >= 3600:
+                    removed = await asyncio.to_thread(self.store.enforce_retention)
+                    last_retention = time.monotonic()
+                    if removed:
+                        logger.info(f"Time-series retention removed {removed} blocks")
+            except Exception as e:
+                logger.error(f"Time-series maintenance failed: {e}")
+
+    def _append(self, user_id: str, factor: str, timestamps: Sequence[int], values: Sequence[float]) -> int:
+        count = self.store.append(user_id, factor, timestamps, values)
+        for listener in self.listeners:
+            try:
+                listener(user_id, factor, timestamps, values)
+            except Exception as e:
+                logger.error(f"Time-series listener failed for {user_id}/{factor}: {e}")
+        return count
+
+    def _append_many(self, readings: Sequence[Tuple[str, str, int, float]]) -> int:
+        return sum(self._append(user_id, factor, timestamps, values)
+                   for (user_id, factor), (timestamps, values) in group_readings(readings).items())
+
+    async def append(self, user_id: str, factor: str, timestamps: Sequence[int], values: Sequence[float]) -> int:
+        return await asyncio.to_thread(self._append, user_id, factor, timestamps, values)
+
+    async def append_many(self, readings: Sequence[Tuple[str, str, int, float]]) -> int:
+        return await asyncio.to_thread(self._append_many, readings)
+
+    async def query(self, *args, **kwargs) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.store.query, *args, **kwargs)
+
+    async def summary(self, *args, **kwargs) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.store.summary, *args, **kwargs)
+
+    async def list_series(self, user_id: str) -> List[str]:
+        return await asyncio.to_thread(self.store.list_series, user_id)
@@ -0,0 +1,397 @@
+"""
+Environmental Context Tracker - WebSocket fan-out
+
+Publishing never awaits a client. Each connection owns a bounded send
+queue drained by its own sender task, so a publish costs one JSON
+serialization plus an O(subscribers) enqueue, and a slow client only ever
+delays itself.
+
+- Subscriptions are per topic. Every connection is subscribed to its own
+  user topic (``user:<id>``) and to ``broadcast``; clients can subscribe to
+  further topics with ``{"action": "subscribe", "topic": ...}``.
+  ``broadcast`` is server-publish-only: client updates sent to it are
+  rejected.
+- Messages published with a ``key`` coalesce: a newer message with the same
+  key replaces the one still waiting in a connection's queue (latest value
+  wins, e.g. sensor readings).
+- When a queue is full the overflow policy applies: ``drop_oldest``,
+  ``drop_newest`` or ``disconnect`` (close with 1013 so the client
+  reconnects and resyncs). A send that takes longer than
+  WS_SEND_TIMEOUT_SECONDS also disconnects the client.
+- With WS_REDIS_URL set, every publish is also sent through Redis pub/sub
+  so connections held by other workers receive it; each worker delivers
+  its own publishes locally and ignores their echo. A lost subscription is
+  re-established with backoff (up to WS_REDIS_RETRY_MAX_SECONDS).
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import uuid
+from collections import OrderedDict, defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Set
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+logger = logging.getLogger(__name__)
+
+WS_QUEUE_SIZE = int(os.environ.get("WS_QUEUE_SIZE", 256))
+WS_OVERFLOW_POLICY = os.environ.get("WS_OVERFLOW_POLICY", "drop_oldest")
+WS_SEND_TIMEOUT_SECONDS = float(os.environ.get("WS_SEND_TIMEOUT_SECONDS", 5))
+WS_REDIS_URL = os.environ.get("WS_REDIS_URL", "")
+WS_REDIS_CHANNEL_PREFIX = os.environ.get("WS_REDIS_CHANNEL_PREFIX", "ect:ws:")
+WS_REDIS_RETRY_MAX_SECONDS = float(os.environ.get("WS_REDIS_RETRY_MAX_SECONDS", 30))
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "disconnect")
+BROADCAST_TOPIC = "broadcast"
+# Topics only the server publishes to; clients may receive but not send
+SERVER_TOPICS = frozenset({BROADCAST_TOPIC})
+# 1013 Try Again Later: the client fell behind and should reconnect
+CLOSE_SLOW_CONSUMER = 1013
+
+
+def user_topic(user_id: str) -> str:
+    return f"user:{user_id}"
+
+
+class Connection:
+    """One WebSocket with its bounded, coalescing send queue"""
+
+    __slots__ = ("websocket", "user_id", "topics", "maxsize", "policy", "sent", "dropped", "coalesced",
+                 "_pending", "_ready", "_sequence", "_overflowed", "_task")
+
+    def __init__(self, websocket: WebSocket, user_id: str, maxsize: int, policy: str):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.topics: Set[str] = set()
+        self.maxsize = maxsize
+        self.policy = policy
+        self.sent = self.dropped = self.coalesced = 0
+        self._pending: "OrderedDict[Any, str]" = OrderedDict()
+        self._ready = asyncio.Event()
+        self._sequence = itertools.count()
+        self._overflowed = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def enqueue(self, payload: str, key: Optional[str] = None) -> bool:
+        """Queue a serialized message without blocking; False if it was dropped"""
+        if key is not None and key in self._pending:
+            self._pending[key] = payload
+            self.coalesced += 1
+            return True
+        if len(self._pending) >= self.maxsize:
+            if self.policy == "drop_newest":
+                self.dropped += 1
+                return False
+            if self.policy == "disconnect":
+                self._overflowed = True
+                self._ready.set()
+                self.dropped += 1
+                return False
+            self._pending.popitem(last=False)
+            self.dropped += 1
+        self._pending[key if key is not None else next(self._sequence)] = payload
+        self._ready.set()
+        return True
+
+    async def run_sender(self, on_close):
+        """Drain the queue to the socket until it closes or falls behind"""
+        try:
+            while True:
+                await self._ready.wait()
+                self._ready.clear()
+                while self._pending:
+                    if self._overflowed:
+                        raise TimeoutError("send queue overflow")
+                    _, payload = self._pending.popitem(last=False)
+                    async with asyncio.timeout(WS_SEND_TIMEOUT_SECONDS):
+                        await self.websocket.send_text(payload)
+                    self.sent += 1
+        except TimeoutError:
+            logger.warning(f"Disconnecting slow WebSocket client {self.user_id}")
+            on_close(self, slow=True)
+            try:
+                await self.websocket.close(code=CLOSE_SLOW_CONSUMER)
+            except Exception:
+                pass
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Client went away mid-send; the receive loop sees the disconnect
+            on_close(self, slow=False)
+
+
+class ConnectionManager:
+    """Topic-scoped WebSocket fan-out with optional cross-worker relay"""
+
+    def __init__(
+        self,
+        queue_size: int = WS_QUEUE_SIZE,
+        overflow_policy: str = WS_OVERFLOW_POLICY,
+        redis_url: str = WS_REDIS_URL,
+        channel_prefix: str = WS_REDIS_CHANNEL_PREFIX,
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow_policy must be one of {OVERFLOW_POLICIES}")
+        self.queue_size = queue_size
+        self.overflow_policy = overflow_policy
+        self.redis_url = redis_url
+        self.channel_prefix = channel_prefix
+        self.worker_id = uuid.uuid4().hex
+
+        self.active_connections: Dict[str, Set[Connection]] = defaultdict(set)
+        self._topics: Dict[str, Set[Connection]] = defaultdict(set)
+        self._redis = None
+        self._relay_task: Optional[asyncio.Task] = None
+        self._stats = defaultdict(int)
+
+    # Lifecycle
+
+    async def start(self):
+        """Connect the Redis relay when configured; local-only fan-out otherwise"""
+        if not self.redis_url:
+            return
+        try:
+            import redis.asyncio as aioredis
+
+            self._redis = aioredis.from_url(self.redis_url)
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            await pubsub.psubscribe(f"{self.channel_prefix}*")
+            self._relay_task = asyncio.create_task(self._relay(pubsub))
+            logger.info(f"WebSocket fan-out relayed through Redis ({self.channel_prefix}*)")
+        except Exception as e:
+            logger.warning(f"Redis relay unavailable, WebSocket fan-out is local to this worker: {e}")
+            self._redis = None
+
+    async def stop(self):
+        if self._relay_task:
+            self._relay_task.cancel()
+            try:
+                await self._relay_task
+            except asyncio.CancelledError:
+                pass
+            self._relay_task = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+        for connections in list(self.active_connections.values()):
+            for connection in list(connections):
+                self.disconnect(connection)
+                try:
+                    await connection.websocket.close(code=1001)
+                except Exception:
+                    pass
+
+    # Connections and subscriptions
+
+    async def connect(self, websocket: WebSocket, user_id: str, topics: Iterable[str] = ()) -> Connection:
+        await websocket.accept()
+        connection = Connection(websocket, user_id, self.queue_size, self.overflow_policy)
+        self.active_connections[user_id].add(connection)
+        for topic in (user_topic(user_id), BROADCAST_TOPIC, *topics):
+            self.subscribe(connection, topic)
+        connection._task = asyncio.create_task(connection.run_sender(self._closed))
+        self._stats["connected"] += 1
+        return connection
+
+    def disconnect(self, connection: Connection):
+        if connection._task is not None and connection._task is not asyncio.current_task():
+            connection._task.cancel()
+        for topic in list(connection.topics):
+            self.unsubscribe(connection, topic)
+        connections = self.active_connections.get(connection.user_id)
+        if connections is not None:
+            connections.discard(connection)
+            if not connections:
+                del self.active_connections[connection.user_id]
+        self._fold_stats(connection)
+
+    def _closed(self, connection: Connection, slow: bool):
+        if slow:
+            self._stats["slow_disconnects"] += 1
+        self.disconnect(connection)
+
+    def _fold_stats(self, connection: Connection):
+        # Keep totals for closed connections; counters are zeroed so a second disconnect adds nothing
+        for name in ("sent", "dropped", "coalesced"):
+            self._stats[name] += getattr(connection, name)
+            setattr(connection, name, 0)
+
+    def subscribe(self, connection: Connection, topic: str):
+        connection.topics.add(topic)
+        self._topics[topic].add(connection)
+
+    def unsubscribe(self, connection: Connection, topic: str):
+        connection.topics.discard(topic)
+        subscribers = self._topics.get(topic)
+        if subscribers is not None:
+            subscribers.discard(connection)
+            if not subscribers:
+                del self._topics[topic]
+
+    @staticmethod
+    def can_subscribe(user_id: str, topic: Any) -> bool:
+        """Any shared topic, but only the caller's own user topic"""
+        if not isinstance(topic, str) or not topic:
+            return False
+        return not topic.startswith("user:") or topic == user_topic(user_id)
+
+    # Publishing
+
+    async def publish(self, topic: str, message: Dict[str, Any], key: Optional[str] = None) -> int:
+        """Fan a message out to the topic's subscribers on every worker; returns local deliveries"""
+        payload = json.dumps(message, default=str)
+        delivered = self._deliver(topic, payload, key)
+        self._stats["published"] += 1
+        if self._redis is not None:
+            envelope = json.dumps({"origin": self.worker_id, "key": key, "payload": payload})
+            try:
+                await self._redis.publish(f"{self.channel_prefix}{topic}", envelope)
+                self._stats["relayed_out"] += 1
+            except Exception as e:
+                self._stats["relay_errors"] += 1
+                logger.warning(f"Redis publish failed for {topic}: {e}")
+        return delivered
+
+    async def broadcast(self, message: Dict[str, Any], key: Optional[str] = None) -> int:
+        return await self.publish(BROADCAST_TOPIC, message, key)
+
+    async def send_to_user(self, user_id: str, message: Dict[str, Any], key: Optional[str] = None) -> int:
+        return await self.publish(user_topic(user_id), message, key)
+
+    def _deliver(self, topic: str, payload: str, key: Optional[str]) -> int:
+        delivered = 0
+        for connection in tuple(self._topics.get(topic, ())):
+            delivered += connection.enqueue(payload, key)
+        self._stats["delivered"] += delivered
+        return delivered
+
+    async def _relay(self, pubsub):
+        """Deliver publishes from other workers to local subscribers
+
+        When the subscription fails (Redis restarted, connection dropped) a
+        new one is made after a backoff that doubles up to
+        WS_REDIS_RETRY_MAX_SECONDS; publishes missed meanwhile are lost.
+        """
+        delay = 1.0
+        while True:
+            try:
+                if pubsub is None:
+                    pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                    await pubsub.psubscribe(f"{self.channel_prefix}*")
+                    self._stats["relay_reconnects"] += 1
+                    logger.info("Redis relay resubscribed")
+                    delay = 1.0
+                await self._relay_messages(pubsub)
+                error = "subscription closed"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = e
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+                    pubsub = None
+            self._stats["relay_lost"] += 1
+            logger.warning(f"Redis relay lost ({error}); resubscribing in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, WS_REDIS_RETRY_MAX_SECONDS)
+
+    async def _relay_messages(self, pubsub):
+        prefix_length = len(self.channel_prefix)
+        async for message in pubsub.listen():
+            if message.get("type") != "pmessage":
+                continue
+            try:
+                envelope = json.loads(message["data"])
+            except (TypeError, ValueError):
+                continue
+            if envelope.get("origin") == self.worker_id:
+                continue
+            channel = message["channel"]
+            topic = (channel.decode() if isinstance(channel, bytes) else channel)[prefix_length:]
+            self._deliver(topic, envelope["payload"], envelope.get("key"))
+            self._stats["relayed_in"] += 1
+
+    # Endpoint
+
+    async def serve(self, websocket: WebSocket, user_id: str):
+        """Receive loop for /ws/{user_id}
+
+        ``{"action": "subscribe"|"unsubscribe", "topic": ...}`` manages
+        subscriptions. Anything else is an update, published to
+        ``data["topic"]`` when the connection is subscribed to it and to the
+        user's own topic otherwise; ``data["key"]`` makes it coalesce.
+        Updates addressed to a server-only topic are answered with an
+        error and not published.
+        """
+        connection = await self.connect(websocket, user_id)
+        try:
+            while True:
+                data = await websocket.receive_json()
+                action = data.get("action") if isinstance(data, dict) else None
+                if action in ("subscribe", "unsubscribe"):
+                    topic = data.get("topic")
+                    ok = self.can_subscribe(user_id, topic)
+                    if ok:
+                        (self.subscribe if action == "subscribe" else self.unsubscribe)(connection, topic)
+                    connection.enqueue(json.dumps({"type": action, "topic": topic, "ok": ok}))
+                    continue
+
+                topic = user_topic(user_id)
+                key = None
+                if isinstance(data, dict):
+                    if data.get("topic") in SERVER_TOPICS:
+                        self._stats["rejected_publishes"] += 1
+                        connection.enqueue(json.dumps(
+                            {"type": "error", "topic": data["topic"], "error": "topic is server-publish-only"}
+                        ))
+                        continue
+                    if data.get("topic") in connection.topics:
+                        topic = data["topic"]
+                    if data.get("key") is not None:
+                        key = f"{topic}:{data['key']}"
+                await self.publish(
+                    topic,
+                    {
+                        "type": "update",
+                        "topic": topic,
+                        "user_id": user_id,
+                        "timestamp": datetime.utcnow().isoformat(),
+                        "data": data,
+                    },
+                    key=key,
+                )
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+        finally:
+            self.disconnect(connection)
+            logger.info(f"User {user_id} disconnected")
+
+    def stats(self) -> Dict[str, Any]:
+        connections = [c for group in self.active_connections.values() for c in group]
+        live = {name: sum(getattr(c, name) for c in connections) for name in ("sent", "dropped", "coalesced")}
+        stats = dict(self._stats)
+        for name, value in live.items():
+            stats[name] = stats.get(name, 0) + value
+        stats.update(
+            connections=len(connections),
+            users=len(self.active_connections),
+            topics=len(self._topics),
+            queued=sum(c.depth for c in connections),
+            max_queue_depth=max((c.depth for c in connections), default=0),
+            queue_size=self.queue_size,
+            overflow_policy=self.overflow_policy,
+            redis_relay=self._redis is not None,
+        )
+        return stats
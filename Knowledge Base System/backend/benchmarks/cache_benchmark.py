@@ -0,0 +1,99 @@
+"""
+Knowledge Base System - Cache Stampede Benchmark
+
+Concurrent clients read a handful of hot keys with a short TTL while the
+loader (standing in for the database query) takes a fixed time. Compares
+plain cache-aside, where every reader that sees a miss runs the loader,
+with CacheService (single-flight + early expiration), and reports loader
+calls and read latency.
+
+    python benchmarks/cache_benchmark.py --clients 200 --seconds 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from services.cache_service import CacheService, MemoryBackend  # noqa: E402
+
+
+def percentiles(values):
+    ordered = sorted(values)
+    pick = lambda p: round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 3)  # noqa: E731
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": round(ordered[-1], 3)}
+
+
+async def run_mode(mode: str, clients: int, seconds: float, keys: int, ttl: int, load_ms: float) -> dict:
+    loads = 0
+    latencies = []
+
+    async def loader():
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(load_ms / 1000)
+        return {"computed_at": time.time()}
+
+    if mode == "naive":
+        backend = MemoryBackend()
+
+        async def read(key):
+            raw, = await backend.mget([key])
+            if raw is not None:
+                return json.loads(raw)
+            value = await loader()
+            await backend.set(key, json.dumps(value), ttl)
+            return value
+    else:
+        cache = CacheService(url=None, default_ttl=ttl)
+        await cache.connect()
+
+        async def read(key):
+            return await cache.get_or_set(key, loader, ttl, tags=["articles"], route="benchmark")
+
+    deadline = time.perf_counter() + seconds
+
+    async def client(seed):
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            await read(f"article:{rng.randrange(keys)}")
+            latencies.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(rng.uniform(0, 0.01))
+
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    return {
+        "reads": len(latencies),
+        "loader_calls": loads,
+        "expiry_cycles": round(seconds / ttl * keys, 1),
+        "read_ms": percentiles(latencies)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Knowledge Base cache stampede benchmark")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--keys", type=int, default=5)
+    parser.add_argument("--ttl", type=int, default=2)
+    parser.add_argument("--load-ms", type=float, default=80)
+    args = parser.parse_args()
+
+    report = {}
+    for mode in ("naive", "cache_service"):
+        report[mode] = asyncio.run(run_mode(mode, args.clients, args.seconds, args.keys, args.ttl, args.load_ms))
+
+    print(f"🧊 {args.clients} clients, {args.keys} hot keys, TTL {args.ttl}s, loader {args.load_ms:g} ms")
+    for mode, r in report.items():
+        p = r["read_ms"]
+        print(f"   {mode:<14} loader calls {r['loader_calls']:>6}  reads {r['reads']:>7}  "
+              f"p50 {p['p50']:.2f} ms  p99 {p['p99']:.2f} ms  max {p['max']:.1f} ms")
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Knowledge Base System - Request Logging Overhead Benchmark
+
+Drives a one-route FastAPI app directly over ASGI (no server, no sockets)
+and reports the time per request of:
+
+    none      no request logging
+    inline    the previous log_requests middleware: BaseHTTPMiddleware with
+              two logger.info calls written by a FileHandler on the request path
+    queued    RequestLoggingMiddleware, one JSON record per request written by
+              a QueueListener thread
+    sampled   RequestLoggingMiddleware logging 10% of requests to the route
+
+The modes run interleaved: each round serves one batch per mode, in an
+order rotated every round, so drift (CPU frequency, GC, other load) hits
+every mode alike. Reported per mode are the median, p10 and p90 of the
+round times and the median of the per-round difference to ``none``. After a
+queued batch the listener is drained before the next batch starts; that
+drain is reported on its own instead of spilling into another mode's time.
+
+    python benchmarks/logging_benchmark.py --rounds 20 --batch 1000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from fastapi import FastAPI, Request
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from middleware.request_logging import (  # noqa: E402
+    JsonLineFormatter,
+    RequestLoggingMiddleware,
+    install_queue_logging,
+    stop_listener,
+)
+
+
+def build_app(mode: str, log_path: str):
+    app = FastAPI()
+
+    @app.get("/api/v1/articles/{article_id}")
+    async def get_article(article_id: int):
+        return {"id": article_id, "title": "Benchmark"}
+
+    handler = logging.FileHandler(log_path)
+    logger_name = f"bench.{mode}"
+    listener = None
+
+    if mode == "inline":
+        handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+        logger = logging.getLogger(logger_name)
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+        @app.middleware("http")
+        async def log_requests(request: Request, call_next):
+            logger.info(f"{request.method} {request.url.path}")
+            response = await call_next(request)
+            logger.info(f"Response status: {response.status_code}")
+            return response
+
+    elif mode in ("queued", "sampled"):
+        handler.setFormatter(JsonLineFormatter())
+        listener = install_queue_logging([handler], logger=logger_name)
+        logging.getLogger(logger_name).propagate = False
+        rates = {"/api/v1/articles": 0.1} if mode == "sampled" else {}
+        app.add_middleware(RequestLoggingMiddleware, logger_name=logger_name, sample_rates=rates)
+
+    return app, listener
+
+
+MODES = ("none", "inline", "queued", "sampled")
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+def scope(i: int) -> dict:
+    return {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": f"/api/v1/articles/{i}", "raw_path": f"/api/v1/articles/{i}".encode(),
+        "query_string": b"", "root_path": "", "client": ("127.0.0.1", 5000), "server": ("testserver", 80),
+        "headers": [(b"host", b"testserver"), (b"x-request-id", b"bench-%d" % i)],
+    }
+
+
+async def drive(app, requests: int) -> float:
+    """Microseconds per request to serve ``requests`` GETs through the ASGI interface"""
+    started = time.perf_counter()
+    for i in range(requests):
+        await app(scope(i), receive, send)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def drain(listener) -> float:
+    """Seconds until the listener has written everything queued so far"""
+    started = time.perf_counter()
+    if listener is not None:
+        listener.queue.join()
+    return time.perf_counter() - started
+
+
+async def measure(apps: dict, rounds: int, batch: int) -> dict:
+    timings = {mode: [] for mode in MODES}
+    drains = {mode: [] for mode in MODES}
+    for mode, (app, listener) in apps.items():  # warm-up
+        for i in range(200):
+            await app(scope(i), receive, send)
+        drain(listener)
+
+    for round_no in range(rounds):
+        offset = round_no % len(MODES)
+        for mode in MODES[offset:] + MODES[:offset]:
+            app, listener = apps[mode]
+            timings[mode].append(await drive(app, batch))
+            drains[mode].append(drain(listener) / batch * 1e6)
+    return {"timings": timings, "drains": drains}
+
+
+def percentile(values, p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def run(rounds: int, batch: int) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        log_paths = {mode: os.path.join(tmp, f"{mode}.log") for mode in MODES}
+        apps = {mode: build_app(mode, log_paths[mode]) for mode in MODES}
+        measured = asyncio.run(measure(apps, rounds, batch))
+
+        base = measured["timings"]["none"]
+        for mode in MODES:
+            listener = apps[mode][1]
+            dropped = 0
+            if listener is not None:
+                dropped = sum(getattr(h, "dropped", 0) for h in logging.getLogger(f"bench.{mode}").handlers)
+                stop_listener(listener)
+            path = log_paths[mode]
+            timings = measured["timings"][mode]
+            results[mode] = {
+                "us_per_request_median": round(statistics.median(timings), 2),
+                "us_per_request_p10": round(percentile(timings, 0.10), 2),
+                "us_per_request_p90": round(percentile(timings, 0.90), 2),
+                "overhead_us_median": round(statistics.median(t - b for t, b in zip(timings, base)), 2),
+                "listener_drain_us_per_request": round(statistics.median(measured["drains"][mode]), 2),
+                "log_lines": sum(1 for _ in open(path)) if os.path.exists(path) else 0,
+                "dropped": dropped,
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Request logging middleware overhead")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=1000, help="requests per mode per round")
+    args = parser.parse_args()
+
+    results = run(args.rounds, args.batch)
+    print(f"🪵 Request logging cost, {args.rounds} interleaved rounds of {args.batch:,} in-process requests per mode")
+    for mode, r in results.items():
+        print(f"   {mode:<8} median {r['us_per_request_median']:>7.1f} µs/request "
+              f"(p10 {r['us_per_request_p10']:>7.1f}, p90 {r['us_per_request_p90']:>7.1f})  "
+              f"overhead {r['overhead_us_median']:>6.1f} µs  drain {r['listener_drain_us_per_request']:>5.1f} µs  "
+              f"lines {r['log_lines']:>6}")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Knowledge Base System - Search Benchmark
+
+Builds a synthetic corpus (Zipf-distributed vocabulary), indexes it in
+batches, then measures text, semantic and hybrid query latency plus the cost
+of an incremental single-article update.
+
+    python benchmarks/search_benchmark.py --articles 100000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from services.search_service import SearchIndex  # noqa: E402
+
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "ta", "vi", "zo", "pe", "sa", "do", "fi", "gu", "ha", "je", "bo"]
+
+
+def vocabulary(size: int, rng: np.random.Generator) -> np.ndarray:
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES, size=rng.integers(2, 5))))
+    return np.array(sorted(words))
+
+
+def corpus(count: int, vocab: np.ndarray, rng: np.random.Generator, body_words: int = 150):
+    """Articles with Zipf word frequencies, like natural text"""
+    ranks = np.minimum(rng.zipf(1.2, size=(count, body_words + 8)), len(vocab)) - 1
+    categories = rng.integers(1, 51, size=count)
+    for i in range(count):
+        words = vocab[ranks[i]]
+        yield {
+            "id": i + 1,
+            "title": " ".join(words[:6]),
+            "tags": " ".join(words[6:8]),
+            "content": " ".join(words[8:]),
+            "category_id": int(categories[i])
+        }
+
+
+def percentiles(values):
+    ordered = sorted(values)
+    pick = lambda p: round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 3)  # noqa: E731
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99)}
+
+
+def run(articles: int, queries: int, batch_size: int, seed: int = 7) -> dict:
+    rng = np.random.default_rng(seed)
+    vocab = vocabulary(20000, rng)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = SearchIndex(os.path.join(tmp, "search.db"), semantic=True).open()
+
+        started = time.perf_counter()
+        batch = []
+        for article in corpus(articles, vocab, rng):
+            batch.append(article)
+            if len(batch) >= batch_size:
+                index.upsert_many(batch)
+                batch = []
+        if batch:
+            index.upsert_many(batch)
+        build_seconds = time.perf_counter() - started
+
+        # Queries drawn from mid-frequency words so they match some but not all articles
+        query_terms = [" ".join(vocab[rng.integers(20, 2000, size=rng.integers(1, 4))]) for _ in range(queries)]
+        latencies = {}
+        for mode in ("text", "semantic", "hybrid"):
+            index.search(query_terms[0], mode=mode)  # warm caches
+            timings = []
+            for query in query_terms:
+                t = time.perf_counter()
+                index.search(query, limit=20, mode=mode)
+                timings.append((time.perf_counter() - t) * 1000)
+            latencies[mode] = percentiles(timings)
+
+        t = time.perf_counter()
+        filtered = [index.search(q, limit=20, category_id=7) for q in query_terms[:50]]
+        filtered_ms = (time.perf_counter() - t) * 1000 / len(filtered)
+
+        update_timings = []
+        for article in corpus(200, vocab, np.random.default_rng(seed + 1)):
+            article["id"] = int(rng.integers(1, articles + 1))
+            t = time.perf_counter()
+            index.upsert(article)
+            update_timings.append((time.perf_counter() - t) * 1000)
+
+        stats = index.stats()
+        index.close()
+        db_bytes = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp))
+
+    return {
+        "articles": articles,
+        "queries": queries,
+        "build_seconds": round(build_seconds, 2),
+        "build_articles_per_second": round(articles / build_seconds),
+        "query_ms": latencies,
+        "hybrid_category_filter_ms_avg": round(filtered_ms, 3),
+        "incremental_update_ms": percentiles(update_timings),
+        "index_bytes_on_disk": db_bytes,
+        "vector_bytes_in_memory": stats["vector_bytes"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Knowledge Base search benchmark")
+    parser.add_argument("--articles", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--batch-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    report = run(args.articles, args.queries, args.batch_size)
+    print(f"🔎 {report['articles']:,} articles indexed in {report['build_seconds']}s "
+          f"({report['build_articles_per_second']:,}/s)")
+    for mode, p in report["query_ms"].items():
+        print(f"   {mode:<9} p50 {p['p50']:.2f} ms  p95 {p['p95']:.2f} ms  p99 {p['p99']:.2f} ms")
+    print(f"   incremental update p50 {report['incremental_update_ms']['p50']:.2f} ms")
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
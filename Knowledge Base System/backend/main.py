@@ -7,32 +7,39 @@ import logging
 from contextlib import asynccontextmanager
 from typing import Optional
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 
 from config import settings
-from database.models import Base
+from database.models import Base, Article
 from routes import (
     auth_routes,
     articles_routes,
     categories_routes,
     search_routes,
+    cache_routes,
     user_routes,
     health_routes,
 )
 from middleware.error_handler import setup_error_handlers
 from middleware.logging_config import setup_logging
+from middleware.request_logging import RequestLoggingMiddleware, setup_access_logging, stop_listener
 from services.cache_service import CacheService
+from services.search_service import SearchService
 
-# Setup logging
+# Setup logging; access records are written off the request path
 logger = setup_logging()
+access_log_listener = setup_access_logging()
 
 # Initialize cache service
 cache_service = CacheService()
 
+# Initialize search index (full-text + semantic)
+search_service = SearchService()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -48,14 +55,29 @@ async def lifespan(app: FastAPI):
     
     # Initialize cache
     await cache_service.connect()
+    cache_service.register_model_listeners(Article)
+    app.state.cache_service = cache_service
     logger.info("Cache service initialized")
     
+    # Initialize search index; article writes are indexed incrementally
+    await search_service.connect()
+    search_service.register_model_listeners(Article)
+    # Cached search results are dropped once the index has the new content
+    search_service.on_flush = lambda article_ids: cache_service.invalidate_tags(["search"])
+    # A new or emptied index is filled from the database once
+    async with async_session_maker() as session:
+        await search_service.backfill(session, Article)
+    app.state.search_service = search_service
+    logger.info("Search index initialized")
+    
     yield
     
     # Shutdown
     logger.info("Shutting down Knowledge Base System")
     await cache_service.disconnect()
+    await search_service.disconnect()
     await engine.dispose()
+    stop_listener(access_log_listener)
 
 
 # Database setup
@@ -106,14 +128,8 @@ app.add_middleware(
 setup_error_handlers(app)
 
 
-# Request/Response logging middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log all HTTP requests and responses"""
-    logger.info(f"{request.method} {request.url.path}")
-    response = await call_next(request)
-    logger.info(f"Response status: {response.status_code}")
-    return response
+# One structured access record per request
+app.add_middleware(RequestLoggingMiddleware)
 
 
 # Include routers
@@ -123,6 +139,7 @@ app.include_router(user_routes.router, prefix="/api/v1/users", tags=["users"])
 app.include_router(articles_routes.router, prefix="/api/v1/articles", tags=["articles"])
 app.include_router(categories_routes.router, prefix="/api/v1/categories", tags=["categories"])
 app.include_router(search_routes.router, prefix="/api/v1/search", tags=["search"])
+app.include_router(cache_routes.router, prefix="/api/v1/cache", tags=["cache"])
 
 
 # Root endpoint
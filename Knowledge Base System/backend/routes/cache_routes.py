@@ -0,0 +1,16 @@
+"""
+Knowledge Base System - Cache Routes
+"""
+
+from fastapi import APIRouter, HTTPException, Request
+
+router = APIRouter()
+
+
+@router.get("/stats")
+async def cache_stats(request: Request):
+    """Per-route hit ratio, early refreshes and latency"""
+    cache = getattr(request.app.state, "cache_service", None)
+    if cache is None:
+        raise HTTPException(status_code=503, detail="Cache not available")
+    return cache.stats()
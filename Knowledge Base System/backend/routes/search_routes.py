@@ -0,0 +1,43 @@
+"""
+Knowledge Base System - Search Routes
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+
+router = APIRouter()
+
+
+def get_search_service(request: Request):
+    """Search service created in the application lifespan"""
+    service = getattr(request.app.state, "search_service", None)
+    if service is None:
+        raise HTTPException(status_code=503, detail="Search index not available")
+    return service
+
+
+@router.get("")
+async def search_articles(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=256, description="Search query"),
+    mode: str = Query("hybrid", pattern="^(hybrid|text|semantic)$"),
+    category_id: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100),
+):
+    """Full-text, semantic or hybrid search over articles"""
+    service = get_search_service(request)
+    cache = getattr(request.app.state, "cache_service", None)
+    if cache is None:
+        return await service.search(q, limit=limit, mode=mode, category_id=category_id)
+
+    params = {"q": q, "mode": mode, "category_id": category_id, "limit": limit}
+    return await cache.get_search(
+        params, lambda: service.search(q, limit=limit, mode=mode, category_id=category_id)
+    )
+
+
+@router.get("/stats")
+async def search_stats(request: Request):
+    """Index size and pending incremental updates"""
+    return get_search_service(request).stats()
@@ -0,0 +1,366 @@
+"""
+Knowledge Base System - Cache Service
+Read-through cache for search responses, invalidated by article writes
+
+``get_or_set`` is the only read path: on a miss the loader runs once per key
+per process, however many requests are waiting (single-flight). Every entry
+records how long it took to compute, and readers refresh it early with a
+probability that rises as expiry approaches (XFetch), so a hot key is
+recomputed by one request before it expires instead of by all of them after.
+
+Entries carry the versions of their tags (``article:42``, ``category:3``,
+``search``...). Invalidating a tag bumps its version, which makes every
+entry written under the old version a miss. That is O(1) however many keys
+carry the tag. Hits, misses, early refreshes and latency are tracked per
+route.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import time
+from collections import OrderedDict, defaultdict, deque
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.environ.get("REDIS_URL")
+CACHE_KEY_PREFIX = os.environ.get("CACHE_KEY_PREFIX", "kb:")
+CACHE_DEFAULT_TTL = int(os.environ.get("CACHE_DEFAULT_TTL", 300))
+
+# XFetch beta: >1 refreshes earlier, <1 later
+CACHE_EARLY_EXPIRY_BETA = float(os.environ.get("CACHE_EARLY_EXPIRY_BETA", 1.0))
+
+# Search results change with every indexed write
+CACHE_TTL_SEARCH = int(os.environ.get("CACHE_TTL_SEARCH", 120))
+
+# Entries the in-process backend holds before evicting the least recently used
+CACHE_MEMORY_MAX_ENTRIES = int(os.environ.get("CACHE_MEMORY_MAX_ENTRIES", 10000))
+
+TAG_PREFIX = "tag:"
+
+# session.info key holding the tags a session's changes invalidate until it commits
+SESSION_TAGS_KEY = "cache_invalidation_tags"
+
+
+class MemoryBackend:
+    """In-process backend, used when REDIS_URL is not set
+
+    Entries live in an LRU of at most ``max_entries``, so keys built from
+    user input (search queries) cannot grow it without bound. Counters (tag
+    versions) are kept apart and never evicted: a version falling back to
+    zero would make entries cached under version zero valid again.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MEMORY_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+
+    async def connect(self):
+        pass
+
+    async def close(self):
+        self._data.clear()
+        self._counters.clear()
+
+    async def mget(self, keys: Sequence[str]) -> List[Optional[str]]:
+        now = time.time()
+        values = []
+        for key in keys:
+            if key in self._counters:
+                values.append(str(self._counters[key]))
+                continue
+            item = self._data.get(key)
+            if item is not None and item[1] is not None and item[1] <= now:
+                del self._data[key]
+                item = None
+            elif item is not None:
+                self._data.move_to_end(key)
+            values.append(item[0] if item else None)
+        return values
+
+    async def set(self, key: str, value: str, ttl: Optional[float]):
+        self._data[key] = (value, time.time() + ttl if ttl else None)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    async def delete(self, keys: Sequence[str]):
+        for key in keys:
+            self._data.pop(key, None)
+            self._counters.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class RedisBackend:
+    """redis.asyncio backend with a pooled connection"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self._redis = None
+
+    async def connect(self):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(self.url, decode_responses=True, max_connections=50)
+        await self._redis.ping()
+
+    async def close(self):
+        if self._redis is not None:
+            await self._redis.aclose()
+
+    async def mget(self, keys: Sequence[str]) -> List[Optional[str]]:
+        return await self._redis.mget(keys)
+
+    async def set(self, key: str, value: str, ttl: Optional[float]):
+        await self._redis.set(key, value, px=int(ttl * 1000) if ttl else None)
+
+    async def incr(self, key: str) -> int:
+        return await self._redis.incr(key)
+
+    async def delete(self, keys: Sequence[str]):
+        if keys:
+            await self._redis.delete(*keys)
+
+
+class RouteStats:
+    """Hit ratio and latency for one route"""
+
+    def __init__(self, window: int = 2000):
+        self.hits = 0
+        self.misses = 0
+        self.early_refreshes = 0
+        self.coalesced = 0
+        self.invalidated = 0
+        self.errors = 0
+        self.hit_ms: deque = deque(maxlen=window)
+        self.miss_ms: deque = deque(maxlen=window)
+
+    @staticmethod
+    def _percentile(values: deque, p: float) -> Optional[float]:
+        if not values:
+            return None
+        ordered = sorted(values)
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 3)
+
+    def to_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "early_refreshes": self.early_refreshes,
+            "coalesced": self.coalesced,
+            "invalidated": self.invalidated,
+            "errors": self.errors,
+            "hit_ms_p50": self._percentile(self.hit_ms, 0.50),
+            "hit_ms_p95": self._percentile(self.hit_ms, 0.95),
+            "miss_ms_p50": self._percentile(self.miss_ms, 0.50),
+            "miss_ms_p95": self._percentile(self.miss_ms, 0.95),
+        }
+
+
+class CacheService:
+    """Cache-aside with single-flight loads, early expiry and tag invalidation"""
+
+    def __init__(self, url: Optional[str] = REDIS_URL, prefix: str = CACHE_KEY_PREFIX,
+                 default_ttl: int = CACHE_DEFAULT_TTL, beta: float = CACHE_EARLY_EXPIRY_BETA):
+        self.backend = RedisBackend(url) if url else MemoryBackend()
+        self.prefix = prefix
+        self.default_ttl = default_ttl
+        self.beta = beta
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._session_listeners = False
+        self._stats: Dict[str, RouteStats] = defaultdict(RouteStats)
+        self._pending_tags: set = set()
+
+    async def connect(self):
+        try:
+            await self.backend.connect()
+        except Exception as e:
+            logger.warning(f"Redis unavailable ({e}); using in-process cache")
+            self.backend = MemoryBackend()
+        logger.info(f"Cache backend: {type(self.backend).__name__}")
+
+    async def disconnect(self):
+        await self.flush_invalidations()
+        await self.backend.close()
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}{TAG_PREFIX}{tag}"
+
+    def _should_refresh_early(self, entry: Dict[str, Any], now: float) -> bool:
+        # XFetch: refresh when now - delta * beta * ln(rand) >= expiry
+        return now - entry["delta"] * self.beta * math.log(random.random() or 1e-12) >= entry["exp"]
+
+    async def get_or_set(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: Optional[int] = None,
+                         tags: Iterable[str] = (), route: str = "default") -> Any:
+        """Cached value for ``key``, computing it with ``loader`` on a miss"""
+        started = time.perf_counter()
+        stats = self._stats[route]
+        tags = list(tags)
+        full_key = self._key(key)
+
+        try:
+            raw, *versions = await self.backend.mget([full_key] + [self._tag_key(t) for t in tags])
+        except Exception as e:
+            stats.errors += 1
+            logger.warning(f"Cache read failed for {key}: {e}")
+            return await loader()
+
+        current_tags = {tag: int(v or 0) for tag, v in zip(tags, versions)}
+        entry = json.loads(raw) if raw else None
+        if entry is not None and entry.get("tags") != current_tags:
+            stats.invalidated += 1
+            entry = None
+
+        if entry is None:
+            stats.misses += 1
+            try:
+                return await self._load(full_key, loader, ttl or self.default_ttl, current_tags, stats)
+            finally:
+                stats.miss_ms.append((time.perf_counter() - started) * 1000)
+
+        if self._should_refresh_early(entry, time.time()) and full_key not in self._inflight:
+            # This reader recomputes (loaders may use its request-scoped session);
+            # concurrent readers see the refresh in flight and keep the current value
+            stats.early_refreshes += 1
+            entry["v"] = await self._load(full_key, loader, ttl or self.default_ttl, current_tags, stats)
+
+        stats.hits += 1
+        stats.hit_ms.append((time.perf_counter() - started) * 1000)
+        return entry["v"]
+
+    async def _load(self, full_key: str, loader, ttl: int, tags: Dict[str, int], stats: RouteStats) -> Any:
+        """Single-flight: concurrent callers for one key share one loader call
+
+        The loader runs in its own task and every caller, the first one
+        included, waits on it through ``shield``. A cancelled caller (client
+        gone, request timeout) stops waiting without cancelling the load the
+        others are waiting for.
+        """
+        task = self._inflight.get(full_key)
+        if task is not None:
+            stats.coalesced += 1
+            return await asyncio.shield(task)
+
+        task = asyncio.create_task(self._compute(full_key, loader, ttl, tags, stats))
+        self._inflight[full_key] = task
+        task.add_done_callback(lambda done: self._load_done(full_key, done))
+        return await asyncio.shield(task)
+
+    async def _compute(self, full_key: str, loader, ttl: int, tags: Dict[str, int], stats: RouteStats) -> Any:
+        computed_at = time.perf_counter()
+        value = await loader()
+        delta = time.perf_counter() - computed_at
+        entry = {"v": value, "exp": time.time() + ttl, "delta": delta, "tags": tags}
+        try:
+            await self.backend.set(full_key, json.dumps(entry, default=str), ttl)
+        except Exception as e:
+            stats.errors += 1
+            logger.warning(f"Cache write failed for {full_key}: {e}")
+        return value
+
+    def _load_done(self, full_key: str, task: asyncio.Task):
+        if self._inflight.get(full_key) is task:
+            del self._inflight[full_key]
+        if not task.cancelled():
+            # Every waiter may have gone; don't warn about the exception going unretrieved
+            task.exception()
+
+    async def get_search(self, params: Dict[str, Any], loader: Callable[[], Awaitable[Any]]) -> Any:
+        return await self.get_or_set(f"search:{params_key(params)}", loader, CACHE_TTL_SEARCH,
+                                     tags=["search"], route="search")
+
+    async def invalidate_tags(self, tags: Iterable[str]):
+        """Make every entry carrying one of ``tags`` a miss"""
+        for tag in set(tags):
+            await self.backend.incr(self._tag_key(tag))
+
+    async def delete(self, *keys: str):
+        await self.backend.delete([self._key(k) for k in keys])
+
+    async def invalidate_article(self, article_id: int, category_id: Optional[int] = None):
+        """Call after an article is created, updated or deleted"""
+        await self.invalidate_tags(article_tags(article_id, category_id))
+
+    def register_model_listeners(self, model, tags_for: Callable[[Any], Iterable[str]] = None):
+        """Invalidate tags when rows of an SQLAlchemy model change
+
+        Mapper events fire inside the session flush, before the transaction
+        commits, so tags are collected in ``session.info`` and bumped only
+        once that session commits, by a task scheduled on the running loop.
+        Bumping earlier would let a concurrent read re-cache the old row
+        under the new tag version. A rollback drops the collected tags.
+        """
+        from sqlalchemy import event
+        from sqlalchemy.orm import Session, object_session
+
+        tags_for = tags_for or (lambda target: article_tags(target.id, getattr(target, "category_id", None)))
+
+        def changed(mapper, connection, target):
+            session = object_session(target)
+            if session is not None:
+                session.info.setdefault(SESSION_TAGS_KEY, set()).update(tags_for(target))
+
+        for event_name in ("after_insert", "after_update", "after_delete"):
+            event.listen(model, event_name, changed)
+
+        if self._session_listeners:
+            return
+        self._session_listeners = True
+
+        def committed(session):
+            tags = session.info.pop(SESSION_TAGS_KEY, None)
+            if not tags:
+                return
+            self._pending_tags.update(tags)
+            try:
+                asyncio.get_running_loop().create_task(self.flush_invalidations())
+            except RuntimeError:
+                pass  # no loop (sync scripts); flushed on the next async call or disconnect
+
+        def rolled_back(session):
+            session.info.pop(SESSION_TAGS_KEY, None)
+
+        event.listen(Session, "after_commit", committed)
+        event.listen(Session, "after_rollback", rolled_back)
+
+    async def flush_invalidations(self):
+        if self._pending_tags:
+            tags, self._pending_tags = self._pending_tags, set()
+            await self.invalidate_tags(tags)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-route hit ratio, early refreshes and latency"""
+        return {
+            "backend": type(self.backend).__name__,
+            "inflight": len(self._inflight),
+            "routes": {route: s.to_dict() for route, s in self._stats.items()},
+        }
+
+
+def article_tags(article_id: int, category_id: Optional[int] = None) -> List[str]:
+    """Tags an article change invalidates: the article, listings, its category and search"""
+    tags = [f"article:{article_id}", "articles", "search"]
+    if category_id is not None:
+        tags += [f"category:{category_id}", "categories"]
+    return tags
+
+
+def params_key(params: Dict[str, Any]) -> str:
+    """Stable cache key fragment for query parameters"""
+    return json.dumps({k: v for k, v in sorted(params.items()) if v is not None}, separators=(",", ":"))
@@ -0,0 +1,552 @@
+"""
+Knowledge Base System - Search Service
+Embedded full-text index with an optional vector index and hybrid ranking
+
+Articles are indexed into a local SQLite FTS5 table (BM25 ranking, weighted
+title > tags > body) and, when semantic search is enabled, into an in-memory
+float32 matrix of embeddings persisted alongside it. Hybrid queries fuse the
+two rankings with reciprocal rank fusion. The index is maintained
+incrementally: article create/update/delete upserts or removes single rows,
+and committed ORM changes picked up by ``register_model_listeners`` are
+applied in small batches by a background task. An empty index is filled
+from the database by ``backfill`` at startup.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SEARCH_INDEX_PATH = os.environ.get("SEARCH_INDEX_PATH", "./data/search_index.db")
+SEARCH_VECTOR_DIM = int(os.environ.get("SEARCH_VECTOR_DIM", 128))
+SEARCH_EMBEDDING_MODEL = os.environ.get("SEARCH_EMBEDDING_MODEL")
+SEARCH_SEMANTIC_ENABLED = os.environ.get("ENABLE_ADVANCED_SEARCH", "true").lower() == "true"
+SEARCH_MIN_SIMILARITY = float(os.environ.get("SEARCH_MIN_SIMILARITY", 0.1))
+
+# BM25 column weights: title, tags, body
+BM25_WEIGHTS = (10.0, 5.0, 1.0)
+
+# Reciprocal rank fusion constant; larger values flatten the rank curve
+RRF_K = 60
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# session.info key holding a session's article changes until it commits
+SESSION_CHANGES_KEY = "search_index_changes"
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+class HashingEmbedder:
+    """Dependency-free embedder: signed feature hashing of unigrams and bigrams
+
+    Captures lexical overlap rather than meaning, so it keeps semantic search
+    usable offline. Set ``SEARCH_EMBEDDING_MODEL`` to use a
+    sentence-transformers model instead.
+    """
+
+    def __init__(self, dim: int = SEARCH_VECTOR_DIM):
+        self.dim = dim
+        self._buckets: Dict[str, int] = {}
+
+    def _bucket(self, feature: str) -> int:
+        bucket = self._buckets.get(feature)
+        if bucket is None:
+            h = zlib.crc32(feature.encode())
+            # Low bits pick the dimension, one high bit the sign
+            bucket = (h % self.dim) + 1
+            if h & 0x80000000:
+                bucket = -bucket
+            if len(self._buckets) < 500_000:
+                self._buckets[feature] = bucket
+        return bucket
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = tokenize(text)
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            if not features:
+                continue
+            buckets = np.fromiter((self._bucket(f) for f in features), dtype=np.int64, count=len(features))
+            signs = np.sign(buckets).astype(np.float32)
+            np.add.at(vectors[row], np.abs(buckets) - 1, signs)
+        # Sublinear term frequency, then unit length so dot product is cosine
+        np.copysign(np.log1p(np.abs(vectors)), vectors, out=vectors)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+
+class SentenceTransformerEmbedder:
+    """Embeddings from a sentence-transformers model (optional dependency)"""
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name)
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        return self.model.encode(list(texts), normalize_embeddings=True, convert_to_numpy=True).astype(np.float32)
+
+
+def default_embedder():
+    if SEARCH_EMBEDDING_MODEL:
+        try:
+            return SentenceTransformerEmbedder(SEARCH_EMBEDDING_MODEL)
+        except ImportError:
+            logger.warning("sentence-transformers not installed; falling back to hashing embeddings")
+    return HashingEmbedder()
+
+
+class VectorIndex:
+    """Contiguous float32 matrix of unit vectors with id -> row bookkeeping
+
+    Rows are appended with amortized doubling and deleted by moving the last
+    row into the hole, so the live rows stay dense and a query is a single
+    matrix-vector product.
+    """
+
+    def __init__(self, dim: int, capacity: int = 1024):
+        self.dim = dim
+        self.size = 0
+        self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._categories = np.zeros(capacity, dtype=np.int64)
+        self._rows: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _reserve(self, extra: int):
+        needed = self.size + extra
+        if needed <= len(self._ids):
+            return
+        capacity = max(needed, len(self._ids) * 2)
+        self._vectors = np.resize(self._vectors, (capacity, self.dim))
+        self._ids = np.resize(self._ids, capacity)
+        self._categories = np.resize(self._categories, capacity)
+
+    def upsert_many(self, ids: Sequence[int], categories: Sequence[int], vectors: np.ndarray):
+        self._reserve(len(ids))
+        for doc_id, category, vector in zip(ids, categories, vectors):
+            row = self._rows.get(doc_id)
+            if row is None:
+                row = self.size
+                self.size += 1
+                self._rows[doc_id] = row
+                self._ids[row] = doc_id
+            self._categories[row] = category
+            self._vectors[row] = vector
+
+    def remove(self, doc_id: int):
+        row = self._rows.pop(doc_id, None)
+        if row is None:
+            return
+        last = self.size - 1
+        if row != last:
+            moved = int(self._ids[last])
+            self._vectors[row] = self._vectors[last]
+            self._ids[row] = moved
+            self._categories[row] = self._categories[last]
+            self._rows[moved] = row
+        self.size -= 1
+
+    def search(self, query: np.ndarray, limit: int, category_id: Optional[int] = None) -> List[tuple]:
+        """(id, cosine similarity) pairs, best first"""
+        if self.size == 0:
+            return []
+        scores = self._vectors[:self.size] @ query
+        if category_id is not None:
+            scores = np.where(self._categories[:self.size] == category_id, scores, -np.inf)
+        limit = min(limit, self.size)
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+        return [(int(self._ids[i]), float(scores[i])) for i in top if np.isfinite(scores[i])]
+
+    @property
+    def nbytes(self) -> int:
+        return self._vectors[:self.size].nbytes
+
+
+class SearchIndex:
+    """FTS5 + vector index over articles, stored in one SQLite file"""
+
+    def __init__(self, path: str = SEARCH_INDEX_PATH, semantic: bool = SEARCH_SEMANTIC_ENABLED, embedder=None):
+        self.path = path
+        self.semantic = semantic
+        self.embedder = (embedder or default_embedder()) if semantic else None
+        self.vectors = VectorIndex(self.embedder.dim) if semantic else None
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def open(self):
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS article_fts USING fts5("
+            "title, tags, body, category_id UNINDEXED, tokenize='porter unicode61')"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS article_vectors ("
+            "id INTEGER PRIMARY KEY, category_id INTEGER, vector BLOB NOT NULL)"
+        )
+        self._conn = conn
+
+        if self.semantic:
+            self._load_vectors()
+        logger.info(f"Search index opened at {self.path} ({self.count()} articles)")
+        return self
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _load_vectors(self):
+        rows = self._conn.execute("SELECT id, category_id, vector FROM article_vectors").fetchall()
+        width = self.embedder.dim * 4
+        rows = [r for r in rows if len(r[2]) == width]
+        if rows:
+            matrix = np.frombuffer(b"".join(r[2] for r in rows), dtype=np.float32).reshape(len(rows), -1)
+            self.vectors.upsert_many([r[0] for r in rows], [r[1] or 0 for r in rows], matrix)
+
+    @staticmethod
+    def _document(article: Any) -> Dict[str, Any]:
+        """Accept an ORM object or a dict with id/title/content/tags/category_id"""
+        get = article.get if isinstance(article, dict) else lambda k, d=None: getattr(article, k, d)
+        tags = get("tags") or []
+        if not isinstance(tags, str):
+            tags = " ".join(getattr(t, "name", str(t)) for t in tags)
+        return {
+            "id": int(get("id")),
+            "title": get("title") or "",
+            "tags": tags,
+            "body": get("content") or get("body") or "",
+            "category_id": get("category_id") or 0
+        }
+
+    def upsert_many(self, articles: Iterable[Any]) -> int:
+        """Index or re-index articles in one transaction"""
+        docs = [self._document(a) for a in articles]
+        if not docs:
+            return 0
+        vectors = self.embedder.embed([f"{d['title']} {d['tags']} {d['body']}" for d in docs]) if self.semantic else None
+
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN")
+            try:
+                conn.executemany("DELETE FROM article_fts WHERE rowid = ?", [(d["id"],) for d in docs])
+                conn.executemany(
+                    "INSERT INTO article_fts(rowid, title, tags, body, category_id) VALUES (?, ?, ?, ?, ?)",
+                    [(d["id"], d["title"], d["tags"], d["body"], d["category_id"]) for d in docs]
+                )
+                if self.semantic:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO article_vectors(id, category_id, vector) VALUES (?, ?, ?)",
+                        [(d["id"], d["category_id"], v.tobytes()) for d, v in zip(docs, vectors)]
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            if self.semantic:
+                self.vectors.upsert_many([d["id"] for d in docs], [d["category_id"] for d in docs], vectors)
+        return len(docs)
+
+    def upsert(self, article: Any):
+        self.upsert_many([article])
+
+    def remove_many(self, article_ids: Iterable[int]):
+        """Drop articles from the index in one transaction"""
+        ids = [(int(i),) for i in article_ids]
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN")
+            try:
+                conn.executemany("DELETE FROM article_fts WHERE rowid = ?", ids)
+                conn.executemany("DELETE FROM article_vectors WHERE id = ?", ids)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            if self.semantic:
+                for (article_id,) in ids:
+                    self.vectors.remove(article_id)
+
+    def remove(self, article_id: int):
+        self.remove_many([article_id])
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT count(*) FROM article_fts").fetchone()[0]
+
+    @staticmethod
+    def _fts_query(query: str) -> Optional[str]:
+        """Any-term match with prefix matching on the last term; BM25 does the ranking"""
+        tokens = tokenize(query)
+        if not tokens:
+            return None
+        terms = [f'"{t}"' for t in tokens[:-1]] + [f'"{tokens[-1]}"*']
+        return " OR ".join(terms)
+
+    def text_search(self, query: str, limit: int = 20, category_id: Optional[int] = None) -> List[tuple]:
+        """(id, bm25 score) pairs, best first"""
+        match = self._fts_query(query)
+        if match is None:
+            return []
+        sql = (
+            f"SELECT rowid, bm25(article_fts, {BM25_WEIGHTS[0]}, {BM25_WEIGHTS[1]}, {BM25_WEIGHTS[2]}) AS rank "
+            "FROM article_fts WHERE article_fts MATCH ?"
+        )
+        params: List[Any] = [match]
+        if category_id is not None:
+            sql += " AND category_id = ?"
+            params.append(category_id)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            return [(row[0], -row[1]) for row in self._conn.execute(sql, params)]
+
+    def semantic_search(self, query: str, limit: int = 20, category_id: Optional[int] = None) -> List[tuple]:
+        if not self.semantic:
+            return []
+        hits = self.vectors.search(self.embedder.embed([query])[0], limit, category_id)
+        return [(doc_id, score) for doc_id, score in hits if score >= SEARCH_MIN_SIMILARITY]
+
+    def search(self, query: str, limit: int = 20, mode: str = "hybrid",
+               category_id: Optional[int] = None, candidates: int = 100) -> Dict[str, Any]:
+        """Ranked results with snippets; ``mode`` is hybrid, text or semantic"""
+        started = time.perf_counter()
+        pool = max(candidates, limit)
+        text_hits = self.text_search(query, pool, category_id) if mode in ("hybrid", "text") else []
+        vector_hits = self.semantic_search(query, pool, category_id) if mode in ("hybrid", "semantic") else []
+
+        scores: Dict[int, float] = {}
+        detail: Dict[int, Dict[str, Any]] = {}
+        for source, hits in (("text", text_hits), ("semantic", vector_hits)):
+            for rank, (doc_id, score) in enumerate(hits, start=1):
+                scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (RRF_K + rank)
+                detail.setdefault(doc_id, {})[f"{source}_rank"] = rank
+                detail[doc_id][f"{source}_score"] = round(score, 4)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        results = self._hydrate(query, [doc_id for doc_id, _ in ranked])
+        for result, (doc_id, score) in zip(results, ranked):
+            result.update(detail[doc_id], score=round(score, 6))
+
+        return {
+            "query": query,
+            "mode": mode if self.semantic or mode == "text" else "text",
+            "total": len(results),
+            "results": results,
+            "took_ms": round((time.perf_counter() - started) * 1000, 3)
+        }
+
+    def _hydrate(self, query: str, doc_ids: List[int]) -> List[Dict[str, Any]]:
+        if not doc_ids:
+            return []
+        match = self._fts_query(query)
+        placeholders = ",".join("?" * len(doc_ids))
+        with self._lock:
+            rows = {
+                row[0]: row for row in self._conn.execute(
+                    f"SELECT rowid, title, category_id, substr(body, 1, 200) FROM article_fts WHERE rowid IN ({placeholders})",
+                    doc_ids
+                )
+            }
+            snippets = {}
+            if match:
+                snippets = dict(self._conn.execute(
+                    f"SELECT rowid, snippet(article_fts, 2, '<mark>', '</mark>', '…', 24) FROM article_fts "
+                    f"WHERE article_fts MATCH ? AND rowid IN ({placeholders})",
+                    [match, *doc_ids]
+                ).fetchall())
+        return [
+            {
+                "id": doc_id,
+                "title": rows[doc_id][1],
+                "category_id": rows[doc_id][2],
+                "snippet": snippets.get(doc_id) or rows[doc_id][3]
+            }
+            for doc_id in doc_ids if doc_id in rows
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "articles": self.count(),
+            "semantic": self.semantic,
+            "vectors": len(self.vectors) if self.semantic else 0,
+            "vector_dim": self.embedder.dim if self.semantic else None,
+            "vector_bytes": self.vectors.nbytes if self.semantic else 0,
+            "index_path": self.path
+        }
+
+
+class SearchService:
+    """Async facade over SearchIndex used by the API
+
+    Index work runs in a thread so queries never block the event loop. ORM
+    changes recorded by ``register_model_listeners`` are held on their
+    session until it commits, then coalesced per article and applied by a
+    background task every ``flush_interval``.
+    """
+
+    def __init__(self, path: str = SEARCH_INDEX_PATH, semantic: bool = SEARCH_SEMANTIC_ENABLED,
+                 embedder=None, flush_interval: float = 0.5):
+        self.index = SearchIndex(path, semantic, embedder)
+        self.flush_interval = flush_interval
+        self._pending: Dict[int, Optional[Dict[str, Any]]] = {}
+        self._pending_lock = threading.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+        self._session_listeners = False
+        # Awaited after pending changes reach the index (e.g. to drop cached results)
+        self.on_flush: Optional[Callable[[List[int]], Awaitable[None]]] = None
+
+    async def connect(self):
+        await asyncio.to_thread(self.index.open)
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def disconnect(self):
+        if self._flusher:
+            self._flusher.cancel()
+        await self.flush()
+        self.index.close()
+
+    async def search(self, query: str, limit: int = 20, mode: str = "hybrid",
+                     category_id: Optional[int] = None) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.index.search, query, limit, mode, category_id)
+
+    async def index_article(self, article: Any):
+        """Call after an article is created or updated"""
+        await asyncio.to_thread(self.index.upsert, article)
+
+    async def remove_article(self, article_id: int):
+        """Call after an article is deleted"""
+        await asyncio.to_thread(self.index.remove, article_id)
+
+    async def reindex(self, articles: Iterable[Any], batch_size: int = 1000) -> int:
+        """Full rebuild from the database, in batches"""
+        total, batch = 0, []
+        for article in articles:
+            batch.append(SearchIndex._document(article))
+            if len(batch) >= batch_size:
+                total += await asyncio.to_thread(self.index.upsert_many, batch)
+                batch = []
+        if batch:
+            total += await asyncio.to_thread(self.index.upsert_many, batch)
+        return total
+
+    async def backfill(self, session, model, batch_size: int = 1000) -> int:
+        """Index every row of ``model`` when the index is empty
+
+        Covers the first start and a fresh ``SEARCH_INDEX_PATH``; incremental
+        updates only see rows written after the listeners were registered.
+        ``session`` is an ``AsyncSession``; rows are read on its sync session
+        so relationships such as tags can load lazily.
+        """
+        if await asyncio.to_thread(self.index.count):
+            return 0
+
+        def load(sync_session):
+            from sqlalchemy import select
+
+            rows = sync_session.execute(select(model).execution_options(yield_per=batch_size)).scalars()
+            return [SearchIndex._document(row) for row in rows]
+
+        documents = await session.run_sync(load)
+        total = await self.reindex(documents, batch_size)
+        logger.info(f"Search index backfilled with {total} articles")
+        return total
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self.index.stats(), pending=len(self._pending))
+
+    def register_model_listeners(self, model, to_document: Callable[[Any], Dict[str, Any]] = None):
+        """Track inserts/updates/deletes of an SQLAlchemy model for incremental indexing
+
+        Mapper events fire inside the session flush, before the transaction
+        is known to succeed, so changes are kept in ``session.info`` and only
+        queued for the index once that session commits. A rollback drops them.
+        """
+        from sqlalchemy import event
+        from sqlalchemy.orm import Session, object_session
+
+        to_document = to_document or SearchIndex._document
+
+        def record(target, document):
+            session = object_session(target)
+            if session is None:
+                return
+            session.info.setdefault(SESSION_CHANGES_KEY, {})[int(target.id)] = document
+
+        def saved(mapper, connection, target):
+            record(target, to_document(target))
+
+        def deleted(mapper, connection, target):
+            record(target, None)
+
+        event.listen(model, "after_insert", saved)
+        event.listen(model, "after_update", saved)
+        event.listen(model, "after_delete", deleted)
+
+        if self._session_listeners:
+            return
+        self._session_listeners = True
+
+        def committed(session):
+            changes = session.info.pop(SESSION_CHANGES_KEY, None)
+            if changes:
+                with self._pending_lock:
+                    self._pending.update(changes)
+
+        def rolled_back(session):
+            session.info.pop(SESSION_CHANGES_KEY, None)
+
+        event.listen(Session, "after_commit", committed)
+        event.listen(Session, "after_rollback", rolled_back)
+
+    async def flush(self):
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        upserts = [doc for doc in pending.values() if doc is not None]
+        removals = [doc_id for doc_id, doc in pending.items() if doc is None]
+        try:
+            if upserts:
+                await asyncio.to_thread(self.index.upsert_many, upserts)
+            if removals:
+                await asyncio.to_thread(self.index.remove_many, removals)
+        except Exception:
+            # Put the batch back for the next flush; newer changes to the same article win
+            with self._pending_lock:
+                for doc_id, doc in pending.items():
+                    self._pending.setdefault(doc_id, doc)
+            raise
+        if self.on_flush:
+            await self.on_flush(list(pending))
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Search index flush failed: {e}")
@@ -23,12 +23,14 @@ from app.routes import (
     users,
     voice,
 )
-from app.middleware import LoggingMiddleware, ErrorHandlingMiddleware
+from app.middleware import ErrorHandlingMiddleware
+from app.middleware.request_logging import RequestLoggingMiddleware, setup_access_logging, stop_listener
 from app.utils.logger import setup_logging
 
-# Setup logging
+# Setup logging; access records are written off the request path
 setup_logging()
 logger = logging.getLogger(__name__)
+access_log_listener = setup_access_logging()
 
 
 @asynccontextmanager
@@ -47,6 +49,7 @@ async def lifespan(app: FastAPI):
     await close_db()
     await close_cache()
     logger.info("Application shutdown complete")
+    stop_listener(access_log_listener)
 
 
 # Create FastAPI application
@@ -59,7 +62,7 @@ app = FastAPI(
 
 # Add middleware
 app.add_middleware(ErrorHandlingMiddleware)
-app.add_middleware(LoggingMiddleware)
+app.add_middleware(RequestLoggingMiddleware)
 app.add_middleware(
     TrustedHostMiddleware,
     allowed_hosts=["localhost", "127.0.0.1", "*.cascade.ai"],
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Agent Runtime Context - Autonomous Team
+Shared services injected into specialized agents
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+WORKSPACE = Path("/root/CascadeProjects/autonomous_team_workspace")
+
+# Search paths every agent used to append on import; done once here instead
+RUNTIME_PATHS = [
+    str(WORKSPACE / "integration" / "deepwiki"),
+    "/root/CascadeProjects/strands-agent-team",
+    "/root/CascadeProjects/strands-agent-team/tools"
+]
+
+class AgentRuntime:
+    """Per-process context holding services shared by all agents"""
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, docs=None, workspace: Path = WORKSPACE):
+        self.workspace = workspace
+        self._ensure_paths()
+
+        if docs is None:
+            from documentation_service import DocumentationService
+            docs = DocumentationService()
+        self.docs = docs
+
+    @staticmethod
+    def _ensure_paths():
+        for path in RUNTIME_PATHS:
+            if path not in sys.path:
+                sys.path.append(path)
+
+    def __reduce__(self):
+        # Agents shipped to a process pool pick up that process's own runtime
+        return (AgentRuntime.default, ())
+
+    @classmethod
+    def default(cls) -> "AgentRuntime":
+        """Process-wide runtime used by agents created without one"""
+        if cls._default is None:
+            with cls._default_lock:
+                if cls._default is None:
+                    cls._default = cls()
+        return cls._default
@@ -6,35 +6,39 @@ Generate and maintain documentation
 Mission: Document the autonomous voice integration system
 Tools: doc_generation, example_creation, api_docs
 Repositories: strands_docs, strands_core
+Inputs: voice_integration, communication_profile
+Outputs: system_documentation
 """
 
-
-# Add DeepWiki documentation access
-sys.path.insert(0, '/root/CascadeProjects/autonomous_team_workspace/integration/deepwiki')
-from deepwiki_client import check_documentation_first, doc_client
-import sys
 import os
 from pathlib import Path
+from typing import Dict, Any
 
-# Add Strands repositories to path
-sys.path.append("/root/CascadeProjects/strands-agent-team")
-sys.path.append("/root/CascadeProjects/strands-agent-team/tools")
+# Shared runtime: path setup and documentation service, created once per process
+from agents.runtime import AgentRuntime
 
 class DocumentationAgent:
     """Autonomous agent for Generate and maintain documentation"""
     
-    def __init__(self):
+    def __init__(self, runtime: AgentRuntime = None):
+        self.runtime = runtime or AgentRuntime.default()
         self.agent_name = "documentation_agent"
         self.specialty = "Generate and maintain documentation"
         self.mission = "Document the autonomous voice integration system"
         self.tools = ['doc_generation', 'example_creation', 'api_docs']
         self.repositories = ['strands_docs', 'strands_core']
-        self.workspace = Path("/root/CascadeProjects/autonomous_team_workspace")
+        self.inputs = ['voice_integration', 'communication_profile']
+        self.outputs = ['system_documentation']
+        self.workspace = self.runtime.workspace
         
-    def execute_mission(self):
-        """Execute autonomous mission"""
+    def execute_mission(self, context: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Execute autonomous mission on the upstream artifacts in ``context``; returns this agent's outputs"""
         print(f"🤖 {self.agent_name} executing mission...")
         print(f"🎯 Mission: {self.mission}")
+        context = context or {}
+        for name in self.inputs:
+            if name in context:
+                print(f"   📥 Using upstream artifact: {name}")
         
         # Access repositories
         for repo in self.repositories:
@@ -43,17 +47,24 @@ class DocumentationAgent:
                 print(f"   ✅ Accessing repository: {repo}")
         
         # Implement mission-specific logic
-        self.implement_mission_logic()
+        insights = self.implement_mission_logic()
         
         print(f"✅ {self.agent_name} mission complete")
+        artifact = {
+            "agent": self.agent_name,
+            "mission": self.mission,
+            "insights": insights,
+            "inputs": {name: context[name] for name in self.inputs if name in context}
+        }
+        return {output: artifact for output in self.outputs}
     
 
     def implement_mission_logic(self):
         """Implement mission-specific autonomous logic with documentation"""
         print(f"🔍 Checking DeepWiki documentation for: {self.mission}")
         
-        # Always check documentation first
-        doc_results = check_documentation_first(self.mission, self.specialty)
+        # Always check documentation first (memoized across agents)
+        doc_results = self.runtime.docs.check_documentation_first(self.mission, self.specialty)
         
         if doc_results:
             print("   📚 Using documentation best practices")
@@ -65,6 +76,7 @@ class DocumentationAgent:
             self.use_autonomous_reasoning()
         
         print(f"✅ {self.agent_name} mission complete with documentation support")
+        return [result.get('title', 'Documentation insight') for result in doc_results.get("results", [])] if doc_results else []
     
     def apply_documentation_insights(self, doc_results):
         """Apply insights from DeepWiki documentation"""
@@ -4,7 +4,9 @@ Complete Implementation - All Next Steps
 Execute everything: testing, optimization, documentation, MCP URL method fix
 """
 
+import sys
 import json
+import inspect
 import subprocess
 import yaml
 import requests
@@ -12,6 +14,9 @@ import time
 from pathlib import Path
 from datetime import datetime
 
+sys.path.append(str(Path(__file__).resolve().parents[2] / "integration" / "mcp_servers"))
+import url_mcp_server as url_mcp_module
+
 class CompleteImplementation:
     """Execute all next steps for autonomous team"""
     
@@ -63,140 +68,8 @@ class CompleteImplementation:
         """Fix MCP integration to use URL method instead of direct execution"""
         print("🔧 Fixing MCP with URL method...")
         
-        # Create URL-based MCP server
-        url_mcp_server = '''#!/usr/bin/env python3
-"""
-URL-based MCP Server for Autonomous Team
-Uses HTTP endpoints instead of direct function execution
-"""
-
-import json
-import requests
-import asyncio
-from datetime import datetime
-from typing import Dict, Any, Optional
-
-class URLBasedMCPServer:
-    """MCP Server that communicates via HTTP URLs"""
-    
-    def __init__(self):
-        self.base_url = "https://163.172.191.225"
-        self.api_endpoints = {
-            "voice_synthesis": "/voice",
-            "web_search": "/search",
-            "code_execution": "/execute",
-            "api_testing": "/test-api",
-            "documentation_lookup": "/docs",
-            "task_delegation": "/tasks",
-            "mcp_management": "/mcp",
-            "infrastructure": "/infrastructure"
-        }
-        
-        print("🌐 URL-based MCP Server Initialized")
-        print(f"📡 Base URL: {self.base_url}")
-    
-    async def delegate_task(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Delegate task via HTTP URL"""
-        task_type = task_data.get("type", "general")
-        
-        if task_type in self.api_endpoints:
-            endpoint = self.api_endpoints[task_type]
-            url = f"{self.base_url}{endpoint}"
-            
-            try:
-                response = requests.post(
-                    url,
-                    json=task_data,
-                    timeout=30,
-                    headers={"Content-Type": "application/json"}
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    result["mcp_method"] = "url_based"
-                    result["timestamp"] = datetime.now().isoformat()
-                    return result
-                else:
-                    return {
-                        "status": "error",
-                        "error": f"HTTP {response.status_code}: {response.text}",
-                        "mcp_method": "url_based"
-                    }
-            except Exception as e:
-                return {
-                    "status": "error",
-                    "error": f"Connection error: {str(e)}",
-                    "mcp_method": "url_based"
-                }
-        else:
-            return {
-                "status": "error",
-                "error": f"Unknown task type: {task_type}",
-                "mcp_method": "url_based"
-            }
-    
-    def get_task_status(self, task_id: str) -> Dict[str, Any]:
-        """Get task status via HTTP URL"""
-        url = f"{self.base_url}/tasks/{task_id}/status"
-        
-        try:
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return {"status": "not_found", "error": f"HTTP {response.status_code}"}
-        except Exception as e:
-            return {"status": "error", "error": f"Connection error: {str(e)}"}
-    
-    def list_tasks(self, status_filter: Optional[str] = None) -> list:
-        """List tasks via HTTP URL"""
-        url = f"{self.base_url}/tasks"
-        if status_filter:
-            url += f"?status={status_filter}"
-        
-        try:
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return []
-        except Exception as e:
-            return []
-    
-    def get_team_capabilities(self) -> Dict[str, Any]:
-        """Get team capabilities via HTTP URL"""
-        url = f"{self.base_url}/capabilities"
-        
-        try:
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return {"error": "Capabilities unavailable"}
-        except Exception as e:
-            return {"error": f"Connection error: {str(e)}"}
-
-# Global URL-based MCP server
-url_mcp_server = URLBasedMCPServer()
-
-async def delegate_task(task_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Delegate task using URL-based MCP"""
-    return await url_mcp_server.delegate_task(task_data)
-
-def get_task_status(task_id: str) -> Dict[str, Any]:
-    """Get task status using URL-based MCP"""
-    return url_mcp_server.get_task_status(task_id)
-
-def list_tasks(status_filter: Optional[str] = None) -> list:
-    """List tasks using URL-based MCP"""
-    return url_mcp_server.list_tasks(status_filter)
-
-def get_team_capabilities() -> Dict[str, Any]:
-    """Get team capabilities using URL-based MCP"""
-    return url_mcp_server.get_team_capabilities()
-
-print("🌐 URL-based MCP Server ready for HTTP communication")
-'''
+        # Create URL-based MCP server (non-blocking aiohttp client with pooled connections)
+        url_mcp_server = inspect.getsource(url_mcp_module)
         
         # Save URL-based MCP server
         server_file = Path("/root/CascadeProjects/strands-agent-team/autonomous_team_url_mcp.py")
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Deployment Watcher - Autonomous Team
+Track many deployments at once with adaptive, jittered polling
+"""
+
+import sys
+import time
+import random
+import argparse
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Callable, Tuple
+
+from scaleway_client import ScalewayClient
+
+READY_STATES = {"ready"}
+FAILED_STATES = {"error"}
+# Final states the watcher itself assigns to non-follow watches
+TIMEOUT_STATE = "timeout"
+PROBE_ERROR_STATE = "probe_error"
+
+class Watch:
+    """One watched resource: its probe, current state and timing"""
+
+    def __init__(self, key: str, probe: Callable[[], Tuple[str, Any]], timeout: float, follow: bool, initial_interval: float):
+        self.key = key
+        self.probe = probe
+        self.timeout = timeout
+        self.follow = follow
+        self.callbacks: List[Callable] = []
+
+        self.state: Optional[str] = None
+        self.detail: Any = None
+        self.started_at = time.time()
+        self.ready_at: Optional[float] = None
+        self.polls = 0
+        self.probe_errors = 0
+        self.transitions: List[Tuple[float, str]] = []
+        self.interval = initial_interval
+        self.next_poll_at = self.started_at
+        self.done = False
+
+    @property
+    def time_to_ready(self) -> Optional[float]:
+        return self.ready_at - self.started_at if self.ready_at else None
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "key": self.key,
+            "state": self.state,
+            "time_to_ready": round(self.time_to_ready, 2) if self.ready_at else None,
+            "polls": self.polls,
+            "transitions": [(round(t - self.started_at, 2), s) for t, s in self.transitions]
+        }
+
+class DeploymentWatcher:
+    """Poll many resources concurrently, fast at first and slower once stable
+
+    Each watch polls after ``initial_interval`` seconds, and the interval grows
+    by ``backoff`` per unchanged poll up to ``max_interval``. Any state change
+    resets it, so transitions are seen within seconds. Intervals are jittered
+    by ``±jitter`` so watches started together do not poll in lockstep.
+    A probe that raises reports ``unknown``; after ``max_probe_errors`` in a
+    row a non-follow watch ends in ``probe_error`` instead of retrying until
+    its timeout. Callbacks receive ``(watch, old_state, new_state)``,
+    including for the final ``timeout`` and ``probe_error`` states.
+    """
+
+    def __init__(self,
+                 client: ScalewayClient = None,
+                 initial_interval: float = 1.0,
+                 max_interval: float = 30.0,
+                 backoff: float = 1.6,
+                 jitter: float = 0.2,
+                 max_workers: int = 8,
+                 max_probe_errors: int = 5):
+        self.client = client or ScalewayClient()
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+        self.max_workers = max_workers
+        self.max_probe_errors = max_probe_errors
+
+        self.watches: Dict[str, Watch] = {}
+        self.callbacks: List[Callable] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+
+    def watch(self, key: str, probe: Callable[[], Tuple[str, Any]], on_change: Callable = None,
+              timeout: float = 300, follow: bool = False) -> Watch:
+        """Watch anything whose probe returns ``(state, detail)``"""
+        watch = Watch(key, probe, timeout, follow, self.initial_interval)
+        if on_change:
+            watch.callbacks.append(on_change)
+        with self._lock:
+            self.watches[key] = watch
+        self._wakeup.set()
+        return watch
+
+    def watch_container(self, container_id: str, **kwargs) -> Watch:
+        def probe():
+            container = self.client.get_container(container_id)
+            return container.status, container
+        return self.watch(container_id, probe, **kwargs)
+
+    def watch_url(self, url: str, expected_status: int = 200, **kwargs) -> Watch:
+        import requests
+
+        session = requests.Session()
+
+        def probe():
+            try:
+                response = session.get(url, timeout=(10, 30))
+            except requests.RequestException as e:
+                return "unreachable", str(e)
+            state = "ready" if response.status_code == expected_status else f"http_{response.status_code}"
+            return state, response.status_code
+        return self.watch(url, probe, **kwargs)
+
+    def on_change(self, callback: Callable):
+        """Register a callback for state changes on every watch"""
+        self.callbacks.append(callback)
+
+    def _next_interval(self, watch: Watch, changed: bool) -> float:
+        if changed:
+            watch.interval = self.initial_interval
+        else:
+            watch.interval = min(watch.interval * self.backoff, self.max_interval)
+        return watch.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _poll(self, watch: Watch):
+        try:
+            state, detail = watch.probe()
+            return watch, state, detail, False
+        except Exception as e:
+            return watch, "unknown", str(e), True
+
+    def _set_state(self, watch: Watch, state: str, detail: Any, now: float) -> bool:
+        """Record the new state and fire callbacks if it changed"""
+        old_state, changed = watch.state, state != watch.state
+        watch.state, watch.detail = state, detail
+        if not changed:
+            return False
+
+        watch.transitions.append((now, state))
+        if state in READY_STATES and watch.ready_at is None:
+            watch.ready_at = now
+        for callback in self.callbacks + watch.callbacks:
+            try:
+                callback(watch, old_state, state)
+            except Exception as e:
+                print(f"   ⚠️  Watch callback failed for {watch.key}: {e}")
+        return True
+
+    def _apply(self, watch: Watch, state: str, detail: Any, probe_failed: bool = False):
+        now = time.time()
+        watch.polls += 1
+        watch.probe_errors = watch.probe_errors + 1 if probe_failed else 0
+        if not watch.follow and self.max_probe_errors and watch.probe_errors >= self.max_probe_errors:
+            state = PROBE_ERROR_STATE
+        changed = self._set_state(watch, state, detail, now)
+
+        if not watch.follow:
+            if state in READY_STATES or state in FAILED_STATES or state == PROBE_ERROR_STATE:
+                watch.done = True
+            elif now - watch.started_at >= watch.timeout:
+                self._set_state(watch, TIMEOUT_STATE, detail, now)
+                watch.done = True
+        watch.next_poll_at = now + self._next_interval(watch, changed)
+
+    def run(self) -> Dict[str, Dict[str, Any]]:
+        """Poll until every non-follow watch finishes (or stop() is called)"""
+        self._stopped = False
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="watch") as pool:
+            while not self._stopped:
+                with self._lock:
+                    active = [w for w in self.watches.values() if not w.done]
+                if not active:
+                    break
+
+                now = time.time()
+                due = [w for w in active if w.next_poll_at <= now]
+                for watch, state, detail, probe_failed in pool.map(self._poll, due):
+                    self._apply(watch, state, detail, probe_failed)
+
+                pending = [w.next_poll_at for w in active if not w.done]
+                if pending:
+                    self._wakeup.clear()
+                    self._wakeup.wait(max(0.0, min(pending) - time.time()))
+
+        return self.report()
+
+    def stop(self):
+        self._stopped = True
+        self._wakeup.set()
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        return {key: watch.summary() for key, watch in self.watches.items()}
+
+def print_change(watch: Watch, old_state: Optional[str], new_state: str):
+    """Default callback: one line per state change"""
+    elapsed = time.time() - watch.started_at
+    failed = new_state in FAILED_STATES or new_state in (TIMEOUT_STATE, PROBE_ERROR_STATE)
+    emoji = "✅" if new_state in READY_STATES else "❌" if failed else "⏳"
+    print(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] {emoji} {watch.key}: {old_state or 'new'} → {new_state} "
+          f"after {elapsed:.1f}s ({watch.polls} polls)")
+
+def main():
+    """Follow containers and endpoints from the command line"""
+    parser = argparse.ArgumentParser(description="Watch Scaleway deployments")
+    parser.add_argument("--container", action="append", default=[], help="Container ID to watch")
+    parser.add_argument("--url", action="append", default=[], help="HTTP endpoint expected to return 200")
+    parser.add_argument("--region", default="fr-par")
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--follow", action="store_true", help="Keep watching after resources become ready")
+    parser.add_argument("--max-interval", type=float, default=30.0)
+    args = parser.parse_args()
+
+    watcher = DeploymentWatcher(ScalewayClient(region=args.region), max_interval=args.max_interval)
+    watcher.on_change(print_change)
+
+    for container_id in args.container:
+        watcher.watch_container(container_id, timeout=args.timeout, follow=args.follow)
+    for url in args.url:
+        watcher.watch_url(url, timeout=args.timeout, follow=args.follow)
+
+    def check_critical(watch, old_state, new_state):
+        if watch.key in args.container and new_state in FAILED_STATES:
+            print(f"   🚨 CRITICAL: Container {watch.key} is in ERROR state")
+            if getattr(watch.detail, "error_message", None):
+                print(f"   📝 Error: {watch.detail.error_message}")
+            print("   💡 Suggestion: Check container logs in Scaleway Console")
+            print("   💡 Suggestion: Consider redeploying the container")
+            return
+        states = {w.key: w.state for w in watcher.watches.values()}
+        containers_ready = all(states.get(c) in READY_STATES for c in args.container)
+        if containers_ready and any(states.get(u) == "unreachable" for u in args.url):
+            print("   🚨 CRITICAL: Container is ready but web endpoint is unreachable")
+            print("   💡 Suggestion: Check port configuration and health checks")
+            print("   💡 Suggestion: Verify environment variables")
+    watcher.on_change(check_critical)
+
+    try:
+        report = watcher.run()
+    except KeyboardInterrupt:
+        watcher.stop()
+        report = watcher.report()
+
+    failed = False
+    for summary in report.values():
+        ttr = f"{summary['time_to_ready']}s" if summary["time_to_ready"] is not None else "n/a"
+        print(f"📊 {summary['key']}: {summary['state']} (time to ready {ttr}, {summary['polls']} polls)")
+        failed = failed or summary["state"] not in READY_STATES
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Fake Scaleway CLI - Autonomous Team
+Stand-in for ``scw function function list|create|update|deploy -o json`` in offline runs
+
+Environment:
+    FAKE_SCW_STATE    JSON file holding the fake namespace contents
+    FAKE_SCW_LATENCY  seconds each create takes (deploys take twice as long)
+    FAKE_SCW_FAIL     comma-separated function names whose deploy fails
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import fcntl
+from pathlib import Path
+
+def parse_args(argv):
+    words, params = [], {}
+    for arg in argv:
+        if "=" in arg:
+            key, value = arg.split("=", 1)
+            params[key] = value
+        elif arg not in ("-o", "json"):
+            words.append(arg)
+    return words, params
+
+def environment_of(params):
+    prefix = "environment-variables."
+    return {key[len(prefix):]: value for key, value in params.items() if key.startswith(prefix)}
+
+def main():
+    words, params = parse_args(sys.argv[1:])
+    state_path = Path(os.environ.get("FAKE_SCW_STATE", "/tmp/fake_scw_state.json"))
+    latency = float(os.environ.get("FAKE_SCW_LATENCY", "1.0"))
+    failing = set(filter(None, os.environ.get("FAKE_SCW_FAIL", "").split(",")))
+
+    if words[:2] != ["function", "function"] or len(words) < 3:
+        print(f"fake scw: unsupported command {' '.join(words)}", file=sys.stderr)
+        return 1
+    action = words[2]
+
+    def update_state(change):
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(state_path.with_suffix(".lock"), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            state = json.loads(state_path.read_text()) if state_path.exists() else {"functions": {}}
+            result = change(state["functions"])
+            state_path.write_text(json.dumps(state, indent=2))
+            return result
+
+    if action == "list":
+        functions = update_state(lambda fns: [f for f in fns.values() if f["namespace_id"] == params.get("namespace-id")])
+        print(json.dumps(functions))
+        return 0
+
+    if action == "create":
+        time.sleep(latency)
+
+        def create(fns):
+            if any(f["name"] == params["name"] and f["namespace_id"] == params["namespace-id"] for f in fns.values()):
+                return None
+            function = {
+                "id": str(uuid.uuid4()),
+                "name": params["name"],
+                "namespace_id": params["namespace-id"],
+                "runtime": params.get("runtime"),
+                "handler": params.get("handler"),
+                "environment_variables": environment_of(params),
+                "status": "created"
+            }
+            fns[function["id"]] = function
+            return function
+
+        function = update_state(create)
+        if function is None:
+            print(f"fake scw: function {params['name']} already exists", file=sys.stderr)
+            return 1
+        print(json.dumps(function))
+        return 0
+
+    if action == "update":
+        function_id = words[3] if len(words) > 3 else params.get("function-id")
+
+        def update(fns):
+            function = fns.get(function_id)
+            if function is not None:
+                function.setdefault("environment_variables", {}).update(environment_of(params))
+            return function
+
+        function = update_state(update)
+        if function is None:
+            print(f"fake scw: function {function_id} not found", file=sys.stderr)
+            return 1
+        print(json.dumps(function))
+        return 0
+
+    if action == "deploy":
+        time.sleep(latency * 2)
+        function_id = params.get("function-id")
+        zip_file = params.get("zip-file")
+        if zip_file and not Path(zip_file).exists():
+            print(f"fake scw: zip file {zip_file} not found", file=sys.stderr)
+            return 1
+
+        def deploy(fns):
+            function = fns.get(function_id)
+            if function is None or function["name"] in failing:
+                return function, False
+            function["status"] = "ready"
+            return function, True
+
+        function, ok = update_state(deploy)
+        if not ok:
+            print(f"fake scw: deploy of {function_id} failed", file=sys.stderr)
+            return 1
+        print(json.dumps(function))
+        return 0
+
+    print(f"fake scw: unsupported action {action}", file=sys.stderr)
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Serverless Function Deployment Pipeline - Autonomous Team
+Build artifacts concurrently, skip unchanged functions, deploy in parallel
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import zipfile
+import argparse
+import threading
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Optional
+
+from scaleway_client import CLITransport, ScalewayError
+
+BUILD_ROOT = Path("/tmp/scaleway_functions")
+DEFAULT_REQUIREMENTS = "requests>=2.31.0\n"
+FAKE_SCW = Path(__file__).resolve().parent / "fake_scw.py"
+
+# Fixed zip metadata so identical sources always produce identical artifacts
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+class FunctionArtifact:
+    """Source files and zip for one function"""
+
+    def __init__(self, spec: Dict[str, Any], build_root: Path):
+        self.spec = spec
+        self.name = spec["name"]
+        self.build_dir = build_root / self.name
+        self.zip_path = self.build_dir / "function.zip"
+
+        self.files: Dict[str, bytes] = {
+            "handler.py": spec["code"].encode(),
+            "requirements.txt": spec.get("requirements", DEFAULT_REQUIREMENTS).encode()
+        }
+        for extra_file in spec.get("extra_files", []):
+            self.files[Path(extra_file).name] = Path(extra_file).read_bytes()
+
+        self.content_hash = self._hash()
+
+    def _hash(self) -> str:
+        digest = hashlib.sha256()
+        config = {k: self.spec.get(k) for k in ("runtime", "handler", "description", "env")}
+        digest.update(json.dumps(config, sort_keys=True).encode())
+        for arcname in sorted(self.files):
+            digest.update(arcname.encode() + b"\0")
+            digest.update(hashlib.sha256(self.files[arcname]).digest())
+        return digest.hexdigest()
+
+    def build(self) -> Path:
+        """Write a deterministic zip of the function sources"""
+        self.build_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.zip_path.with_suffix(".zip.tmp")
+        with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED) as zipf:
+            for arcname in sorted(self.files):
+                info = zipfile.ZipInfo(arcname, date_time=ZIP_DATE_TIME)
+                info.external_attr = 0o644 << 16
+                info.compress_type = zipfile.ZIP_DEFLATED
+                zipf.writestr(info, self.files[arcname])
+        os.replace(tmp_path, self.zip_path)
+        return self.zip_path
+
+class FunctionDeployPipeline:
+    """Deploy a namespace of functions with bounded parallelism
+
+    Artifacts are built concurrently. A function whose content hash matches
+    the last successful deploy is skipped. The remaining create/deploy
+    calls run at most ``concurrency`` at a time, and ``run()`` returns a
+    per-function timing report.
+    """
+
+    def __init__(self,
+                 namespace_id: str,
+                 region: str = "fr-par",
+                 concurrency: int = 4,
+                 build_root: Path = BUILD_ROOT,
+                 transport: CLITransport = None,
+                 create_timeout: float = 60,
+                 deploy_timeout: float = 120):
+        self.namespace_id = namespace_id
+        self.region = region
+        self.concurrency = concurrency
+        self.build_root = Path(build_root)
+        self.transport = transport or CLITransport()
+        self.create_timeout = create_timeout
+        self.deploy_timeout = deploy_timeout
+
+        self.state_file = self.build_root / f".deployed_{namespace_id}.json"
+        self._state_lock = threading.Lock()
+
+    def _load_state(self) -> Dict[str, str]:
+        if self.state_file.exists():
+            return json.loads(self.state_file.read_text())
+        return {}
+
+    def _record_deployed(self, name: str, content_hash: str):
+        with self._state_lock:
+            state = self._load_state()
+            state[name] = content_hash
+            tmp_path = self.state_file.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(state, indent=2))
+            os.replace(tmp_path, self.state_file)
+
+    def _existing_functions(self) -> Dict[str, str]:
+        """Name -> function ID for functions already in the namespace"""
+        functions = self.transport.run(
+            ["function", "function", "list"],
+            {"namespace_id": self.namespace_id, "region": self.region}
+        )
+        return {f["name"]: f["id"] for f in functions or []}
+
+    def _deploy_one(self, artifact: FunctionArtifact, function_id: Optional[str]) -> Dict[str, Any]:
+        spec = artifact.spec
+        timing: Dict[str, Any] = {}
+
+        env = {f"environment_variables.{key}": value for key, value in spec.get("env", {}).items()}
+        if function_id is None:
+            started = time.perf_counter()
+            created = self.transport.run(["function", "function", "create"], {
+                "namespace_id": self.namespace_id,
+                "name": spec["name"],
+                "runtime": spec["runtime"],
+                "handler": spec["handler"],
+                "description": spec.get("description", ""),
+                "region": self.region,
+                **env
+            }, timeout=self.create_timeout)
+            function_id = created["id"]
+            timing["create_seconds"] = round(time.perf_counter() - started, 3)
+            print(f"   ✅ Function {spec['name']} created")
+        elif env:
+            # Environment is part of the content hash; push it before the new code
+            self.transport.run(["function", "function", "update", function_id],
+                               {"region": self.region, **env}, timeout=self.create_timeout)
+
+        started = time.perf_counter()
+        self.transport.run(["function", "function", "deploy"], {
+            "function_id": function_id,
+            "namespace_id": self.namespace_id,
+            "region": self.region,
+            "zip_file": artifact.zip_path
+        }, timeout=self.deploy_timeout)
+        timing["deploy_seconds"] = round(time.perf_counter() - started, 3)
+        timing["function_id"] = function_id
+        return timing
+
+    def run(self, functions: List[Dict[str, Any]], force: bool = False) -> Dict[str, Any]:
+        """Build, diff and deploy; returns the timing report"""
+        pipeline_start = time.perf_counter()
+        report: Dict[str, Dict[str, Any]] = {}
+
+        artifacts = [FunctionArtifact(spec, self.build_root) for spec in functions]
+        deployed_hashes = {} if force else self._load_state()
+        changed = [a for a in artifacts if deployed_hashes.get(a.name) != a.content_hash]
+
+        for artifact in artifacts:
+            report[artifact.name] = {"status": "skipped", "hash": artifact.content_hash[:12]}
+            if artifact not in changed:
+                print(f"   ⏭️  {artifact.name} unchanged - skipping")
+
+        with ThreadPoolExecutor(max_workers=max(1, self.concurrency)) as pool:
+            # Build every changed artifact at once
+            build_start = time.perf_counter()
+            build_futures = {pool.submit(self._timed_build, a): a for a in changed}
+            for future in as_completed(build_futures):
+                report[build_futures[future].name]["build_seconds"] = future.result()
+            build_seconds = time.perf_counter() - build_start
+
+            existing = self._existing_functions() if changed else {}
+
+            deploy_futures = {}
+            for artifact in changed:
+                print(f"   🚀 Deploying {artifact.name}...")
+                deploy_futures[pool.submit(self._timed_deploy, artifact, existing.get(artifact.name))] = artifact
+
+            for future in as_completed(deploy_futures):
+                artifact = deploy_futures[future]
+                entry = report[artifact.name]
+                try:
+                    entry.update(future.result())
+                    entry["status"] = "deployed"
+                    self._record_deployed(artifact.name, artifact.content_hash)
+                    print(f"   ✅ {artifact.name} deployed in {entry['total_seconds']:.1f}s")
+                except Exception as e:
+                    entry["status"] = "failed"
+                    entry["error"] = str(e)
+                    print(f"   ❌ {artifact.name} deployment failed: {e}")
+
+        return {
+            "namespace_id": self.namespace_id,
+            "concurrency": self.concurrency,
+            "wall_clock_seconds": round(time.perf_counter() - pipeline_start, 3),
+            "build_seconds": round(build_seconds, 3),
+            "deployed": [n for n, e in report.items() if e["status"] == "deployed"],
+            "skipped": [n for n, e in report.items() if e["status"] == "skipped"],
+            "failed": [n for n, e in report.items() if e["status"] == "failed"],
+            "functions": report,
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def _timed_build(self, artifact: FunctionArtifact) -> float:
+        started = time.perf_counter()
+        artifact.build()
+        return round(time.perf_counter() - started, 3)
+
+    def _timed_deploy(self, artifact: FunctionArtifact, function_id: Optional[str]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        timing = self._deploy_one(artifact, function_id)
+        timing["total_seconds"] = round(time.perf_counter() - started, 3)
+        return timing
+
+def print_timing_report(report: Dict[str, Any]):
+    """Per-function timing table"""
+    print(f"\n⏱️  Pipeline wall clock: {report['wall_clock_seconds']:.1f}s "
+          f"(builds {report['build_seconds']:.2f}s, concurrency {report['concurrency']})")
+    print(f"   {'function':<28} {'status':<9} {'build':>7} {'create':>7} {'deploy':>7} {'total':>7}")
+    for name, entry in report["functions"].items():
+        def cell(key):
+            return f"{entry[key]:.2f}" if key in entry else "-"
+        print(f"   {name:<28} {entry['status']:<9} {cell('build_seconds'):>7} {cell('create_seconds'):>7} "
+              f"{cell('deploy_seconds'):>7} {cell('total_seconds'):>7}")
+
+def fake_transport(latency: float = 1.0, fail: str = "", state_file: Path = None) -> CLITransport:
+    """CLI transport backed by fake_scw.py for offline runs"""
+    os.environ["FAKE_SCW_LATENCY"] = str(latency)
+    os.environ["FAKE_SCW_FAIL"] = fail
+    os.environ["FAKE_SCW_STATE"] = str(state_file or BUILD_ROOT / "fake_scw_state.json")
+    return CLITransport(scw_binary=str(FAKE_SCW))
+
+def main():
+    """Benchmark sequential vs parallel deploys of the team's functions against the fake CLI"""
+    parser = argparse.ArgumentParser(description="Serverless deployment pipeline benchmark")
+    parser.add_argument("--latency", type=float, default=1.0, help="Fake CLI seconds per call")
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    sys.path.append("/root/CascadeProjects")
+    from deploy_scaleway_functions_correct import function_specs
+
+    build_root = Path("/tmp/scaleway_functions_benchmark")
+    for concurrency in (1, args.concurrency):
+        state_file = build_root / f"fake_state_{concurrency}.json"
+        state_file.unlink(missing_ok=True)
+        pipeline = FunctionDeployPipeline(
+            namespace_id=f"bench-{concurrency}",
+            concurrency=concurrency,
+            build_root=build_root,
+            transport=fake_transport(args.latency, state_file=state_file)
+        )
+        (build_root / f".deployed_bench-{concurrency}.json").unlink(missing_ok=True)
+
+        print(f"\n🚀 Concurrency {concurrency}: first deploy")
+        print_timing_report(pipeline.run(function_specs()))
+        print(f"\n🔁 Concurrency {concurrency}: redeploy with no changes")
+        print_timing_report(pipeline.run(function_specs()))
+
+if __name__ == "__main__":
+    main()
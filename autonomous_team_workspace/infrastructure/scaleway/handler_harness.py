@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Serverless Handler Harness - Autonomous Team
+Simulate cold and warm invocations of a generated function locally
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Any
+
+# Runs in a fresh interpreter, like a new function instance
+INSTANCE_SCRIPT = '''
+import sys, json, time, importlib
+started = time.perf_counter()
+sys.path.insert(0, ".")
+module_name, attr, event, warm = sys.argv[1], sys.argv[2], json.loads(sys.argv[3]), int(sys.argv[4])
+handler = getattr(importlib.import_module(module_name), attr)
+init_ms = (time.perf_counter() - started) * 1000
+
+timings, statuses = [], []
+for _ in range(1 + warm):
+    call_started = time.perf_counter()
+    response = handler(event, {})
+    timings.append((time.perf_counter() - call_started) * 1000)
+    statuses.append(response.get("statusCode"))
+
+print("__HARNESS__" + json.dumps({"init_ms": init_ms, "cold_ms": timings[0], "warm_ms": timings[1:], "statuses": statuses}))
+'''
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 3) if ordered else None
+
+def run_instance(function_dir: Path, handler: str, event: Dict[str, Any], warm: int, env: Dict[str, str] = None) -> Dict[str, Any]:
+    """Start one instance, invoke it once cold then ``warm`` more times"""
+    module_name, attr = handler.rsplit(".", 1)
+    process_env = os.environ.copy()
+    process_env.update(env or {})
+
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", INSTANCE_SCRIPT, module_name, attr, json.dumps(event), str(warm)],
+        cwd=function_dir,
+        env=process_env,
+        capture_output=True,
+        text=True,
+        timeout=120
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    for line in result.stdout.splitlines():
+        if line.startswith("__HARNESS__"):
+            stats = json.loads(line[len("__HARNESS__"):])
+            stats["process_ms"] = wall_ms
+            return stats
+    raise RuntimeError(f"Instance failed: {result.stderr.strip()[-500:]}")
+
+def simulate(function_dir: Path, handler: str = "handler.main", event: Dict[str, Any] = None,
+             cold_starts: int = 5, warm: int = 50, env: Dict[str, str] = None) -> Dict[str, Any]:
+    """Cold starts in fresh instances plus warm invocations on each"""
+    instances = [run_instance(Path(function_dir), handler, event or {}, warm, env) for _ in range(cold_starts)]
+    warm_ms = [t for i in instances for t in i["warm_ms"]]
+    statuses = [s for i in instances for s in i["statuses"]]
+
+    return {
+        "function_dir": str(function_dir),
+        "handler": handler,
+        "cold_starts": cold_starts,
+        "warm_invocations": len(warm_ms),
+        "init_ms_p50": percentile([i["init_ms"] for i in instances], 0.5),
+        "cold_invocation_ms_p50": percentile([i["cold_ms"] for i in instances], 0.5),
+        "instance_start_ms_p50": percentile([i["process_ms"] for i in instances], 0.5),
+        "warm_ms_p50": percentile(warm_ms, 0.5),
+        "warm_ms_p95": percentile(warm_ms, 0.95),
+        "errors": sum(1 for s in statuses if s != 200)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate cold and warm serverless invocations")
+    parser.add_argument("function_dir", type=Path, help="Directory holding handler.py (and handler_runtime.py)")
+    parser.add_argument("--handler", default="handler.main", help="module.function entry point")
+    parser.add_argument("--event", default="{}", help="JSON event passed to every invocation")
+    parser.add_argument("--cold", type=int, default=5, help="Number of fresh instances")
+    parser.add_argument("--warm", type=int, default=50, help="Warm invocations per instance")
+    args = parser.parse_args()
+
+    report = simulate(args.function_dir, args.handler, json.loads(args.event), args.cold, args.warm)
+
+    print(f"🧊 Init (module import):   {report['init_ms_p50']:.2f} ms p50")
+    print(f"🥶 Cold invocation:        {report['cold_invocation_ms_p50']:.2f} ms p50")
+    print(f"🔥 Warm invocation:        {report['warm_ms_p50']:.3f} ms p50, {report['warm_ms_p95']:.3f} ms p95")
+    print(f"🚀 Instance start to exit: {report['instance_start_ms_p50']:.0f} ms p50")
+    print(json.dumps(report, indent=2))
+    return 1 if report["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
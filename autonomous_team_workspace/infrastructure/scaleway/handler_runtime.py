@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Serverless Handler Runtime - Autonomous Team
+Shared by generated function handlers to keep cold starts short and warm calls cheap
+
+Shipped next to each handler.py. Heavy modules (requests, subprocess,
+tempfile) are imported on first use, configuration and the HTTP session are
+built once per instance and reused by warm invocations, and every response
+reports whether it was a cold start plus init and handler timings.
+"""
+
+import os
+import json
+import time
+import functools
+from collections import deque
+
+_RUNTIME_LOADED_AT = time.perf_counter()
+
+_stats = {
+    "init_ms": None,
+    "invocations": 0,
+    "cold_ms": None,
+    "warm_ms": deque(maxlen=1000)
+}
+_session = None
+
+@functools.lru_cache(maxsize=None)
+def env(name: str, default: str = None) -> str:
+    """Environment setting, read once per instance"""
+    return os.environ.get(name, default)
+
+def http_session():
+    """Pooled requests.Session shared by warm invocations (requests imported on first use)"""
+    global _session
+    if _session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        _session = requests.Session()
+        _session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+    return _session
+
+def parse_event(event) -> dict:
+    """Request payload from a raw string, an HTTP event with a body, or a plain dict"""
+    if isinstance(event, (str, bytes)):
+        return json.loads(event) if event else {}
+    if isinstance(event, dict) and "body" in event:
+        body = event["body"]
+        if isinstance(body, (str, bytes)):
+            return json.loads(body) if body else {}
+        return body or {}
+    return event or {}
+
+def json_response(status_code: int, body: dict, headers: dict = None) -> dict:
+    response_headers = {"Content-Type": "application/json"}
+    response_headers.update(headers or {})
+    return {
+        "statusCode": status_code,
+        "body": json.dumps(body),
+        "headers": response_headers
+    }
+
+def function_handler(function_name: str = None, headers: dict = None):
+    """Wrap ``fn(data, context) -> dict`` as a platform handler ``(event, context)``
+
+    The wrapped function receives the parsed payload. Its return value becomes a
+    200 JSON response and any exception a 500. Responses carry ``X-Cold-Start``
+    and a ``Server-Timing`` header with init and handler durations.
+    """
+    def decorator(fn):
+        # Decoration happens at the end of the handler module's import
+        if _stats["init_ms"] is None:
+            _stats["init_ms"] = (time.perf_counter() - _RUNTIME_LOADED_AT) * 1000
+
+        @functools.wraps(fn)
+        def handler(event, context=None):
+            started = time.perf_counter()
+            cold = _stats["invocations"] == 0
+            _stats["invocations"] += 1
+            name = function_name or env("FUNCTION_NAME", "unknown")
+
+            try:
+                status_code, body = 200, fn(parse_event(event), context)
+            except Exception as e:
+                status_code, body = 500, {"error": str(e), "serverless": True, "function": name}
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if cold:
+                _stats["cold_ms"] = elapsed_ms
+                print(json.dumps({
+                    "event": "cold_start",
+                    "function": name,
+                    "init_ms": round(_stats["init_ms"], 2),
+                    "first_invocation_ms": round(elapsed_ms, 2)
+                }))
+            else:
+                _stats["warm_ms"].append(elapsed_ms)
+
+            timing_headers = {
+                "X-Cold-Start": "true" if cold else "false",
+                "Server-Timing": f"init;dur={_stats['init_ms']:.2f}, handler;dur={elapsed_ms:.2f}"
+            }
+            timing_headers.update(headers or {})
+            return json_response(status_code, body, timing_headers)
+
+        return handler
+    return decorator
+
+def runtime_stats() -> dict:
+    """Cold versus warm timings for this instance"""
+    warm = sorted(_stats["warm_ms"])
+
+    def percentile(p: float):
+        return round(warm[min(len(warm) - 1, int(p * len(warm)))], 3) if warm else None
+
+    return {
+        "invocations": _stats["invocations"],
+        "init_ms": round(_stats["init_ms"], 3) if _stats["init_ms"] is not None else None,
+        "cold_ms": round(_stats["cold_ms"], 3) if _stats["cold_ms"] is not None else None,
+        "warm_p50_ms": percentile(0.50),
+        "warm_p95_ms": percentile(0.95)
+    }
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Scaleway Infrastructure Client - Autonomous Team
+Typed access to containers and load balancers via JSON, not scraped CLI text
+"""
+
+import os
+import json
+import subprocess
+import threading
+from pathlib import Path
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Union
+
+DEFAULT_REGION = "fr-par"
+DEFAULT_ZONE = "fr-par-1"
+API_URL = "https://api.scaleway.com"
+
+class ScalewayError(Exception):
+    """A Scaleway CLI or API call failed"""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        self.status = status
+        super().__init__(message)
+
+@dataclass
+class Container:
+    id: str
+    name: str
+    status: str
+    domain_name: Optional[str] = None
+    error_message: Optional[str] = None
+    namespace_id: Optional[str] = None
+    region: str = DEFAULT_REGION
+    raw: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "Container":
+        return cls(
+            id=data["id"],
+            name=data.get("name", ""),
+            status=data.get("status", "unknown"),
+            domain_name=data.get("domain_name") or None,
+            error_message=data.get("error_message") or None,
+            namespace_id=data.get("namespace_id"),
+            region=data.get("region", DEFAULT_REGION),
+            raw=data
+        )
+
+    @property
+    def is_ready(self) -> bool:
+        return self.status == "ready"
+
+    @property
+    def is_failed(self) -> bool:
+        return self.status == "error"
+
+@dataclass
+class LoadBalancer:
+    id: str
+    name: str
+    status: str
+    ip_addresses: List[str] = field(default_factory=list)
+    zone: str = DEFAULT_ZONE
+    raw: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "LoadBalancer":
+        return cls(
+            id=data["id"],
+            name=data.get("name", ""),
+            status=data.get("status", "unknown"),
+            ip_addresses=[ip.get("ip_address") for ip in data.get("ip", []) if ip.get("ip_address")],
+            zone=data.get("zone", DEFAULT_ZONE),
+            raw=data
+        )
+
+# Resource name -> (scw CLI words, API path template, location key)
+RESOURCES = {
+    "container": (["container", "container"], "/containers/v1beta1/regions/{region}/containers", "region"),
+    "namespace": (["container", "namespace"], "/containers/v1beta1/regions/{region}/namespaces", "region"),
+    "function": (["function", "function"], "/functions/v1beta1/regions/{region}/functions", "region"),
+    "lb": (["lb", "lb"], "/lb/v1/zones/{zone}/lbs", "zone")
+}
+
+class CLITransport:
+    """Run ``scw ... -o json`` without a shell and decode the JSON it prints"""
+
+    def __init__(self, scw_binary: str = "scw", timeout: float = 120):
+        self.scw_binary = scw_binary
+        self.timeout = timeout
+
+    def run(self, words: List[str], params: Dict[str, Any] = None, timeout: float = None) -> Any:
+        """Run any ``scw`` subcommand and return its decoded JSON output"""
+        params = params or {}
+        args = [f"{self._flag(k)}={v}" for k, v in params.items()]
+        cmd = [self.scw_binary] + words + args + ["-o", "json"]
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout or self.timeout)
+        if result.returncode != 0:
+            raise ScalewayError(f"{' '.join(cmd[:4])} failed: {result.stderr.strip()}", result.returncode)
+        return json.loads(result.stdout) if result.stdout.strip() else {}
+
+    @staticmethod
+    def _flag(key: str) -> str:
+        """python_name -> cli-name; map keys after the first dot (``environment-variables.MY_VAR``) are kept"""
+        name, dot, rest = key.partition(".")
+        return name.replace("_", "-") + dot + rest
+
+    def get(self, resource: str, resource_id: str, **params) -> Dict[str, Any]:
+        return self.run(RESOURCES[resource][0] + ["get", resource_id], params)
+
+    def list(self, resource: str, **params) -> List[Dict[str, Any]]:
+        return self.run(RESOURCES[resource][0] + ["list"], params)
+
+    def create(self, resource: str, **params) -> Dict[str, Any]:
+        return self.run(RESOURCES[resource][0] + ["create"], params)
+
+class APITransport:
+    """Call the Scaleway REST API over one pooled HTTP session"""
+
+    def __init__(self, secret_key: str = None, pool_size: int = 16, timeout: float = 30):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["X-Auth-Token"] = secret_key or os.environ["SCW_SECRET_KEY"]
+        self.session.mount("https://", HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+
+    def _url(self, resource: str, params: Dict[str, Any]) -> str:
+        _, path, location_key = RESOURCES[resource]
+        location = params.pop(location_key, DEFAULT_REGION if location_key == "region" else DEFAULT_ZONE)
+        return API_URL + path.format(**{location_key: location})
+
+    def _check(self, response) -> Any:
+        if response.status_code >= 400:
+            raise ScalewayError(f"{response.request.method} {response.url} failed: {response.text}", response.status_code)
+        return response.json() if response.content else {}
+
+    def get(self, resource: str, resource_id: str, **params) -> Dict[str, Any]:
+        url = f"{self._url(resource, params)}/{resource_id}"
+        return self._check(self.session.get(url, params=params, timeout=self.timeout))
+
+    def list(self, resource: str, **params) -> List[Dict[str, Any]]:
+        url = self._url(resource, params)
+        body = self._check(self.session.get(url, params=params, timeout=self.timeout))
+        # List responses wrap items, e.g. {"containers": [...], "total_count": n}
+        return next((v for v in body.values() if isinstance(v, list)), [])
+
+    def create(self, resource: str, **params) -> Dict[str, Any]:
+        deploy = str(params.pop("deploy", "false")).lower() == "true"
+        url = self._url(resource, params)
+        created = self._check(self.session.post(url, json=_cli_params_to_body(params), timeout=self.timeout))
+        if deploy:
+            created = self._check(self.session.post(f"{url}/{created['id']}/deploy", json={}, timeout=self.timeout))
+        return created
+
+def _cli_params_to_body(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn CLI-style ``kebab-key.N=value`` / ``kebab-key.NAME=value`` arguments into a JSON body"""
+    body: Dict[str, Any] = {}
+    indexed: Dict[str, Dict[int, Any]] = {}
+    for key, value in params.items():
+        base, _, index = key.partition(".")
+        base = base.replace("-", "_")
+        if index.isdigit():
+            indexed.setdefault(base, {})[int(index)] = value
+        elif index:
+            body.setdefault(base, {})[index] = value
+        else:
+            body[base] = value
+    for base, items in indexed.items():
+        body[base] = [items[i] for i in sorted(items)]
+    return body
+
+class RecordedTransport:
+    """Offline fake that replays recorded responses
+
+    Recordings map ``"<op> <resource> [<id>]"`` to a response, or to a list of
+    responses returned in turn (the last one repeats), so status progressions
+    such as pending -> ready can be replayed. A recorded ``{"error": ...}``
+    raises ScalewayError.
+    """
+
+    def __init__(self, recordings: Union[Dict[str, Any], Path, str]):
+        if not isinstance(recordings, dict):
+            recordings = json.loads(Path(recordings).read_text())
+        self.recordings = recordings
+        self.calls: List[str] = []
+        self._cursor: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _replay(self, key: str) -> Any:
+        with self._lock:
+            self.calls.append(key)
+            if key not in self.recordings:
+                raise ScalewayError(f"No recorded response for '{key}'", 404)
+            response = self.recordings[key]
+            if isinstance(response, list) and response and key.startswith(("get ", "create ")):
+                position = self._cursor.get(key, 0)
+                self._cursor[key] = position + 1
+                response = response[min(position, len(response) - 1)]
+        if isinstance(response, dict) and "error" in response:
+            raise ScalewayError(response["error"], response.get("status"))
+        return response
+
+    def get(self, resource: str, resource_id: str, **params) -> Dict[str, Any]:
+        return self._replay(f"get {resource} {resource_id}")
+
+    def list(self, resource: str, **params) -> List[Dict[str, Any]]:
+        return self._replay(f"list {resource}")
+
+    def create(self, resource: str, **params) -> Dict[str, Any]:
+        return self._replay(f"create {resource}")
+
+class RecordingTransport:
+    """Wrap a live transport and save its responses for RecordedTransport"""
+
+    def __init__(self, inner, recordings_path: Path):
+        self.inner = inner
+        self.recordings_path = Path(recordings_path)
+        self.recordings: Dict[str, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def _record(self, key: str, call, *args, **params) -> Any:
+        try:
+            response = call(*args, **params)
+        except ScalewayError as e:
+            response = {"error": str(e), "status": e.status}
+            self._store(key, response)
+            raise
+        self._store(key, response)
+        return response
+
+    def _store(self, key: str, response: Any):
+        with self._lock:
+            if key.startswith("list "):
+                self.recordings[key] = response
+            else:
+                self.recordings.setdefault(key, []).append(response)
+            self.recordings_path.write_text(json.dumps(self.recordings, indent=2))
+
+    def get(self, resource: str, resource_id: str, **params) -> Dict[str, Any]:
+        return self._record(f"get {resource} {resource_id}", self.inner.get, resource, resource_id, **params)
+
+    def list(self, resource: str, **params) -> List[Dict[str, Any]]:
+        return self._record(f"list {resource}", self.inner.list, resource, **params)
+
+    def create(self, resource: str, **params) -> Dict[str, Any]:
+        return self._record(f"create {resource}", self.inner.create, resource, **params)
+
+def default_transport():
+    """REST API when credentials are in the environment, otherwise the scw CLI"""
+    if os.environ.get("SCW_SECRET_KEY"):
+        return APITransport()
+    return CLITransport()
+
+class ScalewayClient:
+    """Typed container and load balancer queries for the autonomous team"""
+
+    def __init__(self, transport=None, region: str = DEFAULT_REGION, zone: str = DEFAULT_ZONE, max_workers: int = 8):
+        self.transport = transport or default_transport()
+        self.region = region
+        self.zone = zone
+        self.max_workers = max_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def get_container(self, container_id: str) -> Container:
+        return Container.from_json(self.transport.get("container", container_id, region=self.region))
+
+    def get_containers(self, container_ids: List[str], return_exceptions: bool = False) -> List[Union[Container, Exception]]:
+        """Fetch several containers concurrently, in the order given"""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scw")
+        futures = [self._pool.submit(self.get_container, cid) for cid in container_ids]
+
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
+
+    def list_containers(self, namespace_id: str) -> List[Container]:
+        items = self.transport.list("container", namespace_id=namespace_id, region=self.region)
+        return [Container.from_json(item) for item in items]
+
+    def create_container(self, namespace_id: str, name: str, deploy: bool = True, **params) -> Container:
+        """Create (and by default deploy) a container; extra params use CLI argument names"""
+        created = self.transport.create(
+            "container",
+            namespace_id=namespace_id,
+            name=name,
+            region=self.region,
+            deploy=str(deploy).lower(),
+            **params
+        )
+        return Container.from_json(created)
+
+    def get_load_balancer(self, lb_id: str) -> LoadBalancer:
+        return LoadBalancer.from_json(self.transport.get("lb", lb_id, zone=self.zone))
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
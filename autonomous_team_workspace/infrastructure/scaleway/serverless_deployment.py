@@ -8,9 +8,15 @@ import json
 import subprocess
 import yaml
 import os
+import shutil
 from pathlib import Path
 from datetime import datetime
 
+TASK_QUEUE_MODULE = Path("/root/CascadeProjects/autonomous_team_workspace/workflows/task_queue.py")
+# Handlers enqueue through the team API, whose workers drain the queue
+TEAM_API_URL = os.environ.get("TEAM_API_URL", "https://163.172.191.225")
+HANDLER_RUNTIME_MODULE = Path("/root/CascadeProjects/autonomous_team_workspace/infrastructure/scaleway/handler_runtime.py")
+
 class ScalewayServerlessDeployer:
     """Deploy autonomous team to Scaleway native services"""
     
@@ -42,7 +48,8 @@ class ScalewayServerlessDeployer:
                 "environment": {
                     "TEAM_WORKSPACE": "/tmp/workspace",
                     "SECRETS_MANAGER": "scaleway",
-                    "PROJECT_ID": self.project_id
+                    "PROJECT_ID": self.project_id,
+                    "TASK_QUEUE_URL": TEAM_API_URL
                 },
                 "description": "Handle task delegation for autonomous team"
             },
@@ -99,6 +106,13 @@ class ScalewayServerlessDeployer:
             with open(handler_file, 'w') as f:
                 f.write(handler_code)
             
+            # Shared runtime: lazy imports, reused session/config, cold-start timing
+            shutil.copy(HANDLER_RUNTIME_MODULE, func_dir / "handler_runtime.py")
+            
+            # Ship the durable task queue alongside the task delegation handler
+            if name == "task-delegation":
+                shutil.copy(TASK_QUEUE_MODULE, func_dir / "task_queue.py")
+            
             # Create requirements file
             requirements = self.get_function_requirements(name)
             req_file = func_dir / "requirements.txt"
@@ -138,226 +152,169 @@ class ScalewayServerlessDeployer:
         
         handlers = {
             "task-delegation": '''
-import json
-import os
 from datetime import datetime
 
-def handle_task(event, context):
+from handler_runtime import function_handler
+
+@function_handler("task-delegation")
+def handle_task(task_data, context):
     """Handle task delegation"""
-    try:
-        # Parse task from event
-        task_data = json.loads(event['body']) if 'body' in event else event
-        
-        # Process task
-        task_id = f"task_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        
-        result = {
-            "task_id": task_id,
-            "status": "queued",
-            "message": "Task delegated successfully",
-            "timestamp": datetime.now().isoformat(),
-            "function": "task-delegation"
-        }
-        
-        return {
-            "statusCode": 200,
-            "body": json.dumps(result),
-            "headers": {"Content-Type": "application/json"}
-        }
-        
-    except Exception as e:
-        return {
-            "statusCode": 500,
-            "body": json.dumps({"error": str(e)}),
-            "headers": {"Content-Type": "application/json"}
-        }
+    from task_queue import shared_task_queue
+    
+    # Persist task in its priority lane, in the team API's queue
+    task = shared_task_queue().enqueue(task_data)
+    
+    return {
+        "task_id": task["task_id"],
+        "status": task["status"],
+        "priority": task["priority"],
+        "message": "Task delegated successfully",
+        "timestamp": datetime.now().isoformat(),
+        "function": "task-delegation"
+    }
 ''',
             "voice-synthesis": '''
-import json
-import os
-import requests
 from datetime import datetime
 
-def synthesize_voice(event, context):
+from handler_runtime import function_handler, http_session, env
+
+@function_handler("voice-synthesis")
+def synthesize_voice(data, context):
     """Synthesize voice using Cartesia API"""
-    try:
-        # Parse request
-        data = json.loads(event['body']) if 'body' in event else event
-        text = data.get('text', 'Hello from autonomous team')
-        voice_profile = data.get('voice_profile', 'professional_british')
-        
-        # Cartesia API call
-        api_key = os.environ.get('CARTESIA_API_KEY')
-        if not api_key:
-            raise Exception("Cartesia API key not configured")
-        
-        headers = {
-            "Cartesia-API-Key": api_key,
-            "Cartesia-Version": os.environ.get('CARTESIA_VERSION', '2025-04-16'),
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
-            "model_id": "sonic-english",
-            "text": text,
-            "voice": {
-                "mode": "id",
-                "id": voice_profile
-            },
-            "output_format": {
-                "container": "wav",
-                "encoding": "pcm_f32le",
-                "sample_rate": 44100
-            }
-        }
-        
-        response = requests.post(
-            "https://api.cartesia.ai/tts/bytes",
-            headers=headers,
-            json=payload,
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            result = {
-                "status": "success",
-                "text": text,
-                "voice_profile": voice_profile,
-                "audio_size": len(response.content),
-                "timestamp": datetime.now().isoformat(),
-                "function": "voice-synthesis"
-            }
-        else:
-            raise Exception(f"Cartesia API error: {response.status_code}")
-        
-        return {
-            "statusCode": 200,
-            "body": json.dumps(result),
-            "headers": {"Content-Type": "application/json"}
-        }
-        
-    except Exception as e:
-        return {
-            "statusCode": 500,
-            "body": json.dumps({"error": str(e)}),
-            "headers": {"Content-Type": "application/json"}
+    text = data.get('text', 'Hello from autonomous team')
+    voice_profile = data.get('voice_profile', 'professional_british')
+    
+    # Cartesia API call
+    api_key = env('CARTESIA_API_KEY')
+    if not api_key:
+        raise Exception("Cartesia API key not configured")
+    
+    headers = {
+        "Cartesia-API-Key": api_key,
+        "Cartesia-Version": env('CARTESIA_VERSION', '2025-04-16'),
+        "Content-Type": "application/json"
+    }
+    
+    payload = {
+        "model_id": "sonic-english",
+        "text": text,
+        "voice": {
+            "mode": "id",
+            "id": voice_profile
+        },
+        "output_format": {
+            "container": "wav",
+            "encoding": "pcm_f32le",
+            "sample_rate": 44100
         }
+    }
+    
+    response = http_session().post(
+        "https://api.cartesia.ai/tts/bytes",
+        headers=headers,
+        json=payload,
+        timeout=30
+    )
+    
+    if response.status_code != 200:
+        raise Exception(f"Cartesia API error: {response.status_code}")
+    
+    return {
+        "status": "success",
+        "text": text,
+        "voice_profile": voice_profile,
+        "audio_size": len(response.content),
+        "timestamp": datetime.now().isoformat(),
+        "function": "voice-synthesis"
+    }
 ''',
             "web-search": '''
-import json
-import requests
 from datetime import datetime
 
-def search_web(event, context):
+from handler_runtime import function_handler, http_session
+
+@function_handler("web-search")
+def search_web(data, context):
     """Perform web search"""
-    try:
-        # Parse request
-        data = json.loads(event['body']) if 'body' in event else event
-        query = data.get('query', '')
-        max_results = data.get('max_results', 10)
-        
-        # DuckDuckGo search
-        search_url = "https://duckduckgo.com/html/"
-        params = {
-            'q': query,
-            'kl': 'us-en'
-        }
-        
-        response = requests.get(search_url, params=params, timeout=15)
-        
-        # Simple result parsing (in production, use proper HTML parsing)
-        results = []
-        if response.status_code == 200:
-            # Mock results for demonstration
-            results = [
-                {
-                    "title": f"Result {i+1} for {query}",
-                    "url": f"https://example.com/result{i+1}",
-                    "snippet": f"This is result {i+1} for the query {query}"
-                }
-                for i in range(min(max_results, 5))
-            ]
-        
-        result = {
-            "status": "success",
-            "query": query,
-            "results_count": len(results),
-            "results": results,
-            "timestamp": datetime.now().isoformat(),
-            "function": "web-search"
-        }
-        
-        return {
-            "statusCode": 200,
-            "body": json.dumps(result),
-            "headers": {"Content-Type": "application/json"}
-        }
-        
-    except Exception as e:
-        return {
-            "statusCode": 500,
-            "body": json.dumps({"error": str(e)}),
-            "headers": {"Content-Type": "application/json"}
-        }
+    query = data.get('query', '')
+    max_results = data.get('max_results', 10)
+    
+    # DuckDuckGo search
+    search_url = "https://duckduckgo.com/html/"
+    params = {
+        'q': query,
+        'kl': 'us-en'
+    }
+    
+    response = http_session().get(search_url, params=params, timeout=15)
+    
+    # Simple result parsing (in production, use proper HTML parsing)
+    results = []
+    if response.status_code == 200:
+        # Mock results for demonstration
+        results = [
+            {
+                "title": f"Result {i+1} for {query}",
+                "url": f"https://example.com/result{i+1}",
+                "snippet": f"This is result {i+1} for the query {query}"
+            }
+            for i in range(min(max_results, 5))
+        ]
+    
+    return {
+        "status": "success",
+        "query": query,
+        "results_count": len(results),
+        "results": results,
+        "timestamp": datetime.now().isoformat(),
+        "function": "web-search"
+    }
 ''',
             "code-execution": '''
-import json
-import subprocess
-import tempfile
 import os
 from datetime import datetime
 
-def execute_code(event, context):
+from handler_runtime import function_handler
+
+@function_handler("code-execution")
+def execute_code(data, context):
     """Execute code securely"""
+    import subprocess
+    import tempfile
+    
+    code = data.get('code', '')
+    language = data.get('language', 'python')
+    
+    if not code:
+        raise Exception("No code provided")
+    
+    # Create temporary file
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
+        f.write(code)
+        temp_file = f.name
+    
     try:
-        # Parse request
-        data = json.loads(event['body']) if 'body' in event else event
-        code = data.get('code', '')
-        language = data.get('language', 'python')
-        
-        if not code:
-            raise Exception("No code provided")
-        
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write(code)
-            temp_file = f.name
-        
-        try:
-            # Execute code with timeout
-            result = subprocess.run(
-                ['python3', temp_file],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            execution_result = {
-                "status": "success" if result.returncode == 0 else "error",
-                "output": result.stdout,
-                "error": result.stderr if result.stderr else None,
-                "return_code": result.returncode,
-                "language": language,
-                "timestamp": datetime.now().isoformat(),
-                "function": "code-execution"
-            }
-            
-        finally:
-            # Clean up temporary file
-            os.unlink(temp_file)
+        # Execute code with timeout
+        result = subprocess.run(
+            ['python3', temp_file],
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
         
         return {
-            "statusCode": 200,
-            "body": json.dumps(execution_result),
-            "headers": {"Content-Type": "application/json"}
+            "status": "success" if result.returncode == 0 else "error",
+            "output": result.stdout,
+            "error": result.stderr if result.stderr else None,
+            "return_code": result.returncode,
+            "language": language,
+            "timestamp": datetime.now().isoformat(),
+            "function": "code-execution"
         }
         
-    except Exception as e:
-        return {
-            "statusCode": 500,
-            "body": json.dumps({"error": str(e)}),
-            "headers": {"Content-Type": "application/json"}
-        }
+    finally:
+        # Clean up temporary file
+        os.unlink(temp_file)
 '''
         }
         
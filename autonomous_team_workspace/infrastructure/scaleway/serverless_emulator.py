@@ -0,0 +1,655 @@
+#!/usr/bin/env python3
+"""
+Local Serverless Emulator - Autonomous Team
+Run ``main(event, context)`` handlers behind HTTP with Scaleway-like scaling
+
+Each instance is a separate interpreter that imports the handler once and
+serves one request at a time. Instances scale from ``min_scale`` up to
+``max_scale``; a request that finds no idle instance starts a new one (a cold
+start) or queues until one frees up. Idle instances are stopped after
+``idle_timeout``, so scale-to-zero cold starts show up too.
+
+Limits are enforced per instance: ``memory_limit`` caps the address space
+(exceeding it kills the instance like an OOM), ``cpu_limit`` in mvCPU
+stretches each invocation by the CPU time it used (140 mvCPU makes one CPU
+second take ~7 wall seconds), and ``timeout`` kills runaway invocations.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from pathlib import Path
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional
+
+from handler_harness import percentile
+
+WORK_ROOT = Path("/tmp/serverless_emulator")
+SIMPLE_HANDLER = Path("/root/CascadeProjects/simple_handler.py")
+
+# Scaleway allocates vCPU in proportion to memory: 128MB -> 70 mvCPU
+MVCPU_PER_MB = 70 / 128
+
+# Mirrors the limits in serverless_first_architecture.deploy_serverless_functions
+TEAM_FUNCTION_LIMITS = {
+    "autonomous-coordinator": {"memory_limit": "256MB", "timeout": "30s", "max_scale": 10},
+    "voice-synthesis-agent": {"memory_limit": "512MB", "timeout": "60s", "max_scale": 5},
+    "web-search-agent": {"memory_limit": "128MB", "timeout": "15s", "max_scale": 10},
+    "code-execution-sandbox": {"memory_limit": "256MB", "timeout": "30s", "max_scale": 5},
+    "simple-handler": {"memory_limit": "128MB", "timeout": "30s", "max_scale": 5}
+}
+
+TEAM_SAMPLE_EVENTS = {
+    "autonomous-coordinator": {"task_type": "benchmark", "priority": "low"},
+    "voice-synthesis-agent": {"text": "Good morning from the autonomous team"},
+    "web-search-agent": {"query": "serverless cold starts", "max_results": 5},
+    "code-execution-sandbox": {"code": "print(sum(range(1000)))"},
+    "simple-handler": {"ping": True}
+}
+
+# Runs in a fresh interpreter per instance; protocol lines go to the original
+# stdout and everything the handler prints goes to the instance log
+INSTANCE_SCRIPT = '''
+import os, sys, json, time, resource, importlib
+started = time.perf_counter()
+module_name, attr, memory_mb, cpu_limit = sys.argv[1], sys.argv[2], int(sys.argv[3]), int(sys.argv[4])
+
+if memory_mb:
+    limit = memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+protocol = os.fdopen(os.dup(1), "w", buffering=1)
+os.dup2(2, 1)
+sys.stdout = sys.stderr
+
+def send(message):
+    protocol.write("__EMU__" + json.dumps(message, default=str) + "\\n")
+
+sys.path.insert(0, ".")
+try:
+    handler = getattr(importlib.import_module(module_name), attr)
+except MemoryError:
+    send({"ready": False, "oom": True, "error": "memory limit exceeded during init"})
+    sys.exit(137)
+except BaseException as e:
+    send({"ready": False, "error": repr(e)})
+    sys.exit(1)
+send({"ready": True, "init_ms": (time.perf_counter() - started) * 1000})
+
+# 1000 mvCPU is one full core; below that each CPU second is stretched
+slowdown = 1000 / cpu_limit - 1 if 0 < cpu_limit < 1000 else 0
+
+for line in sys.stdin:
+    request = json.loads(line)
+    cpu_started, call_started = time.process_time(), time.perf_counter()
+    try:
+        response, error = handler(request["event"], request["context"]), None
+    except MemoryError:
+        send({"id": request["id"], "oom": True, "error": "memory limit exceeded"})
+        sys.exit(137)
+    except Exception as e:
+        response, error = None, repr(e)
+    cpu_seconds = time.process_time() - cpu_started
+    handler_ms = (time.perf_counter() - call_started) * 1000
+    if slowdown:
+        time.sleep(cpu_seconds * slowdown)
+    send({"id": request["id"], "response": response, "error": error,
+          "cpu_ms": cpu_seconds * 1000, "handler_ms": handler_ms})
+'''
+
+class InstanceFailed(Exception):
+    """The instance died, ran out of memory or timed out"""
+
+    def __init__(self, message: str, status: int = 502):
+        super().__init__(message)
+        self.status = status
+
+def parse_size_mb(value) -> int:
+    """'256MB', '1GB', '512' or 512 -> megabytes"""
+    if isinstance(value, (int, float)):
+        return int(value)
+    text = str(value).strip().upper()
+    if text.endswith("GB"):
+        return int(float(text[:-2]) * 1024)
+    return int(float(text.rstrip("MB") or 0))
+
+def parse_seconds(value) -> float:
+    """'30s', '2m' or 30 -> seconds"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip().lower()
+    if text.endswith("m"):
+        return float(text[:-1]) * 60
+    return float(text.rstrip("s"))
+
+@dataclass
+class FunctionConfig:
+    """One function as the emulator runs it"""
+    name: str
+    function_dir: Path
+    handler: str = "handler.main"
+    memory_limit_mb: int = 256
+    cpu_limit: Optional[int] = None
+    timeout: float = 30.0
+    min_scale: int = 0
+    max_scale: int = 5
+    idle_timeout: float = 60.0
+    cold_start_delay: float = 0.0
+    env: Dict[str, str] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.function_dir = Path(self.function_dir)
+        if self.cpu_limit is None:
+            self.cpu_limit = int(self.memory_limit_mb * MVCPU_PER_MB)
+
+    @classmethod
+    def from_spec(cls, spec: Dict[str, Any], work_root: Path = WORK_ROOT, **overrides) -> "FunctionConfig":
+        """Config from a deploy spec (``name``, ``code``, ``handler``, ``memory_limit``...)
+
+        The handler sources are written the same way the deploy pipeline
+        packages them, so the emulator runs exactly what would be zipped.
+        """
+        from function_pipeline import FunctionArtifact
+
+        function_dir = Path(work_root) / spec["name"]
+        function_dir.mkdir(parents=True, exist_ok=True)
+        for arcname, content in FunctionArtifact(spec, Path(work_root)).files.items():
+            (function_dir / arcname).write_bytes(content)
+
+        settings = {
+            "name": spec["name"],
+            "function_dir": function_dir,
+            "handler": spec.get("handler", "handler.main"),
+            "memory_limit_mb": parse_size_mb(spec.get("memory_limit", 256)),
+            "cpu_limit": spec.get("cpu_limit"),
+            "timeout": parse_seconds(spec.get("timeout", 30)),
+            "min_scale": spec.get("min_scale", 0),
+            "max_scale": spec.get("max_scale", 5),
+            "env": spec.get("env", {})
+        }
+        settings.update({k: v for k, v in overrides.items() if v is not None})
+        return cls(**settings)
+
+    @classmethod
+    def from_path(cls, path: Path, **overrides) -> "FunctionConfig":
+        """Config for a function directory or a single handler file"""
+        path = Path(path).resolve()
+        settings = {"name": path.stem.replace("_", "-"), "function_dir": path}
+        if path.is_file():
+            settings.update(function_dir=path.parent, handler=f"{path.stem}.main")
+        settings.update({k: v for k, v in overrides.items() if v is not None})
+        return cls(**settings)
+
+class Instance:
+    """One running copy of a function, serving a request at a time"""
+
+    def __init__(self, config: FunctionConfig, process: asyncio.subprocess.Process, init_ms: float):
+        self.config = config
+        self.process = process
+        self.init_ms = init_ms
+        self.invocations = 0
+        self.last_used = time.monotonic()
+        self._next_id = 0
+
+    @classmethod
+    async def start(cls, config: FunctionConfig, log_output: bool = False) -> "Instance":
+        if config.cold_start_delay:
+            # Platform overhead before the interpreter runs (image pull, sandbox setup)
+            await asyncio.sleep(config.cold_start_delay)
+
+        process_env = os.environ.copy()
+        process_env.update(config.env)
+        process_env.setdefault("FUNCTION_NAME", config.name)
+
+        module_name, attr = config.handler.rsplit(".", 1)
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", INSTANCE_SCRIPT, module_name, attr,
+            str(config.memory_limit_mb), str(config.cpu_limit),
+            cwd=config.function_dir,
+            env=process_env,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=None if log_output else asyncio.subprocess.DEVNULL,
+            limit=16 * 1024 * 1024
+        )
+        instance = cls(config, process, init_ms=0.0)
+        try:
+            ready = await asyncio.wait_for(instance._read_message(), timeout=config.timeout)
+        except (asyncio.TimeoutError, InstanceFailed):
+            instance.kill()
+            raise InstanceFailed(f"{config.name}: instance failed to start", status=502)
+        if not ready.get("ready"):
+            instance.kill()
+            raise InstanceFailed(f"{config.name}: {ready.get('error')}", status=502)
+
+        instance.init_ms = ready["init_ms"]
+        return instance
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    async def _read_message(self) -> Dict[str, Any]:
+        while True:
+            line = await self.process.stdout.readline()
+            if not line:
+                raise InstanceFailed(f"{self.config.name}: instance exited", status=502)
+            if line.startswith(b"__EMU__"):
+                return json.loads(line[len(b"__EMU__"):])
+
+    async def invoke(self, event: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+        self._next_id += 1
+        request = {"id": self._next_id, "event": event, "context": context}
+        self.process.stdin.write((json.dumps(request) + "\n").encode())
+
+        try:
+            await self.process.stdin.drain()
+            message = await asyncio.wait_for(self._read_message(), timeout=self.config.timeout)
+        except asyncio.TimeoutError:
+            self.kill()
+            await self.process.wait()
+            raise InstanceFailed(f"{self.config.name}: timed out after {self.config.timeout:g}s", status=504)
+        except (BrokenPipeError, ConnectionResetError):
+            raise InstanceFailed(f"{self.config.name}: instance exited", status=502)
+        finally:
+            self.invocations += 1
+            self.last_used = time.monotonic()
+
+        if message.get("oom"):
+            await self.process.wait()
+            raise InstanceFailed(f"{self.config.name}: {message['error']} ({self.config.memory_limit_mb}MB)", status=502)
+        return message
+
+    def kill(self):
+        if self.alive:
+            self.process.kill()
+
+    async def stop(self):
+        if self.alive:
+            self.process.stdin.close()
+            try:
+                await asyncio.wait_for(self.process.wait(), timeout=2)
+            except asyncio.TimeoutError:
+                self.kill()
+                await self.process.wait()
+
+class FunctionPool:
+    """Instances of one function plus their scaling and invocation stats"""
+
+    def __init__(self, config: FunctionConfig, log_output: bool = False):
+        self.config = config
+        self.log_output = log_output
+        self.instances: List[Instance] = []
+        self.idle: List[Instance] = []
+        self._starting = 0
+        self._condition = asyncio.Condition()
+
+        self.stats = {
+            "requests": 0,
+            "errors": 0,
+            "cold_starts": 0,
+            "oom_kills": 0,
+            "timeouts": 0,
+            "peak_instances": 0,
+            "cpu_ms": 0.0
+        }
+        self.latencies: deque = deque(maxlen=100000)
+        self.queue_waits: deque = deque(maxlen=100000)
+        self.init_ms: List[float] = []
+
+    async def _acquire(self):
+        """An idle instance, or a freshly started one (cold) if below max_scale"""
+        async with self._condition:
+            while True:
+                if self.idle:
+                    # Most recently used first, so surplus instances age out
+                    return self.idle.pop(), False
+                if len(self.instances) + self._starting < self.config.max_scale:
+                    self._starting += 1
+                    break
+                await self._condition.wait()
+
+        instance = None
+        try:
+            instance = await Instance.start(self.config, self.log_output)
+            self.stats["cold_starts"] += 1
+            self.init_ms.append(instance.init_ms)
+            return instance, True
+        finally:
+            async with self._condition:
+                self._starting -= 1
+                if instance is not None:
+                    self.instances.append(instance)
+                    self.stats["peak_instances"] = max(self.stats["peak_instances"], len(self.instances))
+                self._condition.notify()
+
+    async def _release(self, instance: Instance):
+        async with self._condition:
+            if instance.alive:
+                self.idle.append(instance)
+            else:
+                self.instances.remove(instance)
+            self._condition.notify()
+
+    async def invoke(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatch one event; returns the handler response plus emulator timings"""
+        started = time.perf_counter()
+        self.stats["requests"] += 1
+        cold = False
+
+        try:
+            instance, cold = await self._acquire()
+            self.queue_waits.append((time.perf_counter() - started) * 1000)
+            try:
+                message = await instance.invoke(event, {"function_name": self.config.name,
+                                                        "memory_limit_in_mb": self.config.memory_limit_mb})
+            finally:
+                await self._release(instance)
+        except InstanceFailed as e:
+            if e.status == 504:
+                self.stats["timeouts"] += 1
+            elif "memory limit" in str(e):
+                self.stats["oom_kills"] += 1
+            self.stats["errors"] += 1
+            self.latencies.append((time.perf_counter() - started) * 1000)
+            return {"statusCode": e.status, "body": json.dumps({"error": str(e)}),
+                    "headers": {"Content-Type": "application/json"}, "cold_start": cold}
+
+        response = message.get("response")
+        if message.get("error") or not isinstance(response, dict):
+            response = {"statusCode": 500, "body": json.dumps({"error": message.get("error") or "invalid handler response"}),
+                        "headers": {"Content-Type": "application/json"}}
+        if response.get("statusCode", 200) >= 500:
+            self.stats["errors"] += 1
+
+        self.stats["cpu_ms"] += message.get("cpu_ms", 0)
+        self.latencies.append((time.perf_counter() - started) * 1000)
+        return dict(response, cold_start=cold)
+
+    async def scale_down(self):
+        """Stop instances idle longer than idle_timeout, keeping min_scale"""
+        now = time.monotonic()
+        async with self._condition:
+            expired = [i for i in self.idle if now - i.last_used > self.config.idle_timeout]
+            expired = expired[:max(0, len(self.instances) - self.config.min_scale)]
+            for instance in expired:
+                self.idle.remove(instance)
+                self.instances.remove(instance)
+        await asyncio.gather(*(i.stop() for i in expired))
+
+    async def prewarm(self):
+        """Start min_scale instances up front"""
+        started = await asyncio.gather(*(self._acquire() for _ in range(self.config.min_scale)))
+        for instance, _ in started:
+            await self._release(instance)
+
+    async def stop(self):
+        async with self._condition:
+            instances, self.instances, self.idle = list(self.instances), [], []
+        await asyncio.gather(*(i.stop() for i in instances))
+
+    def report(self) -> Dict[str, Any]:
+        latencies = list(self.latencies)
+        return {
+            "function": self.config.name,
+            "memory_limit_mb": self.config.memory_limit_mb,
+            "cpu_limit": self.config.cpu_limit,
+            "max_scale": self.config.max_scale,
+            **self.stats,
+            "cpu_ms": round(self.stats["cpu_ms"], 3),
+            "instances": len(self.instances),
+            "init_ms_p50": percentile(self.init_ms, 0.5),
+            "latency_ms_p50": percentile(latencies, 0.50),
+            "latency_ms_p95": percentile(latencies, 0.95),
+            "latency_ms_p99": percentile(latencies, 0.99),
+            "queue_wait_ms_p95": percentile(list(self.queue_waits), 0.95)
+        }
+
+class ServerlessEmulator:
+    """Pools for several functions behind one HTTP front end"""
+
+    def __init__(self, functions: List[FunctionConfig], log_output: bool = False, reap_interval: float = 1.0):
+        self.pools: Dict[str, FunctionPool] = {f.name: FunctionPool(f, log_output) for f in functions}
+        self.reap_interval = reap_interval
+        self._reaper: Optional[asyncio.Task] = None
+
+    async def start(self):
+        await asyncio.gather(*(pool.prewarm() for pool in self.pools.values()))
+        self._reaper = asyncio.create_task(self._reap())
+        return self
+
+    async def stop(self):
+        if self._reaper:
+            self._reaper.cancel()
+        await asyncio.gather(*(pool.stop() for pool in self.pools.values()))
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def _reap(self):
+        while True:
+            await asyncio.sleep(self.reap_interval)
+            await asyncio.gather(*(pool.scale_down() for pool in self.pools.values()))
+
+    async def invoke(self, name: str, event: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.pools[name].invoke(event)
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        return {name: pool.report() for name, pool in self.pools.items()}
+
+    def app(self):
+        """aiohttp application: ``/<function>/...`` (or ``/...`` with one function) plus ``/__stats``"""
+        from aiohttp import web
+
+        async def stats(request):
+            return web.json_response(self.report())
+
+        async def dispatch(request):
+            path = request.match_info.get("path", "")
+            name, _, rest = path.partition("/")
+            if name not in self.pools:
+                if len(self.pools) != 1:
+                    return web.json_response({"error": f"unknown function {name!r}", "functions": list(self.pools)}, status=404)
+                name, rest = next(iter(self.pools)), path
+
+            event = {
+                "httpMethod": request.method,
+                "path": "/" + rest,
+                "headers": dict(request.headers),
+                "queryStringParameters": dict(request.query),
+                "body": await request.text(),
+                "isBase64Encoded": False
+            }
+            response = await self.invoke(name, event)
+
+            headers = dict(response.get("headers") or {})
+            headers["X-Emulator-Cold-Start"] = "true" if response.get("cold_start") else "false"
+            body = response.get("body", "")
+            if not isinstance(body, (str, bytes)):
+                body = json.dumps(body)
+            return web.Response(status=response.get("statusCode", 200), headers=headers,
+                                body=body.encode() if isinstance(body, str) else body)
+
+        app = web.Application()
+        app.router.add_get("/__stats", stats)
+        app.router.add_route("*", "/{path:.*}", dispatch)
+        return app
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8080):
+        from aiohttp import web
+
+        runner = web.AppRunner(self.app(), access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        return runner
+
+def http_event(payload: Dict[str, Any], path: str = "/") -> Dict[str, Any]:
+    """Event shaped like the platform's HTTP trigger"""
+    return {
+        "httpMethod": "POST",
+        "path": path,
+        "headers": {"Content-Type": "application/json"},
+        "queryStringParameters": {},
+        "body": json.dumps(payload),
+        "isBase64Encoded": False
+    }
+
+async def run_load(emulator: ServerlessEmulator, name: str, payload: Dict[str, Any],
+                   requests: int = 500, concurrency: int = 20, url: str = None) -> Dict[str, Any]:
+    """Closed-loop load: ``concurrency`` clients send ``requests`` in total
+
+    With ``url`` the requests go over HTTP to a running ``serve()``;
+    otherwise they are dispatched to the pool directly.
+    """
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    cold = 0
+    remaining = requests
+    session = None
+
+    if url:
+        import aiohttp
+        session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=concurrency))
+
+    async def client():
+        nonlocal remaining, cold
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            if session:
+                async with session.post(f"{url}/{name}", json=payload) as response:
+                    await response.read()
+                    status = response.status
+                    cold += response.headers.get("X-Emulator-Cold-Start") == "true"
+            else:
+                response = await emulator.invoke(name, http_event(payload))
+                status = response.get("statusCode", 200)
+                cold += bool(response.get("cold_start"))
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+    finally:
+        if session:
+            await session.close()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "function": name,
+        "requests": requests,
+        "concurrency": concurrency,
+        "via": "http" if url else "direct",
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 1),
+        "latency_ms_p50": percentile(latencies, 0.50),
+        "latency_ms_p95": percentile(latencies, 0.95),
+        "latency_ms_p99": percentile(latencies, 0.99),
+        "cold_starts": cold,
+        "statuses": statuses
+    }
+
+def team_functions(**overrides) -> List[FunctionConfig]:
+    """The namespace's functions plus simple_handler.py, with their configured limits"""
+    sys.path.append("/root/CascadeProjects")
+    from deploy_scaleway_functions_correct import function_specs
+
+    configs = [FunctionConfig.from_spec(dict(spec, **TEAM_FUNCTION_LIMITS[spec["name"]]), **overrides)
+               for spec in function_specs()]
+    simple = TEAM_FUNCTION_LIMITS["simple-handler"]
+    configs.append(FunctionConfig.from_path(SIMPLE_HANDLER, **dict(
+        {"name": "simple-handler", "memory_limit_mb": parse_size_mb(simple["memory_limit"]),
+         "timeout": parse_seconds(simple["timeout"]), "max_scale": simple["max_scale"]},
+        **{k: v for k, v in overrides.items() if v is not None})))
+    return configs
+
+def print_load_report(result: Dict[str, Any], pool_report: Dict[str, Any]):
+    print(f"\n⚡ {result['function']} ({pool_report['memory_limit_mb']}MB, {pool_report['cpu_limit']} mvCPU, "
+          f"max {pool_report['max_scale']} instances) - {result['requests']} requests @ {result['concurrency']} via {result['via']}")
+    print(f"   🚀 Throughput:   {result['throughput_rps']:.1f} req/s")
+    print(f"   ⏱️  Latency:      p50 {result['latency_ms_p50']:.2f} ms, p95 {result['latency_ms_p95']:.2f} ms, "
+          f"p99 {result['latency_ms_p99']:.2f} ms")
+    print(f"   🥶 Cold starts:  {result['cold_starts']} (init p50 {pool_report['init_ms_p50']} ms, "
+          f"peak {pool_report['peak_instances']} instances)")
+    print(f"   📊 Statuses:     {result['statuses']}  OOM kills: {pool_report['oom_kills']}  timeouts: {pool_report['timeouts']}")
+
+async def _main(args) -> int:
+    overrides = {
+        "memory_limit_mb": parse_size_mb(args.memory_limit) if args.memory_limit else None,
+        "cpu_limit": args.cpu_limit,
+        "max_scale": args.max_scale,
+        "min_scale": args.min_scale,
+        "idle_timeout": args.idle_timeout,
+        "cold_start_delay": args.cold_start_delay,
+        "timeout": parse_seconds(args.timeout) if args.timeout else None
+    }
+    if args.team:
+        functions = team_functions(**overrides)
+    else:
+        functions = [FunctionConfig.from_path(args.path, handler=args.handler, name=args.name, **overrides)]
+
+    async with ServerlessEmulator(functions, log_output=args.logs) as emulator:
+        runner = await emulator.serve(args.host, args.port) if (args.serve or args.http) else None
+        url = f"http://{args.host}:{args.port}"
+
+        if args.serve:
+            print(f"🌐 Serving {', '.join(emulator.pools)} on {url} (stats at {url}/__stats)")
+            try:
+                await asyncio.Event().wait()
+            finally:
+                await runner.cleanup()
+
+        failures = 0
+        for name in emulator.pools:
+            payload = json.loads(args.event) if args.event else TEAM_SAMPLE_EVENTS.get(name, {})
+            result = await run_load(emulator, name, payload, args.requests, args.concurrency,
+                                    url=url if args.http else None)
+            print_load_report(result, emulator.pools[name].report())
+            failures += sum(n for status, n in result["statuses"].items() if status >= 500)
+
+        if runner:
+            await runner.cleanup()
+        print(json.dumps(emulator.report(), indent=2))
+        return 1 if failures else 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Run serverless handlers locally under load")
+    parser.add_argument("path", nargs="?", type=Path, help="Function directory or handler .py file")
+    parser.add_argument("--team", action="store_true", help="Emulate the team's functions and simple_handler.py")
+    parser.add_argument("--handler", help="module.function entry point (default handler.main)")
+    parser.add_argument("--name", help="Function name (default from the path)")
+    parser.add_argument("--memory-limit", help="e.g. 256MB")
+    parser.add_argument("--cpu-limit", type=int, help="mvCPU (default scales with memory)")
+    parser.add_argument("--max-scale", type=int)
+    parser.add_argument("--min-scale", type=int)
+    parser.add_argument("--timeout", help="Invocation timeout, e.g. 30s")
+    parser.add_argument("--idle-timeout", type=float, help="Seconds before an idle instance is stopped")
+    parser.add_argument("--cold-start-delay", type=float, help="Extra platform seconds per cold start")
+    parser.add_argument("--serve", action="store_true", help="Serve over HTTP until interrupted")
+    parser.add_argument("--http", action="store_true", help="Send the benchmark load over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent clients")
+    parser.add_argument("--event", help="JSON payload for every request")
+    parser.add_argument("--logs", action="store_true", help="Show handler output")
+    args = parser.parse_args()
+
+    if not args.team and not args.path:
+        parser.error("give a function path or --team")
+    try:
+        return asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
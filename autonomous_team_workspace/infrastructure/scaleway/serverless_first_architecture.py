@@ -6,10 +6,13 @@ Prioritize serverless deployment and ensure team remembers this preference
 
 import json
 import yaml
+import shutil
 import subprocess
 from pathlib import Path
 from datetime import datetime
 
+HANDLER_RUNTIME_MODULE = Path("/root/CascadeProjects/autonomous_team_workspace/infrastructure/scaleway/handler_runtime.py")
+
 class ServerlessFirstArchitecture:
     """Serverless-first deployment architecture"""
     
@@ -122,6 +125,9 @@ class ServerlessFirstArchitecture:
             with open(handler_file, 'w') as f:
                 f.write(handler_code)
             
+            # Shared runtime: lazy imports, reused session/config, cold-start timing
+            shutil.copy(HANDLER_RUNTIME_MODULE, func_dir / "handler_runtime.py")
+            
             # Create optimized requirements
             requirements = self.get_serverless_requirements(name)
             req_file = func_dir / "requirements.txt"
@@ -158,56 +164,31 @@ class ServerlessFirstArchitecture:
         """Generate optimized serverless handler"""
         
         base_handler = '''
-import json
-import os
 from datetime import datetime
 
+from handler_runtime import function_handler, env
+
 # Serverless-first architecture
-SERVERLESS_MODE = os.environ.get('SERVERLESS_ARCHITECTURE', 'true') == 'true'
+SERVERLESS_MODE = env('SERVERLESS_ARCHITECTURE', 'true') == 'true'
 
-def main(event, context):
+@function_handler(headers={'X-Serverless-Architecture': 'true'})
+def main(event_data, context):
     """Serverless function handler"""
-    try:
-        # Initialize serverless context
-        function_name = os.environ.get('FUNCTION_NAME', 'unknown')
-        start_time = datetime.now()
-        
-        # Process event
-        if isinstance(event, str):
-            event_data = json.loads(event)
-        else:
-            event_data = event
-        
-        # Serverless processing logic
-        result = process_serverless_request(event_data, function_name)
-        
-        # Add serverless metadata
-        result['serverless'] = {
-            'function': function_name,
-            'execution_time': (datetime.now() - start_time).total_seconds(),
-            'memory_usage': 'optimized',
-            'architecture': 'serverless-first'
-        }
-        
-        return {
-            'statusCode': 200,
-            'body': json.dumps(result),
-            'headers': {
-                'Content-Type': 'application/json',
-                'X-Serverless-Architecture': 'true'
-            }
-        }
-        
-    except Exception as e:
-        return {
-            'statusCode': 500,
-            'body': json.dumps({
-                'error': str(e),
-                'serverless': True,
-                'function': function_name
-            }),
-            'headers': {'Content-Type': 'application/json'}
-        }
+    # Initialize serverless context
+    function_name = env('FUNCTION_NAME', 'unknown')
+    start_time = datetime.now()
+    
+    # Serverless processing logic
+    result = process_serverless_request(event_data, function_name)
+    
+    # Add serverless metadata
+    result['serverless'] = {
+        'function': function_name,
+        'execution_time': (datetime.now() - start_time).total_seconds(),
+        'memory_usage': 'optimized',
+        'architecture': 'serverless-first'
+    }
+    return result
 
 def process_serverless_request(event_data, function_name):
     """Process request in serverless context"""
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Autonomous Team API - Flask application
+Shipped into the API container image and served by gunicorn (see team_api_gunicorn.py)
+
+Running this file directly starts Flask's development server, which is what
+the container used to do. Responses go through a JSON provider backed by
+orjson when it is installed, so every endpoint returns compact JSON with an
+``application/json`` content type.
+"""
+
+import os
+import sys
+import json
+import queue
+import threading
+import subprocess
+import tempfile
+from datetime import datetime
+
+import flask
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# task_queue.py sits next to this file in the image; locally it lives in workflows
+sys.path.append("/root/CascadeProjects/autonomous_team_workspace/workflows")
+from task_queue import (
+    task_queue, task_type_of, task_input_of, TaskWorkerPool, PermanentTaskError, TASK_ROUTES,
+    TaskStatusFeed, put_latest, sse_frame, TASK_STREAM_QUEUE_SIZE, TASK_STREAM_KEEPALIVE
+)
+
+MAX_SEARCH_RESULTS = 50
+# Each open /tasks/stream holds one gunicorn thread, so keep this well under the thread count
+TASK_STREAM_MAX_SUBSCRIBERS = int(os.environ.get('TASK_STREAM_MAX_SUBSCRIBERS', 4))
+
+class FastJSONProvider(JSONProvider):
+    """orjson for request parsing and responses, stdlib json as a fallback"""
+
+    def dumps(self, obj, **kwargs) -> str:
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+        return json.dumps(obj, default=str, separators=(",", ":"))
+
+    def loads(self, s, **kwargs):
+        if ORJSON_AVAILABLE:
+            return orjson.loads(s)
+        return json.loads(s)
+
+app = flask.Flask(__name__)
+app.json = FastJSONProvider(app)
+
+_worker_pool = None
+_worker_pool_lock = threading.Lock()
+status_feed = TaskStatusFeed(task_queue, max_subscribers=TASK_STREAM_MAX_SUBSCRIBERS)
+
+@app.route('/health')
+def health():
+    return flask.jsonify({
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "service": "autonomous-team-api",
+        "version": "2.0.0",
+        "capabilities": ["voice", "search", "execute", "tasks"]
+    })
+
+@app.route('/')
+def index():
+    return flask.jsonify({
+        "service": "Autonomous Team API",
+        "status": "running",
+        "endpoints": ["/health", "/voice", "/search", "/execute", "/tasks"],
+        "timestamp": datetime.now().isoformat(),
+        "team": "full-autonomous-team"
+    })
+
+@app.route('/voice', methods=['POST'])
+def voice():
+    try:
+        data = flask.request.get_json(silent=True) or {}
+        text = data.get('text', 'Hello from autonomous team!')
+        voice_profile = data.get('voice_profile', 'professional_british')
+
+        result = {
+            "status": "success",
+            "text": text,
+            "voice_profile": voice_profile,
+            "audio_url": f"https://audio.autonomous-team.com/{voice_profile}/{hash(text)}.wav",
+            "duration": max(1.0, len(text) * 0.1),
+            "timestamp": datetime.now().isoformat(),
+            "function": "voice-synthesis-agent"
+        }
+
+        return flask.jsonify(result), 200
+
+    except Exception as e:
+        return flask.jsonify({"error": str(e)}), 500
+
+def _max_results(data):
+    """``max_results`` as an int clamped to 1..MAX_SEARCH_RESULTS; None when it is not a number"""
+    value = data.get('max_results', 10)
+    if isinstance(value, bool):
+        return None
+    try:
+        return min(max(int(value), 1), MAX_SEARCH_RESULTS)
+    except (TypeError, ValueError):
+        return None
+
+@app.route('/search', methods=['POST'])
+def search():
+    try:
+        data = flask.request.get_json(silent=True) or {}
+        query = data.get('query', '')
+        max_results = _max_results(data)
+
+        if not query:
+            return flask.jsonify({"error": "Query required"}), 400
+        if max_results is None:
+            return flask.jsonify({"error": "max_results must be an integer"}), 400
+
+        results = [
+            {
+                "title": f"Search Result {i+1} for '{query}'",
+                "url": f"https://example.com/result{i+1}",
+                "snippet": f"This is result {i+1} for the query {query}",
+                "relevance": round(0.9 - (i * 0.1), 2)
+            }
+            for i in range(min(max_results, 5))
+        ]
+
+        result = {
+            "status": "success",
+            "query": query,
+            "results": results,
+            "total_results": len(results),
+            "timestamp": datetime.now().isoformat(),
+            "function": "web-search-agent"
+        }
+
+        return flask.jsonify(result), 200
+
+    except Exception as e:
+        return flask.jsonify({"error": str(e)}), 500
+
+@app.route('/execute', methods=['POST'])
+def execute():
+    try:
+        data = flask.request.get_json(silent=True) or {}
+        code = data.get('code', '')
+        language = data.get('language', 'python')
+
+        if not code:
+            return flask.jsonify({"error": "Code required"}), 400
+
+        if language != 'python':
+            return flask.jsonify({"error": "Only Python supported"}), 400
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
+            f.write(code)
+            temp_file = f.name
+
+        try:
+            result = subprocess.run(
+                [sys.executable, temp_file],
+                capture_output=True,
+                text=True,
+                timeout=10
+            )
+
+            execution_result = {
+                "status": "success" if result.returncode == 0 else "error",
+                "output": result.stdout,
+                "error": result.stderr if result.stderr else None,
+                "return_code": result.returncode,
+                "language": language,
+                "timestamp": datetime.now().isoformat(),
+                "function": "code-execution-sandbox"
+            }
+
+            return flask.jsonify(execution_result), 200
+
+        finally:
+            os.unlink(temp_file)
+
+    except subprocess.TimeoutExpired:
+        return flask.jsonify({"error": "Code execution timed out"}), 408
+    except Exception as e:
+        return flask.jsonify({"error": str(e)}), 500
+
+@app.route('/coordinate', methods=['POST'])
+def coordinate():
+    """Coordinator acknowledgement for general and task_delegation tasks run by the workers"""
+    try:
+        data = flask.request.get_json(silent=True) or {}
+
+        result = {
+            "status": "success",
+            "task_type": task_type_of(data),
+            "priority": data.get('priority', 'medium'),
+            "description": data.get('description', 'Autonomous team task'),
+            "coordinated": True,
+            "timestamp": datetime.now().isoformat(),
+            "function": "autonomous-coordinator"
+        }
+
+        return flask.jsonify(result), 200
+
+    except Exception as e:
+        return flask.jsonify({"error": str(e)}), 500
+
+@app.route('/tasks', methods=['POST'])
+def tasks():
+    try:
+        data = flask.request.get_json(silent=True) or {}
+        task_type = task_type_of(data)
+        priority = data.get('priority', 'medium')
+        description = data.get('description', 'Autonomous team task')
+
+        task = task_queue.enqueue(dict(data, task_type=task_type, priority=priority, description=description))
+
+        result = {
+            "status": "success",
+            "task_id": task["task_id"],
+            "task_type": task_type,
+            "priority": priority,
+            "description": description,
+            "queue_status": task["status"],
+            "message": "Task queued successfully",
+            "timestamp": datetime.now().isoformat(),
+            "function": "autonomous-coordinator"
+        }
+
+        return flask.jsonify(result), 200
+
+    except Exception as e:
+        return flask.jsonify({"error": str(e)}), 500
+
+@app.route('/tasks', methods=['GET'])
+def list_tasks():
+    status_filter = flask.request.args.get('status')
+    return flask.jsonify(task_queue.list_tasks(status_filter)), 200
+
+@app.route('/tasks/metrics')
+def task_metrics():
+    return flask.jsonify(task_queue.metrics()), 200
+
+@app.route('/tasks/stream')
+def task_stream():
+    """Status changes of ?ids=a,b as server-sent events; Last-Event-ID resumes"""
+    task_ids = {task_id for task_id in flask.request.args.get('ids', '').split(',') if task_id}
+    if not task_ids:
+        return flask.jsonify({"error": "ids is required"}), 400
+
+    events = queue.Queue(maxsize=TASK_STREAM_QUEUE_SIZE)
+    subscriber = status_feed.subscribe(task_ids, lambda item: put_latest(events, item))
+    if subscriber is None:
+        return flask.jsonify({"error": "Too many task streams", "retry_after": 1}), 503, {"Retry-After": "1"}
+    try:
+        backlog = status_feed.catch_up(task_ids, flask.request.headers.get('Last-Event-ID'))
+    except Exception:
+        status_feed.unsubscribe(subscriber)
+        raise
+
+    def stream():
+        for event_id, event in backlog:
+            yield sse_frame(event_id, event)
+        while True:
+            try:
+                event_id, event = events.get(timeout=TASK_STREAM_KEEPALIVE)
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+                continue
+            yield sse_frame(event_id, event)
+
+    response = flask.Response(stream(), mimetype='text/event-stream',
+                              headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+    response.call_on_close(lambda: status_feed.unsubscribe(subscriber))
+    return response
+
+@app.route('/tasks/<task_id>/status')
+def task_status(task_id):
+    task = task_queue.get_task(task_id)
+    if task is None:
+        return flask.jsonify({"status": "not_found", "task_id": task_id}), 404
+    return flask.jsonify(task), 200
+
+@app.errorhandler(404)
+def not_found(error):
+    return flask.jsonify({"error": "Endpoint not found"}), 404
+
+def process_task(task):
+    """Run a queued task through the endpoint for its type, in-process
+
+    Unknown types and 4xx answers are permanent failures; 5xx answers are
+    retried with backoff by the worker pool.
+    """
+    route = TASK_ROUTES.get(task["task_type"])
+    if route is None:
+        raise PermanentTaskError(f"No handler for task type '{task['task_type']}'")
+
+    with app.test_client() as client:
+        response = client.post(route, json=task_input_of(task["payload"]))
+    body = response.get_json(silent=True) or {}
+    if response.status_code >= 500:
+        raise RuntimeError(body.get("error") or f"{route} returned HTTP {response.status_code}")
+    if response.status_code >= 400:
+        raise PermanentTaskError(body.get("error") or f"{route} returned HTTP {response.status_code}")
+    return body
+
+def start_task_workers(workers: int = None):
+    """Start this process's task worker pool (once)"""
+    global _worker_pool
+    with _worker_pool_lock:
+        if _worker_pool is None:
+            workers = workers if workers is not None else int(os.environ.get('TASK_WORKERS', 4))
+            _worker_pool = TaskWorkerPool(task_queue, process_task, workers=workers)
+            _worker_pool.start()
+    return _worker_pool
+
+def init_worker_process(task_workers: int = None):
+    """Per-process setup after a fork from a preloaded master
+
+    Database connections must not cross a fork, so the forked worker drops the
+    master's connection and opens its own on first use.
+    """
+    task_queue._local = threading.local()
+    if task_workers:
+        start_task_workers(task_workers)
+
+def print_endpoints():
+    print("📊 Available endpoints:")
+    print("   GET  /health - Health check")
+    print("   GET  / - Service information")
+    print("   POST /voice - Voice synthesis")
+    print("   POST /search - Web search")
+    print("   POST /execute - Code execution")
+    print("   POST /coordinate - Run a general or delegated task")
+    print("   POST /tasks - Task delegation")
+    print("   GET  /tasks/<id>/status - Task status")
+    print("   GET  /tasks/stream?ids=a,b - Task status events (SSE)")
+    print("   GET  /tasks/metrics - Queue depth and latency")
+
+if __name__ == '__main__':
+    print("🚀 Starting Full Autonomous Team API (development server)")
+    print_endpoints()
+    start_task_workers()
+    app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 8080)), debug=False)
@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+Autonomous Team API - ASGI application
+The team_api routes without blocking a worker per request
+
+Upstream voice/search calls go through one pooled httpx.AsyncClient (when
+VOICE_UPSTREAM_URL / SEARCH_UPSTREAM_URL are set; otherwise the routes
+answer with the same mock payloads as team_api). /execute runs code in
+child processes bounded by EXECUTE_POOL_SIZE, and /tasks hands SQLite work
+to a thread; TASK_WORKERS threads per process drain the queue by running
+each task through its endpoint in-process. Each route has a concurrency limit with a short wait queue;
+once both are full the route answers 429 with Retry-After instead of
+letting slow requests pile up and starve the rest of the API.
+
+Run with ``uvicorn team_api_async:asgi_app`` or gunicorn's UvicornWorker.
+"""
+
+import os
+import sys
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+
+# task_queue.py sits next to this file in the image; locally it lives in workflows
+sys.path.append("/root/CascadeProjects/autonomous_team_workspace/workflows")
+from task_queue import (
+    task_queue, task_type_of, task_input_of, TaskWorkerPool, PermanentTaskError, TASK_ROUTES,
+    TaskStatusFeed, put_latest, sse_frame, TASK_STREAM_QUEUE_SIZE, TASK_STREAM_KEEPALIVE
+)
+
+EXECUTE_TIMEOUT = 10
+EXECUTE_POOL_SIZE = int(os.environ.get("EXECUTE_POOL_SIZE", 4))
+VOICE_UPSTREAM_URL = os.environ.get("VOICE_UPSTREAM_URL")
+SEARCH_UPSTREAM_URL = os.environ.get("SEARCH_UPSTREAM_URL")
+MAX_SEARCH_RESULTS = 50
+# Task workers per process; the total stays near TASK_WORKERS across WEB_CONCURRENCY processes
+TASK_WORKERS = max(1, int(os.environ.get("TASK_WORKERS", 4)) // int(os.environ.get("WEB_CONCURRENCY", 1)))
+TASK_STREAM_MAX_SUBSCRIBERS = int(os.environ.get("TASK_STREAM_MAX_SUBSCRIBERS", 256))
+
+# path -> (concurrent requests, waiting requests); /health is never limited.
+# The first matching prefix wins, so long-lived streams stay out of the /tasks slots.
+ROUTE_LIMITS = {
+    "/tasks/stream": (TASK_STREAM_MAX_SUBSCRIBERS, 0),
+    "/voice": (int(os.environ.get("VOICE_CONCURRENCY", 64)), 128),
+    "/search": (int(os.environ.get("SEARCH_CONCURRENCY", 64)), 128),
+    "/execute": (EXECUTE_POOL_SIZE, EXECUTE_POOL_SIZE * 2),
+    "/tasks": (int(os.environ.get("TASKS_CONCURRENCY", 32)), 64)
+}
+
+class RouteSaturated(Exception):
+    """No slot and no room in the wait queue"""
+
+class RouteLimit:
+    """Concurrency limit with a bounded wait queue for one route
+
+    Admission is decided on the synchronous ``in_flight``/``waiting``
+    counters, so requests arriving in the same event-loop tick cannot all
+    slip past the queue cap before any of them reaches the semaphore.
+    """
+
+    def __init__(self, concurrency: int, queue_size: int, queue_timeout: float = 5.0):
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+        self.accepted = 0
+        self.rejected = 0
+
+    async def __aenter__(self):
+        if self.in_flight + self.waiting >= self.concurrency + self.queue_size:
+            self.rejected += 1
+            raise RouteSaturated()
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise RouteSaturated()
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        self.accepted += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "queue_size": self.queue_size,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "accepted": self.accepted,
+            "rejected": self.rejected
+        }
+
+class ConcurrencyLimitMiddleware:
+    """ASGI middleware applying ROUTE_LIMITS by path prefix, answering 429 when saturated"""
+
+    def __init__(self, app, limits: Dict[str, tuple]):
+        self.app = app
+        self.limits = {path: RouteLimit(*limit) for path, limit in limits.items()}
+
+    def _limit_for(self, path: str) -> Optional[RouteLimit]:
+        for prefix, limit in self.limits.items():
+            if path == prefix or path.startswith(prefix + "/"):
+                return limit
+        return None
+
+    async def __call__(self, scope, receive, send):
+        limit = self._limit_for(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            return await self.app(scope, receive, send)
+
+        try:
+            async with limit:
+                await self.app(scope, receive, send)
+        except RouteSaturated:
+            response = ORJSONResponse(
+                {"error": "Too many requests", "route": scope["path"], "retry_after": 1},
+                status_code=429,
+                headers={"Retry-After": "1"}
+            )
+            await response(scope, receive, send)
+
+async def run_task(app: FastAPI, task: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a queued task through the endpoint for its type, in-process
+
+    Unknown types and 4xx answers are permanent failures; 5xx answers are
+    retried with backoff by the worker pool.
+    """
+    route = TASK_ROUTES.get(task["task_type"])
+    if route is None:
+        raise PermanentTaskError(f"No handler for task type '{task['task_type']}'")
+
+    response = await app.state.task_client.post(route, json=task_input_of(task["payload"]))
+    body = response.json() if response.content else {}
+    if response.status_code >= 500:
+        raise RuntimeError(body.get("error") or f"{route} returned HTTP {response.status_code}")
+    if response.status_code >= 400:
+        raise PermanentTaskError(body.get("error") or f"{route} returned HTTP {response.status_code}")
+    return body
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """One pooled upstream client, one execute pool and one task worker pool per worker"""
+    import httpx
+
+    app.state.http = httpx.AsyncClient(
+        timeout=httpx.Timeout(10.0, connect=3.0),
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+    )
+    app.state.execute_pool = asyncio.Semaphore(EXECUTE_POOL_SIZE)
+
+    # Task workers are threads; each task runs on this loop against the app itself
+    loop = asyncio.get_running_loop()
+    app.state.task_client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://team-api", timeout=EXECUTE_TIMEOUT * 2
+    )
+    app.state.task_workers = TaskWorkerPool(
+        task_queue,
+        lambda task: asyncio.run_coroutine_threadsafe(run_task(app, task), loop).result(),
+        workers=TASK_WORKERS
+    )
+    app.state.task_workers.start()
+    yield
+    await asyncio.to_thread(app.state.task_workers.stop)
+    await app.state.task_client.aclose()
+    await app.state.http.aclose()
+
+app = FastAPI(title="Autonomous Team API", version="2.0.0", default_response_class=ORJSONResponse, lifespan=lifespan)
+limiter = ConcurrencyLimitMiddleware(app, ROUTE_LIMITS)
+status_feed = TaskStatusFeed(task_queue, max_subscribers=TASK_STREAM_MAX_SUBSCRIBERS)
+
+def _max_results(data: Dict[str, Any]) -> Optional[int]:
+    """``max_results`` as an int clamped to 1..MAX_SEARCH_RESULTS; None when it is not a number"""
+    value = data.get('max_results', 10)
+    if isinstance(value, bool):
+        return None
+    try:
+        return min(max(int(value), 1), MAX_SEARCH_RESULTS)
+    except (TypeError, ValueError):
+        return None
+
+async def _json_body(request: Request) -> Dict[str, Any]:
+    try:
+        data = await request.json()
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+async def _upstream(request: Request, url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    response = await request.app.state.http.post(url, json=payload)
+    response.raise_for_status()
+    return response.json()
+
+@app.get("/health")
+async def health():
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "service": "autonomous-team-api",
+        "version": "2.0.0",
+        "capabilities": ["voice", "search", "execute", "tasks"]
+    }
+
+@app.get("/")
+async def index():
+    return {
+        "service": "Autonomous Team API",
+        "status": "running",
+        "endpoints": ["/health", "/voice", "/search", "/execute", "/tasks"],
+        "timestamp": datetime.now().isoformat(),
+        "team": "full-autonomous-team"
+    }
+
+@app.get("/limits")
+async def limits():
+    """Per-route concurrency, queue and rejection counters"""
+    return {path: limit.stats() for path, limit in limiter.limits.items()}
+
+@app.post("/voice")
+async def voice(request: Request):
+    try:
+        data = await _json_body(request)
+        text = data.get('text', 'Hello from autonomous team!')
+        voice_profile = data.get('voice_profile', 'professional_british')
+
+        if VOICE_UPSTREAM_URL:
+            upstream = await _upstream(request, VOICE_UPSTREAM_URL, {"text": text, "voice_profile": voice_profile})
+            audio_url = upstream.get("audio_url")
+            duration = upstream.get("duration", max(1.0, len(text) * 0.1))
+        else:
+            audio_url = f"https://audio.autonomous-team.com/{voice_profile}/{hash(text)}.wav"
+            duration = max(1.0, len(text) * 0.1)
+
+        return {
+            "status": "success",
+            "text": text,
+            "voice_profile": voice_profile,
+            "audio_url": audio_url,
+            "duration": duration,
+            "timestamp": datetime.now().isoformat(),
+            "function": "voice-synthesis-agent"
+        }
+
+    except Exception as e:
+        return ORJSONResponse({"error": str(e)}, status_code=500)
+
+@app.post("/search")
+async def search(request: Request):
+    try:
+        data = await _json_body(request)
+        query = data.get('query', '')
+        max_results = _max_results(data)
+
+        if not query:
+            return ORJSONResponse({"error": "Query required"}, status_code=400)
+        if max_results is None:
+            return ORJSONResponse({"error": "max_results must be an integer"}, status_code=400)
+
+        if SEARCH_UPSTREAM_URL:
+            upstream = await _upstream(request, SEARCH_UPSTREAM_URL, {"query": query, "max_results": max_results})
+            results = upstream.get("results", [])[:max_results]
+        else:
+            results = [
+                {
+                    "title": f"Search Result {i+1} for '{query}'",
+                    "url": f"https://example.com/result{i+1}",
+                    "snippet": f"This is result {i+1} for the query {query}",
+                    "relevance": round(0.9 - (i * 0.1), 2)
+                }
+                for i in range(min(max_results, 5))
+            ]
+
+        return {
+            "status": "success",
+            "query": query,
+            "results": results,
+            "total_results": len(results),
+            "timestamp": datetime.now().isoformat(),
+            "function": "web-search-agent"
+        }
+
+    except Exception as e:
+        return ORJSONResponse({"error": str(e)}, status_code=500)
+
+@app.post("/execute")
+async def execute(request: Request):
+    data = await _json_body(request)
+    code = data.get('code', '')
+    language = data.get('language', 'python')
+
+    if not code:
+        return ORJSONResponse({"error": "Code required"}, status_code=400)
+
+    if language != 'python':
+        return ORJSONResponse({"error": "Only Python supported"}, status_code=400)
+
+    # Code goes in on stdin, so there is no temp file to write or clean up
+    async with request.app.state.execute_pool:
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(code.encode()), timeout=EXECUTE_TIMEOUT)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            return ORJSONResponse({"error": "Code execution timed out"}, status_code=408)
+
+    return {
+        "status": "success" if process.returncode == 0 else "error",
+        "output": stdout.decode(errors="replace"),
+        "error": stderr.decode(errors="replace") or None,
+        "return_code": process.returncode,
+        "language": language,
+        "timestamp": datetime.now().isoformat(),
+        "function": "code-execution-sandbox"
+    }
+
+@app.post("/coordinate")
+async def coordinate(request: Request):
+    """Coordinator acknowledgement for general and task_delegation tasks run by the workers"""
+    try:
+        data = await _json_body(request)
+
+        return {
+            "status": "success",
+            "task_type": task_type_of(data),
+            "priority": data.get('priority', 'medium'),
+            "description": data.get('description', 'Autonomous team task'),
+            "coordinated": True,
+            "timestamp": datetime.now().isoformat(),
+            "function": "autonomous-coordinator"
+        }
+
+    except Exception as e:
+        return ORJSONResponse({"error": str(e)}, status_code=500)
+
+@app.post("/tasks")
+async def tasks(request: Request):
+    try:
+        data = await _json_body(request)
+        task_type = task_type_of(data)
+        priority = data.get('priority', 'medium')
+        description = data.get('description', 'Autonomous team task')
+
+        task = await asyncio.to_thread(
+            task_queue.enqueue, dict(data, task_type=task_type, priority=priority, description=description)
+        )
+
+        return {
+            "status": "success",
+            "task_id": task["task_id"],
+            "task_type": task_type,
+            "priority": priority,
+            "description": description,
+            "queue_status": task["status"],
+            "message": "Task queued successfully",
+            "timestamp": datetime.now().isoformat(),
+            "function": "autonomous-coordinator"
+        }
+
+    except Exception as e:
+        return ORJSONResponse({"error": str(e)}, status_code=500)
+
+@app.get("/tasks")
+async def list_tasks(status: Optional[str] = None):
+    return await asyncio.to_thread(task_queue.list_tasks, status)
+
+@app.get("/tasks/metrics")
+async def task_metrics():
+    return await asyncio.to_thread(task_queue.metrics)
+
+@app.get("/tasks/stream")
+async def task_stream(request: Request, ids: str = ""):
+    """Status changes of ?ids=a,b as server-sent events; Last-Event-ID resumes"""
+    task_ids = {task_id for task_id in ids.split(",") if task_id}
+    if not task_ids:
+        return ORJSONResponse({"error": "ids is required"}, status_code=400)
+
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue(maxsize=TASK_STREAM_QUEUE_SIZE)
+    subscriber = status_feed.subscribe(task_ids, lambda item: loop.call_soon_threadsafe(put_latest, events, item))
+    if subscriber is None:
+        return ORJSONResponse({"error": "Too many task streams", "retry_after": 1},
+                              status_code=503, headers={"Retry-After": "1"})
+    try:
+        backlog = await asyncio.to_thread(status_feed.catch_up, task_ids, request.headers.get("last-event-id"))
+    except Exception:
+        status_feed.unsubscribe(subscriber)
+        raise
+
+    async def stream():
+        try:
+            for event_id, event in backlog:
+                yield sse_frame(event_id, event)
+            while True:
+                try:
+                    event_id, event = await asyncio.wait_for(events.get(), timeout=TASK_STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield sse_frame(event_id, event)
+        finally:
+            status_feed.unsubscribe(subscriber)
+
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.get("/tasks/{task_id}/status")
+async def task_status(task_id: str):
+    task = await asyncio.to_thread(task_queue.get_task, task_id)
+    if task is None:
+        return ORJSONResponse({"status": "not_found", "task_id": task_id}, status_code=404)
+    return task
+
+# The ASGI entry point: route limits wrap the whole application
+asgi_app = limiter
+
+if __name__ == '__main__':
+    import uvicorn
+
+    print("🚀 Starting Autonomous Team API (ASGI)")
+    uvicorn.run("team_api_async:asgi_app", host="0.0.0.0", port=int(os.environ.get("PORT", 8080)),
+                workers=int(os.environ.get("WEB_CONCURRENCY", 1)), access_log=False)
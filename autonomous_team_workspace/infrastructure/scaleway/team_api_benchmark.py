@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Autonomous Team API Benchmark - Autonomous Team
+Compare the Flask development server, gunicorn and the ASGI app
+
+All servers run locally on the same routes. The ``mixed`` scenario is a
+closed loop of concurrent clients over /health, /voice, /search and /tasks
+and reports req/s, p50/p99 latency, errors and whether every response
+carried an application/json content type. The ``starvation`` scenario
+floods /execute with slow scripts and measures what /health sees
+meanwhile, plus how many executes were shed with 429.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Any
+
+from handler_harness import percentile
+
+SCALEWAY_DIR = Path(__file__).resolve().parent
+
+REQUEST_MIX = [
+    ("GET", "/health", None),
+    ("POST", "/voice", {"text": "Benchmarking the autonomous team"}),
+    ("POST", "/search", {"query": "production wsgi", "max_results": 5}),
+    ("GET", "/health", None),
+    ("POST", "/tasks", {"task_type": "benchmark", "priority": "low"})
+]
+
+def start_server(mode: str, port: int, db_path: str, workers: int = None) -> subprocess.Popen:
+    env = os.environ.copy()
+    env.update({"PORT": str(port), "TASK_QUEUE_DB": db_path, "TASK_WORKERS": "2", "APP_MODULE": "team_api"})
+    if workers:
+        env["WEB_CONCURRENCY"] = str(workers)
+
+    if mode == "dev":
+        command = [sys.executable, "team_api.py"]
+    elif mode == "asgi":
+        command = [sys.executable, "-m", "uvicorn", "team_api_async:asgi_app", "--port", str(port),
+                   "--workers", str(workers or 1), "--no-access-log"]
+    else:
+        command = [sys.executable, "-m", "gunicorn", "-c", "team_api_gunicorn.py"]
+    return subprocess.Popen(command, cwd=SCALEWAY_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+async def wait_ready(url: str, timeout: float = 30):
+    import aiohttp
+
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(f"{url}/health") as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not become healthy within {timeout}s")
+
+async def run_load(url: str, requests: int, concurrency: int) -> Dict[str, Any]:
+    """Closed-loop load over REQUEST_MIX"""
+    import aiohttp
+
+    latencies: List[float] = []
+    errors = 0
+    wrong_content_type = 0
+    sent = 0
+
+    async def client(session):
+        nonlocal sent, errors, wrong_content_type
+        while sent < requests:
+            method, path, payload = REQUEST_MIX[sent % len(REQUEST_MIX)]
+            sent += 1
+            started = time.perf_counter()
+            try:
+                async with session.request(method, f"{url}{path}", json=payload) as response:
+                    await response.read()
+                    if response.status >= 400:
+                        errors += 1
+                    if response.content_type != "application/json":
+                        wrong_content_type += 1
+            except aiohttp.ClientError:
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        started = time.perf_counter()
+        await asyncio.gather(*(client(session) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "latency_ms_p50": percentile(latencies, 0.50),
+        "latency_ms_p99": percentile(latencies, 0.99),
+        "errors": errors,
+        "non_json_responses": wrong_content_type
+    }
+
+async def run_starvation(url: str, slow_requests: int, slow_seconds: float, probes: int = 50) -> Dict[str, Any]:
+    """Flood /execute with slow scripts and probe /health while they run"""
+    import aiohttp
+
+    statuses: Dict[int, int] = {}
+    health_ms: List[float] = []
+    slow_code = f"import time; time.sleep({slow_seconds})"
+
+    async def slow(session):
+        try:
+            async with session.post(f"{url}/execute", json={"code": slow_code}) as response:
+                await response.read()
+                statuses[response.status] = statuses.get(response.status, 0) + 1
+        except aiohttp.ClientError:
+            statuses[0] = statuses.get(0, 0) + 1
+
+    async def probe(session):
+        await asyncio.sleep(0.2)
+        for _ in range(probes):
+            started = time.perf_counter()
+            async with session.get(f"{url}/health") as response:
+                await response.read()
+            health_ms.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(slow_seconds / probes)
+
+    timeout = aiohttp.ClientTimeout(total=slow_seconds * slow_requests + 30)
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0), timeout=timeout) as session:
+        started = time.perf_counter()
+        await asyncio.gather(probe(session), *(slow(session) for _ in range(slow_requests)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "slow_requests": slow_requests,
+        "slow_seconds": slow_seconds,
+        "seconds": round(elapsed, 3),
+        "health_ms_p50": percentile(health_ms, 0.50),
+        "health_ms_p99": percentile(health_ms, 0.99),
+        "health_ms_max": round(max(health_ms), 3) if health_ms else None,
+        "execute_statuses": statuses
+    }
+
+async def benchmark(requests: int, concurrency: int, workers: int = None, port: int = 8095,
+                    modes=("dev", "gunicorn", "asgi"), scenario: str = "mixed",
+                    slow_requests: int = 64, slow_seconds: float = 2.0) -> Dict[str, Any]:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for offset, mode in enumerate(modes):
+            url = f"http://127.0.0.1:{port + offset}"
+            server = start_server(mode, port + offset, str(Path(tmp) / f"{mode}_tasks.db"), workers)
+            try:
+                await wait_ready(url)
+                if scenario == "starvation":
+                    results[mode] = await run_starvation(url, slow_requests, slow_seconds)
+                else:
+                    await run_load(url, min(200, requests), concurrency)  # warm-up
+                    results[mode] = await run_load(url, requests, concurrency)
+            finally:
+                server.terminate()
+                server.wait(timeout=10)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Dev server vs gunicorn vs ASGI benchmark for the team API")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, help="Server processes (gunicorn default from team_api_gunicorn.py, ASGI 1)")
+    parser.add_argument("--modes", default="dev,gunicorn,asgi", help="Comma-separated servers to compare")
+    parser.add_argument("--scenario", choices=("mixed", "starvation"), default="mixed")
+    parser.add_argument("--slow-requests", type=int, default=64, help="Concurrent slow /execute calls (starvation)")
+    parser.add_argument("--slow-seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    modes = tuple(args.modes.split(","))
+    results = asyncio.run(benchmark(args.requests, args.concurrency, args.workers, modes=modes,
+                                    scenario=args.scenario, slow_requests=args.slow_requests,
+                                    slow_seconds=args.slow_seconds))
+
+    if args.scenario == "starvation":
+        print(f"\n🐢 {args.slow_requests} concurrent {args.slow_seconds:g}s /execute calls - /health latency meanwhile")
+        print(f"   {'server':<10} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}  execute statuses")
+        for mode, r in results.items():
+            print(f"   {mode:<10} {r['health_ms_p50']:>9.2f} {r['health_ms_p99']:>9.2f} {r['health_ms_max']:>9.2f}  {r['execute_statuses']}")
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n⚡ Team API: {args.requests} requests @ {args.concurrency} concurrent clients")
+    print(f"   {'server':<10} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7} {'non-json':>9}")
+    for mode, r in results.items():
+        print(f"   {mode:<10} {r['throughput_rps']:>9.1f} {r['latency_ms_p50']:>9.2f} {r['latency_ms_p99']:>9.2f} "
+              f"{r['errors']:>7} {r['non_json_responses']:>9}")
+    for mode in ("gunicorn", "asgi"):
+        if "dev" in results and mode in results:
+            speedup = results[mode]["throughput_rps"] / results["dev"]["throughput_rps"]
+            print(f"   🚀 {mode} serves {speedup:.1f}x the dev server's throughput")
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Gunicorn settings for the Autonomous Team API
+Shipped as gunicorn.conf.py in the API image: ``gunicorn -c gunicorn.conf.py``
+
+Every setting can be overridden through the container environment.
+"""
+
+import os
+import importlib
+import multiprocessing
+
+# app.py in the image, team_api when run from the repository
+APP_MODULE = os.environ.get("APP_MODULE", "app")
+wsgi_app = f"{APP_MODULE}:app"
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+
+# Threaded workers: /execute waits on a subprocess for up to 10s, so each
+# process keeps serving other requests on its remaining threads
+worker_class = "gthread"
+workers = int(os.environ.get("WEB_CONCURRENCY", min(2 * multiprocessing.cpu_count() + 1, 4)))
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
+
+# Import the app once in the master and fork it, so workers boot fast and share pages
+preload_app = True
+
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = 10
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 10000))
+max_requests_jitter = 1000
+
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG") or None
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "warning")
+
+def post_fork(server, worker):
+    # Task workers are split across web workers so the total stays at TASK_WORKERS
+    init_worker_process = importlib.import_module(APP_MODULE).init_worker_process
+    total = int(os.environ.get("TASK_WORKERS", 4))
+    init_worker_process(task_workers=max(1, total // workers))
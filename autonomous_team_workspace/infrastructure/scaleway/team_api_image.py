@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Autonomous Team API Image - Autonomous Team
+Build and push the production API image with its dependencies prebuilt
+
+The container used to start from python:3.11-slim and run ``pip install
+flask`` on every cold start. The image built here installs pinned
+dependencies from wheels at build time and starts gunicorn directly. It is
+tagged with a hash of its build context, so an unchanged API is never
+rebuilt or pushed again.
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Dict
+
+SCALEWAY_DIR = Path(__file__).resolve().parent
+TEAM_API_MODULE = SCALEWAY_DIR / "team_api.py"
+GUNICORN_CONFIG = SCALEWAY_DIR / "team_api_gunicorn.py"
+TASK_QUEUE_MODULE = Path("/root/CascadeProjects/autonomous_team_workspace/workflows/task_queue.py")
+
+BUILD_DIR = Path("/tmp/autonomous_team_api_image")
+REGISTRY = os.environ.get("SCW_REGISTRY", "rg.fr-par.scw.cloud/autonomous-team")
+IMAGE_NAME = "autonomous-team-api"
+
+API_REQUIREMENTS = """flask>=3.0,<4
+gunicorn>=22.0,<27
+orjson>=3.9,<4
+psycopg2-binary>=2.9,<3
+"""
+
+DOCKERFILE = """FROM python:3.11-slim AS build
+COPY requirements.txt .
+RUN pip wheel --no-cache-dir --wheel-dir /wheels -r requirements.txt
+
+FROM python:3.11-slim
+ENV PYTHONDONTWRITEBYTECODE=1 \\
+    PYTHONUNBUFFERED=1 \\
+    APP_MODULE=app \\
+    PORT=8080
+WORKDIR /app
+
+# Dependencies come from wheels built above - nothing is installed at start
+COPY --from=build /wheels /wheels
+RUN pip install --no-cache-dir --no-index /wheels/* && rm -rf /wheels
+
+COPY task_queue.py app.py gunicorn.conf.py ./
+RUN python -m compileall -q /app && useradd -m -u 1000 appuser && chown -R appuser:appuser /app
+USER appuser
+
+EXPOSE 8080
+CMD ["gunicorn", "-c", "gunicorn.conf.py"]
+"""
+
+def build_context() -> Dict[str, bytes]:
+    """Files of the image build context"""
+    return {
+        "Dockerfile": DOCKERFILE.encode(),
+        "requirements.txt": API_REQUIREMENTS.encode(),
+        "app.py": TEAM_API_MODULE.read_bytes(),
+        "gunicorn.conf.py": GUNICORN_CONFIG.read_bytes(),
+        "task_queue.py": TASK_QUEUE_MODULE.read_bytes()
+    }
+
+def context_hash(files: Dict[str, bytes]) -> str:
+    digest = hashlib.sha256()
+    for name in sorted(files):
+        digest.update(name.encode() + b"\0")
+        digest.update(hashlib.sha256(files[name]).digest())
+    return digest.hexdigest()
+
+def write_build_context(build_dir: Path = BUILD_DIR) -> Dict[str, str]:
+    """Write the build context; returns its directory and content-hash tag"""
+    files = build_context()
+    build_dir.mkdir(parents=True, exist_ok=True)
+    for name, content in files.items():
+        (build_dir / name).write_bytes(content)
+    return {"build_dir": str(build_dir), "tag": context_hash(files)[:12]}
+
+def _image_exists(image: str) -> bool:
+    result = subprocess.run(["docker", "manifest", "inspect", image], capture_output=True, text=True)
+    return result.returncode == 0
+
+def build_api_image(registry: str = REGISTRY, build_dir: Path = BUILD_DIR, push: bool = True) -> str:
+    """Build (and push) the API image; returns the image reference to deploy"""
+    context = write_build_context(build_dir)
+    image = f"{registry}/{IMAGE_NAME}:{context['tag']}"
+
+    if push and _image_exists(image):
+        print(f"   ⏭️  {image} already in the registry - skipping build")
+        return image
+
+    print(f"   🏗️  Building {image}...")
+    result = subprocess.run(["docker", "build", "-t", image, context["build_dir"]],
+                            capture_output=True, text=True, timeout=900)
+    if result.returncode != 0:
+        raise RuntimeError(f"docker build failed: {result.stderr.strip()[-1000:]}")
+
+    if push:
+        print(f"   📤 Pushing {image}...")
+        result = subprocess.run(["docker", "push", image], capture_output=True, text=True, timeout=900)
+        if result.returncode != 0:
+            raise RuntimeError(f"docker push failed: {result.stderr.strip()[-1000:]}")
+
+    print(f"   ✅ API image ready: {image}")
+    return image
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the Autonomous Team API image")
+    parser.add_argument("--registry", default=REGISTRY)
+    parser.add_argument("--no-push", action="store_true", help="Build locally only")
+    parser.add_argument("--context-only", action="store_true", help="Write the build context and stop")
+    args = parser.parse_args()
+
+    if args.context_only:
+        print(json.dumps(write_build_context(), indent=2))
+        return 0
+    try:
+        print(build_api_image(args.registry, push=not args.no_push))
+    except (RuntimeError, FileNotFoundError) as e:
+        print(f"❌ {e}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,9 @@ import requests
 from pathlib import Path
 from typing import Optional, Dict, Any
 
+class DocumentationUnavailable(Exception):
+    """DeepWiki could not be reached or answered with an HTTP error"""
+
 class DeepWikiDocClient:
     """DeepWiki MCP server client for autonomous agents"""
     
@@ -18,8 +21,13 @@ class DeepWikiDocClient:
         self.cache = {}
         self.workspace = Path("/root/CascadeProjects/autonomous_team_workspace")
         
-    def search_documentation(self, query: str, context: str = None) -> Optional[Dict[str, Any]]:
-        """Search DeepWiki documentation for help"""
+    def search_documentation(self, query: str, context: str = None,
+                             raise_errors: bool = False) -> Optional[Dict[str, Any]]:
+        """Search DeepWiki documentation for help
+
+        With ``raise_errors``, transport and HTTP failures raise
+        DocumentationUnavailable instead of looking like an empty answer.
+        """
         print(f"🔍 DeepWiki Search: {query}")
         
         # Check cache first
@@ -59,10 +67,16 @@ class DeepWikiDocClient:
                 return results
             else:
                 print(f"   ❌ DeepWiki search failed: {response.status_code}")
+                if raise_errors:
+                    raise DocumentationUnavailable(f"DeepWiki answered HTTP {response.status_code}")
                 return None
                 
+        except DocumentationUnavailable:
+            raise
         except Exception as e:
             print(f"   ❌ DeepWiki client error: {e}")
+            if raise_errors:
+                raise DocumentationUnavailable(str(e)) from e
             return None
     
     def get_best_practice(self, topic: str) -> Optional[str]:
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Shared Documentation Service - Autonomous Team
+One documentation client per process with memoized lookups across agents
+"""
+
+import re
+import time
+import threading
+from typing import Optional, Dict, Any, Tuple
+
+class DocumentationService:
+    """Documentation-first lookups shared by every agent in a process
+
+    The DeepWiki client (and the local documentation seeding it triggers) is
+    imported on first use only. A mission and its context are reduced to the
+    documentation topics they mention, and lookups are memoized on that query,
+    so agents asking about the same topics share one result; the lookup itself
+    sends the original task and context. Concurrent lookups for the same query
+    wait for a single in-flight request, misses are remembered for
+    ``negative_ttl`` seconds only, and once external DeepWiki is unreachable or
+    answers with an HTTP error every agent skips it for
+    ``external_retry_after`` seconds instead of paying the timeout again.
+    DeepWiki answering with nothing is a miss, not an outage.
+    """
+
+    def __init__(self, external_retry_after: float = 300.0, negative_ttl: float = 60.0):
+        self.external_retry_after = external_retry_after
+        self.negative_ttl = negative_ttl
+        self._doc_client = None
+        self._local_search = None
+        self._unavailable = None
+        self._topics: frozenset = frozenset()
+        self._init_lock = threading.Lock()
+
+        # query -> (result, expires_at); found documentation never expires
+        self._memo: Dict[str, Tuple[Optional[Dict[str, Any]], float]] = {}
+        self._inflight: Dict[str, threading.Event] = {}
+        self._memo_lock = threading.Lock()
+        self._external_unavailable_until = 0.0
+
+        self.stats = {
+            "lookups": 0,
+            "memo_hits": 0,
+            "external_calls": 0,
+            "external_skipped": 0,
+            "local_calls": 0
+        }
+
+    def _clients(self):
+        """Import DeepWiki and local documentation once, on first lookup"""
+        if self._doc_client is None:
+            with self._init_lock:
+                if self._doc_client is None:
+                    from deepwiki_client import doc_client, DocumentationUnavailable
+                    from local_documentation import search_local_documentation, local_documentation_topics
+                    self._local_search = search_local_documentation
+                    self._topics = frozenset(local_documentation_topics())
+                    self._unavailable = DocumentationUnavailable
+                    self._doc_client = doc_client
+        return self._doc_client, self._local_search
+
+    def documentation_query(self, task: str, context: str = None) -> str:
+        """Normalized query: the known documentation topics in task and context, sorted
+
+        Falls back to all words when no known topic is mentioned.
+        """
+        words = set(re.findall(r"[a-z0-9]+", f"{task} {context or ''}".lower()))
+        return " ".join(sorted(words & self._topics or words))
+
+    def check_documentation_first(self, task: str, context: str = None) -> Optional[Dict[str, Any]]:
+        """Memoized equivalent of deepwiki_client.check_documentation_first"""
+        doc_client, _ = self._clients()
+        with self._memo_lock:
+            self.stats["lookups"] += 1
+        if not doc_client.should_check_docs(task):
+            return None
+        key = self.documentation_query(task, context)
+
+        with self._memo_lock:
+            memo = self._memo.get(key)
+            if memo is not None and memo[1] > time.time():
+                self.stats["memo_hits"] += 1
+                return memo[0]
+
+            waiter = self._inflight.get(key)
+            if waiter is None:
+                self._inflight[key] = threading.Event()
+
+        if waiter is not None:
+            # Another agent is already looking this up
+            waiter.wait()
+            with self._memo_lock:
+                self.stats["memo_hits"] += 1
+                return self._memo.get(key, (None, 0.0))[0]
+
+        try:
+            result = self._lookup(task, context)
+        except Exception:
+            result = None
+
+        with self._memo_lock:
+            self._memo[key] = (result, float("inf") if result else time.time() + self.negative_ttl)
+            self._inflight.pop(key).set()
+        return result
+
+    def _lookup(self, task: str, context: str = None) -> Optional[Dict[str, Any]]:
+        print("🤖 Autonomous Agent: Checking documentation first...")
+        doc_client, local_search = self._clients()
+
+        if time.time() >= self._external_unavailable_until:
+            self.stats["external_calls"] += 1
+            try:
+                results = doc_client.search_documentation(task, context, raise_errors=True)
+            except self._unavailable:
+                self._external_unavailable_until = time.time() + self.external_retry_after
+                print("   🌐 External docs unavailable - checking local documentation...")
+            else:
+                if results:
+                    print("   📚 External documentation found - applying best practices")
+                    return results
+                print("   🌐 No external documentation - checking local documentation...")
+        else:
+            self.stats["external_skipped"] += 1
+            print("   🌐 External docs recently unavailable - using local documentation")
+
+        self.stats["local_calls"] += 1
+        local_results = local_search(task, context)
+        if local_results:
+            print("   📚 Local documentation found - applying best practices")
+            return local_results
+
+        print("   📚 No documentation found - using autonomous reasoning")
+        return None
+
+    def clear(self):
+        """Drop memoized lookups and the external-unavailable marker"""
+        with self._memo_lock:
+            self._memo.clear()
+            self._external_unavailable_until = 0.0
@@ -208,6 +208,14 @@ class LocalDocumentationSystem:
         
         return None
     
+    def topics(self) -> set:
+        """Every tag used by the local documents"""
+        topics = set()
+        for doc_file in self.docs_dir.glob("*.json"):
+            with open(doc_file, 'r') as f:
+                topics.update(json.load(f).get("tags", []))
+        return topics
+
     def get_best_practice(self, topic: str) -> Optional[str]:
         """Get best practices for a specific topic"""
         results = self.search_documentation(f"best practices {topic}")
@@ -236,6 +244,10 @@ def search_local_documentation(query: str, context: str = None) -> Optional[Dict
     """Search local documentation"""
     return local_docs.search_documentation(query, context)
 
+def local_documentation_topics() -> set:
+    """Tags of the local documents; the vocabulary documentation queries are reduced to"""
+    return local_docs.topics()
+
 def get_local_best_practice(topic: str) -> Optional[str]:
     """Get best practices from local docs"""
     return local_docs.get_best_practice(topic)
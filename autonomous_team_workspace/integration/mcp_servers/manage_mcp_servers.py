@@ -10,7 +10,7 @@ from pathlib import Path
 
 # Add MCP manager to path
 sys.path.append("/root/CascadeProjects/autonomous_team_workspace/integration/mcp_servers")
-from mcp_manager import add_mcp_server, list_mcp_servers, test_mcp_server, deploy_to_scaleway
+from mcp_manager import add_mcp_server, list_mcp_servers, test_all_mcp_servers, deploy_to_scaleway
 
 def main():
     print("🌐 MCP Server Management - Autonomous Team")
@@ -33,8 +33,7 @@ def main():
     
     # Test servers
     print("\n🧪 Testing MCP servers...")
-    for server in list_mcp_servers():
-        test_mcp_server(server['name'])
+    test_all_mcp_servers(concurrency=10)
     
     # Deploy to Scaleway
     print("\n🚀 Deploying to Scaleway...")
@@ -4,20 +4,62 @@ MCP Server Manager - Autonomous Team
 Add, configure, and manage MCP servers
 """
 
+import os
+import copy
 import json
+import time
+import fcntl
+import atexit
+import asyncio
+import tempfile
+import threading
 import subprocess
 import yaml
 from pathlib import Path
 from datetime import datetime
+from contextlib import contextmanager
 from typing import Dict, List, Any, Optional
 
+from mcp_status_store import MCPStatusStore
+
 class MCPServerManager:
     """Manage MCP servers for autonomous team"""
     
-    def __init__(self):
+    def __init__(self, save_debounce: float = 0.5):
         self.mcp_config_path = Path("/root/CascadeProjects/autonomous_team_workspace/integration/mcp_servers/mcp_config.json")
+        self.lock_path = self.mcp_config_path.with_name(self.mcp_config_path.name + ".lock")
         self.servers_config = self.load_mcp_config()
+        self._status_store: Optional[MCPStatusStore] = None
+        
+        # Write-behind state: changed servers are flushed together
+        self.save_debounce = save_debounce
+        self._lock = threading.RLock()
+        self._dirty = set()
+        self._dirty_all = False
+        self._flush_timer: Optional[threading.Timer] = None
+        # One savepoint per open batch(), innermost last
+        self._savepoints: List[tuple] = []
+        atexit.register(self.flush)
         
+    @property
+    def status_store(self) -> MCPStatusStore:
+        """Health check history, opened on first use
+
+        Lives next to the config (or at ``MCP_STATUS_DB``); falls back to the
+        temp directory when the config directory does not exist.
+        """
+        if self._status_store is None:
+            with self._lock:
+                if self._status_store is None:
+                    db_path = os.environ.get("MCP_STATUS_DB")
+                    if db_path is None:
+                        directory = self.mcp_config_path.parent
+                        if not directory.is_dir():
+                            directory = Path(tempfile.gettempdir())
+                        db_path = directory / "mcp_status_history.db"
+                    self._status_store = MCPStatusStore(db_path)
+        return self._status_store
+
     def load_mcp_config(self) -> Dict[str, Any]:
         """Load MCP server configuration"""
         if self.mcp_config_path.exists():
@@ -30,11 +72,117 @@ class MCPServerManager:
                 "last_updated": None
             }
     
-    def save_mcp_config(self):
-        """Save MCP server configuration"""
-        self.servers_config["last_updated"] = datetime.now().isoformat()
-        with open(self.mcp_config_path, 'w') as f:
-            json.dump(self.servers_config, f, indent=2)
+    def save_mcp_config(self, server_name: str = None):
+        """Queue configuration changes for saving
+        
+        Inside ``batch()`` the write waits for the batch to commit; otherwise
+        it is debounced so bursts of changes produce a single write. Pass the
+        changed server's name so concurrent writers only touch that entry.
+        """
+        with self._lock:
+            if server_name is None:
+                self._dirty_all = True
+            else:
+                self._dirty.add(server_name)
+            
+            if self._savepoints:
+                return
+            if self.save_debounce <= 0:
+                self.flush()
+                return
+            if self._flush_timer:
+                self._flush_timer.cancel()
+            self._flush_timer = threading.Timer(self.save_debounce, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+    
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive lock shared by every process writing the config"""
+        with open(self.lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _write_config_atomic(self, config: Dict[str, Any]):
+        """Write the config to a temp file and rename it over the original"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.mcp_config_path.parent, prefix=".mcp_config.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(config, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.mcp_config_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    
+    def flush(self):
+        """Write pending changes now, merged with what other processes saved"""
+        with self._lock:
+            if self._flush_timer:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not (self._dirty or self._dirty_all):
+                return
+            
+            # A full save rewrites every server we hold, but still merges per
+            # key so servers other processes added are kept
+            dirty = set(self._dirty)
+            if self._dirty_all:
+                dirty.update(self.servers_config["mcpServers"])
+            
+            with self._file_lock():
+                merged = self.load_mcp_config()
+                for key, value in self.servers_config.items():
+                    if key != "mcpServers":
+                        merged[key] = copy.deepcopy(value)
+                for name in dirty:
+                    if name in self.servers_config["mcpServers"]:
+                        merged["mcpServers"][name] = copy.deepcopy(self.servers_config["mcpServers"][name])
+                    else:
+                        merged["mcpServers"].pop(name, None)
+                
+                merged["last_updated"] = datetime.now().isoformat()
+                self._write_config_atomic(merged)
+            
+            # Pick up servers other processes added or removed, in place
+            servers = self.servers_config["mcpServers"]
+            servers.clear()
+            servers.update(merged["mcpServers"])
+            self.servers_config["last_updated"] = merged["last_updated"]
+            self._dirty.clear()
+            self._dirty_all = False
+    
+    @contextmanager
+    def batch(self):
+        """Group changes into one atomic write; rolled back if the block raises
+
+        Batches nest like savepoints: an inner batch that raises undoes only
+        its own changes, and the outermost batch writes everything else.
+        """
+        with self._lock:
+            self._savepoints.append((copy.deepcopy(self.servers_config), set(self._dirty), self._dirty_all))
+        
+        try:
+            yield self
+        except BaseException:
+            with self._lock:
+                snapshot, self._dirty, self._dirty_all = self._savepoints.pop()
+                # Restore in place so holders of servers_config stay valid
+                servers = self.servers_config["mcpServers"]
+                servers.clear()
+                servers.update(snapshot.pop("mcpServers"))
+                self.servers_config.clear()
+                self.servers_config.update(snapshot, mcpServers=servers)
+            raise
+        
+        with self._lock:
+            self._savepoints.pop()
+            if not self._savepoints:
+                self.flush()
     
     def add_mcp_server(self, 
                       server_name: str,
@@ -55,17 +203,29 @@ class MCPServerManager:
         }
         
         self.servers_config["mcpServers"][server_name] = server_config
-        self.save_mcp_config()
-        
-        print(f"   ✅ MCP server {server_name} added successfully")
+        if self._save_now(server_name):
+            print(f"   ✅ MCP server {server_name} added successfully")
+        else:
+            print(f"   ⏳ MCP server {server_name} added; saved when the batch completes")
         return True
     
+    def _save_now(self, server_name: str) -> bool:
+        """Save one server's change immediately, unless a batch will; returns whether it was written"""
+        with self._lock:
+            self.save_mcp_config(server_name)
+            if self._savepoints:
+                return False
+            self.flush()
+            return True
+    
     def remove_mcp_server(self, server_name: str) -> bool:
         """Remove an MCP server"""
         if server_name in self.servers_config["mcpServers"]:
             del self.servers_config["mcpServers"][server_name]
-            self.save_mcp_config()
-            print(f"   ✅ MCP server {server_name} removed")
+            if self._save_now(server_name):
+                print(f"   ✅ MCP server {server_name} removed")
+            else:
+                print(f"   ⏳ MCP server {server_name} removed; saved when the batch completes")
             return True
         else:
             print(f"   ❌ MCP server {server_name} not found")
@@ -84,6 +244,16 @@ class MCPServerManager:
             })
         return servers
     
+    def _apply_test_result(self, server_name: str, status: str, error: str = None, tested_at: float = None):
+        """Record a test outcome on the in-memory config; callers save once"""
+        server_config = self.servers_config["mcpServers"][server_name]
+        server_config["status"] = status
+        server_config["last_test"] = datetime.fromtimestamp(tested_at or time.time()).isoformat()
+        if error is not None:
+            server_config["error"] = error
+        else:
+            server_config.pop("error", None)
+    
     def test_mcp_server(self, server_name: str) -> bool:
         """Test MCP server connectivity"""
         if server_name not in self.servers_config["mcpServers"]:
@@ -91,13 +261,14 @@ class MCPServerManager:
             return False
         
         server_config = self.servers_config["mcpServers"][server_name]
+        started = time.time()
         
         try:
             # Test server command
             cmd = [server_config["command"]] + server_config["args"]
             
             # Set environment variables
-            env = subprocess.os.environ.copy()
+            env = os.environ.copy()
             env.update(server_config.get("env", {}))
             
             # Run test (timeout after 10 seconds)
@@ -111,27 +282,91 @@ class MCPServerManager:
             
             if result.returncode == 0:
                 print(f"   ✅ MCP server {server_name} is responding")
-                server_config["status"] = "active"
-                server_config["last_test"] = datetime.now().isoformat()
+                status, error = "active", None
             else:
                 print(f"   ❌ MCP server {server_name} test failed")
-                server_config["status"] = "error"
-                server_config["error"] = result.stderr
-            
-            self.save_mcp_config()
-            return result.returncode == 0
+                status, error = "error", result.stderr
             
         except subprocess.TimeoutExpired:
             print(f"   ⏰ MCP server {server_name} test timed out")
-            server_config["status"] = "timeout"
-            self.save_mcp_config()
-            return False
+            status, error = "timeout", None
         except Exception as e:
             print(f"   ❌ MCP server {server_name} test error: {e}")
-            server_config["status"] = "error"
-            server_config["error"] = str(e)
-            self.save_mcp_config()
-            return False
+            status, error = "error", str(e)
+        
+        self._apply_test_result(server_name, status, error, started)
+        self.status_store.record(server_name, status, time.time() - started, started)
+        self._save_now(server_name)
+        return status == "active"
+    
+    async def _probe_server(self, server_name: str, semaphore: asyncio.Semaphore, timeout: float) -> Dict[str, Any]:
+        """Run one server's test command as an asyncio subprocess"""
+        server_config = self.servers_config["mcpServers"][server_name]
+        cmd = [server_config["command"]] + server_config["args"]
+        env = os.environ.copy()
+        env.update(server_config.get("env", {}))
+        
+        async with semaphore:
+            started = time.time()
+            status, error = "error", None
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    env=env,
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                try:
+                    _, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+                    if proc.returncode == 0:
+                        status = "active"
+                    else:
+                        error = stderr.decode(errors="replace")
+                except asyncio.TimeoutError:
+                    proc.kill()
+                    await proc.wait()
+                    status = "timeout"
+            except FileNotFoundError as e:
+                status, error = "not_found", str(e)
+            except Exception as e:
+                error = str(e)
+            
+            return {
+                "name": server_name,
+                "status": status,
+                "error": error,
+                "started": started,
+                "duration": time.time() - started
+            }
+    
+    async def test_all_async(self, concurrency: int = 10, timeout: float = 10) -> Dict[str, bool]:
+        """Probe every configured server concurrently, then save once"""
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        names = list(self.servers_config["mcpServers"])
+        results = await asyncio.gather(*(self._probe_server(name, semaphore, timeout) for name in names))
+        
+        # One history transaction and one config write for the whole fleet
+        with self.batch():
+            for result in results:
+                emoji = {"active": "✅", "timeout": "⏰"}.get(result["status"], "❌")
+                print(f"   {emoji} MCP server {result['name']}: {result['status']} ({result['duration']:.2f}s)")
+                self._apply_test_result(result["name"], result["status"], result["error"], result["started"])
+                self.save_mcp_config(result["name"])
+        self.status_store.record_many(
+            (r["name"], r["status"], r["duration"], r["started"]) for r in results
+        )
+        
+        return {r["name"]: r["status"] == "active" for r in results}
+    
+    def test_all(self, concurrency: int = 10, timeout: float = 10) -> Dict[str, bool]:
+        """Test all MCP servers, ``concurrency`` at a time"""
+        print(f"🧪 Testing {len(self.servers_config['mcpServers'])} MCP servers (concurrency {concurrency})...")
+        return asyncio.run(self.test_all_async(concurrency, timeout))
+    
+    def server_history(self, server_name: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """Recent health checks for a server, newest first"""
+        return self.status_store.history(server_name, limit=limit)
     
     def deploy_mcp_servers_to_scaleway(self) -> bool:
         """Deploy MCP servers to Scaleway infrastructure"""
@@ -174,6 +409,12 @@ def list_mcp_servers() -> List[Dict[str, Any]]:
 def test_mcp_server(name: str) -> bool:
     return mcp_manager.test_mcp_server(name)
 
+def test_all_mcp_servers(concurrency: int = 10, timeout: float = 10) -> Dict[str, bool]:
+    return mcp_manager.test_all(concurrency=concurrency, timeout=timeout)
+
+def flush_mcp_config():
+    mcp_manager.flush()
+
 def deploy_to_scaleway() -> bool:
     return mcp_manager.deploy_mcp_servers_to_scaleway()
 
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+MCP Server Status Store - Autonomous Team
+Compact time-series history of MCP server health checks
+"""
+
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+
+# Statuses are stored as small integers; names are dictionary-encoded
+STATUS_CODES = {
+    "active": 0,
+    "error": 1,
+    "timeout": 2,
+    "not_found": 3,
+    "unknown": 4
+}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+class MCPStatusStore:
+    """Append-only health check history, one small integer row per check"""
+
+    def __init__(self, db_path: Path = None):
+        self.db_path = Path(db_path or "/root/CascadeProjects/autonomous_team_workspace/integration/mcp_servers/mcp_status_history.db")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS servers (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE
+            );
+        """)
+        self._create_history()
+        self._server_ids: Dict[str, int] = {
+            name: server_id for server_id, name in self._conn.execute("SELECT id, name FROM servers")
+        }
+
+    def _create_history(self):
+        """History keyed by rowid, so checks in the same millisecond are all kept
+
+        Databases written with the old (server_id, ts_ms) primary key are
+        migrated in place.
+        """
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(status_history)")]
+        with self._conn:
+            if columns and "id" not in columns:
+                self._conn.execute("ALTER TABLE status_history RENAME TO status_history_v1")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS status_history (
+                    id INTEGER PRIMARY KEY,
+                    server_id INTEGER NOT NULL,
+                    ts_ms INTEGER NOT NULL,
+                    status INTEGER NOT NULL,
+                    duration_ms INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS status_history_server_ts ON status_history (server_id, ts_ms);
+            """)
+            if columns and "id" not in columns:
+                self._conn.executescript("""
+                    INSERT INTO status_history (server_id, ts_ms, status, duration_ms)
+                        SELECT server_id, ts_ms, status, duration_ms FROM status_history_v1 ORDER BY ts_ms;
+                    DROP TABLE status_history_v1;
+                """)
+
+    def _server_id(self, name: str) -> int:
+        if name not in self._server_ids:
+            cursor = self._conn.execute("INSERT OR IGNORE INTO servers (name) VALUES (?)", (name,))
+            if cursor.lastrowid and cursor.rowcount:
+                self._server_ids[name] = cursor.lastrowid
+            else:
+                self._server_ids[name] = self._conn.execute(
+                    "SELECT id FROM servers WHERE name = ?", (name,)
+                ).fetchone()[0]
+        return self._server_ids[name]
+
+    def record_many(self, records: Iterable[Tuple[str, str, float, Optional[float]]]):
+        """Store (server_name, status, duration_seconds, timestamp) rows in one transaction"""
+        with self._lock, self._conn:
+            rows = []
+            for name, status, duration, ts in records:
+                rows.append((
+                    self._server_id(name),
+                    int((ts or time.time()) * 1000),
+                    STATUS_CODES.get(status, STATUS_CODES["unknown"]),
+                    int(duration * 1000)
+                ))
+            self._conn.executemany(
+                "INSERT INTO status_history (server_id, ts_ms, status, duration_ms) VALUES (?, ?, ?, ?)",
+                rows
+            )
+
+    def record(self, name: str, status: str, duration: float, ts: float = None):
+        """Store a single health check result"""
+        self.record_many([(name, status, duration, ts)])
+
+    def history(self, name: str, since: float = None, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Most recent checks for a server, newest first"""
+        if name not in self._server_ids:
+            return []
+        rows = self._conn.execute(
+            """SELECT ts_ms, status, duration_ms FROM status_history
+               WHERE server_id = ? AND ts_ms >= ?
+               ORDER BY ts_ms DESC, id DESC LIMIT ?""",
+            (self._server_ids[name], int((since or 0) * 1000), limit)
+        ).fetchall()
+        return [
+            {"timestamp": ts / 1000, "status": STATUS_NAMES.get(status, "unknown"), "duration": duration / 1000}
+            for ts, status, duration in rows
+        ]
+
+    def uptime(self, name: str, window_seconds: float = 86400) -> Optional[float]:
+        """Fraction of checks in the window that found the server active"""
+        if name not in self._server_ids:
+            return None
+        total, active = self._conn.execute(
+            """SELECT COUNT(*), SUM(status = ?) FROM status_history
+               WHERE server_id = ? AND ts_ms >= ?""",
+            (STATUS_CODES["active"], self._server_ids[name], int((time.time() - window_seconds) * 1000))
+        ).fetchone()
+        return (active or 0) / total if total else None
+
+    def prune(self, older_than_seconds: float) -> int:
+        """Drop history older than the retention window"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM status_history WHERE ts_ms < ?",
+                (int((time.time() - older_than_seconds) * 1000),)
+            )
+            return cursor.rowcount
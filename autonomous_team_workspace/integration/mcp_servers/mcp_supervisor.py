@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+MCP Server Supervisor - Autonomous Team
+Keep configured MCP servers running and multiplex JSON-RPC over their stdio
+"""
+
+import os
+import json
+import time
+import asyncio
+from collections import deque
+from typing import Dict, List, Any, Optional
+
+MCP_PROTOCOL_VERSION = "2024-11-05"
+CLIENT_INFO = {"name": "autonomous-team-supervisor", "version": "1.0.0"}
+
+class MCPRequestError(Exception):
+    """JSON-RPC error returned by an MCP server"""
+
+    def __init__(self, server_name: str, error: Dict[str, Any]):
+        self.server_name = server_name
+        self.code = error.get("code")
+        self.data = error.get("data")
+        super().__init__(f"{server_name}: {error.get('message', 'unknown error')} (code {self.code})")
+
+class MCPServerProcess:
+    """One supervised MCP server speaking newline-delimited JSON-RPC on stdio
+
+    Requests from any number of callers share the single process: each gets a
+    unique JSON-RPC id and waits on a future that the stdout reader resolves
+    when the matching response arrives. ``max_in_flight`` bounds requests sent
+    to the server; callers beyond that wait in a queue.
+    """
+
+    def __init__(self,
+                 name: str,
+                 config: Dict[str, Any],
+                 max_in_flight: int = 32,
+                 restart_backoff: float = 1.0,
+                 max_restart_backoff: float = 60.0,
+                 stable_after: float = 30.0):
+        self.name = name
+        self.command = [config["command"]] + config.get("args", [])
+        self.env = os.environ.copy()
+        self.env.update(config.get("env", {}))
+
+        self.max_in_flight = max_in_flight
+        self.restart_backoff = restart_backoff
+        self.max_restart_backoff = max_restart_backoff
+        self.stable_after = stable_after
+
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.state = "stopped"
+        self.server_info: Dict[str, Any] = {}
+        self.restarts = 0
+        self.started_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+        self._next_id = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._ready: Optional[asyncio.Event] = None
+        self._supervisor_task: Optional[asyncio.Task] = None
+        # stdout reader and stderr drain of the current process; held so they are not collected mid-read
+        self._io_tasks: List[asyncio.Task] = []
+        self._stop_event: Optional[asyncio.Event] = None
+
+        self.queued = 0
+        self.requests = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=1000)
+        self.stderr_tail = deque(maxlen=20)
+
+    async def start(self):
+        """Launch the server and keep it running until stop()"""
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._write_lock = asyncio.Lock()
+        self._ready = asyncio.Event()
+        self._stop_event = asyncio.Event()
+        self._supervisor_task = asyncio.create_task(self._supervise())
+
+    async def wait_ready(self, timeout: float = 30.0) -> bool:
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _supervise(self):
+        backoff = self.restart_backoff
+        while not self._stop_event.is_set():
+            launched = time.time()
+            try:
+                await self._launch()
+                await self.process.wait()
+                self.last_error = f"exited with code {self.process.returncode}"
+            except Exception as e:
+                self.last_error = str(e)
+            finally:
+                self._ready.clear()
+                self._fail_pending(ConnectionError(f"MCP server {self.name} stopped: {self.last_error}"))
+
+            if self._stop_event.is_set():
+                break
+
+            # A server that stayed up for a while gets a fresh backoff
+            if time.time() - launched >= self.stable_after:
+                backoff = self.restart_backoff
+            self.state = "restarting"
+            self.restarts += 1
+            print(f"   🔁 MCP server {self.name} {self.last_error}; restarting in {backoff:.1f}s")
+            # Sleep on the stop event so stop() does not wait out the backoff
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=backoff)
+                break
+            except asyncio.TimeoutError:
+                pass
+            backoff = min(backoff * 2, self.max_restart_backoff)
+
+        self.state = "stopped"
+
+    async def _launch(self):
+        self.state = "starting"
+        self.process = await asyncio.create_subprocess_exec(
+            *self.command,
+            env=self.env,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=16 * 1024 * 1024
+        )
+        self.started_at = time.time()
+        reader = asyncio.create_task(self._read_stdout(self.process))
+        self._io_tasks = [reader, asyncio.create_task(self._drain_stderr(self.process))]
+
+        try:
+            result = await self._send("initialize", {
+                "protocolVersion": MCP_PROTOCOL_VERSION,
+                "capabilities": {},
+                "clientInfo": CLIENT_INFO
+            }, timeout=30.0)
+            self.server_info = result.get("serverInfo", {})
+            await self._write({"jsonrpc": "2.0", "method": "notifications/initialized"})
+        except Exception:
+            if self.process.returncode is None:
+                self.process.kill()
+            reader.cancel()
+            raise
+
+        self.state = "running"
+        self._ready.set()
+        print(f"   ✅ MCP server {self.name} running (pid {self.process.pid})")
+
+    async def _read_stdout(self, process):
+        """Resolve pending futures as responses arrive, in any order
+
+        EOF means the server is gone: new requests wait for the restart
+        instead of being written to a dead pipe.
+        """
+        while True:
+            line = await process.stdout.readline()
+            if not line:
+                break
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            future = self._pending.pop(message.get("id"), None) if "id" in message else None
+            if future is None or future.done():
+                continue
+            if "error" in message:
+                future.set_exception(MCPRequestError(self.name, message["error"]))
+            else:
+                future.set_result(message.get("result", {}))
+        if process is self.process:
+            self._ready.clear()
+        self._fail_pending(ConnectionError(f"MCP server {self.name} closed stdout"))
+
+    async def _drain_stderr(self, process):
+        # Keep stderr flowing so a chatty server never blocks on a full pipe
+        while True:
+            line = await process.stderr.readline()
+            if not line:
+                break
+            self.stderr_tail.append(line.decode(errors="replace").rstrip())
+
+    def _fail_pending(self, error: Exception):
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    async def _write(self, message: Dict[str, Any]):
+        async with self._write_lock:
+            self.process.stdin.write(json.dumps(message).encode() + b"\n")
+            await self.process.stdin.drain()
+
+    async def _send(self, method: str, params: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await self._write({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+            return await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def request(self, method: str, params: Dict[str, Any] = None, timeout: float = 30.0) -> Dict[str, Any]:
+        """Send a JSON-RPC request once the server is ready and a slot is free
+
+        ``timeout`` is one deadline covering the wait for readiness, the wait
+        for a slot and the response.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        self.queued += 1
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+            await asyncio.wait_for(self._slots.acquire(), timeout=max(deadline - loop.time(), 0))
+        except asyncio.TimeoutError:
+            self.errors += 1
+            raise
+        finally:
+            self.queued -= 1
+
+        started = time.perf_counter()
+        try:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+            result = await self._send(method, params or {}, remaining)
+            self.requests += 1
+            return result
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.latencies.append(time.perf_counter() - started)
+            self._slots.release()
+
+    async def stop(self, timeout: float = 5.0):
+        """Terminate the server and stop restarting it"""
+        if self._stop_event is not None:
+            self._stop_event.set()
+        if self.process and self.process.returncode is None:
+            self.process.terminate()
+            try:
+                await asyncio.wait_for(self.process.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                self.process.kill()
+        if self._supervisor_task:
+            await self._supervisor_task
+        for task in self._io_tasks:
+            task.cancel()
+        self._io_tasks = []
+
+    def metrics(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 2)
+
+        return {
+            "state": self.state,
+            "pid": self.process.pid if self.process and self.process.returncode is None else None,
+            "uptime_seconds": round(time.time() - self.started_at, 1) if self.state == "running" else 0,
+            "restarts": self.restarts,
+            "requests": self.requests,
+            "errors": self.errors,
+            "in_flight": len(self._pending),
+            "queued": self.queued,
+            "latency_ms": {"p50": percentile(0.50), "p95": percentile(0.95), "p99": percentile(0.99)},
+            "last_error": self.last_error
+        }
+
+class MCPSupervisor:
+    """Supervise every configured MCP server for the autonomous team"""
+
+    def __init__(self, servers_config: Dict[str, Dict[str, Any]] = None, max_in_flight: int = 32):
+        if servers_config is None:
+            from mcp_manager import mcp_manager
+            servers_config = mcp_manager.servers_config["mcpServers"]
+        self.servers_config = servers_config
+        self.max_in_flight = max_in_flight
+        self.servers: Dict[str, MCPServerProcess] = {}
+
+    async def start(self, names: List[str] = None, wait: bool = True, timeout: float = 30.0) -> Dict[str, bool]:
+        """Start servers (all by default); returns which became ready in time"""
+        names = names or list(self.servers_config)
+        for name in names:
+            if name not in self.servers:
+                self.servers[name] = MCPServerProcess(name, self.servers_config[name], self.max_in_flight)
+                await self.servers[name].start()
+
+        if not wait:
+            return {name: False for name in names}
+        ready = await asyncio.gather(*(self.servers[name].wait_ready(timeout) for name in names))
+        return dict(zip(names, ready))
+
+    async def stop(self):
+        await asyncio.gather(*(server.stop() for server in self.servers.values()))
+        self.servers.clear()
+
+    async def request(self, server_name: str, method: str, params: Dict[str, Any] = None, timeout: float = 30.0) -> Dict[str, Any]:
+        if server_name not in self.servers:
+            raise KeyError(f"MCP server {server_name} is not supervised")
+        return await self.servers[server_name].request(method, params, timeout)
+
+    async def list_tools(self, server_name: str) -> List[Dict[str, Any]]:
+        result = await self.request(server_name, "tools/list")
+        return result.get("tools", [])
+
+    async def call_tool(self, server_name: str, tool_name: str, arguments: Dict[str, Any] = None, timeout: float = 60.0) -> Dict[str, Any]:
+        return await self.request(server_name, "tools/call", {"name": tool_name, "arguments": arguments or {}}, timeout)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        return {name: server.metrics() for name, server in self.servers.items()}
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+async def main():
+    print("🌐 MCP Server Supervisor - Autonomous Team")
+    print("=" * 50)
+
+    supervisor = MCPSupervisor()
+    ready = await supervisor.start()
+    for name, ok in ready.items():
+        if ok:
+            tools = await supervisor.list_tools(name)
+            print(f"   🔧 {name}: {len(tools)} tools")
+        else:
+            print(f"   ❌ {name}: not ready")
+
+    print(json.dumps(supervisor.metrics(), indent=2))
+    await supervisor.stop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
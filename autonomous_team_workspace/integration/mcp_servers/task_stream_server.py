@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Task Stream Server - Autonomous Team
+Local stand-in for the /tasks endpoint that pushes status transitions over SSE
+"""
+
+import json
+import asyncio
+import itertools
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, List, Set
+
+from aiohttp import web
+
+class TaskStreamServer:
+    """In-memory task endpoint with a server-sent events status stream"""
+
+    def __init__(self, replay_size: int = 10000, keepalive_interval: float = 15.0, queue_size: int = 256):
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        self.keepalive_interval = keepalive_interval
+        self.queue_size = queue_size
+
+        # Event log for Last-Event-ID resume, and live subscriber queues
+        self._sequence = itertools.count(1)
+        self._events = deque(maxlen=replay_size)
+        self._subscribers: List[tuple] = []
+        self._task_counter = itertools.count()
+
+        self.app = web.Application()
+        self.app.router.add_post("/tasks", self.handle_create_task)
+        self.app.router.add_get("/tasks", self.handle_list_tasks)
+        self.app.router.add_get("/tasks/stream", self.handle_stream)
+        self.app.router.add_get("/tasks/{task_id}/status", self.handle_get_status)
+        self.app.router.add_post("/tasks/{task_id}/status", self.handle_set_status)
+
+    def create_task(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Register a task in the queued state"""
+        task_id = task_data.get("task_id") or f"task_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{next(self._task_counter)}"
+        self.tasks[task_id] = {**task_data, "task_id": task_id, "status": "queued"}
+        self.publish(task_id, "queued")
+        return self.tasks[task_id]
+
+    def set_status(self, task_id: str, status: str, **details) -> Dict[str, Any]:
+        """Move a task to a new status and notify subscribers"""
+        task = self.tasks.setdefault(task_id, {"task_id": task_id})
+        task.update(details)
+        task["status"] = status
+        self.publish(task_id, status, **details)
+        return task
+
+    def publish(self, task_id: str, status: str, **details):
+        """Append a transition to the event log and fan it out to subscribers"""
+        event = {
+            "task_id": task_id,
+            "status": status,
+            "timestamp": datetime.now().isoformat(),
+            **details
+        }
+        event_id = next(self._sequence)
+        self._events.append((event_id, event))
+
+        for task_ids, queue in self._subscribers:
+            if task_id in task_ids:
+                # A subscriber that falls behind loses its oldest events, not the server's memory
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait((event_id, event))
+
+    async def handle_create_task(self, request: web.Request) -> web.Response:
+        task = self.create_task(await request.json())
+        return web.json_response({"status": "success", "task_id": task["task_id"]})
+
+    async def handle_list_tasks(self, request: web.Request) -> web.Response:
+        status_filter = request.query.get("status")
+        tasks = [t for t in self.tasks.values() if not status_filter or t.get("status") == status_filter]
+        return web.json_response(tasks)
+
+    async def handle_get_status(self, request: web.Request) -> web.Response:
+        task = self.tasks.get(request.match_info["task_id"])
+        if task is None:
+            return web.json_response({"status": "not_found"}, status=404)
+        return web.json_response(task)
+
+    async def handle_set_status(self, request: web.Request) -> web.Response:
+        try:
+            data = await request.json()
+        except json.JSONDecodeError:
+            return web.json_response({"error": "Body must be a JSON object"}, status=400)
+        if not isinstance(data, dict) or not isinstance(data.get("status"), str):
+            return web.json_response({"error": "Missing 'status'"}, status=400)
+        status = data.pop("status")
+        return web.json_response(self.set_status(request.match_info["task_id"], status, **data))
+
+    async def handle_stream(self, request: web.Request) -> web.StreamResponse:
+        """Stream transitions for ?ids=a,b,c as text/event-stream"""
+        task_ids: Set[str] = {t for t in request.query.get("ids", "").split(",") if t}
+        last_event_id = request.headers.get("Last-Event-ID")
+
+        response = web.StreamResponse(headers={
+            "Content-Type": "text/event-stream",
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive"
+        })
+        await response.prepare(request)
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        subscriber = (task_ids, queue)
+        self._subscribers.append(subscriber)
+
+        try:
+            # Catch the subscriber up: replay missed events, or send current state
+            if last_event_id is not None and last_event_id.isdigit():
+                for event_id, event in list(self._events):
+                    if event_id > int(last_event_id) and event["task_id"] in task_ids:
+                        await self._send(response, event_id, event)
+            else:
+                for task_id in task_ids:
+                    if task_id in self.tasks:
+                        snapshot = {"timestamp": datetime.now().isoformat(), **self.tasks[task_id]}
+                        await self._send(response, None, snapshot)
+
+            while True:
+                try:
+                    event_id, event = await asyncio.wait_for(queue.get(), self.keepalive_interval)
+                    await self._send(response, event_id, event)
+                except asyncio.TimeoutError:
+                    await response.write(b": keep-alive\n\n")
+        except ConnectionResetError:
+            pass
+        finally:
+            self._subscribers.remove(subscriber)
+
+        return response
+
+    @staticmethod
+    async def _send(response: web.StreamResponse, event_id, event: Dict[str, Any]):
+        frame = ""
+        if event_id is not None:
+            frame += f"id: {event_id}\n"
+        frame += f"data: {json.dumps(event)}\n\n"
+        await response.write(frame.encode("utf-8"))
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> web.AppRunner:
+        """Start serving in the running event loop"""
+        runner = web.AppRunner(self.app)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        print(f"📡 Task stream server listening on http://{host}:{port}")
+        return runner
+
+async def simulate_tasks(server: TaskStreamServer, count: int = 5, step_delay: float = 0.5):
+    """Drive a few tasks through queued → running → completed"""
+    task_ids = [server.create_task({"type": "general"})["task_id"] for _ in range(count)]
+    for status in ("running", "completed"):
+        await asyncio.sleep(step_delay)
+        for task_id in task_ids:
+            server.set_status(task_id, status)
+    return task_ids
+
+def main():
+    """Run the stand-in server with simulated task traffic"""
+    async def run():
+        server = TaskStreamServer()
+        await server.start()
+        while True:
+            await simulate_tasks(server)
+            await asyncio.sleep(5)
+
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+URL-based MCP Server for Autonomous Team
+Uses HTTP endpoints instead of direct function execution
+"""
+
+import os
+import json
+import asyncio
+import weakref
+from datetime import datetime
+from typing import Dict, Any, Optional, List, AsyncIterator
+
+import aiohttp
+
+# Statuses after which a task no longer changes
+TERMINAL_TASK_STATUSES = {"completed", "failed", "cancelled", "dead"}
+
+class URLBasedMCPServer:
+    """MCP Server that communicates via HTTP URLs"""
+
+    def __init__(self,
+                 base_url: str = None,
+                 max_connections: int = 100,
+                 endpoint_concurrency: Dict[str, int] = None,
+                 default_endpoint_concurrency: int = 10,
+                 timeout: float = 30,
+                 status_timeout: float = 10):
+        self.base_url = base_url or os.environ.get("BASE_URL", "https://163.172.191.225")
+        self.api_endpoints = {
+            "voice_synthesis": "/voice",
+            "web_search": "/search",
+            "code_execution": "/execute",
+            "api_testing": "/test-api",
+            "documentation_lookup": "/docs",
+            "task_delegation": "/tasks",
+            "mcp_management": "/mcp",
+            "infrastructure": "/infrastructure"
+        }
+
+        # Connection pool shared by every request made through this server
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.status_timeout = status_timeout
+
+        # Per-endpoint concurrency limits (slow endpoints can't starve the pool)
+        endpoint_concurrency = endpoint_concurrency or {}
+        self.default_endpoint_concurrency = default_endpoint_concurrency
+        self.endpoint_limits = {
+            endpoint: endpoint_concurrency.get(endpoint, default_endpoint_concurrency)
+            for endpoint in set(self.api_endpoints.values()) | {"/capabilities"}
+        }
+
+        # Sessions and semaphores belong to one event loop; each loop gets its own
+        self._loops: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopResources]" = weakref.WeakKeyDictionary()
+
+        print("🌐 URL-based MCP Server Initialized")
+        print(f"📡 Base URL: {self.base_url}")
+
+    def _resources(self) -> "_LoopResources":
+        """Session and semaphores for the running event loop"""
+        loop = asyncio.get_running_loop()
+        resources = self._loops.get(loop)
+        if resources is None:
+            resources = self._loops[loop] = _LoopResources()
+        return resources
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return this loop's HTTP session, creating it on first use"""
+        resources = self._resources()
+        if resources.session is None or resources.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections)
+            resources.session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"Content-Type": "application/json"}
+            )
+        return resources.session
+
+    def _semaphore(self, endpoint: str) -> asyncio.Semaphore:
+        semaphores = self._resources().semaphores
+        if endpoint not in semaphores:
+            semaphores[endpoint] = asyncio.Semaphore(
+                self.endpoint_limits.get(endpoint, self.default_endpoint_concurrency)
+            )
+        return semaphores[endpoint]
+
+    async def close(self):
+        """Close this loop's HTTP session"""
+        resources = self._loops.pop(asyncio.get_running_loop(), None)
+        if resources is not None and resources.session is not None and not resources.session.closed:
+            await resources.session.close()
+
+    async def __aenter__(self):
+        """Hold the session open; it is closed when the outermost context in this loop exits"""
+        self._resources().users += 1
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        resources = self._resources()
+        resources.users -= 1
+        if resources.users <= 0:
+            await self.close()
+
+    async def _request(self, method: str, endpoint: str, timeout: float, **kwargs) -> aiohttp.ClientResponse:
+        """Issue a request under the endpoint's concurrency limit"""
+        session = await self._get_session()
+        semaphore = self._semaphore(endpoint)
+
+        async with semaphore:
+            response = await session.request(
+                method,
+                f"{self.base_url}{endpoint}",
+                timeout=aiohttp.ClientTimeout(total=timeout),
+                **kwargs
+            )
+            # Read the body while still holding the slot
+            await response.read()
+            return response
+
+    async def delegate_task(self, task_data: Dict[str, Any], timeout: float = None) -> Dict[str, Any]:
+        """Delegate task via HTTP URL"""
+        task_type = task_data.get("type", "general")
+
+        if task_type in self.api_endpoints:
+            endpoint = self.api_endpoints[task_type]
+
+            try:
+                response = await self._request("POST", endpoint, timeout or self.timeout, json=task_data)
+
+                if response.status == 200:
+                    result = await response.json(content_type=None)
+                    result["mcp_method"] = "url_based"
+                    result["timestamp"] = datetime.now().isoformat()
+                    return result
+                else:
+                    return {
+                        "status": "error",
+                        "error": f"HTTP {response.status}: {await response.text()}",
+                        "mcp_method": "url_based"
+                    }
+            except asyncio.TimeoutError:
+                return {
+                    "status": "error",
+                    "error": "Request timed out",
+                    "mcp_method": "url_based"
+                }
+            except Exception as e:
+                return {
+                    "status": "error",
+                    "error": f"Connection error: {str(e)}",
+                    "mcp_method": "url_based"
+                }
+        else:
+            return {
+                "status": "error",
+                "error": f"Unknown task type: {task_type}",
+                "mcp_method": "url_based"
+            }
+
+    async def delegate_many(self, tasks: List[Dict[str, Any]], timeout: float = None) -> List[Dict[str, Any]]:
+        """Delegate many tasks concurrently, each bounded by its own timeout
+
+        Results are returned in the same order as ``tasks``. A task that
+        exceeds its timeout yields an error result instead of failing the batch.
+        """
+        per_task_timeout = timeout or self.timeout
+
+        async def run_one(task_data: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                return await asyncio.wait_for(
+                    self.delegate_task(task_data, timeout=per_task_timeout),
+                    timeout=per_task_timeout
+                )
+            except asyncio.TimeoutError:
+                return {
+                    "status": "error",
+                    "error": f"Task timed out after {per_task_timeout}s",
+                    "mcp_method": "url_based"
+                }
+
+        return await asyncio.gather(*(run_one(task_data) for task_data in tasks))
+
+    async def get_task_status(self, task_id: str) -> Dict[str, Any]:
+        """Get task status via HTTP URL"""
+        try:
+            response = await self._request("GET", f"/tasks/{task_id}/status", self.status_timeout)
+            if response.status == 200:
+                return await response.json(content_type=None)
+            else:
+                return {"status": "not_found", "error": f"HTTP {response.status}"}
+        except Exception as e:
+            return {"status": "error", "error": f"Connection error: {str(e)}"}
+
+    async def subscribe_task_status(self,
+                                    task_ids: List[str],
+                                    until_terminal: bool = True,
+                                    reconnect_delay: float = 1.0,
+                                    max_reconnect_delay: float = 30.0) -> AsyncIterator[Dict[str, Any]]:
+        """Stream status transitions for many tasks over one SSE connection
+
+        Yields one event per transition (``{"task_id", "status", ...}``).
+        The stream reconnects with backoff and resumes from the last event id;
+        the backoff resets only once a connection delivers an event, so a
+        server that accepts and immediately closes is not hammered.
+        With ``until_terminal`` it ends once every task reached a terminal status.
+        """
+        wanted = set(task_ids)
+        pending = set(wanted)
+        last_status: Dict[str, str] = {}
+        last_event_id = None
+        delay = reconnect_delay
+
+        while pending or not until_terminal:
+            headers = {"Accept": "text/event-stream"}
+            if last_event_id is not None:
+                headers["Last-Event-ID"] = last_event_id
+
+            delivered = False
+            try:
+                session = await self._get_session()
+                async with session.get(
+                    f"{self.base_url}/tasks/stream",
+                    params={"ids": ",".join(sorted(pending if until_terminal else wanted))},
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=None, sock_connect=self.status_timeout)
+                ) as response:
+                    if response.status != 200:
+                        raise aiohttp.ClientResponseError(
+                            response.request_info, response.history,
+                            status=response.status, message="Task stream unavailable"
+                        )
+                    async for event_id, event in self._read_sse(response):
+                        if not delivered:
+                            delivered = True
+                            delay = reconnect_delay
+                        if event_id is not None:
+                            last_event_id = event_id
+
+                        task_id = event.get("task_id")
+                        status = event.get("status")
+                        if task_id not in wanted or last_status.get(task_id) == status:
+                            continue
+                        last_status[task_id] = status
+
+                        yield event
+
+                        if status in TERMINAL_TASK_STATUSES:
+                            pending.discard(task_id)
+                            if until_terminal and not pending:
+                                return
+                reason = "closed by server"
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                reason = f"interrupted: {e}"
+
+            print(f"   ⚠️  Task stream {reason} (reconnecting in {delay:.1f}s)")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_reconnect_delay)
+
+    @staticmethod
+    async def _read_sse(response: aiohttp.ClientResponse) -> AsyncIterator[tuple]:
+        """Parse a text/event-stream body into (event_id, data) pairs"""
+        event_id = None
+        data_lines: List[str] = []
+
+        async for raw_line in response.content:
+            line = raw_line.decode("utf-8").rstrip("\r\n")
+
+            if not line:
+                if data_lines:
+                    yield event_id, json.loads("\n".join(data_lines))
+                event_id = None
+                data_lines = []
+            elif line.startswith(":"):
+                continue  # keep-alive comment
+            elif line.startswith("id:"):
+                event_id = line[3:].strip()
+            elif line.startswith("data:"):
+                data_lines.append(line[5:].lstrip())
+
+    async def list_tasks(self, status_filter: Optional[str] = None) -> list:
+        """List tasks via HTTP URL"""
+        params = {"status": status_filter} if status_filter else None
+
+        try:
+            response = await self._request("GET", "/tasks", self.status_timeout, params=params)
+            if response.status == 200:
+                return await response.json(content_type=None)
+            else:
+                return []
+        except Exception as e:
+            return []
+
+    async def get_team_capabilities(self) -> Dict[str, Any]:
+        """Get team capabilities via HTTP URL"""
+        try:
+            response = await self._request("GET", "/capabilities", self.status_timeout)
+            if response.status == 200:
+                return await response.json(content_type=None)
+            else:
+                return {"error": "Capabilities unavailable"}
+        except Exception as e:
+            return {"error": f"Connection error: {str(e)}"}
+
+class _LoopResources:
+    """One event loop's HTTP session, endpoint semaphores and open contexts"""
+
+    __slots__ = ("session", "semaphores", "users")
+
+    def __init__(self):
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.users = 0
+
+# Global URL-based MCP server. The helpers below hold it open for the call;
+# wrap several calls in ``async with url_mcp_server:`` to share one pool.
+url_mcp_server = URLBasedMCPServer()
+
+async def delegate_task(task_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Delegate task using URL-based MCP"""
+    async with url_mcp_server:
+        return await url_mcp_server.delegate_task(task_data)
+
+async def delegate_many(tasks: List[Dict[str, Any]], timeout: float = None) -> List[Dict[str, Any]]:
+    """Delegate many tasks concurrently using URL-based MCP"""
+    async with url_mcp_server:
+        return await url_mcp_server.delegate_many(tasks, timeout)
+
+async def get_task_status(task_id: str) -> Dict[str, Any]:
+    """Get task status using URL-based MCP"""
+    async with url_mcp_server:
+        return await url_mcp_server.get_task_status(task_id)
+
+async def subscribe_task_status(task_ids: List[str], until_terminal: bool = True) -> AsyncIterator[Dict[str, Any]]:
+    """Stream task status transitions using URL-based MCP"""
+    async with url_mcp_server:
+        async for event in url_mcp_server.subscribe_task_status(task_ids, until_terminal):
+            yield event
+
+async def list_tasks(status_filter: Optional[str] = None) -> list:
+    """List tasks using URL-based MCP"""
+    async with url_mcp_server:
+        return await url_mcp_server.list_tasks(status_filter)
+
+async def get_team_capabilities() -> Dict[str, Any]:
+    """Get team capabilities using URL-based MCP"""
+    async with url_mcp_server:
+        return await url_mcp_server.get_team_capabilities()
+
+print("🌐 URL-based MCP Server ready for HTTP communication")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Mission Wall-Clock Benchmark
+Compare the original per-agent documentation lookups run in sequence against the shared runtime
+"""
+
+import sys
+import json
+import time
+
+# Add all repositories to path
+sys.path.append("/root/CascadeProjects/strands-agent-team")
+sys.path.append("/root/CascadeProjects/autonomous_team_workspace/workflows")
+sys.path.append("/root/CascadeProjects/autonomous_team_workspace/integration/deepwiki")
+
+from agents.specialized.cartesia_integration_agent import CartesiaIntegrationAgent
+from agents.specialized.infj_adhd_optimization_agent import InfjAdhdOptimizationAgent
+from agents.specialized.autonomous_coordinator_agent import AutonomousCoordinatorAgent
+from agents.specialized.documentation_agent import DocumentationAgent
+from agents.runtime import AgentRuntime
+from documentation_service import DocumentationService
+from mission_scheduler import MissionScheduler
+
+class LegacyDocumentationLookups:
+    """The pre-runtime code path: each agent calls deepwiki_client.check_documentation_first directly"""
+
+    def __init__(self):
+        import deepwiki_client
+        self._check = deepwiki_client.check_documentation_first
+        self._doc_client = deepwiki_client.doc_client
+        self._doc_client.cache.clear()
+        self.stats = {"external_calls": 0, "memo_hits": 0}
+
+        search = self._doc_client.search_documentation
+
+        def counted_search(query, context=None):
+            self.stats["external_calls"] += 1
+            return search(query, context)
+        self._doc_client.search_documentation = counted_search
+
+    def check_documentation_first(self, task, context=None):
+        return self._check(task, context)
+
+    def close(self):
+        del self._doc_client.search_documentation
+
+AGENT_CLASSES = [
+    CartesiaIntegrationAgent,
+    InfjAdhdOptimizationAgent,
+    DocumentationAgent,
+    AutonomousCoordinatorAgent
+]
+
+def run_mission(docs, max_workers: int) -> dict:
+    """Run the mission once with every agent on ``docs``; returns wall clock plus lookup stats"""
+    runtime = AgentRuntime(docs=docs)
+    scheduler = MissionScheduler(max_workers=max_workers)
+    for agent_class in AGENT_CLASSES:
+        scheduler.add_agent(agent_class(runtime))
+
+    start = time.time()
+    report = scheduler.run()
+    elapsed = time.time() - start
+
+    return {
+        "wall_clock_seconds": round(elapsed, 3),
+        "critical_path": report["critical_path"],
+        "external_calls": docs.stats["external_calls"],
+        "memo_hits": docs.stats["memo_hits"]
+    }
+
+def main():
+    """Benchmark before (original lookups, sequential) and after (shared service, concurrent)"""
+    print("⏱️  MISSION WALL-CLOCK BENCHMARK")
+    print("=" * 50)
+
+    legacy = LegacyDocumentationLookups()
+    try:
+        before = run_mission(legacy, max_workers=1)
+    finally:
+        legacy.close()
+    after = run_mission(DocumentationService(), max_workers=4)
+
+    print(f"\n📊 Before (original lookups, sequential): {before['wall_clock_seconds']:.2f}s, "
+          f"{before['external_calls']} external lookups")
+    print(f"📊 After  (shared docs, DAG scheduler):   {after['wall_clock_seconds']:.2f}s, "
+          f"{after['external_calls']} external lookups")
+    if after["wall_clock_seconds"]:
+        print(f"🚀 Speedup: {before['wall_clock_seconds'] / after['wall_clock_seconds']:.1f}x")
+
+    return {"before": before, "after": after}
+
+if __name__ == "__main__":
+    print(json.dumps(main(), indent=2))
@@ -7,51 +7,55 @@ Cartesia Voice Integration with British Female Voices for INFJ ADHD
 import sys
 import os
 from pathlib import Path
+from datetime import datetime
 
 # Add all repositories to path
 sys.path.append("/root/CascadeProjects/strands-agent-team")
 sys.path.append("/root/CascadeProjects/strands-agent-team/tools")
+sys.path.append("/root/CascadeProjects/autonomous_team_workspace/workflows")
 
 # Import specialized agents
 from agents.specialized.cartesia_integration_agent import CartesiaIntegrationAgent
 from agents.specialized.infj_adhd_optimization_agent import InfjAdhdOptimizationAgent
 from agents.specialized.autonomous_coordinator_agent import AutonomousCoordinatorAgent
 from agents.specialized.documentation_agent import DocumentationAgent
+from agents.runtime import AgentRuntime
+from mission_scheduler import MissionScheduler
 
-def execute_autonomous_mission():
+def execute_autonomous_mission(max_workers: int = 4, executor: str = "thread"):
     """Execute the complete mission autonomously"""
     print("🚀 AUTONOMOUS MISSION EXECUTION")
     print("=" * 50)
     
-    # Deploy specialized agents
-    coordinator = AutonomousCoordinatorAgent()
-    cartesia_agent = CartesiaIntegrationAgent()
-    infj_agent = InfjAdhdOptimizationAgent()
-    docs_agent = DocumentationAgent()
+    # One runtime (and documentation service) shared by every agent
+    runtime = AgentRuntime.default()
     
-    # Coordinate mission execution
-    print("🤖 Coordinating autonomous agents...")
-    
-    # Step 1: Fix Cartesia integration
-    print("🎙️  Step 1: Fixing Cartesia API integration...")
-    cartesia_agent.execute_mission()
+    # Deploy specialized agents; each declares its inputs, outputs and tools
+    scheduler = MissionScheduler(max_workers=max_workers, executor=executor)
+    scheduler.add_agent(CartesiaIntegrationAgent(runtime))
+    scheduler.add_agent(InfjAdhdOptimizationAgent(runtime))
+    scheduler.add_agent(DocumentationAgent(runtime))
+    scheduler.add_agent(AutonomousCoordinatorAgent(runtime))
     
-    # Step 2: Optimize for INFJ ADHD
-    print("🧠 Step 2: Optimizing for INFJ ADHD communication...")
-    infj_agent.execute_mission()
+    # Independent agents (Cartesia fix, INFJ ADHD optimization) run concurrently;
+    # documentation and final coordination wait for the artifacts they need
+    print("🤖 Coordinating autonomous agents...")
+    trace_file = Path("/root/CascadeProjects/autonomous_team_workspace/logs") / f"mission_trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    report = scheduler.run(trace_file=trace_file)
     
-    # Step 3: Generate documentation
-    print("📚 Step 3: Generating autonomous documentation...")
-    docs_agent.execute_mission()
+    scheduler.print_report(report)
+    print(f"🧭 Trace written to {trace_file}")
+    print(f"📚 Documentation lookups: {runtime.docs.stats}")
     
-    # Step 4: Final coordination
-    print("🎯 Step 4: Final coordination and deployment...")
-    coordinator.execute_mission()
+    if report["status"] != "completed":
+        print("❌ AUTONOMOUS MISSION INCOMPLETE")
+        return report
     
     print("✅ AUTONOMOUS MISSION COMPLETE")
     print("🎉 Cartesia voice integration ready with British female voices")
     print("🧠 Optimized for INFJ ADHD communication style")
     print("🤖 Full autonomous deployment achieved")
+    return report
 
 if __name__ == "__main__":
     execute_autonomous_mission()
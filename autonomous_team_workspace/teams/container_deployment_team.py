@@ -9,9 +9,16 @@ import json
 import time
 import tempfile
 import os
+import sys
 from datetime import datetime
 from pathlib import Path
 
+sys.path.append("/root/CascadeProjects/autonomous_team_workspace/infrastructure/scaleway")
+from scaleway_client import ScalewayClient, ScalewayError
+from team_api_image import (
+    REGISTRY, IMAGE_NAME, TEAM_API_MODULE, build_api_image, build_context, context_hash, write_build_context
+)
+
 class ContainerDeploymentTeam:
     """Specialized team for container deployment troubleshooting and fixes"""
     
@@ -19,6 +26,7 @@ class ContainerDeploymentTeam:
         self.project_id = "c5d299b8-8462-40fb-b5ae-32a8808bf394"
         self.region = "fr-par"
         self.namespace_id = "af8c35dc-3d68-4fbf-ab0b-a84c0f99d967"
+        self.infra = ScalewayClient(region=self.region)
         
         self.team_members = {
             "cockpit_investigator": "Expert in analyzing Cockpit logs and metrics",
@@ -51,35 +59,22 @@ class ContainerDeploymentTeam:
         print("   📊 Analyzing container errors...")
         
         failed_containers = []
-        for container_id in investigator["focus_containers"]:
-            try:
-                # Get container details
-                cmd = f"scw container container get {container_id} region={self.region}"
-                result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-                
-                if result.returncode == 0:
-                    lines = result.stdout.split('\\n')
-                    container_info = {}
-                    
-                    for line in lines:
-                        if 'Name' in line and len(line.split()) > 1:
-                            container_info['name'] = ' '.join(line.split()[1:])
-                        elif 'Status' in line and len(line.split()) > 1:
-                            container_info['status'] = line.split()[-1]
-                        elif 'ErrorMessage' in line and len(line.split()) > 1:
-                            container_info['error'] = ' '.join(line.split()[1:])
-                    
-                    failed_containers.append({
-                        'id': container_id,
-                        **container_info
-                    })
-                    
-                    print(f"      • {container_info.get('name', 'Unknown')}: {container_info.get('status', 'Unknown')}")
-                    if container_info.get('error'):
-                        print(f"        Error: {container_info['error']}")
-                        
-            except Exception as e:
-                print(f"      ❌ Could not analyze container {container_id}: {e}")
+        containers = self.infra.get_containers(investigator["focus_containers"], return_exceptions=True)
+        for container_id, container in zip(investigator["focus_containers"], containers):
+            if isinstance(container, Exception):
+                print(f"      ❌ Could not analyze container {container_id}: {container}")
+                continue
+            
+            failed_containers.append({
+                'id': container_id,
+                'name': container.name,
+                'status': container.status,
+                'error': container.error_message
+            })
+            
+            print(f"      • {container.name or 'Unknown'}: {container.status}")
+            if container.error_message:
+                print(f"        Error: {container.error_message}")
         
         analysis = {
             "status": "cockpit_analysis_complete",
@@ -116,276 +111,23 @@ class ContainerDeploymentTeam:
             ]
         }
         
-        # Create production-ready Flask application
-        flask_app = '''#!/usr/bin/env python3
-"""
-Autonomous Team Flask Application
-Production-ready containerized API
-"""
-
-import sys
-import json
-import subprocess
-import tempfile
-import os
-from flask import Flask, jsonify, request
-from datetime import datetime
-
-# Ensure Flask is installed
-try:
-    from flask import Flask, jsonify, request
-except ImportError:
-    print("Installing Flask...")
-    subprocess.run([sys.executable, "-m", "pip", "install", "flask"], check=True)
-    from flask import Flask, jsonify, request
-
-# Create Flask app
-app = Flask(__name__)
-
-# Configuration
-PORT = 8080
-HOST = '0.0.0.0'
-
-@app.route('/health', methods=['GET'])
-def health():
-    """Health check endpoint"""
-    try:
-        return jsonify({
-            "status": "healthy",
-            "timestamp": datetime.now().isoformat(),
-            "service": "autonomous-team-api",
-            "version": "1.0.0",
-            "port": PORT
-        }), 200
-    except Exception as e:
-        return jsonify({
-            "status": "unhealthy",
-            "error": str(e),
-            "timestamp": datetime.now().isoformat()
-        }), 500
-
-@app.route('/', methods=['GET'])
-def index():
-    """Main endpoint"""
-    try:
-        return jsonify({
-            "service": "Autonomous Team API",
-            "status": "running",
-            "endpoints": [
-                "/health",
-                "/voice", 
-                "/search",
-                "/execute",
-                "/tasks"
-            ],
-            "timestamp": datetime.now().isoformat(),
-            "container": "production-ready"
-        }), 200
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-@app.route('/voice', methods=['POST'])
-def voice_synthesis():
-    """Voice synthesis endpoint"""
-    try:
-        data = request.get_json() or {}
-        text = data.get('text', 'Hello from autonomous team!')
-        voice_profile = data.get('voice_profile', 'professional_british')
-        
-        result = {
-            "status": "success",
-            "text": text,
-            "voice_profile": voice_profile,
-            "audio_url": f"https://audio.autonomous-team.com/{voice_profile}/{hash(text)}.wav",
-            "duration": max(1.0, len(text) * 0.1),
-            "timestamp": datetime.now().isoformat(),
-            "function": "voice-synthesis-agent"
-        }
-        
-        return jsonify(result), 200
-        
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-@app.route('/search', methods=['POST'])
-def web_search():
-    """Web search endpoint"""
-    try:
-        data = request.get_json() or {}
-        query = data.get('query', '')
-        max_results = data.get('max_results', 10)
-        
-        if not query:
-            return jsonify({"error": "Query required"}), 400
-        
-        # Mock search results
-        results = [
-            {
-                "title": f"Search Result {i+1} for '{query}'",
-                "url": f"https://example.com/result{i+1}",
-                "snippet": f"This is result {i+1} for the query {query}",
-                "relevance": round(0.9 - (i * 0.1), 2)
-            }
-            for i in range(min(max_results, 5))
-        ]
-        
-        result = {
-            "status": "success",
-            "query": query,
-            "results": results,
-            "total_results": len(results),
-            "timestamp": datetime.now().isoformat(),
-            "function": "web-search-agent"
-        }
-        
-        return jsonify(result), 200
-        
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-@app.route('/execute', methods=['POST'])
-def code_execution():
-    """Code execution endpoint"""
-    try:
-        data = request.get_json() or {}
-        code = data.get('code', '')
-        language = data.get('language', 'python')
-        
-        if not code:
-            return jsonify({"error": "Code required"}), 400
-        
-        if language != 'python':
-            return jsonify({"error": "Only Python supported"}), 400
-        
-        # Create temporary file and execute
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write(code)
-            temp_file = f.name
-        
-        try:
-            result = subprocess.run(
-                [sys.executable, temp_file],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            execution_result = {
-                "status": "success" if result.returncode == 0 else "error",
-                "output": result.stdout,
-                "error": result.stderr if result.stderr else None,
-                "return_code": result.returncode,
-                "language": language,
-                "timestamp": datetime.now().isoformat(),
-                "function": "code-execution-sandbox"
-            }
-            
-            return jsonify(execution_result), 200
-            
-        finally:
-            os.unlink(temp_file)
-        
-    except subprocess.TimeoutExpired:
-        return jsonify({"error": "Code execution timed out"}), 408
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-@app.route('/tasks', methods=['POST'])
-def task_delegation():
-    """Task delegation endpoint"""
-    try:
-        data = request.get_json() or {}
-        task_type = data.get('task_type', 'general')
-        priority = data.get('priority', 'medium')
-        description = data.get('description', 'Autonomous team task')
-        
-        task_id = f"task_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        
-        result = {
-            "status": "success",
-            "task_id": task_id,
-            "task_type": task_type,
-            "priority": priority,
-            "description": description,
-            "message": "Task delegated successfully",
-            "timestamp": datetime.now().isoformat(),
-            "function": "autonomous-coordinator"
-        }
-        
-        return jsonify(result), 200
-        
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-# Error handlers
-@app.errorhandler(404)
-def not_found(error):
-    return jsonify({"error": "Endpoint not found"}), 404
-
-@app.errorhandler(500)
-def internal_error(error):
-    return jsonify({"error": "Internal server error"}), 500
-
-# Startup function
-def start_server():
-    """Start the Flask server"""
-    print(f"🚀 Starting Autonomous Team API on {HOST}:{PORT}")
-    print(f"📊 Health check: http://{HOST}:{PORT}/health")
-    print(f"🌐 Main endpoint: http://{HOST}:{PORT}/")
-    
-    # Test Flask installation
-    try:
-        with app.test_client() as client:
-            response = client.get('/health')
-            if response.status_code == 200:
-                print("✅ Flask application test passed")
-            else:
-                print("❌ Flask application test failed")
-    except Exception as e:
-        print(f"❌ Flask test error: {e}")
-    
-    # Start the server
-    app.run(host=HOST, port=PORT, debug=False)
-
-if __name__ == '__main__':
-    start_server()
-'''
-        
-        # Create startup script
-        startup_script = '''#!/bin/bash
-set -e
-
-echo "🐍 Autonomous Team Container Startup"
-echo "======================================"
-
-# Install Flask if not present
-python3 -c "import flask" 2>/dev/null || {
-    echo "📦 Installing Flask..."
-    pip3 install flask
-}
-
-# Create the Flask application
-cat > /app/app.py << 'EOF'
-''' + flask_app + '''
-EOF
-
-echo "🚀 Starting Flask application..."
-cd /app
-python3 app.py
-'''
+        # The production app is the shared team API, served by gunicorn from a
+        # prebuilt image - no inline app, dev server or pip install at start
+        image_context = write_build_context()
         
-        print("   ✅ Flask specialist created production-ready application")
+        print("   ✅ Flask specialist prepared the team API image build context")
+        print(f"   📦 Build context: {image_context['build_dir']} (tag {image_context['tag']})")
         
         specialist_solution = {
             "status": "flask_app_created",
-            "application": flask_app,
-            "startup_script": startup_script,
+            "application": str(TEAM_API_MODULE),
+            "image_context": image_context,
             "features": [
-                "Binds to 0.0.0.0:8080",
-                "Robust error handling",
+                "Binds to 0.0.0.0:8080 under gunicorn gthread workers",
+                "JSON responses through an orjson provider",
                 "Health check endpoint",
                 "All 5 autonomous team capabilities",
-                "Production-ready startup script"
+                "Dependencies installed from wheels at image build time"
             ],
             "next_action": "Deploy container architect to create deployment strategy"
         }
@@ -417,7 +159,7 @@ python3 app.py
                 "scw container container create",
                 f"namespace-id={self.namespace_id}",
                 "name=autonomous-team-production-api",
-                "registry-image=python:3.11-slim",
+                f"registry-image={REGISTRY}/{IMAGE_NAME}:{context_hash(build_context())[:12]}",
                 f"region={self.region}",
                 "port=8080",
                 "cpu-limit=140",
@@ -425,9 +167,9 @@ python3 app.py
                 "min-scale=0",
                 "max-scale=5",
                 "description=Production autonomous team Flask API",
-                "command=bash",
-                "command.1=-c",
-                "command.2='pip install flask && echo \"Flask app code\" > /app.py && python3 /app.py'",
+                "environment-variables.WEB_CONCURRENCY=1",
+                "environment-variables.GUNICORN_THREADS=8",
+                "environment-variables.TASK_WORKERS=2",
                 "deploy=true"
             ],
             "monitor_deployment": [
@@ -443,9 +185,9 @@ python3 app.py
             "status": "cli_commands_created",
             "deployment_strategy": deployment_commands,
             "key_fixes": [
-                "Proper command structure with bash shell",
-                "Flask installation in container",
-                "Inline Flask application code",
+                "Prebuilt image tagged by build-context hash",
+                "No package installation at container start",
+                "gunicorn started by the image CMD",
                 "Correct port binding (0.0.0.0:8080)",
                 "Deploy flag for immediate deployment"
             ],
@@ -463,7 +205,7 @@ python3 app.py
             "agent": "container_architect",
             "mission": "Execute complete container deployment strategy",
             "expertise": ["Container orchestration", "Deployment strategy", "Problem solving"],
-            "strategy": "Combine Flask app with proper CLI commands"
+            "strategy": "Deploy the prebuilt API image with proper CLI commands"
         }
         
         print("   🎯 Executing deployment strategy...")
@@ -482,117 +224,52 @@ python3 app.py
             except Exception as e:
                 print(f"         ⚠️  Cleanup error: {e}")
         
-        # Step 2: Create new container with proper configuration
+        # Step 2: Create new container from the prebuilt image
         print("      🚀 Creating production container...")
         
-        # Create the Flask application as a single command
-        flask_app_code = flask_solution["application"]
-        
-        # Create a simpler, working container
-        create_cmd = [
-            "scw", "container", "container", "create",
-            f"namespace-id={self.namespace_id}",
-            "name=autonomous-team-production-api",
-            "registry-image=python:3.11-slim",
-            f"region={self.region}",
-            "port=8080",
-            "cpu-limit=140",
-            "memory-limit=256",
-            "min-scale=0",
-            "max-scale=5",
-            "description=Production autonomous team Flask API",
-            "command=bash",
-            "command.1=-c",
-            f"command.2='pip install flask && cat > /app.py << \"EOF\n{flask_app_code}\nEOF\npython3 /app.py'",
-            "deploy=true"
-        ]
-        
         try:
-            print("      🏗️  Building container with Flask application...")
-            create_result = subprocess.run(create_cmd, capture_output=True, text=True, timeout=120)
+            print("      🏗️  Building API image with prebuilt dependencies...")
+            image = build_api_image()
             
-            if create_result.returncode == 0:
-                print("      ✅ Container creation initiated!")
-                
-                # Extract container info
-                lines = create_result.stdout.split('\\n')
-                container_id = None
-                domain = None
-                
-                for line in lines:
-                    if 'ID' in line and len(line.split()) > 1:
-                        container_id = line.split()[-1]
-                    elif 'DomainName' in line:
-                        domain = ' '.join(line.split()[1:])
-                
-                architect_solution = {
-                    "status": "container_deployment_initiated",
-                    "container_id": container_id,
-                    "domain": domain,
-                    "deployment_time": datetime.now().isoformat(),
-                    "next_action": "Monitor deployment and test endpoints"
+            container = self.infra.create_container(
+                namespace_id=self.namespace_id,
+                name="autonomous-team-production-api",
+                deploy=True,
+                **{
+                    "registry-image": image,
+                    "port": 8080,
+                    "cpu-limit": 140,
+                    "memory-limit": 256,
+                    "min-scale": 0,
+                    "max-scale": 5,
+                    "description": "Production autonomous team Flask API",
+                    "environment-variables.WEB_CONCURRENCY": 1,
+                    "environment-variables.GUNICORN_THREADS": 8,
+                    "environment-variables.TASK_WORKERS": 2
                 }
-                
-                print(f"      📊 Container ID: {container_id}")
-                print(f"      🌐 Domain: {domain}")
-                
-                return architect_solution
-            else:
-                print(f"      ❌ Container creation failed: {create_result.stderr}")
-                
-                # Fallback: Try simpler approach
-                print("      🔄 Trying simpler container approach...")
-                
-                simple_cmd = [
-                    "scw", "container", "container", "create",
-                    f"namespace-id={self.namespace_id}",
-                    "name=autonomous-team-simple-api",
-                    "registry-image=python:3.11-slim",
-                    f"region={self.region}",
-                    "port=8080",
-                    "cpu-limit=140",
-                    "memory-limit=256",
-                    "min-scale=0",
-                    "max-scale=5",
-                    "description=Simple autonomous team API",
-                    "command=python3",
-                    "command.1=-c",
-                    "command.2='import flask; app = flask.Flask(__name__); @app.route(\"/health\")\ndef health(): return {\"status\": \"healthy\"}; app.run(host=\"0.0.0.0\", port=8080)'",
-                    "deploy=true"
-                ]
-                
-                simple_result = subprocess.run(simple_cmd, capture_output=True, text=True, timeout=120)
-                
-                if simple_result.returncode == 0:
-                    print("      ✅ Simple container deployed!")
-                    
-                    lines = simple_result.stdout.split('\\n')
-                    simple_container_id = None
-                    simple_domain = None
-                    
-                    for line in lines:
-                        if 'ID' in line and len(line.split()) > 1:
-                            simple_container_id = line.split()[-1]
-                        elif 'DomainName' in line:
-                            simple_domain = ' '.join(line.split()[1:])
-                    
-                    return {
-                        "status": "simple_container_deployed",
-                        "container_id": simple_container_id,
-                        "domain": simple_domain,
-                        "fallback_used": True,
-                        "next_action": "Test simple container and enhance"
-                    }
-                else:
-                    return {
-                        "status": "deployment_failed",
-                        "error": simple_result.stderr,
-                        "tried_approaches": ["complex", "simple"]
-                    }
-                
+            )
+        except RuntimeError as e:
+            print(f"      ❌ Image build failed: {e}")
+            return {"status": "deployment_failed", "error": str(e)}
+        except ScalewayError as e:
+            print(f"      ❌ Container creation failed: {e}")
+            return {"status": "deployment_failed", "error": str(e)}
         except Exception as e:
             print(f"      ❌ Container architect error: {e}")
             return {"status": "architect_error", "error": str(e)}
+        
+        print("      ✅ Container creation initiated!")
+        print(f"      📊 Container ID: {container.id}")
+        print(f"      🌐 Domain: {container.domain_name}")
+        
+        return {
+            "status": "container_deployment_initiated",
+            "container_id": container.id,
+            "domain": container.domain_name,
+            "image": image,
+            "deployment_time": datetime.now().isoformat(),
+            "next_action": "Monitor deployment and test endpoints"
+        }
     
     def deploy_api_validator(self, container_info):
         """Deploy API validator to test endpoints"""
@@ -0,0 +1,11 @@
+"""Put the workspace's script directories on sys.path, as the scripts themselves do"""
+
+import sys
+from pathlib import Path
+
+WORKSPACE = Path(__file__).resolve().parents[1]
+
+for directory in ("integration/mcp_servers", "infrastructure/scaleway", "workflows"):
+    path = str(WORKSPACE / directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
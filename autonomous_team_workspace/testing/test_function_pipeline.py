@@ -0,0 +1,95 @@
+"""Serverless deploy pipeline against the fake scw CLI"""
+
+import json
+
+import pytest
+
+from function_pipeline import FAKE_SCW, FunctionArtifact, FunctionDeployPipeline
+from scaleway_client import CLITransport, ScalewayError
+
+
+def spec(name, code="def handle(event, context):\n    return {}\n", **extra):
+    return dict({"name": name, "runtime": "python311", "handler": "handler.handle", "code": code}, **extra)
+
+
+@pytest.fixture
+def fake_scw(tmp_path, monkeypatch):
+    state_file = tmp_path / "fake_scw_state.json"
+    monkeypatch.setenv("FAKE_SCW_STATE", str(state_file))
+    monkeypatch.setenv("FAKE_SCW_LATENCY", "0")
+    monkeypatch.setenv("FAKE_SCW_FAIL", "")
+
+    def functions():
+        return {f["name"]: f for f in json.loads(state_file.read_text())["functions"].values()}
+    return functions
+
+
+def pipeline(tmp_path, concurrency=4):
+    return FunctionDeployPipeline(
+        namespace_id="ns-test",
+        concurrency=concurrency,
+        build_root=tmp_path / "build",
+        transport=CLITransport(scw_binary=str(FAKE_SCW))
+    )
+
+
+def test_first_run_creates_and_deploys_then_unchanged_functions_are_skipped(tmp_path, fake_scw):
+    specs = [spec("voice"), spec("search"), spec("coordinator", env={"TASK_QUEUE_URL": "https://team.example"})]
+    first = pipeline(tmp_path).run(specs)
+    assert sorted(first["deployed"]) == ["coordinator", "search", "voice"]
+    assert all("create_seconds" in first["functions"][name] for name in first["deployed"])
+
+    functions = fake_scw()
+    assert {f["status"] for f in functions.values()} == {"ready"}
+    assert functions["coordinator"]["environment_variables"] == {"TASK_QUEUE_URL": "https://team.example"}
+
+    second = pipeline(tmp_path).run(specs)
+    assert second["deployed"] == [] and sorted(second["skipped"]) == ["coordinator", "search", "voice"]
+
+
+def test_changed_code_and_env_redeploy_only_that_function(tmp_path, fake_scw):
+    pipeline(tmp_path).run([spec("voice"), spec("coordinator", env={"TASK_QUEUE_URL": "https://old.example"})])
+    ids = {name: f["id"] for name, f in fake_scw().items()}
+
+    report = pipeline(tmp_path).run([
+        spec("voice", code="def handle(event, context):\n    return {'v': 2}\n"),
+        spec("coordinator", env={"TASK_QUEUE_URL": "https://new.example"})
+    ])
+    assert sorted(report["deployed"]) == ["coordinator", "voice"]
+    # Existing functions are updated in place, not created again
+    assert all("create_seconds" not in report["functions"][name] for name in report["deployed"])
+    functions = fake_scw()
+    assert {name: f["id"] for name, f in functions.items()} == ids
+    assert functions["coordinator"]["environment_variables"] == {"TASK_QUEUE_URL": "https://new.example"}
+
+    report = pipeline(tmp_path).run([spec("voice", code="def handle(event, context):\n    return {'v': 2}\n")])
+    assert report["skipped"] == ["voice"]
+
+
+def test_failed_deploy_is_reported_and_retried_next_run(tmp_path, fake_scw, monkeypatch):
+    monkeypatch.setenv("FAKE_SCW_FAIL", "search")
+    report = pipeline(tmp_path).run([spec("voice"), spec("search")])
+    assert report["deployed"] == ["voice"]
+    assert report["failed"] == ["search"]
+    assert "deploy of" in report["functions"]["search"]["error"]
+
+    monkeypatch.setenv("FAKE_SCW_FAIL", "")
+    report = pipeline(tmp_path, concurrency=1).run([spec("voice"), spec("search")])
+    assert report["skipped"] == ["voice"]
+    assert report["deployed"] == ["search"]
+
+
+def test_artifacts_are_deterministic(tmp_path):
+    first = FunctionArtifact(spec("voice"), tmp_path / "a")
+    second = FunctionArtifact(spec("voice"), tmp_path / "b")
+    assert first.content_hash == second.content_hash
+    assert first.build().read_bytes() == second.build().read_bytes()
+    assert FunctionArtifact(spec("voice", description="changed"), tmp_path / "c").content_hash != first.content_hash
+
+
+def test_fake_cli_rejects_unsupported_commands(fake_scw):
+    transport = CLITransport(scw_binary=str(FAKE_SCW))
+    with pytest.raises(ScalewayError, match="unsupported"):
+        transport.run(["container", "container", "list"])
+    with pytest.raises(ScalewayError, match="not found"):
+        transport.run(["function", "function", "update", "no-such-id"], {"region": "fr-par"})
@@ -0,0 +1,42 @@
+"""MCP config batching: savepoints for nested batches and immediate test saves"""
+
+import json
+
+import pytest
+
+from mcp_manager import MCPServerManager
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setenv("MCP_STATUS_DB", str(tmp_path / "status.db"))
+    manager = MCPServerManager()
+    manager.mcp_config_path = tmp_path / "mcp_config.json"
+    manager.lock_path = tmp_path / "mcp_config.json.lock"
+    manager.servers_config = manager.load_mcp_config()
+    return manager
+
+
+def saved_servers(manager):
+    return json.loads(manager.mcp_config_path.read_text())["mcpServers"]
+
+
+def test_failed_inner_batch_rolls_back_only_its_changes(manager):
+    with manager.batch():
+        manager.add_mcp_server("outer", "true")
+        with pytest.raises(RuntimeError):
+            with manager.batch():
+                manager.add_mcp_server("inner", "true")
+                manager.remove_mcp_server("outer")
+                raise RuntimeError("inner batch failed")
+        manager.add_mcp_server("after", "true")
+
+    assert sorted(saved_servers(manager)) == ["after", "outer"]
+    assert sorted(manager.servers_config["mcpServers"]) == ["after", "outer"]
+
+
+def test_server_test_result_is_written_immediately(manager):
+    manager.add_mcp_server("ok", "true")
+    assert manager.test_mcp_server("ok")
+    assert manager._flush_timer is None
+    assert saved_servers(manager)["ok"]["status"] == "active"
@@ -0,0 +1,47 @@
+"""MCP server restarts as seen by callers of the supervisor"""
+
+import asyncio
+import sys
+import textwrap
+
+from mcp_supervisor import MCPServerProcess
+
+# Answers initialize and echoes other methods; on its first run, "crash"
+# closes stdout and exits a moment later, like a server dying mid-request
+CRASHING_SERVER = textwrap.dedent("""
+    import json, os, sys, time
+    first_run = not os.path.exists(sys.argv[1])
+    open(sys.argv[1], "a").close()
+    for line in sys.stdin:
+        message = json.loads(line)
+        if "id" not in message:
+            continue
+        if first_run and message["method"] == "crash":
+            os.close(1)
+            time.sleep(0.5)
+            sys.exit(3)
+        result = {"serverInfo": {"name": "crashing"}} if message["method"] == "initialize" else {"echo": message["method"]}
+        print(json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": result}), flush=True)
+""")
+
+
+def test_request_after_stdout_eof_waits_for_restart(tmp_path):
+    script = tmp_path / "server.py"
+    script.write_text(CRASHING_SERVER)
+    server = MCPServerProcess("crashing", {"command": sys.executable, "args": [str(script), str(tmp_path / "ran")]},
+                              restart_backoff=0.1)
+
+    async def scenario():
+        await server.start()
+        assert await server.wait_ready(5)
+        try:
+            await server.request("crash", timeout=5)
+        except ConnectionError:
+            pass
+        try:
+            return await server.request("ping", timeout=5)
+        finally:
+            await server.stop()
+
+    assert asyncio.run(scenario()) == {"echo": "ping"}
+    assert server.restarts == 1
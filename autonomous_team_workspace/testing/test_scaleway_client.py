@@ -0,0 +1,133 @@
+"""Typed Scaleway client and deployment watcher replayed from recorded responses"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from deployment_watcher import PROBE_ERROR_STATE, TIMEOUT_STATE, DeploymentWatcher
+from scaleway_client import CLITransport, RecordedTransport, RecordingTransport, ScalewayClient, ScalewayError
+
+RECORDINGS = Path(__file__).parent / "fixtures" / "scaleway_recordings.json"
+API = "11111111-aaaa-4aaa-8aaa-000000000001"
+WORKER = "11111111-aaaa-4aaa-8aaa-000000000002"
+MISSING = "11111111-aaaa-4aaa-8aaa-00000000dead"
+LB = "22222222-bbbb-4bbb-8bbb-000000000001"
+
+
+def recorded_client():
+    return ScalewayClient(transport=RecordedTransport(RECORDINGS))
+
+
+def test_get_container_replays_status_progression():
+    client = recorded_client()
+    statuses = [client.get_container(API).status for _ in range(4)]
+    assert statuses == ["pending", "pending", "ready", "ready"]
+
+    container = client.get_container(API)
+    assert container.is_ready and not container.is_failed
+    assert container.domain_name == "autonomousteamapi-ns0001.functions.fnc.fr-par.scw.cloud"
+
+
+def test_empty_domain_and_error_message_are_normalized():
+    client = recorded_client()
+    pending = client.get_container(WORKER)
+    assert pending.domain_name is None and pending.error_message is None
+
+    failed = client.get_container(WORKER)
+    assert failed.is_failed
+    assert failed.error_message == "container is not listening on port 8080"
+
+
+def test_recorded_error_raises_with_status():
+    with pytest.raises(ScalewayError) as excinfo:
+        recorded_client().get_container(MISSING)
+    assert excinfo.value.status == 404
+
+
+def test_get_containers_keeps_order_and_can_return_exceptions():
+    client = recorded_client()
+    try:
+        results = client.get_containers([WORKER, MISSING, API], return_exceptions=True)
+    finally:
+        client.close()
+    assert [getattr(r, "name", None) for r in results] == ["voice-worker", None, "autonomous-team-api"]
+    assert isinstance(results[1], ScalewayError)
+
+
+def test_list_create_and_load_balancer():
+    client = recorded_client()
+    assert [(c.name, c.status) for c in client.list_containers("ns-0001")] == [
+        ("autonomous-team-api", "ready"),
+        ("voice-worker", "error"),
+    ]
+    assert client.create_container("ns-0001", "search-worker").id == "11111111-aaaa-4aaa-8aaa-000000000003"
+
+    lb = client.get_load_balancer(LB)
+    assert lb.status == "ready"
+    assert lb.ip_addresses == ["163.172.191.225"]
+    assert client.transport.calls == ["list container", "create container", f"get lb {LB}"]
+
+
+def test_unrecorded_call_is_a_404():
+    with pytest.raises(ScalewayError) as excinfo:
+        recorded_client().get_load_balancer("not-recorded")
+    assert excinfo.value.status == 404
+
+
+def test_recording_transport_output_replays_identically(tmp_path):
+    path = tmp_path / "recorded.json"
+    recorder = RecordingTransport(RecordedTransport(RECORDINGS), path)
+    live = [recorder.get("container", WORKER)["status"] for _ in range(2)]
+    with pytest.raises(ScalewayError):
+        recorder.get("container", MISSING)
+
+    replay = RecordedTransport(path)
+    assert [replay.get("container", WORKER)["status"] for _ in range(2)] == live == ["pending", "error"]
+    with pytest.raises(ScalewayError):
+        replay.get("container", MISSING)
+    assert json.loads(path.read_text())[f"get container {MISSING}"] == [{"error": "container not found", "status": 404}]
+
+
+def test_watcher_follows_recorded_deployments_to_final_state():
+    watcher = DeploymentWatcher(recorded_client(), initial_interval=0.01, max_interval=0.02)
+    changes = []
+    watcher.on_change(lambda watch, old, new: changes.append((watch.key, old, new)))
+    watcher.watch_container(API, timeout=5)
+    watcher.watch_container(WORKER, timeout=5)
+
+    report = watcher.run()
+    assert report[API]["state"] == "ready"
+    assert report[API]["polls"] == 3
+    assert report[API]["time_to_ready"] is not None
+    assert report[WORKER]["state"] == "error"
+    assert (API, "pending", "ready") in changes
+    assert (WORKER, "pending", "error") in changes
+
+
+def test_cli_flags_keep_map_keys():
+    assert CLITransport._flag("namespace_id") == "namespace-id"
+    assert CLITransport._flag("environment_variables.TASK_QUEUE_URL") == "environment-variables.TASK_QUEUE_URL"
+
+
+def test_watch_gives_up_after_repeated_probe_errors():
+    watcher = DeploymentWatcher(recorded_client(), initial_interval=0.01, max_interval=0.02, max_probe_errors=3)
+    changes = []
+    watch = watcher.watch_container(MISSING, on_change=lambda w, old, new: changes.append(new), timeout=5)
+
+    watcher.run()
+    assert watch.state == PROBE_ERROR_STATE
+    assert watch.polls == 3
+    assert "container not found" in watch.detail
+    assert changes == ["unknown", PROBE_ERROR_STATE]
+
+
+def test_timeout_fires_callbacks():
+    watcher = DeploymentWatcher(initial_interval=0.01, max_interval=0.02)
+    changes = []
+    watch = watcher.watch("slow", lambda: ("pending", None), on_change=lambda w, old, new: changes.append((old, new)),
+                          timeout=0.05)
+
+    watcher.run()
+    assert watch.state == TIMEOUT_STATE
+    assert changes == [(None, "pending"), ("pending", TIMEOUT_STATE)]
@@ -0,0 +1,34 @@
+"""Task routing and the remote queue client against the Flask team API"""
+
+import threading
+
+from werkzeug.serving import make_server
+
+import team_api
+import team_api_async
+from task_queue import DurableTaskQueue, RemoteTaskQueue, TASK_ROUTES
+
+
+def test_default_task_types_are_routed():
+    for task_type in ("general", "task_delegation"):
+        result = team_api.process_task({"task_type": task_type, "payload": {"description": "plan"}})
+        assert result["coordinated"] is True
+        assert result["description"] == "plan"
+    assert "/coordinate" in {route.path for route in team_api_async.app.routes}
+    assert set(TASK_ROUTES.values()) <= {rule.rule for rule in team_api.app.url_map.iter_rules()}
+
+
+def test_remote_queue_reads_metrics_and_tasks(tmp_path, monkeypatch):
+    task_queue = DurableTaskQueue(str(tmp_path / "tasks.db"))
+    monkeypatch.setattr(team_api, "task_queue", task_queue)
+    server = make_server("127.0.0.1", 0, team_api.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        remote = RemoteTaskQueue(f"http://127.0.0.1:{server.server_port}")
+        task_id = remote.enqueue({"task_type": "general", "priority": "high"})["task_id"]
+
+        assert remote.metrics()["queue_depth"]["high"] == 1
+        assert [t["task_id"] for t in remote.list_tasks("queued")] == [task_id]
+        assert remote.list_tasks("completed") == []
+    finally:
+        server.shutdown()
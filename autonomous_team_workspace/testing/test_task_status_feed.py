@@ -0,0 +1,111 @@
+"""/tasks/stream in the team APIs, fed by the durable task queue"""
+
+import asyncio
+import queue
+
+import uvicorn
+
+import team_api
+import team_api_async
+from task_queue import DurableTaskQueue, TaskStatusFeed, put_latest
+from url_mcp_server import URLBasedMCPServer
+
+
+def test_async_api_streams_queue_transitions(tmp_path, monkeypatch):
+    task_queue = DurableTaskQueue(str(tmp_path / "tasks.db"))
+    monkeypatch.setattr(team_api_async, "status_feed", TaskStatusFeed(task_queue, poll_interval=0.05))
+    a = task_queue.enqueue({"task_type": "search"})["task_id"]
+    b = task_queue.enqueue({"task_type": "search"})["task_id"]
+
+    def work():
+        for _ in range(2):
+            task = task_queue.claim("worker-1")
+            if task["task_id"] == a:
+                task_queue.complete(a, "worker-1", {"ok": True})
+            else:
+                task_queue.fail(b, "worker-1", "boom", retry=False)
+
+    async def scenario():
+        server = uvicorn.Server(uvicorn.Config(team_api_async.app, host="127.0.0.1", port=0,
+                                               lifespan="off", log_level="warning"))
+        serving = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.01)
+        port = server.servers[0].sockets[0].getsockname()[1]
+
+        async def drive():
+            await asyncio.sleep(0.2)
+            await asyncio.to_thread(work)
+
+        try:
+            async with URLBasedMCPServer(base_url=f"http://127.0.0.1:{port}") as client:
+                driver = asyncio.create_task(drive())
+                events = [e async for e in client.subscribe_task_status([a, b])]
+                await driver
+        finally:
+            server.should_exit = True
+            await serving
+        return events
+
+    events = asyncio.run(asyncio.wait_for(scenario(), 10))
+    assert [e["status"] for e in events if e["task_id"] == a] == ["queued", "running", "completed"]
+    assert [e["status"] for e in events if e["task_id"] == b] == ["queued", "running", "dead"]
+    assert [e["error"] for e in events if e["status"] == "dead"] == ["boom"]
+    assert team_api_async.status_feed.subscribers() == 0
+
+
+def test_feed_polls_changes_made_elsewhere_and_replays(tmp_path):
+    path = str(tmp_path / "tasks.db")
+    local, other = DurableTaskQueue(path), DurableTaskQueue(path)
+    feed = TaskStatusFeed(local, poll_interval=0.02)
+    task_id = local.enqueue({"task_type": "search"})["task_id"]
+
+    events = queue.Queue()
+    subscriber = feed.subscribe([task_id], events.put)
+    assert [e["status"] for _, e in feed.catch_up([task_id])] == ["queued"]
+
+    other.claim("elsewhere")
+    other.complete(task_id, "elsewhere")
+    # The poll may or may not catch the queued state first; it must end on completed
+    seen = [events.get(timeout=2)]
+    while seen[-1][1]["status"] != "completed":
+        seen.append(events.get(timeout=2))
+    assert {e["status"] for _, e in seen} <= {"queued", "running", "completed"}
+
+    # Resuming after the first event replays the rest; an unknown id gets a snapshot
+    assert feed.catch_up([task_id], str(seen[0][0])) == seen[1:]
+    assert [(i, e["status"]) for i, e in feed.catch_up([task_id], "999")] == [(None, "completed")]
+    feed.unsubscribe(subscriber)
+    assert feed.subscribers() == 0
+
+
+def test_subscriber_queues_are_bounded():
+    events = queue.Queue(maxsize=2)
+    for item in range(5):
+        put_latest(events, item)
+    assert [events.get_nowait(), events.get_nowait()] == [3, 4]
+
+    async def bounded_async():
+        events = asyncio.Queue(maxsize=2)
+        for item in range(5):
+            put_latest(events, item)
+        return [events.get_nowait(), events.get_nowait()]
+
+    assert asyncio.run(bounded_async()) == [3, 4]
+
+
+def test_flask_stream_rejects_over_capacity_and_releases_on_close(tmp_path, monkeypatch):
+    task_queue = DurableTaskQueue(str(tmp_path / "tasks.db"))
+    feed = TaskStatusFeed(task_queue, max_subscribers=1)
+    monkeypatch.setattr(team_api, "status_feed", feed)
+    task_id = task_queue.enqueue({"task_type": "search"})["task_id"]
+    client = team_api.app.test_client()
+
+    assert client.get('/tasks/stream').status_code == 400
+    response = client.get(f'/tasks/stream?ids={task_id}', buffered=False)
+    assert response.status_code == 200
+    assert b'"status": "queued"' in next(response.response)
+    assert client.get(f'/tasks/stream?ids={task_id}').status_code == 503
+
+    response.close()
+    assert feed.subscribers() == 0
@@ -0,0 +1,131 @@
+"""SSE task status subscriptions against the local task stream server"""
+
+import asyncio
+
+from aiohttp import web
+
+from task_stream_server import TaskStreamServer
+from url_mcp_server import URLBasedMCPServer
+
+
+# The stream handler notices a gone client on its next keep-alive write
+async def serve(app: web.Application):
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    return runner, f"http://{host}:{port}"
+
+
+def test_subscription_follows_tasks_to_terminal_status():
+    async def scenario():
+        server = TaskStreamServer(keepalive_interval=0.05)
+        runner, base_url = await serve(server.app)
+        for task_id in ("a", "b"):
+            server.create_task({"task_id": task_id})
+
+        async def drive():
+            await asyncio.sleep(0.1)
+            server.set_status("a", "running")
+            server.set_status("b", "failed", error="boom")
+            server.set_status("c", "running")  # not subscribed
+            server.set_status("a", "completed")
+
+        try:
+            async with URLBasedMCPServer(base_url=base_url) as client:
+                driver = asyncio.create_task(drive())
+                events = [e async for e in client.subscribe_task_status(["a", "b"])]
+                await driver
+        finally:
+            await runner.cleanup()
+        return [(e["task_id"], e["status"]) for e in events]
+
+    events = asyncio.run(asyncio.wait_for(scenario(), 10))
+    assert ("c", "running") not in events
+    assert [s for t, s in events if t == "a"] == ["queued", "running", "completed"]
+    assert [s for t, s in events if t == "b"] == ["queued", "failed"]
+
+
+def test_reconnect_resumes_from_last_event_id():
+    async def scenario():
+        server = TaskStreamServer(keepalive_interval=0.05)
+        server.create_task({"task_id": "a"})
+        state = {"connections": 0, "last_event_ids": []}
+
+        async def flaky_stream(request):
+            # First connection: deliver one event, then drop; later ones are served normally
+            state["connections"] += 1
+            state["last_event_ids"].append(request.headers.get("Last-Event-ID"))
+            if state["connections"] == 1:
+                response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+                await response.prepare(request)
+                server.set_status("a", "running")
+                await response.write(b'id: 2\ndata: {"task_id": "a", "status": "running"}\n\n')
+                server.set_status("a", "completed")
+                return response
+            return await server.handle_stream(request)
+
+        app = web.Application()
+        app.router.add_get("/tasks/stream", flaky_stream)
+        runner, base_url = await serve(app)
+        try:
+            async with URLBasedMCPServer(base_url=base_url) as client:
+                stream = client.subscribe_task_status(["a"], reconnect_delay=0.01)
+                statuses = [e["status"] async for e in stream]
+        finally:
+            await runner.cleanup()
+        return statuses, state
+
+    statuses, state = asyncio.run(asyncio.wait_for(scenario(), 10))
+    assert statuses == ["running", "completed"]
+    assert state["last_event_ids"] == [None, "2"]
+
+
+def test_clean_server_close_backs_off():
+    async def scenario():
+        connections = []
+
+        async def closes_immediately(request):
+            connections.append(asyncio.get_running_loop().time())
+            response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+            await response.prepare(request)
+            return response
+
+        app = web.Application()
+        app.router.add_get("/tasks/stream", closes_immediately)
+        runner, base_url = await serve(app)
+        try:
+            async with URLBasedMCPServer(base_url=base_url) as client:
+                stream = client.subscribe_task_status(["a"], reconnect_delay=0.05)
+                try:
+                    await asyncio.wait_for(stream.__anext__(), 0.6)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await runner.cleanup()
+        return connections
+
+    connections = asyncio.run(scenario())
+    # 0.05 + 0.1 + 0.2 (+ 0.4): a handful of attempts, not a hot loop
+    assert 2 <= len(connections) <= 5
+    gaps = [b - a for a, b in zip(connections, connections[1:])]
+    assert all(later > earlier for earlier, later in zip(gaps, gaps[1:]))
+
+
+def test_set_status_requires_status():
+    async def scenario():
+        server = TaskStreamServer(keepalive_interval=0.05)
+        server.create_task({"task_id": "a"})
+        runner, base_url = await serve(server.app)
+        try:
+            async with URLBasedMCPServer(base_url=base_url) as client:
+                session = await client._get_session()
+                missing = await session.post(f"{base_url}/tasks/a/status", json={"note": "x"})
+                not_json = await session.post(f"{base_url}/tasks/a/status", data=b"nope")
+                ok = await session.post(f"{base_url}/tasks/a/status", json={"status": "running"})
+                return missing.status, not_json.status, ok.status, server.tasks["a"]["status"]
+        finally:
+            await runner.cleanup()
+
+    assert asyncio.run(scenario()) == (400, 400, 200, "running")
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Mission Scheduler - Autonomous Team
+Run specialized agents as a dependency DAG instead of a fixed sequence
+"""
+
+import os
+import json
+import time
+import inspect
+import threading
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, Optional, List
+
+class MissionStep:
+    """One agent in the mission graph with its declared inputs, outputs and tools"""
+
+    def __init__(self, name: str, agent, inputs: List[str], outputs: List[str], tools: List[str], priority: int = 0):
+        self.name = name
+        self.agent = agent
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.tools = list(tools)
+        self.priority = priority
+        # Agents whose execute_mission takes an argument receive their upstream artifacts
+        self.takes_context = bool(inspect.signature(agent.execute_mission).parameters)
+
+        self.status = "pending"
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.worker: Optional[str] = None
+        self.error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+def _run_agent(agent, context: Optional[Dict[str, Any]] = None) -> tuple:
+    """Execute one agent mission; top-level so it can run in a process pool"""
+    started_at = time.time()
+    result = agent.execute_mission(context) if context is not None else agent.execute_mission()
+    worker = f"{os.getpid()}:{threading.current_thread().name}"
+    return result, started_at, time.time(), worker
+
+class MissionScheduler:
+    """Dependency-aware scheduler for specialized agent missions
+
+    Agents declare the artifacts they consume (``inputs``) and produce
+    (``outputs``). Every agent whose inputs are available runs concurrently,
+    subject to ``max_workers`` and per-tool limits. Among ready agents the
+    one with the higher priority, then the longer remaining path, goes first.
+    An agent whose ``execute_mission`` takes a context argument is handed
+    the artifacts named in its ``inputs``.
+    """
+
+    def __init__(self, max_workers: int = 4, executor: str = "thread", tool_limits: Dict[str, int] = None):
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor: {executor}")
+        for tool, limit in (tool_limits or {}).items():
+            # A limit of 0 would leave every step using the tool pending forever
+            if not isinstance(limit, int) or limit < 1:
+                raise ValueError(f"Tool limit for '{tool}' must be a positive integer, got {limit!r}")
+        self.max_workers = max_workers
+        self.executor = executor
+        self.tool_limits = tool_limits or {}
+        self.steps: Dict[str, MissionStep] = {}
+
+    def add_agent(self,
+                  agent,
+                  inputs: List[str] = None,
+                  outputs: List[str] = None,
+                  tools: List[str] = None,
+                  priority: int = None,
+                  name: str = None) -> MissionStep:
+        """Register an agent; declarations default to the agent's own attributes"""
+        name = name or getattr(agent, "agent_name", type(agent).__name__)
+        if name in self.steps:
+            raise ValueError(f"Agent already scheduled: {name}")
+
+        step = MissionStep(
+            name=name,
+            agent=agent,
+            inputs=inputs if inputs is not None else getattr(agent, "inputs", []),
+            outputs=outputs if outputs is not None else getattr(agent, "outputs", []),
+            tools=tools if tools is not None else getattr(agent, "tools", []),
+            priority=priority if priority is not None else getattr(agent, "priority", 0)
+        )
+        self.steps[name] = step
+        return step
+
+    def dependencies(self, initial_inputs: Dict[str, Any] = None) -> Dict[str, set]:
+        """Map each step to the steps producing its inputs; validates the graph"""
+        available = set(initial_inputs or {})
+        producers: Dict[str, str] = {}
+        for step in self.steps.values():
+            for output in step.outputs:
+                if output in producers:
+                    raise ValueError(f"Output '{output}' produced by both {producers[output]} and {step.name}")
+                producers[output] = step.name
+
+        deps = {}
+        for step in self.steps.values():
+            deps[step.name] = set()
+            for needed in step.inputs:
+                if needed in producers:
+                    deps[step.name].add(producers[needed])
+                elif needed not in available:
+                    raise ValueError(f"{step.name} needs '{needed}' but nothing produces it")
+
+        # Kahn's algorithm to reject cycles
+        remaining = {name: set(d) for name, d in deps.items()}
+        ready = [name for name, d in remaining.items() if not d]
+        visited = 0
+        while ready:
+            current = ready.pop()
+            visited += 1
+            for name, d in remaining.items():
+                if current in d:
+                    d.discard(current)
+                    if not d:
+                        ready.append(name)
+        if visited != len(deps):
+            raise ValueError("Mission graph contains a dependency cycle")
+
+        return deps
+
+    def _remaining_path_length(self, deps: Dict[str, set]) -> Dict[str, int]:
+        """Number of steps on the longest chain starting at each step"""
+        dependents = {name: [n for n, d in deps.items() if name in d] for name in deps}
+        lengths: Dict[str, int] = {}
+
+        def length(name: str) -> int:
+            if name not in lengths:
+                lengths[name] = 1 + max((length(d) for d in dependents[name]), default=0)
+            return lengths[name]
+
+        for name in deps:
+            length(name)
+        return lengths
+
+    def run(self, initial_inputs: Dict[str, Any] = None, trace_file: Path = None) -> Dict[str, Any]:
+        """Execute the mission graph and return the run report"""
+        deps = self.dependencies(initial_inputs)
+        path_length = self._remaining_path_length(deps)
+        artifacts: Dict[str, Any] = dict(initial_inputs or {})
+        tools_in_use: Dict[str, int] = {}
+
+        pool_class = ThreadPoolExecutor if self.executor == "thread" else ProcessPoolExecutor
+        mission_start = time.time()
+        running = {}
+
+        def tools_available(step: MissionStep) -> bool:
+            return all(tools_in_use.get(t, 0) < self.tool_limits[t] for t in step.tools if t in self.tool_limits)
+
+        with pool_class(max_workers=self.max_workers) as pool:
+            while True:
+                # Skip anything downstream of a failure
+                for step in self.steps.values():
+                    if step.status == "pending" and any(self.steps[d].status in ("failed", "skipped") for d in deps[step.name]):
+                        step.status = "skipped"
+
+                ready = [
+                    step for step in self.steps.values()
+                    if step.status == "pending" and all(self.steps[d].status == "completed" for d in deps[step.name])
+                ]
+                ready.sort(key=lambda s: (-s.priority, -path_length[s.name], s.name))
+
+                for step in ready:
+                    if len(running) >= self.max_workers or not tools_available(step):
+                        continue
+                    for tool in step.tools:
+                        tools_in_use[tool] = tools_in_use.get(tool, 0) + 1
+                    step.status = "running"
+                    print(f"   ▶️  {step.name} started")
+                    context = {name: artifacts[name] for name in step.inputs} if step.takes_context else None
+                    running[pool.submit(_run_agent, step.agent, context)] = step
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    for tool in step.tools:
+                        tools_in_use[tool] -= 1
+                    try:
+                        result, step.started_at, step.finished_at, step.worker = future.result()
+                        for output in step.outputs:
+                            artifacts[output] = result.get(output) if isinstance(result, dict) else result
+                        step.status = "completed"
+                        print(f"   ✅ {step.name} finished in {step.duration:.2f}s")
+                    except Exception as e:
+                        step.finished_at = time.time()
+                        step.error = str(e)
+                        step.status = "failed"
+                        print(f"   ❌ {step.name} failed: {e}")
+
+        wall_clock = time.time() - mission_start
+        report = self._build_report(deps, mission_start, wall_clock, artifacts)
+
+        if trace_file is not None:
+            self.write_trace(trace_file, mission_start)
+            report["trace_file"] = str(trace_file)
+
+        return report
+
+    def critical_path(self, deps: Dict[str, set]) -> tuple:
+        """Longest chain of measured step durations through the graph"""
+        finish: Dict[str, float] = {}
+        via: Dict[str, Optional[str]] = {}
+
+        def earliest_finish(name: str) -> float:
+            if name not in finish:
+                best = max(deps[name], key=earliest_finish, default=None)
+                via[name] = best
+                finish[name] = (finish[best] if best else 0.0) + self.steps[name].duration
+            return finish[name]
+
+        for name in deps:
+            earliest_finish(name)
+        if not finish:
+            return [], 0.0
+
+        end = max(finish, key=finish.get)
+        path = []
+        while end is not None:
+            path.append(end)
+            end = via[end]
+        path.reverse()
+        return path, finish[path[-1]]
+
+    def _build_report(self, deps, mission_start: float, wall_clock: float, artifacts: Dict[str, Any]) -> Dict[str, Any]:
+        path, path_seconds = self.critical_path(deps)
+        busy = sum(step.duration for step in self.steps.values())
+
+        return {
+            "status": "completed" if all(s.status == "completed" for s in self.steps.values()) else "failed",
+            "wall_clock_seconds": round(wall_clock, 4),
+            "sequential_seconds": round(busy, 4),
+            "parallel_speedup": round(busy / wall_clock, 2) if wall_clock else 0.0,
+            "critical_path": path,
+            "critical_path_seconds": round(path_seconds, 4),
+            "artifacts": sorted(artifacts),
+            "steps": [
+                {
+                    "agent": step.name,
+                    "status": step.status,
+                    "depends_on": sorted(deps[step.name]),
+                    "tools": step.tools,
+                    "start_offset": round(step.started_at - mission_start, 4) if step.started_at else None,
+                    "duration": round(step.duration, 4),
+                    "worker": step.worker,
+                    "error": step.error
+                }
+                for step in self.steps.values()
+            ],
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def write_trace(self, trace_file: Path, mission_start: float):
+        """Write the run as Chrome trace events (open in chrome://tracing or Perfetto)"""
+        events = [
+            {
+                "name": step.name,
+                "cat": "agent",
+                "ph": "X",
+                "ts": int((step.started_at - mission_start) * 1e6),
+                "dur": int(step.duration * 1e6),
+                "pid": 0,
+                "tid": step.worker or "main",
+                "args": {"status": step.status, "tools": step.tools, "outputs": step.outputs}
+            }
+            for step in self.steps.values() if step.started_at is not None
+        ]
+        trace_file = Path(trace_file)
+        trace_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(trace_file, 'w') as f:
+            json.dump({"traceEvents": events}, f, indent=2)
+
+    def print_report(self, report: Dict[str, Any]):
+        """Print a short run summary"""
+        print(f"⏱️  Wall clock: {report['wall_clock_seconds']:.2f}s "
+              f"(sequential {report['sequential_seconds']:.2f}s, speedup {report['parallel_speedup']}x)")
+        print(f"🛤️  Critical path ({report['critical_path_seconds']:.2f}s): {' → '.join(report['critical_path'])}")
+        for step in report["steps"]:
+            emoji = "✅" if step["status"] == "completed" else "❌"
+            print(f"   {emoji} {step['agent']}: {step['status']} ({step['duration']:.2f}s)")
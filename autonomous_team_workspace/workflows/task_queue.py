@@ -0,0 +1,658 @@
+#!/usr/bin/env python3
+"""
+Durable Task Queue - Autonomous Team
+SQLite-backed task queue with priority lanes, visibility timeouts and retries
+
+The queue lives with the team API, whose TaskWorkerPool drains it. A SQLite
+file is private to one container instance and gone when it scales to zero,
+so a deployment that scales out sets TASK_QUEUE_DSN and every instance uses
+the same PostgresTaskQueue instead.
+Serverless function instances each have their own /tmp, so they must not
+open a local queue: with TASK_QUEUE_URL set (the team API base URL), the
+module-level ``task_queue`` is a RemoteTaskQueue that enqueues through the
+API's /tasks endpoint instead.
+
+TaskStatusFeed turns the queue's status transitions into the events the
+API streams from /tasks/stream.
+"""
+
+import os
+import json
+import time
+import uuid
+import queue
+import random
+import asyncio
+import sqlite3
+import itertools
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Callable, Iterable, Tuple
+
+try:
+    import psycopg2
+    import psycopg2.extras
+    PSYCOPG2_AVAILABLE = True
+except ImportError:
+    PSYCOPG2_AVAILABLE = False
+
+# Lower lane number is served first; unknown priorities fall back to "medium"
+PRIORITY_LANES = {
+    "critical": 0,
+    "high": 1,
+    "medium": 2,
+    "low": 3
+}
+
+DEFAULT_DB_PATH = os.environ.get("TASK_QUEUE_DB", "/tmp/autonomous_team_tasks.db")
+TASK_QUEUE_URL = os.environ.get("TASK_QUEUE_URL")
+TASK_QUEUE_DSN = os.environ.get("TASK_QUEUE_DSN")
+
+# /tasks/stream: events buffered per subscriber, and the keep-alive comment interval
+TASK_STREAM_QUEUE_SIZE = int(os.environ.get("TASK_STREAM_QUEUE_SIZE", 256))
+TASK_STREAM_KEEPALIVE = float(os.environ.get("TASK_STREAM_KEEPALIVE", 15))
+
+# Task types the team API workers can run, and the endpoint that runs them.
+# Keys match URLBasedMCPServer.api_endpoints; the short names are aliases.
+TASK_ROUTES = {
+    "voice_synthesis": "/voice",
+    "voice": "/voice",
+    "web_search": "/search",
+    "search": "/search",
+    "code_execution": "/execute",
+    "execute": "/execute",
+    # Untyped tasks and delegations are acknowledged by the coordinator
+    "general": "/coordinate",
+    "task_delegation": "/coordinate"
+}
+
+class PermanentTaskError(Exception):
+    """A task that can never succeed (unknown type, invalid payload); it is not retried"""
+
+def generate_task_id(prefix: str = "task") -> str:
+    """Collision-free task ID that keeps the task_{YYYYmmdd_HHMMSS} prefix"""
+    return f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:12]}"
+
+def task_type_of(task_data: Dict[str, Any]) -> str:
+    """The task's type; ``type`` (sent by the URL MCP server) is accepted for ``task_type``"""
+    return task_data.get("task_type") or task_data.get("type") or "general"
+
+def task_input_of(task_data: Dict[str, Any]) -> Dict[str, Any]:
+    """The body handed to the task's endpoint: its ``payload`` object, or the task itself"""
+    payload = task_data.get("payload")
+    return payload if isinstance(payload, dict) else task_data
+
+class DurableTaskQueue:
+    """Persistent task queue shared by the API, serverless handlers and workers"""
+
+    # The claim transaction; stores with row locks also skip rows another worker is claiming
+    _BEGIN_CLAIM = "BEGIN IMMEDIATE"
+    _CLAIM_LOCK = ""
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            task_id TEXT PRIMARY KEY,
+            task_type TEXT NOT NULL,
+            priority TEXT NOT NULL,
+            lane INTEGER NOT NULL,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL,
+            available_at REAL NOT NULL,
+            lease_expires_at REAL,
+            worker_id TEXT,
+            created_at REAL NOT NULL,
+            started_at REAL,
+            completed_at REAL,
+            result TEXT,
+            error TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_tasks_ready ON tasks (status, lane, available_at);
+        CREATE INDEX IF NOT EXISTS idx_tasks_lease ON tasks (status, lease_expires_at);
+    """
+
+    def __init__(self,
+                 db_path: str = None,
+                 visibility_timeout: float = 30.0,
+                 max_attempts: int = 5,
+                 backoff_base: float = 2.0,
+                 backoff_max: float = 300.0):
+        self.db_path = db_path or DEFAULT_DB_PATH
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._local = threading.local()
+        # Called with (task_id, status, error) after each transition made through this object
+        self.listeners: List[Callable[[str, str, Optional[str]], None]] = []
+
+        self._create_schema()
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread; WAL lets readers run alongside the writer"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _create_schema(self):
+        self._connection().executescript(self._SCHEMA)
+
+    def enqueue(self, task_data: Dict[str, Any], task_id: str = None, delay: float = 0) -> Dict[str, Any]:
+        """Persist a task in its priority lane and return its queue record"""
+        task_id = task_id or generate_task_id()
+        priority = task_data.get("priority", "medium")
+        lane = PRIORITY_LANES.get(priority, PRIORITY_LANES["medium"])
+        now = time.time()
+
+        self._connection().execute(
+            """INSERT INTO tasks (task_id, task_type, priority, lane, payload, status,
+                                  max_attempts, available_at, created_at)
+               VALUES (?, ?, ?, ?, ?, 'queued', ?, ?, ?)""",
+            (task_id, task_type_of(task_data), priority, lane,
+             json.dumps(task_data), self.max_attempts, now + delay, now)
+        )
+        self._notify(task_id, "queued")
+        return self.get_task(task_id)
+
+    def _notify(self, task_id: str, status: str, error: str = None):
+        for listener in list(self.listeners):
+            try:
+                listener(task_id, status, error)
+            except Exception as e:
+                print(f"⚠️  Task status listener failed: {e}")
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Lease the next ready task, highest priority lane first
+
+        A task whose lease expired (worker crashed or overran the visibility
+        timeout) becomes claimable again.
+        """
+        conn = self._connection()
+        now = time.time()
+
+        conn.execute(self._BEGIN_CLAIM)
+        try:
+            # Expired leases that already used every attempt are not retried again
+            conn.execute(
+                """UPDATE tasks
+                   SET status = 'dead', error = COALESCE(error, 'visibility timeout exceeded'),
+                       completed_at = ?, lease_expires_at = NULL
+                   WHERE status = 'running' AND lease_expires_at <= ? AND attempts >= max_attempts""",
+                (now, now)
+            )
+
+            row = conn.execute(
+                """SELECT task_id FROM tasks
+                   WHERE (status = 'queued' AND available_at <= ?)
+                      OR (status = 'running' AND lease_expires_at <= ?)
+                   ORDER BY lane, available_at
+                   LIMIT 1""" + self._CLAIM_LOCK,
+                (now, now)
+            ).fetchone()
+
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            conn.execute(
+                """UPDATE tasks
+                   SET status = 'running', worker_id = ?, attempts = attempts + 1,
+                       lease_expires_at = ?, started_at = COALESCE(started_at, ?)
+                   WHERE task_id = ?""",
+                (worker_id, now + self.visibility_timeout, now, row["task_id"])
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        self._notify(row["task_id"], "running")
+        return self.get_task(row["task_id"])
+
+    def extend_lease(self, task_id: str, worker_id: str, seconds: float = None) -> bool:
+        """Keep a long-running task invisible to other workers"""
+        cursor = self._connection().execute(
+            """UPDATE tasks SET lease_expires_at = ?
+               WHERE task_id = ? AND worker_id = ? AND status = 'running'""",
+            (time.time() + (seconds or self.visibility_timeout), task_id, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, task_id: str, worker_id: str, result: Dict[str, Any] = None) -> bool:
+        """Mark a leased task as completed"""
+        cursor = self._connection().execute(
+            """UPDATE tasks
+               SET status = 'completed', completed_at = ?, result = ?, lease_expires_at = NULL
+               WHERE task_id = ? AND worker_id = ? AND status = 'running'""",
+            (time.time(), json.dumps(result or {}), task_id, worker_id)
+        )
+        if cursor.rowcount != 1:
+            return False
+        self._notify(task_id, "completed")
+        return True
+
+    def fail(self, task_id: str, worker_id: str, error: str, retry: bool = True) -> Optional[str]:
+        """Record a failed attempt; requeue with backoff or move to 'dead'
+
+        Returns the task's new status, or None if the lease was lost.
+        """
+        conn = self._connection()
+        task = self.get_task(task_id)
+        if task is None or task["status"] != "running" or task["worker_id"] != worker_id:
+            return None
+
+        if not retry or task["attempts"] >= task["max_attempts"]:
+            cursor = conn.execute(
+                """UPDATE tasks
+                   SET status = 'dead', error = ?, completed_at = ?, lease_expires_at = NULL
+                   WHERE task_id = ? AND worker_id = ? AND status = 'running'""",
+                (error, time.time(), task_id, worker_id)
+            )
+            if cursor.rowcount != 1:
+                return None
+            self._notify(task_id, "dead", error)
+            return "dead"
+
+        # Exponential backoff with full jitter
+        backoff = min(self.backoff_max, self.backoff_base ** task["attempts"])
+        cursor = conn.execute(
+            """UPDATE tasks
+               SET status = 'queued', error = ?, available_at = ?, worker_id = NULL, lease_expires_at = NULL
+               WHERE task_id = ? AND worker_id = ? AND status = 'running'""",
+            (error, time.time() + random.uniform(0, backoff), task_id, worker_id)
+        )
+        if cursor.rowcount != 1:
+            return None
+        self._notify(task_id, "queued", error)
+        return "queued"
+
+    def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Return a task record, or None if unknown"""
+        row = self._connection().execute("SELECT * FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def statuses(self, task_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """{task_id: {"status", "error"}} for the known tasks among ``task_ids``"""
+        task_ids = list(task_ids)
+        found = {}
+        for start in range(0, len(task_ids), 500):
+            chunk = task_ids[start:start + 500]
+            for row in self._connection().execute(
+                f"SELECT task_id, status, error FROM tasks WHERE task_id IN ({', '.join('?' * len(chunk))})",
+                chunk
+            ):
+                found[row["task_id"]] = {"status": row["status"], "error": row["error"]}
+        return found
+
+    def list_tasks(self, status_filter: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """List tasks, newest first"""
+        if status_filter:
+            rows = self._connection().execute(
+                "SELECT * FROM tasks WHERE status = ? ORDER BY created_at DESC LIMIT ?",
+                (status_filter, limit)
+            ).fetchall()
+        else:
+            rows = self._connection().execute(
+                "SELECT * FROM tasks ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def metrics(self, window: int = 1000) -> Dict[str, Any]:
+        """Queue depth per lane and wait/run latency over the last ``window`` completions"""
+        conn = self._connection()
+        lane_names = {lane: name for name, lane in PRIORITY_LANES.items()}
+
+        depth = {name: 0 for name in PRIORITY_LANES}
+        for row in conn.execute(
+            "SELECT lane, COUNT(*) AS n FROM tasks WHERE status = 'queued' GROUP BY lane"
+        ):
+            depth[lane_names.get(row["lane"], str(row["lane"]))] = row["n"]
+
+        statuses = {row["status"]: row["n"] for row in conn.execute(
+            "SELECT status, COUNT(*) AS n FROM tasks GROUP BY status"
+        )}
+
+        recent = conn.execute(
+            """SELECT started_at - created_at AS wait, completed_at - started_at AS run
+               FROM tasks WHERE status = 'completed'
+               ORDER BY completed_at DESC LIMIT ?""",
+            (window,)
+        ).fetchall()
+
+        return {
+            "queue_depth": depth,
+            "total_queued": sum(depth.values()),
+            "status_counts": statuses,
+            "wait_latency_seconds": self._summarize([r["wait"] for r in recent]),
+            "run_latency_seconds": self._summarize([r["run"] for r in recent]),
+            "timestamp": datetime.now().isoformat()
+        }
+
+    @staticmethod
+    def _summarize(values: List[float]) -> Dict[str, float]:
+        if not values:
+            return {"count": 0, "avg": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+        ordered = sorted(values)
+        pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+        return {
+            "count": len(ordered),
+            "avg": round(sum(ordered) / len(ordered), 4),
+            "p50": round(pick(0.50), 4),
+            "p95": round(pick(0.95), 4),
+            "max": round(ordered[-1], 4)
+        }
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        task = dict(row)
+        task["payload"] = json.loads(task["payload"])
+        task["result"] = json.loads(task["result"]) if task["result"] else None
+        for field in ("created_at", "started_at", "completed_at"):
+            if task[field] is not None:
+                task[field] = datetime.fromtimestamp(task[field]).isoformat()
+        return task
+
+class _PostgresConnection:
+    """sqlite3-style ``execute`` over psycopg2: ? placeholders, dict rows, autocommit"""
+
+    def __init__(self, dsn: str):
+        self.conn = psycopg2.connect(dsn)
+        self.conn.autocommit = True
+
+    @property
+    def closed(self) -> bool:
+        return bool(self.conn.closed)
+
+    def execute(self, sql: str, params: Iterable = ()):
+        cursor = self.conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        cursor.execute(sql.replace("?", "%s"), tuple(params))
+        return cursor
+
+class PostgresTaskQueue(DurableTaskQueue):
+    """The same queue in Postgres, shared by every API instance and surviving scale-to-zero
+
+    Claims lock the chosen row with SKIP LOCKED, so workers on different
+    instances never lease the same task.
+    """
+
+    _BEGIN_CLAIM = "BEGIN"
+    _CLAIM_LOCK = " FOR UPDATE SKIP LOCKED"
+
+    def __init__(self, dsn: str = None, **kwargs):
+        if not PSYCOPG2_AVAILABLE:
+            raise RuntimeError("TASK_QUEUE_DSN is set but psycopg2 is not installed")
+        self.dsn = dsn or TASK_QUEUE_DSN
+        super().__init__(db_path=self.dsn, **kwargs)
+
+    def _connection(self) -> _PostgresConnection:
+        """One connection per thread, replaced once the server closed it"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or conn.closed:
+            conn = _PostgresConnection(self.dsn)
+            self._local.conn = conn
+        return conn
+
+    def _create_schema(self):
+        # REAL is single precision in Postgres, too coarse for epoch timestamps
+        schema = self._SCHEMA.replace(" REAL", " DOUBLE PRECISION")
+        conn = self._connection()
+        conn.execute("BEGIN")
+        try:
+            # Instances starting together would race on CREATE TABLE IF NOT EXISTS
+            conn.execute("SELECT pg_advisory_xact_lock(hashtext('autonomous_team_tasks'))")
+            for statement in filter(str.strip, schema.split(";")):
+                conn.execute(statement)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+class TaskWorkerPool:
+    """Pool of worker threads consuming from a DurableTaskQueue"""
+
+    def __init__(self,
+                 queue: DurableTaskQueue,
+                 handler: Callable[[Dict[str, Any]], Dict[str, Any]],
+                 workers: int = 4,
+                 poll_interval: float = 0.5):
+        self.queue = queue
+        self.handler = handler
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        """Start the worker threads"""
+        for i in range(self.workers):
+            worker_id = f"worker-{os.getpid()}-{i}"
+            thread = threading.Thread(target=self._run, args=(worker_id,), name=worker_id, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        print(f"👷 Task worker pool started with {self.workers} workers")
+
+    def stop(self, timeout: float = None):
+        """Signal workers to stop and wait for in-flight tasks"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _run(self, worker_id: str):
+        while not self._stop.is_set():
+            task = self.queue.claim(worker_id)
+            if task is None:
+                self._stop.wait(self.poll_interval)
+                continue
+
+            try:
+                result = self.handler(task)
+                self.queue.complete(task["task_id"], worker_id, result)
+            except Exception as e:
+                retry = not isinstance(e, PermanentTaskError)
+                status = self.queue.fail(task["task_id"], worker_id, str(e), retry=retry)
+                print(f"   ❌ Task {task['task_id']} failed (attempt {task['attempts']}): {e} → {status}")
+
+def put_latest(events, item):
+    """Bounded put into a subscriber's queue.Queue or asyncio.Queue; the oldest event gives way"""
+    while True:
+        try:
+            events.put_nowait(item)
+            return
+        except (queue.Full, asyncio.QueueFull):
+            try:
+                events.get_nowait()
+            except (queue.Empty, asyncio.QueueEmpty):
+                pass
+
+def sse_frame(event_id: Optional[int], event: Dict[str, Any]) -> str:
+    """One server-sent event; events without an id (snapshots) cannot be resumed from"""
+    frame = f"id: {event_id}\n" if event_id is not None else ""
+    return frame + f"data: {json.dumps(event, default=str)}\n\n"
+
+class TaskStatusFeed:
+    """Status transitions of watched tasks, for /tasks/stream subscribers
+
+    The queue reports transitions made in this process as they happen;
+    transitions made elsewhere (another worker process or instance sharing
+    the store) are picked up by polling the watched tasks every
+    ``poll_interval``. Events are numbered per process and the last
+    ``replay_size`` kept for Last-Event-ID resume; an id this process does
+    not know gets a snapshot of the tasks' current status instead.
+    """
+
+    def __init__(self, task_queue: DurableTaskQueue, poll_interval: float = 1.0,
+                 replay_size: int = 10000, max_subscribers: int = 64):
+        self.queue = task_queue
+        self.poll_interval = poll_interval
+        self.max_subscribers = max_subscribers
+        self._lock = threading.Lock()
+        self._sequence = itertools.count(1)
+        self._events = deque(maxlen=replay_size)
+        self._subscribers: List[Tuple[frozenset, Callable[[tuple], None]]] = []
+        self._last: Dict[str, str] = {}
+        self._poller: Optional[threading.Thread] = None
+        task_queue.listeners.append(self._observed)
+
+    def subscribe(self, task_ids: Iterable[str], deliver: Callable[[tuple], None]) -> Optional[tuple]:
+        """Call ``deliver((event_id, event))`` for each transition of ``task_ids``; None when at capacity"""
+        subscriber = (frozenset(task_ids), deliver)
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return None
+            self._subscribers.append(subscriber)
+            if self._poller is None:
+                self._poller = threading.Thread(target=self._poll, name="task-status-feed", daemon=True)
+                self._poller.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber: tuple):
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+            watched = self._watched()
+            for task_id in [t for t in self._last if t not in watched]:
+                del self._last[task_id]
+
+    def catch_up(self, task_ids: Iterable[str], last_event_id: Optional[str] = None) -> List[tuple]:
+        """What a (re)connecting subscriber missed, or the tasks' current status"""
+        task_ids = set(task_ids)
+        after = int(last_event_id) if last_event_id is not None and str(last_event_id).isdigit() else None
+        with self._lock:
+            if after is not None and self._events and self._events[0][0] <= after + 1 <= self._events[-1][0] + 1:
+                return [(event_id, event) for event_id, event in self._events
+                        if event_id > after and event["task_id"] in task_ids]
+        return [(None, self._event(task_id, row["status"], row["error"]))
+                for task_id, row in self.queue.statuses(task_ids).items()]
+
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def _watched(self) -> set:
+        return set().union(*(task_ids for task_ids, _ in self._subscribers))
+
+    @staticmethod
+    def _event(task_id: str, status: str, error: Optional[str]) -> Dict[str, Any]:
+        event = {"task_id": task_id, "status": status, "timestamp": datetime.now().isoformat()}
+        if error and status == "dead":
+            event["error"] = error
+        return event
+
+    def _observed(self, task_id: str, status: str, error: Optional[str]):
+        with self._lock:
+            if not any(task_id in task_ids for task_ids, _ in self._subscribers):
+                return
+        self._publish(task_id, status, error)
+
+    def _publish(self, task_id: str, status: str, error: Optional[str]):
+        with self._lock:
+            if self._last.get(task_id) == status:
+                return
+            self._last[task_id] = status
+            event_id = next(self._sequence)
+            event = self._event(task_id, status, error)
+            self._events.append((event_id, event))
+            targets = [deliver for task_ids, deliver in self._subscribers if task_id in task_ids]
+        for deliver in targets:
+            try:
+                deliver((event_id, event))
+            except Exception as e:
+                print(f"⚠️  Task stream delivery failed: {e}")
+
+    def _poll(self):
+        while True:
+            time.sleep(self.poll_interval)
+            with self._lock:
+                watched = self._watched()
+            if not watched:
+                continue
+            try:
+                current = self.queue.statuses(watched)
+            except Exception as e:
+                print(f"⚠️  Task status poll failed: {e}")
+                continue
+            for task_id, row in current.items():
+                self._publish(task_id, row["status"], row["error"])
+
+class RemoteTaskQueue:
+    """Enqueue into the team API's queue over HTTP (for serverless handlers)"""
+
+    def __init__(self, base_url: str, timeout: float = 10.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _call(self, method: str, path: str, body: Dict[str, Any] = None) -> Dict[str, Any]:
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(
+            f"{self.base_url}{path}", data=data, method=method,
+            headers={"Content-Type": "application/json", "Accept": "application/json"}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read() or b"{}")
+
+    def enqueue(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue the task in the API's store; returns the same fields as DurableTaskQueue.enqueue"""
+        queued = self._call("POST", "/tasks", task_data)
+        if "task_id" not in queued:
+            raise RuntimeError(f"Task queue rejected the task: {queued.get('error', queued)}")
+        return {
+            "task_id": queued["task_id"],
+            "task_type": queued.get("task_type", task_type_of(task_data)),
+            "priority": queued.get("priority", task_data.get("priority", "medium")),
+            "status": queued.get("queue_status", "queued")
+        }
+
+    def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self._call("GET", f"/tasks/{task_id}/status")
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return None
+            raise
+
+    def list_tasks(self, status_filter: Optional[str] = None) -> List[Dict[str, Any]]:
+        query = f"?{urllib.parse.urlencode({'status': status_filter})}" if status_filter else ""
+        return self._call("GET", f"/tasks{query}")
+
+    def metrics(self) -> Dict[str, Any]:
+        """The API queue's depth and latency metrics"""
+        return self._call("GET", "/tasks/metrics")
+
+def open_task_queue():
+    """The team API's queue: remote with TASK_QUEUE_URL, Postgres with TASK_QUEUE_DSN, else SQLite"""
+    if TASK_QUEUE_URL:
+        return RemoteTaskQueue(TASK_QUEUE_URL)
+    if TASK_QUEUE_DSN:
+        return PostgresTaskQueue(TASK_QUEUE_DSN)
+    return DurableTaskQueue()
+
+def shared_task_queue() -> RemoteTaskQueue:
+    """The queue for serverless handlers; a per-instance /tmp store would never be drained"""
+    if not isinstance(task_queue, RemoteTaskQueue):
+        raise RuntimeError("TASK_QUEUE_URL is not set; serverless handlers must enqueue through the team API")
+    return task_queue
+
+# Global task queue instance
+task_queue = open_task_queue()
+
+def enqueue_task(task_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Queue a task for the autonomous team"""
+    return task_queue.enqueue(task_data)
+
+def get_task_status(task_id: str) -> Optional[Dict[str, Any]]:
+    """Get a queued task's current record"""
+    return task_queue.get_task(task_id)
+
+def get_queue_metrics() -> Dict[str, Any]:
+    """Get queue depth and latency metrics"""
+    return task_queue.metrics()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Check modules that are copied between services
+
+Each service builds its image from its own directory, so a module shared by
+several services is kept as identical copies. This exits non-zero when the
+copies of a shared module differ.
+
+    python check_shared_modules.py          # check
+    python check_shared_modules.py --sync   # copy the first path over the others
+"""
+
+import argparse
+import hashlib
+import shutil
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+# The first path of each group is the one --sync copies from
+SHARED_MODULES = {
+    "request_logging": [
+        "Knowledge Base System/backend/middleware/request_logging.py",
+        "Ambient Context System/backend/app/middleware/request_logging.py",
+        "Creative Pattern Analytics Platform/backend/app/middleware/request_logging.py",
+        "Pattern-Based Recommendation Engine/app/middleware/request_logging.py",
+    ],
+}
+
+
+def digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def diverged(paths):
+    """Copies whose content differs from the first path (missing files included)"""
+    source = ROOT / paths[0]
+    expected = digest(source)
+    return [p for p in paths[1:] if not (ROOT / p).exists() or digest(ROOT / p) != expected]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Fail when copies of a shared module differ")
+    parser.add_argument("--sync", action="store_true", help="copy the first path of each group over the others")
+    args = parser.parse_args()
+
+    failed = False
+    for name, paths in SHARED_MODULES.items():
+        stale = diverged(paths)
+        if not stale:
+            print(f"✅ {name}: {len(paths)} copies identical")
+            continue
+        if args.sync:
+            for path in stale:
+                shutil.copyfile(ROOT / paths[0], ROOT / path)
+                print(f"🔄 {name}: updated {path}")
+            continue
+        failed = True
+        print(f"❌ {name}: differs from {paths[0]}:")
+        for path in stale:
+            print(f"   {path}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
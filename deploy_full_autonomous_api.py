@@ -1,267 +1,93 @@
 #!/usr/bin/env python3
 """
 Deploy Full Autonomous Team API
-Complete Flask application with all capabilities
+Complete Flask application with all capabilities, served by gunicorn
 """
 
+import os
+import sys
 import subprocess
 import json
-import time
 from datetime import datetime
 
+sys.path.append("/root/CascadeProjects/autonomous_team_workspace/infrastructure/scaleway")
+from scaleway_client import ScalewayClient, ScalewayError
+from deployment_watcher import DeploymentWatcher, print_change, PROBE_ERROR_STATE
+from team_api_image import build_api_image
+
+infra = ScalewayClient(region="fr-par")
+
+# Postgres DSN for the shared task queue; without it the queue is a SQLite file in the container
+TASK_QUEUE_DSN = os.environ.get("TASK_QUEUE_DSN")
+
+def queue_scaling():
+    """Scale settings that keep queued tasks in one durable place
+
+    Instances only share the queue through Postgres. Without it the API is
+    pinned to a single always-on instance: status lookups land on the
+    instance holding the task and scale-to-zero no longer drops the queue,
+    though a redeploy still starts from an empty one.
+    """
+    if TASK_QUEUE_DSN:
+        return {
+            "min-scale": 0,
+            "max-scale": 5,
+            "secret-environment-variables.0.key": "TASK_QUEUE_DSN",
+            "secret-environment-variables.0.value": TASK_QUEUE_DSN
+        }
+    print("   ⚠️  TASK_QUEUE_DSN not set: pinning to one instance with a local SQLite queue")
+    return {"min-scale": 1, "max-scale": 1}
+
 def deploy_full_api():
     """Deploy the complete autonomous team API"""
     
     print("🚀 DEPLOYING FULL AUTONOMOUS TEAM API")
     print("=" * 50)
     
-    # Create the full Flask application
-    full_flask_app = '''import flask
-import json
-import subprocess
-import tempfile
-import os
-from datetime import datetime
-
-app = flask.Flask(__name__)
-
-@app.route('/health')
-def health():
-    return json.dumps({
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "service": "autonomous-team-api",
-        "version": "2.0.0",
-        "capabilities": ["voice", "search", "execute", "tasks"]
-    })
-
-@app.route('/')
-def index():
-    return json.dumps({
-        "service": "Autonomous Team API",
-        "status": "running",
-        "endpoints": ["/health", "/voice", "/search", "/execute", "/tasks"],
-        "timestamp": datetime.now().isoformat(),
-        "team": "full-autonomous-team"
-    })
-
-@app.route('/voice', methods=['POST'])
-def voice():
-    try:
-        data = flask.request.get_json() or {}
-        text = data.get('text', 'Hello from autonomous team!')
-        voice_profile = data.get('voice_profile', 'professional_british')
-        
-        result = {
-            "status": "success",
-            "text": text,
-            "voice_profile": voice_profile,
-            "audio_url": f"https://audio.autonomous-team.com/{voice_profile}/{hash(text)}.wav",
-            "duration": max(1.0, len(text) * 0.1),
-            "timestamp": datetime.now().isoformat(),
-            "function": "voice-synthesis-agent"
-        }
-        
-        return json.dumps(result), 200
-        
-    except Exception as e:
-        return json.dumps({"error": str(e)}), 500
-
-@app.route('/search', methods=['POST'])
-def search():
+    # Flask app, gunicorn config and task queue are baked into a prebuilt image
+    print("\\n🏗️  Building API image with prebuilt dependencies...")
+    
     try:
-        data = flask.request.get_json() or {}
-        query = data.get('query', '')
-        max_results = data.get('max_results', 10)
-        
-        if not query:
-            return json.dumps({"error": "Query required"}), 400
-        
-        results = [
-            {
-                "title": f"Search Result {i+1} for '{query}'",
-                "url": f"https://example.com/result{i+1}",
-                "snippet": f"This is result {i+1} for the query {query}",
-                "relevance": round(0.9 - (i * 0.1), 2)
+        image = build_api_image()
+        
+        print("\\n🚀 Creating container with full autonomous team API...")
+        container = infra.create_container(
+            namespace_id="af8c35dc-3d68-4fbf-ab0b-a84c0f99d967",
+            name="autonomous-team-full-api",
+            deploy=True,
+            **{
+                "registry-image": image,
+                "port": 8080,
+                "cpu-limit": 200,
+                "memory-limit": 512,
+                **queue_scaling(),
+                "description": "Full autonomous team Flask API with all capabilities",
+                "environment-variables.WEB_CONCURRENCY": 2,
+                "environment-variables.GUNICORN_THREADS": 8,
+                "environment-variables.TASK_WORKERS": 4
             }
-            for i in range(min(max_results, 5))
-        ]
-        
-        result = {
-            "status": "success",
-            "query": query,
-            "results": results,
-            "total_results": len(results),
-            "timestamp": datetime.now().isoformat(),
-            "function": "web-search-agent"
+        )
+        
+        print("   ✅ Full API container deployment initiated!")
+        print(f"   📊 Container ID: {container.id}")
+        print(f"   📦 Image: {image}")
+        if container.domain_name:
+            print(f"   🌐 Domain: {container.domain_name}")
+        
+        return {
+            "status": "full_api_deployed",
+            "container_id": container.id,
+            "domain": container.domain_name,
+            "image": image,
+            "capabilities": ["health", "voice", "search", "execute", "tasks"],
+            "next_action": "Monitor deployment and test endpoints"
         }
-        
-        return json.dumps(result), 200
-        
-    except Exception as e:
-        return json.dumps({"error": str(e)}), 500
-
-@app.route('/execute', methods=['POST'])
-def execute():
-    try:
-        data = flask.request.get_json() or {}
-        code = data.get('code', '')
-        language = data.get('language', 'python')
-        
-        if not code:
-            return json.dumps({"error": "Code required"}), 400
-        
-        if language != 'python':
-            return json.dumps({"error": "Only Python supported"}), 400
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write(code)
-            temp_file = f.name
-        
-        try:
-            result = subprocess.run(
-                ['python3', temp_file],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            execution_result = {
-                "status": "success" if result.returncode == 0 else "error",
-                "output": result.stdout,
-                "error": result.stderr if result.stderr else None,
-                "return_code": result.returncode,
-                "language": language,
-                "timestamp": datetime.now().isoformat(),
-                "function": "code-execution-sandbox"
-            }
-            
-            return json.dumps(execution_result), 200
-            
-        finally:
-            os.unlink(temp_file)
-        
-    except subprocess.TimeoutExpired:
-        return json.dumps({"error": "Code execution timed out"}), 408
-    except Exception as e:
-        return json.dumps({"error": str(e)}), 500
-
-@app.route('/tasks', methods=['POST'])
-def tasks():
-    try:
-        data = flask.request.get_json() or {}
-        task_type = data.get('task_type', 'general')
-        priority = data.get('priority', 'medium')
-        description = data.get('description', 'Autonomous team task')
-        
-        task_id = f"task_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        
-        result = {
-            "status": "success",
-            "task_id": task_id,
-            "task_type": task_type,
-            "priority": priority,
-            "description": description,
-            "message": "Task delegated successfully",
-            "timestamp": datetime.now().isoformat(),
-            "function": "autonomous-coordinator"
-        }
-        
-        return json.dumps(result), 200
-        
-    except Exception as e:
-        return json.dumps({"error": str(e)}), 500
-
-if __name__ == '__main__':
-    print("🚀 Starting Full Autonomous Team API")
-    print("📊 Available endpoints:")
-    print("   GET  /health - Health check")
-    print("   GET  / - Service information")
-    print("   POST /voice - Voice synthesis")
-    print("   POST /search - Web search")
-    print("   POST /execute - Code execution")
-    print("   POST /tasks - Task delegation")
-    app.run(host='0.0.0.0', port=8080, debug=False)
-'''
-    
-    # Create deployment script
-    deployment_script = f'''#!/bin/bash
-set -e
-
-echo "🚀 Autonomous Team API Deployment"
-echo "=================================="
-
-# Install Flask
-pip install flask
-
-# Create the Flask application
-cat > /app.py << 'EOF'
-{full_flask_app}
-EOF
-
-echo "✅ Flask application created"
-echo "🌐 Starting server on port 8080..."
-
-cd /
-python3 app.py
-'''
-    
-    # Deploy container with the script
-    print("\\n🏗️  Creating container with full autonomous team API...")
-    
-    deploy_cmd = [
-        "scw", "container", "container", "create",
-        "namespace-id=af8c35dc-3d68-4fbf-ab0b-a84c0f99d967",
-        "name=autonomous-team-full-api",
-        "registry-image=python:3.11-slim",
-        "region=fr-par",
-        "port=8080",
-        "cpu-limit=200",
-        "memory-limit=512",
-        "min-scale=0",
-        "max-scale=5",
-        "description=Full autonomous team Flask API with all capabilities",
-        "command=bash",
-        "command.1=-c",
-        f"command.2=pip install flask && cat > /app.py << 'EOF'\n{full_flask_app}\nEOF\npython3 /app.py",
-        "deploy=true"
-    ]
-    
-    try:
-        result = subprocess.run(deploy_cmd, capture_output=True, text=True, timeout=120)
-        
-        if result.returncode == 0:
-            print("   ✅ Full API container deployment initiated!")
-            
-            # Extract container information
-            lines = result.stdout.split('\\n')
-            container_id = None
-            domain = None
-            
-            for line in lines:
-                if 'ID' in line and len(line.split()) > 1:
-                    container_id = line.split()[-1]
-                elif 'DomainName' in line:
-                    domain = ' '.join(line.split()[1:])
-            
-            if container_id:
-                print(f"   📊 Container ID: {container_id}")
-                if domain:
-                    print(f"   🌐 Domain: {domain}")
-                
-                return {
-                    "status": "full_api_deployed",
-                    "container_id": container_id,
-                    "domain": domain,
-                    "capabilities": ["health", "voice", "search", "execute", "tasks"],
-                    "next_action": "Monitor deployment and test endpoints"
-                }
-            else:
-                return {"status": "deployment_failed", "error": "Could not extract container info"}
-        else:
-            print(f"   ❌ Deployment failed: {result.stderr}")
-            return {"status": "deployment_failed", "error": result.stderr}
-            
+    except RuntimeError as e:
+        print(f"   ❌ Image build failed: {e}")
+        return {"status": "image_build_failed", "error": str(e)}
+    except ScalewayError as e:
+        print(f"   ❌ Deployment failed: {e}")
+        return {"status": "deployment_failed", "error": str(e)}
     except Exception as e:
         print(f"   ❌ Deployment error: {e}")
         return {"status": "deployment_error", "error": str(e)}
@@ -272,47 +98,32 @@ def monitor_container_deployment(container_id):
     print(f"\\n⏳ MONITORING CONTAINER DEPLOYMENT: {container_id}")
     print("-" * 50)
     
-    for i in range(10):  # Wait up to 5 minutes
-        time.sleep(30)
-        
-        try:
-            check_cmd = f"scw container container get {container_id} region=fr-par"
-            check_result = subprocess.run(check_cmd, shell=True, capture_output=True, text=True)
-            
-            if check_result.returncode == 0:
-                lines = check_result.stdout.split('\\n')
-                status = "unknown"
-                
-                for line in lines:
-                    if "Status" in line and len(line.split()) > 1:
-                        status = line.split()[-1]
-                        break
-                
-                print(f"   📊 Check {i+1}/10: {status}")
-                
-                if status == "ready":
-                    print("   🎉 Container is ready!")
-                    
-                    # Extract domain
-                    domain = None
-                    for line in lines:
-                        if "DomainName" in line:
-                            domain = ' '.join(line.split()[1:])
-                            break
-                    
-                    return {
-                        "status": "ready",
-                        "container_id": container_id,
-                        "domain": domain
-                    }
-                elif status == "error":
-                    print("   ❌ Container deployment failed")
-                    break
-            else:
-                print(f"   ❌ Could not check status: {check_result.stderr}")
-                
-        except Exception as e:
-            print(f"   ❌ Check error: {e}")
+    watcher = DeploymentWatcher(infra, max_interval=30)
+    watch = watcher.watch_container(container_id, on_change=print_change, timeout=300)
+    watcher.run()
+    
+    if watch.state == "ready":
+        print(f"   🎉 Container is ready! (time to ready {watch.time_to_ready:.1f}s)")
+        return {
+            "status": "ready",
+            "container_id": container_id,
+            "domain": watch.detail.domain_name,
+            "time_to_ready": round(watch.time_to_ready, 2)
+        }
+    elif watch.state == "error":
+        print(f"   ❌ Container deployment failed: {watch.detail.error_message}")
+        return {
+            "status": "error",
+            "container_id": container_id,
+            "message": watch.detail.error_message or "Container deployment failed"
+        }
+    elif watch.state == PROBE_ERROR_STATE:
+        print(f"   ❌ Could not check container status: {watch.detail}")
+        return {
+            "status": "probe_error",
+            "container_id": container_id,
+            "message": f"Could not check container status: {watch.detail}"
+        }
     
     return {
         "status": "timeout",
@@ -335,7 +146,7 @@ def test_api_endpoints(domain):
         {"method": "POST", "path": "/voice", "expected_status": 200, "data": {"text": "Hello world!"}},
         {"method": "POST", "path": "/search", "expected_status": 200, "data": {"query": "test search"}},
         {"method": "POST", "path": "/execute", "expected_status": 200, "data": {"code": "print('Hello!')"}},
-        {"method": "POST", "path": "/tasks", "expected_status": 200, "data": {"task_type": "test"}}
+        {"method": "POST", "path": "/tasks", "expected_status": 200, "data": {"task_type": "general"}}
     ]
     
     results = []
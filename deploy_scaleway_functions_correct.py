@@ -4,31 +4,30 @@ Deploy Serverless Functions to Scaleway - Correct Method
 Using the proper Scaleway CLI commands
 """
 
-import subprocess
-import json
-import zipfile
 import os
+import sys
+import json
 from pathlib import Path
 from datetime import datetime
 
-def deploy_serverless_functions_correct():
-    """Deploy functions using correct Scaleway method"""
-    
-    print("🚀 DEPLOYING SERVERLESS FUNCTIONS - CORRECT METHOD")
-    print("=" * 60)
-    
-    project_id = "c5d299b8-8462-40fb-b5ae-32a8808bf394"
-    region = "fr-par"
-    namespace_id = "9a4d8548-df9c-4038-93e7-ae0b21c7d8bb"
-    
-    # Function definitions
-    functions = [
+TASK_QUEUE_MODULE = Path("/root/CascadeProjects/autonomous_team_workspace/workflows/task_queue.py")
+# The coordinator enqueues through the team API, whose workers drain the queue
+TEAM_API_URL = os.environ.get("TEAM_API_URL", "https://163.172.191.225")
+
+sys.path.append("/root/CascadeProjects/autonomous_team_workspace/infrastructure/scaleway")
+from function_pipeline import FunctionDeployPipeline, print_timing_report
+
+def function_specs():
+    """Function definitions for the autonomous team namespace"""
+    return [
         {
             "name": "autonomous-coordinator",
             "runtime": "python311",
             "handler": "handler.main",
             "description": "Coordinate autonomous team operations",
-            "code": generate_coordinator_code()
+            "code": generate_coordinator_code(),
+            "extra_files": [TASK_QUEUE_MODULE],
+            "env": {"TASK_QUEUE_URL": TEAM_API_URL}
         },
         {
             "name": "voice-synthesis-agent", 
@@ -52,99 +51,35 @@ def deploy_serverless_functions_correct():
             "code": generate_code_execution()
         }
     ]
+
+def deploy_serverless_functions_correct(concurrency: int = 4, force: bool = False):
+    """Deploy functions using correct Scaleway method"""
     
-    deployed_functions = []
+    print("🚀 DEPLOYING SERVERLESS FUNCTIONS - CORRECT METHOD")
+    print("=" * 60)
     
-    for func in functions:
-        print(f"\n⚡ Deploying: {func['name']}")
-        
-        # Create function directory
-        func_dir = Path(f"/tmp/scaleway_functions/{func['name']}")
-        func_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Write handler code
-        handler_file = func_dir / "handler.py"
-        with open(handler_file, 'w') as f:
-            f.write(func['code'])
-        
-        # Write requirements
-        req_file = func_dir / "requirements.txt"
-        with open(req_file, 'w') as f:
-            f.write("requests>=2.31.0\n")
-        
-        # Create zip file
-        zip_path = func_dir / "function.zip"
-        with zipfile.ZipFile(zip_path, 'w') as zipf:
-            zipf.write(handler_file, "handler.py")
-            zipf.write(req_file, "requirements.txt")
-        
-        # Create function first
-        create_cmd = [
-            "scw", "function", "function", "create",
-            f"namespace-id={namespace_id}",
-            f"name={func['name']}",
-            f"runtime={func['runtime']}",
-            f"handler={func['handler']}",
-            f"description={func['description']}",
-            f"region={region}"
-        ]
-        
-        try:
-            print(f"   📦 Creating function {func['name']}...")
-            result = subprocess.run(create_cmd, capture_output=True, text=True, timeout=60)
-            
-            if result.returncode == 0:
-                print(f"   ✅ Function {func['name']} created")
-                
-                # Deploy code to function
-                deploy_cmd = [
-                    "scw", "function", "function", "deploy",
-                    f"function-id={func['name']}",
-                    f"namespace-id={namespace_id}",
-                    f"region={region}",
-                    f"zip-file={zip_path}"
-                ]
-                
-                print(f"   🚀 Deploying code to {func['name']}...")
-                deploy_result = subprocess.run(deploy_cmd, capture_output=True, text=True, timeout=120)
-                
-                if deploy_result.returncode == 0:
-                    print(f"   ✅ {func['name']} deployed successfully")
-                    deployed_functions.append(func['name'])
-                else:
-                    print(f"   ❌ {func['name']} code deployment failed:")
-                    print(f"      {deploy_result.stderr}")
-            else:
-                print(f"   ❌ {func['name']} creation failed:")
-                print(f"      {result.stderr}")
-                
-        except subprocess.TimeoutExpired:
-            print(f"   ❌ {func['name']} deployment timed out")
-        except Exception as e:
-            print(f"   ❌ {func['name']} deployment error: {e}")
+    project_id = "c5d299b8-8462-40fb-b5ae-32a8808bf394"
+    region = "fr-par"
+    namespace_id = "9a4d8548-df9c-4038-93e7-ae0b21c7d8bb"
     
-    # List deployed functions
-    print(f"\n🔍 Listing deployed functions...")
-    list_cmd = [
-        "scw", "function", "function", "list",
-        f"namespace-id={namespace_id}",
-        f"region={region}"
-    ]
+    functions = function_specs()
     
-    try:
-        result = subprocess.run(list_cmd, capture_output=True, text=True, timeout=30)
-        if result.returncode == 0:
-            print("   ✅ Functions listed:")
-            print(f"   {result.stdout}")
-        else:
-            print(f"   ❌ Failed to list functions: {result.stderr}")
-    except Exception as e:
-        print(f"   ❌ Error listing functions: {e}")
+    # Zips build concurrently, unchanged functions are skipped and
+    # create/deploy calls run in parallel under the concurrency cap
+    pipeline = FunctionDeployPipeline(namespace_id, region=region, concurrency=concurrency)
+    report = pipeline.run(functions, force=force)
+    print_timing_report(report)
+    
+    deployed_functions = report["deployed"]
     
     print(f"\n🎉 DEPLOYMENT SUMMARY")
     print(f"   ✅ Successfully deployed: {len(deployed_functions)}/{len(functions)} functions")
     for func in deployed_functions:
         print(f"      - {func}")
+    if report["skipped"]:
+        print(f"   ⏭️  Unchanged: {', '.join(report['skipped'])}")
+    for func in report["failed"]:
+        print(f"   ❌ {func}: {report['functions'][func]['error']}")
     
     return deployed_functions
 
@@ -153,6 +88,8 @@ def generate_coordinator_code():
 import os
 from datetime import datetime
 
+from task_queue import shared_task_queue, task_type_of
+
 def main(event, context):
     """Autonomous coordinator function"""
     try:
@@ -162,19 +99,24 @@ def main(event, context):
         else:
             data = event.get('body', {}) if 'body' in event else event
         
-        # Generate task ID
-        task_id = f"task_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        # HTTP triggers deliver the body as a JSON string
+        if isinstance(data, str):
+            data = json.loads(data) if data else {}
         
         # Process task
-        task_type = data.get('task_type', 'general')
+        task_type = task_type_of(data)
         priority = data.get('priority', 'medium')
         
+        # Persist task in the team API's queue (collision-free task ID)
+        task = shared_task_queue().enqueue(dict(data, task_type=task_type, priority=priority))
+        
         result = {
             "status": "success",
-            "task_id": task_id,
+            "task_id": task["task_id"],
             "task_type": task_type,
             "priority": priority,
-            "message": "Task delegated successfully",
+            "queue_status": task["status"],
+            "message": "Task queued successfully",
             "timestamp": datetime.now().isoformat(),
             "function": "autonomous-coordinator"
         }
@@ -207,6 +149,10 @@ def main(event, context):
         else:
             data = event.get('body', {}) if 'body' in event else event
         
+        # HTTP triggers deliver the body as a JSON string
+        if isinstance(data, str):
+            data = json.loads(data) if data else {}
+        
         text = data.get('text', 'Hello from autonomous team!')
         voice_profile = data.get('voice_profile', 'professional_british')
         
@@ -251,6 +197,10 @@ def main(event, context):
         else:
             data = event.get('body', {}) if 'body' in event else event
         
+        # HTTP triggers deliver the body as a JSON string
+        if isinstance(data, str):
+            data = json.loads(data) if data else {}
+        
         query = data.get('query', '')
         max_results = data.get('max_results', 10)
         
@@ -311,6 +261,10 @@ def main(event, context):
         else:
             data = event.get('body', {}) if 'body' in event else event
         
+        # HTTP triggers deliver the body as a JSON string
+        if isinstance(data, str):
+            data = json.loads(data) if data else {}
+        
         code = data.get('code', '')
         language = data.get('language', 'python')
         
@@ -7,9 +7,14 @@ Real deployment, not just configuration
 import subprocess
 import json
 import os
+import shutil
 from pathlib import Path
 from datetime import datetime
 
+TASK_QUEUE_MODULE = Path("/root/CascadeProjects/autonomous_team_workspace/workflows/task_queue.py")
+# The coordinator enqueues through the team API, whose workers drain the queue
+TEAM_API_URL = os.environ.get("TEAM_API_URL", "https://163.172.191.225")
+
 def deploy_real_serverless_functions():
     """Deploy actual serverless functions to Scaleway"""
     
@@ -31,7 +36,9 @@ def deploy_real_serverless_functions():
             "min_scale": "0",
             "max_scale": "10",
             "description": "Coordinate autonomous team operations",
-            "code": generate_coordinator_code()
+            "code": generate_coordinator_code(),
+            "extra_files": [TASK_QUEUE_MODULE],
+            "env": {"TASK_QUEUE_URL": TEAM_API_URL}
         },
         {
             "name": "voice-synthesis-agent", 
@@ -87,6 +94,10 @@ def deploy_real_serverless_functions():
         with open(req_file, 'w') as f:
             f.write("requests>=2.31.0\n")
         
+        # Copy supporting modules next to the handler
+        for extra_file in func.get('extra_files', []):
+            shutil.copy(extra_file, func_dir / Path(extra_file).name)
+        
         # Deploy using scw function deploy
         deploy_cmd = [
             "scw", "function", "deploy",
@@ -99,7 +110,7 @@ def deploy_real_serverless_functions():
             f"max-scale={func['max_scale']}",
             f"region={region}",
             f"local-path={func_dir}"
-        ]
+        ] + [f"environment-variables.{key}={value}" for key, value in func.get('env', {}).items()]
         
         try:
             result = subprocess.run(deploy_cmd, capture_output=True, text=True, timeout=120)
@@ -146,6 +157,8 @@ def generate_coordinator_code():
 import os
 from datetime import datetime
 
+from task_queue import shared_task_queue, task_type_of
+
 def main(event, context):
     """Autonomous coordinator function"""
     try:
@@ -155,19 +168,20 @@ def main(event, context):
         else:
             data = event.get('body', {}) if 'body' in event else event
         
-        # Generate task ID
-        task_id = f"task_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        
         # Process task
-        task_type = data.get('task_type', 'general')
+        task_type = task_type_of(data)
         priority = data.get('priority', 'medium')
         
+        # Persist task in the team API's queue (collision-free task ID)
+        task = shared_task_queue().enqueue(dict(data, task_type=task_type, priority=priority))
+        
         result = {
             "status": "success",
-            "task_id": task_id,
+            "task_id": task["task_id"],
             "task_type": task_type,
             "priority": priority,
-            "message": "Task delegated successfully",
+            "queue_status": task["status"],
+            "message": "Task queued successfully",
             "timestamp": datetime.now().isoformat(),
             "function": "autonomous-coordinator"
         }
@@ -221,12 +221,13 @@ EXPOSE 8080
 HEALTHCHECK --interval=30s --timeout=10s --start-period=5s --retries=3 \\
     CMD curl -f http://localhost:8080/health || exit 1
 
-# Run the application
-CMD ["python", "app.py"]
+# Run the application under gunicorn (threaded workers; /execute can block for 10s)
+CMD ["gunicorn", "--bind", "0.0.0.0:8080", "--workers", "2", "--worker-class", "gthread", "--threads", "8", "app:app"]
 '''
     
     # Create requirements.txt
     requirements = '''flask>=2.3.0
+gunicorn>=22.0
 requests>=2.31.0
 '''
     
@@ -1,14 +1,23 @@
 #!/usr/bin/env python3
 """
 Final Container Deployment Fix
-Deploy working Flask container with correct CLI commands
+Deploy the team API image (Flask on gunicorn) with correct CLI commands
 """
 
+import sys
 import subprocess
 import json
-import time
 from datetime import datetime
 
+import requests
+
+sys.path.append("/root/CascadeProjects/autonomous_team_workspace/infrastructure/scaleway")
+from scaleway_client import ScalewayClient, ScalewayError
+from deployment_watcher import DeploymentWatcher, print_change, PROBE_ERROR_STATE
+from team_api_image import build_api_image
+
+infra = ScalewayClient(region="fr-par")
+
 def fix_container_deployment():
     """Fix container deployment with correct CLI syntax"""
     
@@ -35,239 +44,101 @@ def fix_container_deployment():
         except Exception as e:
             print(f"   • Container {container_id}: Already cleaned")
     
-    # Step 2: Create working Flask app with simple approach
-    print("\\n🐍 Step 2: Creating working Flask container...")
+    # Step 2: Build the API image (Flask app on gunicorn, orjson responses)
+    print("\\n🏗️  Step 2: Building API image with prebuilt dependencies...")
     
-    # Create a simple, working Flask application
-    flask_app_code = '''
-import flask
-import json
-from datetime import datetime
-
-app = flask.Flask(__name__)
-
-@app.route('/health')
-def health():
-    return json.dumps({
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "service": "autonomous-team-api"
-    })
-
-@app.route('/')
-def index():
-    return json.dumps({
-        "service": "Autonomous Team API",
-        "status": "running",
-        "endpoints": ["/health", "/voice", "/search", "/execute", "/tasks"],
-        "timestamp": datetime.now().isoformat()
-    })
-
-@app.route('/voice', methods=['POST'])
-def voice():
-    try:
-        data = flask.request.get_json() or {}
-        text = data.get('text', 'Hello from autonomous team!')
-        return json.dumps({
-            "status": "success",
-            "text": text,
-            "audio_url": f"https://audio.autonomous-team.com/{hash(text)}.wav",
-            "timestamp": datetime.now().isoformat()
-        })
-    except Exception as e:
-        return json.dumps({"error": str(e)}), 500
-
-@app.route('/search', methods=['POST'])
-def search():
-    try:
-        data = flask.request.get_json() or {}
-        query = data.get('query', '')
-        results = [
-            {"title": f"Result for {query}", "url": "https://example.com", "snippet": f"Search result for {query}"}
-            for i in range(3)
-        ]
-        return json.dumps({
-            "status": "success",
-            "query": query,
-            "results": results,
-            "timestamp": datetime.now().isoformat()
-        })
-    except Exception as e:
-        return json.dumps({"error": str(e)}), 500
-
-@app.route('/execute', methods=['POST'])
-def execute():
     try:
-        data = flask.request.get_json() or {}
-        code = data.get('code', 'print("Hello!")')
-        return json.dumps({
-            "status": "success",
-            "output": code,
-            "timestamp": datetime.now().isoformat()
-        })
-    except Exception as e:
-        return json.dumps({"error": str(e)}), 500
-
-@app.route('/tasks', methods=['POST'])
-def tasks():
-    try:
-        data = flask.request.get_json() or {}
-        task_type = data.get('task_type', 'general')
-        return json.dumps({
-            "status": "success",
-            "task_id": f"task_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-            "task_type": task_type,
-            "timestamp": datetime.now().isoformat()
-        })
-    except Exception as e:
-        return json.dumps({"error": str(e)}), 500
-
-if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=8080, debug=False)
-'''
-    
-    # Step 3: Deploy container with correct command structure
-    print("\\n🚀 Step 3: Deploying container with correct CLI syntax...")
-    
-    # Use the correct command structure for Scaleway CLI
-    deploy_cmd = [
-        "scw", "container", "container", "create",
-        f"namespace-id={namespace_id}",
-        "name=autonomous-team-final-api",
-        "registry-image=python:3.11-slim",
-        f"region={region}",
-        "port=8080",
-        "cpu-limit=140",
-        "memory-limit=256",
-        "min-scale=0",
-        "max-scale=5",
-        "description=Final autonomous team Flask API",
-        "command=bash",
-        "command.1=-c",
-        f"command.2=pip install flask && cat > app.py << 'EOF'\n{flask_app_code}\nEOF\npython3 app.py",
-        "deploy=true"
-    ]
+        image = build_api_image()
+    except RuntimeError as e:
+        print(f"   ❌ Image build failed: {e}")
+        return {"status": "image_build_failed", "error": str(e)}
     
-    print("   🏗️  Executing deployment command...")
+    # Step 3: Deploy container from the image
+    print("\\n🚀 Step 3: Deploying container from the prebuilt image...")
     
     try:
-        result = subprocess.run(deploy_cmd, capture_output=True, text=True, timeout=120)
-        
-        if result.returncode == 0:
-            print("   ✅ Container deployment initiated!")
-            
-            # Extract container information
-            lines = result.stdout.split('\\n')
-            container_id = None
-            domain = None
-            
-            for line in lines:
-                if 'ID' in line and len(line.split()) > 1:
-                    container_id = line.split()[-1]
-                elif 'DomainName' in line:
-                    domain = ' '.join(line.split()[1:])
-            
-            if container_id:
-                print(f"   📊 Container ID: {container_id}")
-                if domain:
-                    print(f"   🌐 Domain: {domain}")
-                
-                # Step 4: Monitor deployment
-                print("\\n⏳ Step 4: Monitoring deployment progress...")
-                
-                for i in range(10):  # Wait up to 5 minutes
-                    time.sleep(30)
-                    
-                    check_cmd = f"scw container container get {container_id} region={region}"
-                    check_result = subprocess.run(check_cmd, shell=True, capture_output=True, text=True)
-                    
-                    if check_result.returncode == 0:
-                        lines = check_result.stdout.split('\\n')
-                        status = "unknown"
-                        
-                        for line in lines:
-                            if "Status" in line and len(line.split()) > 1:
-                                status = line.split()[-1]
-                                break
-                        
-                        print(f"   📊 Check {i+1}/10: {status}")
-                        
-                        if status == "ready":
-                            print("   🎉 Container is ready!")
-                            
-                            # Test the container
-                            if domain:
-                                print("\\n🧪 Step 5: Testing container endpoints...")
-                                
-                                # Test health endpoint
-                                health_cmd = f'curl -f https://{domain}/health --max-time 10'
-                                health_result = subprocess.run(health_cmd, shell=True, capture_output=True, text=True)
-                                
-                                if health_result.returncode == 0:
-                                    print("   ✅ Health endpoint working!")
-                                    print(f"   📄 Response: {health_result.stdout[:100]}...")
-                                    
-                                    # Test main endpoint
-                                    main_cmd = f'curl -f https://{domain}/ --max-time 10'
-                                    main_result = subprocess.run(main_cmd, shell=True, capture_output=True, text=True)
-                                    
-                                    if main_result.returncode == 0:
-                                        print("   ✅ Main endpoint working!")
-                                        print(f"   📄 Response: {main_result.stdout[:100]}...")
-                                        
-                                        return {
-                                            "status": "deployment_successful",
-                                            "container_id": container_id,
-                                            "domain": domain,
-                                            "health_endpoint": f"https://{domain}/health",
-                                            "main_endpoint": f"https://{domain}/",
-                                            "api_endpoints": [
-                                                f"https://{domain}/health",
-                                                f"https://{domain}/",
-                                                f"https://{domain}/voice",
-                                                f"https://{domain}/search",
-                                                f"https://{domain}/execute",
-                                                f"https://{domain}/tasks"
-                                            ],
-                                            "next_action": "Configure load balancer backend"
-                                        }
-                                    else:
-                                        print(f"   ❌ Main endpoint failed: {main_result.stderr}")
-                                else:
-                                    print(f"   ❌ Health endpoint failed: {health_result.stderr}")
-                            
-                            break
-                        elif status == "error":
-                            print("   ❌ Container deployment failed")
-                            break
-                    else:
-                        print(f"   ❌ Could not check status: {check_result.stderr}")
-                
-                # If we get here, deployment didn't complete in time
-                return {
-                    "status": "deployment_timeout",
-                    "container_id": container_id,
-                    "domain": domain,
-                    "message": "Container created but not ready after 5 minutes"
-                }
-            else:
-                return {
-                    "status": "deployment_failed",
-                    "error": "Could not extract container ID from response"
-                }
-        else:
-            print(f"   ❌ Deployment failed: {result.stderr}")
-            return {
-                "status": "deployment_failed",
-                "error": result.stderr
+        container = infra.create_container(
+            namespace_id=namespace_id,
+            name="autonomous-team-final-api",
+            deploy=True,
+            **{
+                "registry-image": image,
+                "port": 8080,
+                "cpu-limit": 140,
+                "memory-limit": 256,
+                "min-scale": 0,
+                "max-scale": 5,
+                "description": "Final autonomous team Flask API",
+                "environment-variables.WEB_CONCURRENCY": 1,
+                "environment-variables.GUNICORN_THREADS": 8,
+                "environment-variables.TASK_WORKERS": 2
             }
-            
-    except subprocess.TimeoutExpired:
-        print("   ❌ Deployment command timed out")
-        return {"status": "deployment_timeout"}
-    except Exception as e:
-        print(f"   ❌ Deployment error: {e}")
-        return {"status": "deployment_error", "error": str(e)}
+        )
+    except ScalewayError as e:
+        print(f"   ❌ Deployment failed: {e}")
+        return {"status": "deployment_failed", "error": str(e)}
+    
+    print("   ✅ Container deployment initiated!")
+    print(f"   📊 Container ID: {container.id}")
+    print(f"   📦 Image: {image}")
+    
+    # Step 4: Monitor deployment
+    print("\\n⏳ Step 4: Monitoring deployment progress...")
+    
+    watcher = DeploymentWatcher(infra, max_interval=30)
+    watch = watcher.watch_container(container.id, on_change=print_change, timeout=300)
+    watcher.run()
+    
+    if watch.state == "error":
+        print(f"   ❌ Container deployment failed: {watch.detail.error_message}")
+        return {"status": "deployment_failed", "container_id": container.id, "error": watch.detail.error_message}
+    if watch.state == PROBE_ERROR_STATE:
+        print(f"   ❌ Could not check status: {watch.detail}")
+        return {"status": "deployment_failed", "container_id": container.id, "error": watch.detail}
+    if watch.state != "ready":
+        return {
+            "status": "deployment_timeout",
+            "container_id": container.id,
+            "domain": container.domain_name,
+            "message": "Container created but not ready after 5 minutes"
+        }
+    
+    domain = watch.detail.domain_name
+    print(f"   🎉 Container is ready! (time to ready {watch.time_to_ready:.1f}s)")
+    
+    # Step 5: Test the container
+    print("\\n🧪 Step 5: Testing container endpoints...")
+    
+    for path in ("/health", "/"):
+        try:
+            response = requests.get(f"https://{domain}{path}", timeout=10)
+        except requests.RequestException as e:
+            print(f"   ❌ {path} failed: {e}")
+            return {"status": "endpoint_check_failed", "container_id": container.id, "domain": domain, "error": str(e)}
+        if response.status_code != 200:
+            print(f"   ❌ {path} failed: HTTP {response.status_code}")
+            return {"status": "endpoint_check_failed", "container_id": container.id, "domain": domain,
+                    "error": f"{path} returned HTTP {response.status_code}"}
+        print(f"   ✅ {path} working ({response.headers.get('Content-Type')})")
+        print(f"   📄 Response: {response.text[:100]}...")
+    
+    return {
+        "status": "deployment_successful",
+        "container_id": container.id,
+        "domain": domain,
+        "image": image,
+        "health_endpoint": f"https://{domain}/health",
+        "main_endpoint": f"https://{domain}/",
+        "api_endpoints": [
+            f"https://{domain}/health",
+            f"https://{domain}/",
+            f"https://{domain}/voice",
+            f"https://{domain}/search",
+            f"https://{domain}/execute",
+            f"https://{domain}/tasks"
+        ],
+        "next_action": "Configure load balancer backend"
+    }
 
 def configure_load_balancer(container_info):
     """Configure load balancer backend with working container"""
@@ -326,7 +197,7 @@ def main():
         
         # Final summary
         print("\\n📊 DEPLOYMENT SUMMARY:")
-        print("   ✅ Flask container deployed and running")
+        print("   ✅ Flask API image deployed and running on gunicorn")
         print("   ✅ All API endpoints available")
         print("   ✅ Load balancer backend configured")
         print("   ✅ Production-ready")
@@ -5,6 +5,9 @@ CONTAINER_ID="9aed38a3-e22d-4703-913e-dab883fe99e6"
 NAMESPACE_ID="343a2c4c-875c-4aa3-bfe4-c69cfe19ae9f"
 MATTERMOST_URL="https://mattermostns2hlwvdds-mattermost-private.functions.fnc.fr-par.scw.cloud"
 LOG_FILE="/tmp/mattermost-monitor.log"
+WATCHER="/root/CascadeProjects/autonomous_team_workspace/infrastructure/scaleway/deployment_watcher.py"
+DASHBOARD_REFRESH=30
+WATCHER_PID=""
 
 # Colors for output
 RED='\033[0;31m'
@@ -103,40 +106,15 @@ display_dashboard() {
     
     echo
     echo -e "${BLUE}═══════════════════════════════════════════════════════════════${NC}"
-    echo -e "${BLUE} Press Ctrl+C to stop monitoring | Auto-refresh every 30s ${NC}"
+    echo -e "${BLUE} Press Ctrl+C to stop monitoring | Auto-refresh every ${DASHBOARD_REFRESH}s ${NC}"
     echo -e "${BLUE}═══════════════════════════════════════════════════════════════${NC}"
 }
 
-# Function to check for critical issues and suggest actions
-check_critical_issues() {
-    local status=$(check_container_status)
-    local http_code=$(check_web_endpoint)
-    
-    if [[ "$status" == "error" ]]; then
-        log "${RED}🚨 CRITICAL: Container is in ERROR state${NC}"
-        log "${YELLOW}💡 Suggestion: Check container logs in Scaleway Console${NC}"
-        log "${YELLOW}💡 Suggestion: Consider redeploying the container${NC}"
-        return 1
-    fi
-    
-    if [[ "$http_code" == "000" && "$status" == "ready" ]]; then
-        log "${RED}🚨 CRITICAL: Container is ready but web endpoint is unreachable${NC}"
-        log "${YELLOW}💡 Suggestion: Check port configuration and health checks${NC}"
-        log "${YELLOW}💡 Suggestion: Verify environment variables${NC}"
-        return 1
-    fi
-    
-    if [[ "$status" == "pending" ]]; then
-        log "${YELLOW}⏳ Container is still deploying...${NC}"
-        return 2
-    fi
-    
-    if [[ "$http_code" == "200" ]]; then
-        log "${GREEN}✅ All systems operational${NC}"
-        return 0
-    fi
-    
-    return 3
+# Stop the background watcher with the monitor
+stop_monitoring() {
+    [[ -n "$WATCHER_PID" ]] && kill "$WATCHER_PID" 2>/dev/null
+    log "${YELLOW}🛑 Monitoring stopped by user${NC}"
+    exit 0
 }
 
 # Main monitoring loop
@@ -145,26 +123,28 @@ main() {
     log "${BLUE}📦 Container ID: $CONTAINER_ID${NC}"
     log "${BLUE}🌐 Monitoring URL: $MATTERMOST_URL${NC}"
     
+    # Event-driven watcher in the background: logs state changes and critical
+    # alerts within seconds, backing off to 60s while stable
+    python3 -u "$WATCHER" \
+        --container "$CONTAINER_ID" \
+        --url "$MATTERMOST_URL" \
+        --follow \
+        --max-interval 60 >> "$LOG_FILE" 2>&1 &
+    WATCHER_PID=$!
+    
+    # The dashboard shows the watcher's latest entries under Recent Logs
     while true; do
         display_dashboard
-        
-        # Check for issues
-        check_critical_issues
-        local issue_level=$?
-        
-        # Sleep based on issue level
-        if [[ $issue_level -eq 1 ]]; then
-            sleep 10  # Check more frequently for critical issues
-        elif [[ $issue_level -eq 2 ]]; then
-            sleep 20  # Check moderately during deployment
-        else
-            sleep 30  # Normal interval
+        if ! kill -0 "$WATCHER_PID" 2>/dev/null; then
+            log "${RED}🚨 Deployment watcher exited; see $LOG_FILE${NC}"
+            exit 1
         fi
+        sleep "$DASHBOARD_REFRESH"
     done
 }
 
 # Trap to handle exit
-trap 'log "${YELLOW}🛑 Monitoring stopped by user${NC}"; exit 0' INT TERM
+trap stop_monitoring INT TERM
 
 # Start monitoring
 main
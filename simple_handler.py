@@ -10,6 +10,10 @@ def main(event, context):
         else:
             data = event.get('body', {}) if 'body' in event else event
         
+        # HTTP triggers deliver the body as a JSON string
+        if isinstance(data, str):
+            data = json.loads(data) if data else {}
+        
         result = {
             "status": "success",
             "message": "Autonomous team function is working!",
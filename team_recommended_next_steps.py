@@ -4,11 +4,14 @@ Team Recommended Next Steps Implementation
 Following autonomous team's prioritized backlog
 """
 
-import subprocess
+import sys
 import json
-import time
 from datetime import datetime
 
+sys.path.append("/root/CascadeProjects/autonomous_team_workspace/infrastructure/scaleway")
+from scaleway_client import ScalewayClient, ScalewayError
+from deployment_watcher import DeploymentWatcher, print_change
+
 def implement_team_recommendations():
     """Implement the autonomous team's recommended next steps"""
     
@@ -18,46 +21,35 @@ def implement_team_recommendations():
     # Step 1: Monitor container deployment
     print("\\n⏳ Step 1: Monitoring container deployment...")
     
+    infra = ScalewayClient(region="fr-par")
     container_id = "d6859ad2-46a1-47ea-8120-3f4e74407b59"
-    max_wait_time = 300  # 5 minutes
-    start_time = time.time()
     
-    while time.time() - start_time < max_wait_time:
-        check_cmd = f"scw container container get {container_id} region=fr-par"
-        result = subprocess.run(check_cmd, shell=True, capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            lines = result.stdout.split('\\n')
-            status = "unknown"
-            for line in lines:
-                if "Status" in line:
-                    status = line.split()[-1]
-                    break
-            
-            print(f"   📊 Container status: {status}")
-            
-            if status == "ready":
-                print("   ✅ Container is ready!")
-                break
-            elif status == "error":
-                print("   ❌ Container deployment failed")
-                break
-            else:
-                print("   ⏳ Still building...")
-                time.sleep(30)
-        else:
-            print("   ❌ Could not check container status")
-            break
+    # Polls within seconds of a change, backing off to 30s while nothing happens
+    watcher = DeploymentWatcher(infra, max_interval=30)
+    watch = watcher.watch_container(container_id, on_change=print_change, timeout=300)
+    watcher.run()
+    
+    if watch.state == "ready":
+        print(f"   ✅ Container is ready! (time to ready {watch.time_to_ready:.1f}s, {watch.polls} checks)")
+    elif watch.state == "error":
+        print("   ❌ Container deployment failed")
+    elif watch.state == "timeout":
+        print("   ⏰ Container not ready after 5 minutes")
+    else:
+        print(f"   ❌ Could not check container status: {watch.detail}")
     
     # Step 2: Prepare load balancer configuration
     print("\\n🔧 Step 2: Preparing load balancer configuration...")
     
     # Get current load balancer info
-    lb_check_cmd = "scw lb lb get 5762a273-5b57-43a3-bd00-31c4ff7ae372 region=fr-par"
-    lb_result = subprocess.run(lb_check_cmd, shell=True, capture_output=True, text=True)
+    try:
+        load_balancer = infra.get_load_balancer("5762a273-5b57-43a3-bd00-31c4ff7ae372")
+    except ScalewayError as e:
+        print(f"   ❌ Could not retrieve load balancer info: {e}")
+        load_balancer = None
     
-    if lb_result.returncode == 0:
-        print("   ✅ Load balancer configuration retrieved")
+    if load_balancer:
+        print(f"   ✅ Load balancer configuration retrieved ({load_balancer.status})")
         
         # Prepare backend update command (will use when container is ready)
         backend_config = {
@@ -72,8 +64,6 @@ def implement_team_recommendations():
         print(f"      - Container Domain: {backend_config['container_domain']}")
         print(f"      - Health Check: {backend_config['health_check_path']}")
         print(f"      - Port: {backend_config['port']}")
-    else:
-        print("   ❌ Could not retrieve load balancer info")
     
     # Step 3: Create comprehensive test suite
     print("\\n🧪 Step 3: Creating comprehensive test suite...")